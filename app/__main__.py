@@ -36,6 +36,8 @@ import loguru
 from loguru import logger
 
 from app.controllers.app_controller import AppController
+from app.controllers.metadata_db_controller import AuxMetadataController
+from app.utils import batch_sort
 from app.utils.app_info import AppInfo
 from app.utils.obfuscate_message import obfuscate_message
 from app.views.dialogue import show_fatal_error
@@ -132,6 +134,13 @@ def main_thread() -> None:
                 logger.warning(
                     f"watchdog received the following exception while exiting: {stacktrace}"
                 )
+            try:
+                logger.debug("Committing queued Aux DB updates...")
+                AuxMetadataController.close_all()
+            except Exception as e:
+                logger.warning(
+                    f"Failed to commit queued Aux DB updates while exiting: {e}"
+                )
         logger.info("Exiting application!")
         sys.exit()
 
@@ -210,5 +219,11 @@ if __name__ == "__main__":
 
         logger.debug("Running using Nuitka bundle")
 
+    if len(sys.argv) > 1 and sys.argv[1] == "sort":
+        # Headless batch sort, errors are reported on the command line
+        sys.excepthook = sys.__excepthook__
+        logger.info(f"Running RimSort batch sort: {AppInfo().app_version}")
+        sys.exit(batch_sort.main(sys.argv[2:]))
+
     logger.info(f"Initializing RimSort application: {AppInfo().app_version}")
     main_thread()
@@ -1,6 +1,7 @@
 import os
 import re
 import xml.etree.ElementTree as ET
+from collections.abc import Mapping
 from typing import Any, Optional, Union
 from xml.dom import minidom
 
@@ -579,7 +580,7 @@ class SearchWorker(QThread):
                 steam_metadata = getattr(
                     self.metadata_manager, "external_steam_metadata", {}
                 )
-                if isinstance(steam_metadata, dict):
+                if isinstance(steam_metadata, Mapping):
                     return steam_metadata.get(pfid, {})
 
             return {}
@@ -7,6 +7,7 @@ from PySide6.QtWidgets import QPushButton
 
 from app.utils.event_bus import EventBus
 from app.utils.metadata import MetadataManager
+from app.utils.steam_db_index import find_publishedfileids_by_packageid
 from app.views.main_window import MainWindow
 from app.windows.missing_dependencies_dialog import MissingDependenciesDialog
 
@@ -180,16 +181,12 @@ class MainWindowController(QObject):
                         # First check if we have it in our Steam metadata
                         workshop_id = None
                         if self.metadata_manager.external_steam_metadata:
-                            for (
-                                pfid,
-                                metadata,
-                            ) in self.metadata_manager.external_steam_metadata.items():
-                                if (
-                                    metadata.get("packageId", "").lower()
-                                    == dep_id.lower()
-                                ):
-                                    workshop_id = pfid
-                                    break
+                            workshop_ids = find_publishedfileids_by_packageid(
+                                self.metadata_manager.external_steam_metadata,
+                                [dep_id.lower()],
+                            ).get(dep_id.lower())
+                            if workshop_ids:
+                                workshop_id = workshop_ids[0]
 
                         if workshop_id:
                             mods_to_download.append(workshop_id)
@@ -419,7 +416,5 @@ class MainWindowController(QObject):
 
     @Slot()
     def on_reset_use_this_instead_cache(self) -> None:
-        logger.warning(
-            'Resetting "Use This Instead" cache - performance may be impacted until xml is re-cached'
-        )
-        MetadataManager.instance().has_alternative_mod.cache_clear()
+        logger.info('Resetting "Use This Instead" cache')
+        MetadataManager.instance().reset_use_this_instead_index()
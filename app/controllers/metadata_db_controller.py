@@ -1,9 +1,12 @@
+import threading
 from pathlib import Path
+from sqlite3 import Connection as SQLite3Connection
 from typing import Any, Iterable
 
 from loguru import logger
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text, update
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import ConnectionPoolEntry
 
 from app.models.metadata.metadata_db import AuxMetadataEntry, Base
 from app.models.metadata.metadata_structure import ModType
@@ -22,18 +25,69 @@ class MetadataDbController:
                 f"Failed to ensure database directory exists for {db_path}: {e}"
             )
 
-        self.engine = create_engine(f"sqlite+pysqlite:///{db_path}")
+        # Skip syncing commits to disk, set with set_performance_mode
+        self.performance_mode = False
+        self.engine = create_engine(
+            f"sqlite+pysqlite:///{db_path}",
+            # Reuse more prepared statements per connection (default 128)
+            connect_args={"cached_statements": 512},
+        )
+        event.listen(self.engine, "connect", self._set_sqlite_pragmas)
         self.Session = sessionmaker(bind=self.engine, expire_on_commit=False)
 
+    def set_performance_mode(self, enabled: bool) -> None:
+        """
+        Enable or disable syncing commits to disk. Disabling it is faster, at
+        the risk of corrupting the database if the system crashes.
+
+        :param enabled: Whether to skip syncing.
+        """
+        if enabled == self.performance_mode:
+            return
+        self.performance_mode = enabled
+        # Pooled connections were configured for the previous mode
+        self.engine.dispose()
+
+    def _set_sqlite_pragmas(
+        self,
+        dbapi_connection: SQLite3Connection,
+        connection_record: ConnectionPoolEntry,
+    ) -> None:
+        """
+        Configure every new connection. WAL lets the list building reads run
+        while queued updates are committed, and makes synchronous=NORMAL safe
+        from corruption: a crash can only lose the last commits.
+        """
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode = WAL")
+        cursor.execute(
+            f"PRAGMA synchronous = {'OFF' if self.performance_mode else 'NORMAL'}"
+        )
+        # 16 MiB page cache (negative values are in KiB)
+        cursor.execute("PRAGMA cache_size = -16384")
+        cursor.close()
+
 
 class AuxMetadataController(MetadataDbController):
     _instances: dict[
         Path, "AuxMetadataController"
     ] = {}  # db_path : AuxMetadataController
 
+    # Seconds queued updates wait for more edits before they are committed
+    WRITE_BEHIND_DELAY = 0.5
+
     def __init__(self, db_path: Path) -> None:
         super().__init__(db_path)
         Base.metadata.create_all(self.engine)
+        # Queued updates by path, committed together by a background thread
+        self._pending_updates: dict[str, dict[str, Any]] = {}
+        # Increases with every queued update
+        self._pending_generation = 0
+        self._write_condition = threading.Condition()
+        # Keeps commits of queued updates in order
+        self._flush_lock = threading.Lock()
+        self._writer: threading.Thread | None = None
+        self._stopping = False
 
     @classmethod
     def get_or_create_cached_instance(cls, db_path: Path) -> "AuxMetadataController":
@@ -45,6 +99,111 @@ class AuxMetadataController(MetadataDbController):
             cls._instances[db_path] = cls(db_path)
         return cls._instances[db_path]
 
+    @classmethod
+    def flush_all(cls) -> None:
+        """Commit the queued updates of every cached instance."""
+        for controller in cls._instances.values():
+            controller.flush()
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Commit the queued updates and stop the writers of every cached instance."""
+        for controller in cls._instances.values():
+            controller.close()
+
+    def queue_update(self, item_path: Path | str, **kwargs: Any) -> None:
+        """
+        Queue an update of an aux metadata entry by the mod path.
+
+        Queued updates are committed together on a background thread once
+        edits stop for WRITE_BEHIND_DELAY seconds, so rapid edits from the UI
+        (e.g. typing notes) do not commit a transaction each. Later values of
+        a field replace earlier ones. Entries that do not exist are skipped,
+        as with update.
+
+        :param item_path: The key path.
+        :type item_path: Path | str
+        :param kwargs: The fields to update.
+        """
+        with self._write_condition:
+            self._pending_updates.setdefault(str(item_path), {}).update(kwargs)
+            self._pending_generation += 1
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._write_behind, name="AuxMetadataWriter", daemon=True
+                )
+                self._writer.start()
+            self._write_condition.notify_all()
+
+    def _write_behind(self) -> None:
+        """Background thread committing queued updates."""
+        while True:
+            with self._write_condition:
+                self._write_condition.wait_for(
+                    lambda: bool(self._pending_updates) or self._stopping
+                )
+                # Wait until edits stop, or until the queue is flushed
+                generation = -1
+                while (
+                    not self._stopping
+                    and self._pending_updates
+                    and generation != self._pending_generation
+                ):
+                    generation = self._pending_generation
+                    self._write_condition.wait(self.WRITE_BEHIND_DELAY)
+                if self._stopping:
+                    return
+            try:
+                self.flush()
+            except Exception:
+                # Logged by flush, the updates are lost
+                pass
+
+    def flush(self) -> None:
+        """
+        Commit the queued updates now. Call before reading entries that may
+        have queued updates.
+        """
+        with self._flush_lock:
+            with self._write_condition:
+                pending, self._pending_updates = self._pending_updates, {}
+                self._write_condition.notify_all()
+            if not pending:
+                return
+            with self.Session() as session:
+                entries = (
+                    session.query(AuxMetadataEntry)
+                    .filter(AuxMetadataEntry.path.in_(pending.keys()))
+                    .all()
+                )
+                for entry in entries:
+                    for key, value in pending[entry.path].items():
+                        setattr(entry, key, value)
+                try:
+                    session.commit()
+                except Exception as e:
+                    session.rollback()
+                    logger.exception(
+                        f"Failed to commit queued aux metadata updates: {e}"
+                    )
+                    raise e
+            logger.debug(
+                f"Committed queued aux metadata updates of {len(pending)} mods"
+            )
+
+    def close(self) -> None:
+        """Commit the queued updates and stop the background writer."""
+        with self._write_condition:
+            writer = self._writer
+            self._stopping = True
+            self._write_condition.notify_all()
+        if writer is not None:
+            writer.join()
+        with self._write_condition:
+            self._writer = None
+            self._stopping = False
+        self.flush()
+
     @staticmethod
     def update(
         session: Session, item_path: Path | str, **kwargs: Any
@@ -129,6 +288,66 @@ class AuxMetadataController(MetadataDbController):
 
         return entry
 
+    @staticmethod
+    def get_or_create_many(
+        session: Session, item_paths: Iterable[Path | str]
+    ) -> dict[str, AuxMetadataEntry]:
+        """Get or create the aux metadata entries of many paths at once.
+
+        Loads every entry of the database in one query, then inserts the
+        missing ones in one batch. Used when building whole mod lists.
+
+        :param session: The database session.
+        :type session: Session
+        :param item_paths: The key paths.
+        :type item_paths: Iterable[Path | str]
+        :return: The aux metadata entries by path.
+        :rtype: dict[str, AuxMetadataEntry]
+        """
+        entries = {entry.path: entry for entry in session.query(AuxMetadataEntry).all()}
+        missing = {str(item_path) for item_path in item_paths} - entries.keys()
+        if missing:
+            new_entries = [AuxMetadataEntry(path=item_path) for item_path in missing]
+            try:
+                with session.begin_nested():
+                    session.add_all(new_entries)
+                    session.flush()
+            except Exception as e:
+                session.rollback()
+                logger.exception(f"Failed to create new aux metadata entries: {e}")
+                raise e
+            entries.update((entry.path, entry) for entry in new_entries)
+
+        return entries
+
+    @staticmethod
+    def update_many(
+        session: Session, item_paths: Iterable[Path | str], **kwargs: Any
+    ) -> None:
+        """Update the aux metadata entries of many paths with one statement.
+
+        :param session: The database session.
+        :type session: Session
+        :param item_paths: The key paths.
+        :type item_paths: Iterable[Path | str]
+        :param kwargs: The fields to update.
+        """
+        paths = [str(item_path) for item_path in item_paths]
+        if not paths:
+            return
+
+        try:
+            session.execute(
+                update(AuxMetadataEntry)
+                .where(AuxMetadataEntry.path.in_(paths))
+                .values(**kwargs)
+            )
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.exception(f"Failed to update aux metadata entries: {e}")
+            raise e
+
     @staticmethod
     def get_value_equals(
         session: Session, key: str, value: str
@@ -125,15 +125,12 @@ class ModsPanelController(QObject):
                             "Unable to retrieve uuid when saving toggle_warning to Aux DB after menu bar reset."
                         )
                         return
-                    with aux_metadata_controller.Session() as aux_metadata_session:
-                        mod_path = widget.metadata_manager.internal_local_metadata[
-                            uuid
-                        ]["path"]
-                        aux_metadata_controller.update(
-                            aux_metadata_session,
-                            mod_path,
-                            ignore_warnings=mod_data["warning_toggled"],
-                        )
+                    mod_path = widget.metadata_manager.internal_local_metadata[uuid][
+                        "path"
+                    ]
+                    aux_metadata_controller.queue_update(
+                        mod_path, ignore_warnings=mod_data["warning_toggled"]
+                    )
                     logger.debug(f"Reset warning toggle for: {package_id}")
         self.mods_panel.active_mods_list.recalculate_warnings_signal.emit()
         self.mods_panel.inactive_mods_list.recalculate_warnings_signal.emit()
@@ -239,7 +236,6 @@ class ModsPanelController(QObject):
                     mod.setHidden(False)
         self.mods_panel.update_count("Active")
         self.mods_panel.active_mods_list.repaint()
-        self.mods_panel.active_mods_list.check_widgets_visible()
 
     def do_all_entries_in_aux_db_as_outdated(self) -> None:
         """
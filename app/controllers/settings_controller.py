@@ -6,7 +6,6 @@ from pathlib import Path
 from loguru import logger
 from PySide6.QtCore import QObject, Slot
 from PySide6.QtWidgets import QApplication, QLineEdit, QMessageBox
-from sqlalchemy import text
 
 from app.controllers.language_controller import LanguageController
 from app.controllers.metadata_db_controller import AuxMetadataController
@@ -684,6 +683,10 @@ class SettingsController(QObject):
                 )
             )
 
+        self.settings_dialog.incremental_sort_checkbox.setChecked(
+            self.settings.incremental_sort
+        )
+
         # Set dependencies checkbox
         self.settings_dialog.check_deps_checkbox.setChecked(
             self.settings.check_dependencies_on_sort
@@ -894,6 +897,25 @@ class SettingsController(QObject):
             )
         except Exception:
             pass
+        # Mod metadata parsing backend
+        try:
+            self.settings_dialog.metadata_parser_backend_combobox.setCurrentIndex(
+                max(
+                    0,
+                    self.settings_dialog.metadata_parser_backend_combobox.findData(
+                        self.settings.metadata_parser_backend
+                    ),
+                )
+            )
+        except Exception:
+            pass
+        # Steam DB index
+        try:
+            self.settings_dialog.use_steam_db_index_checkbox.setChecked(
+                self.settings.use_steam_db_index
+            )
+        except Exception:
+            pass
         # Advanced: enable advanced filtering toggle
         try:
             self.settings_dialog.enable_advanced_filtering_checkbox.setChecked(
@@ -1029,6 +1051,10 @@ class SettingsController(QObject):
             self.settings_dialog.use_moddependencies_as_loadTheseBefore.isChecked()
         )
 
+        self.settings.incremental_sort = (
+            self.settings_dialog.incremental_sort_checkbox.isChecked()
+        )
+
         # Set dependencies checkbox
         self.settings.check_dependencies_on_sort = (
             self.settings_dialog.check_deps_checkbox.isChecked()
@@ -1209,6 +1235,20 @@ class SettingsController(QObject):
             )
         except Exception:
             pass
+        # Mod metadata parsing backend
+        try:
+            self.settings.metadata_parser_backend = (
+                self.settings_dialog.metadata_parser_backend_combobox.currentData()
+            )
+        except Exception:
+            pass
+        # Steam DB index
+        try:
+            self.settings.use_steam_db_index = (
+                self.settings_dialog.use_steam_db_index_checkbox.isChecked()
+            )
+        except Exception:
+            pass
         self.settings.enable_aux_db_behavior_editing = (
             self.settings_dialog.enable_aux_db_behavior_editing.isChecked()
         )
@@ -2051,16 +2091,9 @@ class SettingsController(QObject):
         aux_metadata_controller = AuxMetadataController.get_or_create_cached_instance(
             instance_path / "aux_metadata.db"
         )
-        with aux_metadata_controller.Session() as session:
-            if self.settings_dialog.aux_db_performance_mode.isChecked():
-                session.execute(text("PRAGMA synchronous = OFF"))
-                session.execute(text("PRAGMA journal_mode = MEMORY"))
-            else:
-                session.execute(text("PRAGMA synchronous = FULL"))
-                session.execute(text("PRAGMA journal_mode = DELETE"))
-
-            session.commit()
-            session.close()
+        aux_metadata_controller.set_performance_mode(
+            self.settings_dialog.aux_db_performance_mode.isChecked()
+        )
 
     @Slot()
     def _handle_mod_coloring_mode_changed(self) -> None:
@@ -0,0 +1,237 @@
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Iterable, Mapping
+
+import msgspec
+from loguru import logger
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal, Slot
+
+from app.controllers.settings_controller import SettingsController
+from app.controllers.sort_controller import Sorter
+from app.utils.metadata import MetadataManager
+from app.utils.rule_snapshot import RuleSnapshot
+
+# Number of sort results kept, e.g. to go back and forth between two lists
+SORT_CACHE_SIZE = 8
+# Wait for the active list to settle before sorting it in the background
+SORT_PRECOMPUTE_DELAY_MS = 500
+
+
+@dataclass
+class CachedSort:
+    """
+    A successful sort of an active mod list.
+
+    :param order: The sorted uuids.
+    :param sorter: The Sorter that sorted them, to start incremental sorts from.
+    """
+
+    order: list[str]
+    sorter: Sorter
+
+
+def sort_cache_key(
+    metadata: Mapping[str, Mapping[str, Any]],
+    rule_snapshot: RuleSnapshot,
+    active_uuids: Iterable[str],
+    sort_method: str,
+    use_moddependencies_as_loadTheseBefore: bool,
+    consider_alternative_package_ids: bool,
+) -> str:
+    """
+    Hash everything a sort of the active mods depends on: their names and
+    compiled rules, the loadTop rules of all mods, which decide tier one, the
+    sort settings, and the version of the rule snapshot the sort uses.
+
+    :param metadata: Mod metadata by uuid, e.g. internal_local_metadata.
+    :param rule_snapshot: The rules sorted with, e.g. Sorter.rule_snapshot.
+    :param active_uuids: Uuids of the active mods.
+    :param sort_method: The sorting algorithm setting.
+    :param use_moddependencies_as_loadTheseBefore: The setting of the same name.
+    :param consider_alternative_package_ids: The setting of the same name.
+    :return: Hex digest identifying the sort.
+    """
+    active_uuids = sorted(active_uuids)
+    # The same rules as the Sorter, which adds mods missing from the snapshot
+    rule_snapshot = rule_snapshot.covering(metadata, active_uuids)
+    mods = []
+    for uuid in active_uuids:
+        mod_rules = rule_snapshot[uuid]
+        mod = [
+            uuid,
+            mod_rules.package_id,
+            str(metadata[uuid].get("name")),
+            sorted(mod_rules.load_these_before),
+            sorted(mod_rules.load_these_after),
+            mod_rules.load_bottom,
+        ]
+        if use_moddependencies_as_loadTheseBefore:
+            mod.append(
+                sorted(
+                    [dependency.package_id, sorted(dependency.alternatives)]
+                    for dependency in mod_rules.dependencies
+                )
+            )
+        mods.append(mod)
+    key_data = [
+        str(sort_method),
+        use_moddependencies_as_loadTheseBefore,
+        consider_alternative_package_ids,
+        rule_snapshot.version,
+        sorted(rule_snapshot.load_top_package_ids),
+        mods,
+    ]
+    return hashlib.sha256(msgspec.json.encode(key_data)).hexdigest()
+
+
+class _SortWorkerSignals(QObject):
+    finished = Signal(str, object)  # cache key, CachedSort or None
+
+
+class SortWorker(QRunnable):
+    """Sorts an active mod list in a thread pool thread"""
+
+    def __init__(self, key: str, sorter: Sorter) -> None:
+        super().__init__()
+        self.key = key
+        self.sorter = sorter
+        self.signals = _SortWorkerSignals()
+
+    @Slot()
+    def run(self) -> None:
+        start = time.perf_counter()
+        try:
+            success, order = self.sorter.sort()
+        except Exception as e:
+            # The metadata may change while sorting, e.g. during a refresh
+            logger.warning(f"Background sort {self.key[:12]} failed: {e}")
+            success, order = False, []
+        elapsed = (time.perf_counter() - start) * 1000
+        logger.info(
+            f"Background sort {self.key[:12]} finished in {elapsed:.0f} ms: "
+            f"{'sorted' if success else 'not sorted'}"
+        )
+        self.signals.finished.emit(
+            self.key, CachedSort(order, self.sorter) if success else None
+        )
+
+
+class SortCacheController(QObject):
+    """
+    Pre-computes full sorts of the active mod list in the background, so the
+    Sort button can apply an already computed order.
+
+    Results are cached by sort_cache_key, so any change to the active mods,
+    their rules or the sort settings is a cache miss. Sorts that fail, e.g.
+    because of circular dependencies, are not cached: the Sort button then
+    sorts as usual, which shows the warning.
+    """
+
+    def __init__(self, settings_controller: SettingsController) -> None:
+        super().__init__()
+        self.settings_controller = settings_controller
+        self._cache: OrderedDict[str, CachedSort] = OrderedDict()
+        self._active_uuids: list[str] = []
+        self._running_key: str | None = None
+        self._pending = False
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(SORT_PRECOMPUTE_DELAY_MS)
+        self._timer.timeout.connect(self._start)
+
+    def key(
+        self, active_uuids: Iterable[str], rule_snapshot: RuleSnapshot | None = None
+    ) -> str:
+        """
+        :param active_uuids: Uuids of the active mods.
+        :param rule_snapshot: The rules of the sort, e.g. Sorter.rule_snapshot.
+            Defaults to the current rules.
+        :return: The cache key of sorting them with the current settings.
+        """
+        settings = self.settings_controller.settings
+        metadata_manager = MetadataManager.instance()
+        if rule_snapshot is None:
+            rule_snapshot = metadata_manager.rule_snapshot
+        start = time.perf_counter()
+        key = sort_cache_key(
+            metadata_manager.internal_local_metadata,
+            rule_snapshot,
+            active_uuids,
+            settings.sorting_algorithm,
+            settings.use_moddependencies_as_loadTheseBefore,
+            settings.consider_alternative_package_ids,
+        )
+        logger.debug(
+            f"Computed sort cache key {key[:12]} in "
+            f"{(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+        return key
+
+    def get(self, key: str) -> CachedSort | None:
+        cached = self._cache.get(key)
+        logger.info(f"Sort cache {'hit' if cached else 'miss'} for {key[:12]}")
+        if cached is not None:
+            self._cache.move_to_end(key)
+        return cached
+
+    def put(self, key: str, cached: CachedSort) -> None:
+        self._cache[key] = cached
+        self._cache.move_to_end(key)
+        while len(self._cache) > SORT_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def schedule(self, active_uuids: Iterable[str]) -> None:
+        """
+        Sort the active mods in the background, once they stop changing.
+
+        :param active_uuids: Uuids of the active mods.
+        """
+        self._active_uuids = list(active_uuids)
+        self._timer.start()
+
+    @Slot()
+    def _start(self) -> None:
+        if self._running_key is not None:
+            # Only one background sort at a time, the latest list is sorted next
+            self._pending = True
+            return
+        metadata = MetadataManager.instance().internal_local_metadata
+        active_uuids = {uuid for uuid in self._active_uuids if uuid in metadata}
+        if not active_uuids:
+            return
+        settings = self.settings_controller.settings
+        try:
+            sorter = Sorter(
+                settings.sorting_algorithm,
+                active_package_ids={
+                    metadata[uuid]["packageid"] for uuid in active_uuids
+                },
+                active_uuids=active_uuids,
+                use_moddependencies_as_loadTheseBefore=settings.use_moddependencies_as_loadTheseBefore,
+            )
+        except NotImplementedError:
+            return
+        # Keyed by the rules the sorter captured, not whatever rules are
+        # current when it finishes
+        key = self.key(active_uuids, sorter.rule_snapshot)
+        if key in self._cache:
+            return
+        logger.info(f"Starting background sort {key[:12]} of {len(active_uuids)} mods")
+        self._running_key = key
+        worker = SortWorker(key, sorter)
+        worker.signals.finished.connect(self._on_finished)
+        QThreadPool.globalInstance().start(worker)
+
+    @Slot(str, object)
+    def _on_finished(self, key: str, cached: CachedSort | None) -> None:
+        self._running_key = None
+        if cached is not None:
+            self.put(key, cached)
+        if self._pending:
+            self._pending = False
+            self._start()
@@ -4,8 +4,11 @@ from loguru import logger
 
 import app.sort.dependencies as sort_deps
 from app.sort.alphabetical_sort import do_alphabetical_sort
+from app.sort.dependency_graph import DependencyGraph
+from app.sort.incremental_sort import do_incremental_sort
 from app.sort.topo_sort import CircularDependencyError, do_topo_sort
 from app.utils.constants import SortMethod
+from app.utils.metadata import MetadataManager
 
 
 class Sorter:
@@ -23,6 +26,16 @@ class Sorter:
         self.use_moddependencies_as_loadTheseBefore = (
             use_moddependencies_as_loadTheseBefore
         )
+        # The tier graphs and packageid order of the last successful sort, used
+        # as the starting point of an incremental sort
+        self.dependency_graphs: list[dict[str, set[str]]] | None = None
+        self.sorted_package_ids: list[str] | None = None
+        # The tier of each mod in the last generated dependency graphs, and why
+        self.tier_assignment: sort_deps.TierAssignment | None = None
+        # The rules to sort with. A sort running in a background thread uses
+        # the rules it was scheduled with, even if compile_metadata replaces
+        # them in the meantime.
+        self.rule_snapshot = MetadataManager.instance().rule_snapshot
 
         if isinstance(sort_method, SortMethod) or isinstance(sort_method, str):
             logger.info(f"Created sorter instance with {sort_method} sort method")
@@ -44,30 +57,34 @@ class Sorter:
         self,
     ) -> list[dict[str, set[str]]]:
         logger.info("Generating dependency graphs")
-        dependencies_graph = sort_deps.gen_deps_graph(
-            self.active_uuids, list(self.active_package_ids)
-        )
-        reverse_dependencies_graph = sort_deps.gen_rev_deps_graph(
-            self.active_uuids, list(self.active_package_ids)
+        metadata_manager = MetadataManager.instance()
+        mod_graph = DependencyGraph.from_rules(
+            self.rule_snapshot.covering(
+                metadata_manager.internal_local_metadata, self.active_uuids
+            ),
+            self.active_uuids,
         )
 
+        tier_assignment = sort_deps.assign_tiers(mod_graph)
+        self.tier_assignment = tier_assignment
+        for package_id in mod_graph:
+            if tier_assignment.tier(package_id) != 2:
+                logger.debug(tier_assignment.reason(package_id))
+
         tier_zero_graph, tier_zero_mods = sort_deps.gen_tier_zero_deps_graph(
-            dependencies_graph
+            mod_graph, tier_assignment
         )
 
         tier_one_graph, tier_one_mods = sort_deps.gen_tier_one_deps_graph(
-            dependencies_graph
+            mod_graph, tier_assignment
         )
 
         tier_three_graph, tier_three_mods = sort_deps.gen_tier_three_deps_graph(
-            dependencies_graph,
-            reverse_dependencies_graph,
-            self.active_uuids,
+            mod_graph, tier_assignment
         )
 
         tier_two_graph = sort_deps.gen_tier_two_deps_graph(
-            self.active_uuids,
-            list(self.active_package_ids),
+            mod_graph,
             tier_one_mods,
             tier_three_mods,
             self.use_moddependencies_as_loadTheseBefore,
@@ -99,4 +116,83 @@ class Sorter:
             logger.info("Circular dependency detected, abandoning sort")
             return False, []
 
-        return True, list(dict.fromkeys(sorted_uuids))
+        sorted_uuids = list(dict.fromkeys(sorted_uuids))
+        metadata = MetadataManager.instance().internal_local_metadata
+        self._remember(
+            dependency_graphs, [metadata[uuid]["packageid"] for uuid in sorted_uuids]
+        )
+        return True, sorted_uuids
+
+    def sort_incrementally(self, previous: "Sorter") -> tuple[bool, list[str]]:
+        """Re-sorts starting from the order of a previous sort, so that mods only
+        move when a rule requires it. Mods that were not sorted previously are
+        added at the end of their tier and moved up as needed.
+
+        Falls back to a full sort if the previous sort used another sort method
+        or rules, did not succeed, or the new rules have a cycle.
+
+        :param previous: The sorter of the previous sort
+        :type previous: Sorter
+        :return: True and the sorted list of UUIDs if the sort was successful, False and an empty list otherwise
+        :rtype: tuple[bool, list[str]]
+        """
+        dependency_graphs = self.generate_dependency_graphs()
+        if (
+            previous.dependency_graphs is None
+            or previous.sorted_package_ids is None
+            or previous.sort_method is not self.sort_method
+            or previous.use_moddependencies_as_loadTheseBefore
+            != self.use_moddependencies_as_loadTheseBefore
+        ):
+            logger.info("No compatible previous sort, doing a full sort")
+            return self.sort(dependency_graphs)
+
+        previous_graph = _merge_graphs(previous.dependency_graphs)
+        graph = _merge_graphs(dependency_graphs)
+        changed_mods = {
+            package_id
+            for package_id in graph.keys() | previous_graph.keys()
+            if graph.get(package_id) != previous_graph.get(package_id)
+        }
+        logger.info(
+            f"Incremental sort: {len(changed_mods)} mods added, removed or with changed rules"
+        )
+
+        sorted_package_ids: list[str] = []
+        try:
+            for i, graph in enumerate(dependency_graphs):
+                logger.info(f"Incrementally sorting tier {i + 1}")
+                sorted_package_ids += do_incremental_sort(
+                    graph, previous.sorted_package_ids
+                )
+        except CircularDependencyError:
+            logger.info("Circular dependency detected, doing a full sort")
+            return self.sort(dependency_graphs)
+
+        sorted_package_ids = list(dict.fromkeys(sorted_package_ids))
+        metadata = MetadataManager.instance().internal_local_metadata
+        package_id_to_uuid = {
+            metadata[uuid]["packageid"]: uuid for uuid in self.active_uuids
+        }
+        self._remember(dependency_graphs, sorted_package_ids)
+        return True, [
+            package_id_to_uuid[package_id]
+            for package_id in sorted_package_ids
+            if package_id in package_id_to_uuid
+        ]
+
+    def _remember(
+        self,
+        dependency_graphs: list[dict[str, set[str]]],
+        sorted_package_ids: list[str],
+    ) -> None:
+        self.dependency_graphs = dependency_graphs
+        self.sorted_package_ids = sorted_package_ids
+
+
+def _merge_graphs(dependency_graphs: list[dict[str, set[str]]]) -> dict[str, set[str]]:
+    merged: dict[str, set[str]] = {}
+    for graph in dependency_graphs:
+        for package_id, dependencies in graph.items():
+            merged.setdefault(package_id, set()).update(dependencies)
+    return merged
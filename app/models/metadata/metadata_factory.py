@@ -589,6 +589,7 @@ def create_rules_from_external_rules(external_rule: ExternalRule) -> Rules:
 
     rules.load_before = CaseInsensitiveSet(external_rule.loadBefore.keys())
     rules.load_after = CaseInsensitiveSet(external_rule.loadAfter.keys())
+    rules.incompatible_with = CaseInsensitiveSet(external_rule.incompatibleWith.keys())
 
     rules.load_first = external_rule.loadTop.value
     rules.load_last = external_rule.loadBottom.value
@@ -508,46 +508,63 @@ class AboutXmlMod(ListedMod, PackageIdMod):
             pass
 
 
-class SubExternalRule(msgspec.Struct, omit_defaults=True):
-    name: list[str] | str
-    comment: list[str] | str = msgspec.field(default_factory=str)
+def _struct_to_dict(struct: msgspec.Struct) -> dict[str, Any]:
+    """Convert a DB struct to builtins, leaving out defaults and empty fields."""
+    return {
+        key: value for key, value in msgspec.to_builtins(struct).items() if value != {}
+    }
 
 
-class SubExternalBoolRule(msgspec.Struct, omit_defaults=True):
+class SubExternalRule(msgspec.Struct, omit_defaults=True, gc=False):
+    name: list[str] | str = ""
+    comment: list[str] | str = ""
+
+
+class SubExternalBoolRule(msgspec.Struct, omit_defaults=True, gc=False):
     value: bool = False
-    comment: list[str] | str = msgspec.field(default_factory=str)
+    comment: list[str] | str = ""
 
 
-class ExternalRule(msgspec.Struct, omit_defaults=True):
+class ExternalRule(msgspec.Struct, omit_defaults=True, gc=False):
     loadAfter: dict[str, SubExternalRule] = {}
     loadBefore: dict[str, SubExternalRule] = {}
+    incompatibleWith: dict[str, SubExternalRule] = {}
     loadTop: SubExternalBoolRule = msgspec.field(default_factory=SubExternalBoolRule)
     loadBottom: SubExternalBoolRule = msgspec.field(default_factory=SubExternalBoolRule)
 
+    def to_dict(self) -> dict[str, Any]:
+        """Returns the rule in the dict form used by MetadataManager."""
+        return _struct_to_dict(self)
+
 
-class ExternalRulesSchema(msgspec.Struct, omit_defaults=True):
+class ExternalRulesSchema(msgspec.Struct, omit_defaults=True, gc=False):
     timestamp: int
     rules: dict[str, ExternalRule]
 
 
-class SteamDbEntryDependency(msgspec.Struct, omit_defaults=True):
+class SteamDbEntryDependency(msgspec.Struct, omit_defaults=True, gc=False):
     name: str
     url: str
 
 
-class SteamDbEntryBlacklist(msgspec.Struct, omit_defaults=True):
+class SteamDbEntryBlacklist(msgspec.Struct, omit_defaults=True, gc=False):
     value: bool = False
-    comment: str = msgspec.field(default_factory=str)
+    comment: str = ""
 
 
-class SteamDbEntry(msgspec.Struct, omit_defaults=True):
+# DB entries hold no reference cycles, so they are not tracked by the garbage
+# collector. This keeps decoding and collecting a 40k-entry SteamDB cheap.
+class SteamDbEntry(msgspec.Struct, omit_defaults=True, gc=False):
     unpublished: bool = False
-    url: str = msgspec.field(default_factory=str)
-    packageId: str = msgspec.field(default_factory=str)
+    appid: bool = False
+    url: str = ""
+    packageId: str | None = ""
+    # Lowercase key used by DLC entries
+    packageid: str | None = None
     gameVersions: list[str] | str = msgspec.field(default_factory=list)
-    steamName: str = msgspec.field(default_factory=str)
-    name: str = msgspec.field(default_factory=str)
-    authors: list[str] | str | None = msgspec.field(default_factory=str)
+    steamName: str = ""
+    name: str | None = ""
+    authors: list[str] | str | None = ""
     dependencies: dict[str, list[str] | SteamDbEntryDependency] = msgspec.field(
         default_factory=dict
     )
@@ -555,7 +572,11 @@ class SteamDbEntry(msgspec.Struct, omit_defaults=True):
         default_factory=SteamDbEntryBlacklist
     )
 
+    def to_dict(self) -> dict[str, Any]:
+        """Returns the entry in the dict form used by MetadataManager."""
+        return _struct_to_dict(self)
+
 
-class SteamDbSchema(msgspec.Struct):
+class SteamDbSchema(msgspec.Struct, gc=False):
     version: int
     database: dict[str, SteamDbEntry] = msgspec.field(default_factory=dict)
@@ -86,6 +86,8 @@ class Settings(QObject):
         self.use_moddependencies_as_loadTheseBefore: bool = False
         # Whether to check for missing dependencies when sorting
         self.check_dependencies_on_sort: bool = True
+        # Whether to re-sort starting from the order of the last sort
+        self.incremental_sort: bool = False
 
         # DB Builder
         self.db_builder_include: str = "all_mods"
@@ -160,6 +162,12 @@ class Settings(QObject):
         # If enabled, About.xml *ByVersion tags take precedence over base tags
         # e.g., modDependenciesByVersion, loadAfterByVersion, loadBeforeByVersion, incompatibleWithByVersion, descriptionsByVersion
         self.prefer_versioned_about_tags: bool = False
+        # Mod metadata parsing backend: "thread" (default) or "process"
+        # The process backend parses About.xml files on all CPU cores
+        self.metadata_parser_backend: str = "thread"
+        # Whether to query the Steam DB through a memory-mapped binary index,
+        # compiled from steamDB.json whenever it changes, instead of loading the JSON
+        self.use_steam_db_index: bool = False
 
         # Authentication
         self.rentry_auth_code: str = ""
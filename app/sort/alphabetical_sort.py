@@ -1,3 +1,5 @@
+from typing import Iterator
+
 from loguru import logger
 
 from app.utils.metadata import MetadataManager
@@ -41,21 +43,17 @@ def do_alphabetical_sort(
             dependencies_alphabetized[tuple_id_name[0]] = dependency_graph[
                 tuple_id_name[0]
             ]
-    mods_load_order = []
+    mods_load_order = LoadOrder()
     for package_id in dependencies_alphabetized:
         # Avoid repeating adding packages that have already been added
         if package_id not in mods_load_order:
             # Add the current mod in alphabetical order
             mods_load_order.append(package_id)
-
-            # ?
-            index_just_appended = mods_load_order.index(package_id)
-            recursively_force_insert(
+            force_insert_dependencies(
                 mods_load_order,
                 dependency_graph,
                 package_id,
-                active_mods_uuids,
-                index_just_appended,
+                active_mods_id_to_name,
             )
 
     reordered = list()
@@ -67,60 +65,125 @@ def do_alphabetical_sort(
     return reordered
 
 
-def recursively_force_insert(
-    mods_load_order: list[str],
+class LoadOrder:
+    """
+    Doubly linked list of packageids, so that inserting next to a packageid
+    and checking membership do not need list.index() or list.insert().
+
+    Each packageid is stamped with the number of insertions made before it.
+    """
+
+    def __init__(self) -> None:
+        # The sentinel None is both the head and the tail of the circular list
+        self._next: dict[str | None, str | None] = {None: None}
+        self._prev: dict[str | None, str | None] = {None: None}
+        self.stamps: dict[str, int] = {}
+
+    def __contains__(self, package_id: str) -> bool:
+        return package_id in self.stamps
+
+    def __len__(self) -> int:
+        return len(self.stamps)
+
+    def __iter__(self) -> Iterator[str]:
+        package_id = self._next[None]
+        while package_id is not None:
+            yield package_id
+            package_id = self._next[package_id]
+
+    def previous(self, package_id: str) -> str | None:
+        """Return the packageid before package_id, or None if it is the first"""
+        return self._prev[package_id]
+
+    def insert_after(self, anchor: str | None, package_id: str) -> None:
+        """Insert package_id after anchor, or at the start if anchor is None"""
+        following = self._next[anchor]
+        self._next[anchor] = package_id
+        self._prev[package_id] = anchor
+        self._next[package_id] = following
+        self._prev[following] = package_id
+        self.stamps[package_id] = len(self.stamps)
+
+    def append(self, package_id: str) -> None:
+        self.insert_after(self._prev[None], package_id)
+
+
+def force_insert_dependencies(
+    mods_load_order: LoadOrder,
     dependency_graph: dict[str, set[str]],
     package_id: str,
-    active_mods_uuids: set[str],
-    index_just_appended: int,
+    active_mods_id_to_name: dict[str, str],
 ) -> None:
-    # Cache MetadataManager instance
-    metadata_manager = MetadataManager.instance()
+    """
+    Insert the dependencies of package_id, and theirs, before it.
+
+    Each mod's dependencies are processed in reverse alphabetical order (by
+    name), so that e.g. mod A with dependencies B and C gives [B, C, A]. A
+    dependency is inserted at the start of the block of dependencies inserted
+    for its mod, unless it depends on one of them: then it is inserted right
+    after the last one it depends on. The dependencies of each inserted mod are
+    then inserted the same way, before it.
+
+    Uses an explicit stack instead of recursion, so long dependency chains
+    cannot exceed the recursion limit.
+    """
+    # A block of dependencies is only ever grown by insertions at its start or
+    # after one of its members. So it is tracked by the packageid before it
+    # (the anchor) and by the insertion stamps, as every packageid inserted
+    # after the mod's own insertion belongs to the block.
+    stack = [
+        _force_insert_frame(
+            mods_load_order, dependency_graph, package_id, active_mods_id_to_name
+        )
+    ]
+    while stack:
+        mod_id, anchor, first_stamp, deps = stack[-1]
+        dep_id = next(deps, None)
+        if dep_id is None:
+            stack.pop()
+            continue
+        if dep_id in mods_load_order:
+            continue
+        stamps = mods_load_order.stamps
+        deps_of_dep = dependency_graph[dep_id]
+        inserted_deps_of_dep = [
+            e for e in deps_of_dep if stamps.get(e, -1) >= first_stamp
+        ]
+        index_to_insert_after = anchor
+        if len(inserted_deps_of_dep) == 1:
+            index_to_insert_after = inserted_deps_of_dep[0]
+        elif inserted_deps_of_dep:
+            # Find the last of them, walking back from the mod itself
+            e = mods_load_order.previous(mod_id)
+            while e not in deps_of_dep:
+                e = mods_load_order.previous(e)  # type: ignore[arg-type]
+            index_to_insert_after = e
+        mods_load_order.insert_after(index_to_insert_after, dep_id)
+        stack.append(
+            _force_insert_frame(
+                mods_load_order, dependency_graph, dep_id, active_mods_id_to_name
+            )
+        )
+
+
+def _force_insert_frame(
+    mods_load_order: LoadOrder,
+    dependency_graph: dict[str, set[str]],
+    package_id: str,
+    active_mods_id_to_name: dict[str, str],
+) -> tuple[str, str | None, int, Iterator[str]]:
     # Get the reverse alphabetized list (by name) of the current mod's dependencies
-    deps_of_package = dependency_graph[package_id]
-    deps_id_to_name = {}
-    for dependency_id in deps_of_package:
-        for uuid in active_mods_uuids:
-            mod_package_id = metadata_manager.internal_local_metadata[uuid]["packageid"]
-            if dependency_id == mod_package_id:
-                deps_id_to_name[dependency_id] = (
-                    metadata_manager.internal_local_metadata[uuid]["name"]
-                )
+    deps_id_to_name = {
+        dependency_id: active_mods_id_to_name[dependency_id]
+        for dependency_id in dependency_graph[package_id]
+        if dependency_id in active_mods_id_to_name
+    }
     deps_of_package_alphabetized = sorted(
         deps_id_to_name.items(), key=lambda x: x[1], reverse=True
     )
-
-    # Iterate through the list of reverse alphabetized dependencies
-    # The idea is to insert at the list index so that e.g.
-    # mod A has dependencies B and C (in that rev alphabetical order),
-    # then the return list will have [C, B, A].
-    for tuple_dep_id_dep_name in deps_of_package_alphabetized:
-        dep_id = tuple_dep_id_dep_name[0]
-        if dep_id not in mods_load_order:
-            # We can't just insert it here. This is because deps in deps_of_package_alphabetized
-            # may contain deps that depend on each other. Therefore, before we insert a dep,
-            # we need to iterate through the sublist starting at the original package_id index
-            # and ending at the live index of the package_id (this gives the sublist of deps)
-            # that have been inserted for this package_id, this also works for recursively
-            # inserted deps of deps). We iterate through this list backwards, as we want to check
-            # for the first dep that the current dep depends on (if it exists). It if exists,
-            # the index to insert the current dep will be the index of that dep + 1, as we do not
-            # want to shift that dep back. Otherwise, if no dep of dep is found, then we insert
-            # at the original index normally.
-            index_to_insert_at = index_just_appended
-            for e in reversed(
-                mods_load_order[index_just_appended : mods_load_order.index(package_id)]
-            ):
-                if e in dependency_graph[dep_id]:
-                    index_to_insert_at = mods_load_order.index(e) + 1
-                    break
-
-            mods_load_order.insert(index_to_insert_at, dep_id)
-            new_idx = mods_load_order.index(dep_id)
-            recursively_force_insert(
-                mods_load_order,
-                dependency_graph,
-                dep_id,
-                active_mods_uuids,
-                new_idx,
-            )
+    return (
+        package_id,
+        mods_load_order.previous(package_id),
+        len(mods_load_order),
+        (dep_id for dep_id, _ in deps_of_package_alphabetized),
+    )
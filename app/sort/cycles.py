@@ -0,0 +1,277 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Iterable, Mapping
+
+from app.utils.metadata import MetadataManager
+from app.utils.rule_snapshot import RuleSnapshot
+
+ABOUT_XML = "About.xml"
+COMMUNITY_RULES = "Community Rules"
+USER_RULES = "User Rules"
+DEPENDENCIES = "Dependencies"
+INFERRED = "Inferred"
+
+# About.xml tags of a mod listing mods it loads after, and mods it loads before
+_ABOUT_LOAD_AFTER_TAGS = ("loadafter", "forceloadafter")
+_ABOUT_LOAD_BEFORE_TAGS = ("loadbefore", "forceloadbefore")
+
+
+@dataclass(frozen=True)
+class DependencyCycle:
+    """
+    A group of mods that all, directly or indirectly, must load after each other.
+
+    :param component: Packageids of the strongly connected component, sorted.
+    :param cycle: A shortest cycle through the first mod of the component, as
+        packageids where each mod loads after the next one. The first mod is
+        repeated at the end.
+    """
+
+    component: list[str]
+    cycle: list[str]
+
+    @property
+    def edges(self) -> list[tuple[str, str]]:
+        """(dependent, dependency) pairs of the cycle"""
+        return list(zip(self.cycle, self.cycle[1:]))
+
+
+def strongly_connected_components(
+    dependency_graph: Mapping[str, Iterable[str]],
+) -> list[list[str]]:
+    """
+    Find the strongly connected components of a dependency graph with an
+    iterative version of Tarjan's algorithm, in linear time.
+
+    :param dependency_graph: Schema: {item: {dependency1, dependency2, ...}}
+        Dependencies that are not keys of the graph are ignored.
+    :return: The components, in reverse topological order: a component only
+        depends on components listed before it.
+    """
+    index: dict[str, int] = {}
+    low_link: dict[str, int] = {}
+    on_stack: set[str] = set()
+    stack: list[str] = []
+    components: list[list[str]] = []
+
+    for root in dependency_graph:
+        if root in index:
+            continue
+        index[root] = low_link[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(dependency_graph[root]))]
+        while work:
+            node, dependencies = work[-1]
+            for dependency in dependencies:
+                if dependency not in dependency_graph:
+                    continue
+                if dependency not in index:
+                    index[dependency] = low_link[dependency] = len(index)
+                    stack.append(dependency)
+                    on_stack.add(dependency)
+                    work.append((dependency, iter(dependency_graph[dependency])))
+                    break
+                if dependency in on_stack:
+                    low_link[node] = min(low_link[node], index[dependency])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low_link[parent] = min(low_link[parent], low_link[node])
+                if low_link[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    return components
+
+
+def shortest_cycle(
+    dependency_graph: Mapping[str, Iterable[str]], component: Iterable[str]
+) -> list[str]:
+    """
+    Find a shortest cycle through the first mod of a strongly connected
+    component, with a breadth-first search that stays inside the component.
+
+    :param dependency_graph: Schema: {item: {dependency1, dependency2, ...}}
+    :param component: Packageids of a strongly connected component.
+    :return: The cycle, starting and ending with the first packageid of the
+        sorted component.
+    """
+    members = set(component)
+    start = min(members)
+    parents: dict[str, str] = {}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        for dependency in sorted(dependency_graph[node]):
+            if dependency == start:
+                cycle = [start]
+                while node != start:
+                    cycle.append(node)
+                    node = parents[node]
+                cycle.append(start)
+                # The path was walked back from its end
+                return [start] + cycle[-2:0:-1] + [start]
+            if dependency in members and dependency not in parents:
+                parents[dependency] = node
+                queue.append(dependency)
+    return [start]
+
+
+def find_dependency_cycles(
+    dependency_graph: Mapping[str, Iterable[str]],
+) -> list[DependencyCycle]:
+    """
+    Find every group of mods in a circular dependency, with one shortest cycle
+    per group to show how it is circular.
+
+    Self references are ignored, as with toposort.
+
+    :param dependency_graph: Schema: {item: {dependency1, dependency2, ...}}
+    :return: The cycles, sorted by their first packageid.
+    """
+    graph = {
+        package_id: [d for d in dependencies if d != package_id]
+        for package_id, dependencies in dependency_graph.items()
+    }
+    cycles = [
+        DependencyCycle(sorted(component), shortest_cycle(graph, component))
+        for component in strongly_connected_components(graph)
+        if len(component) > 1
+    ]
+    return sorted(cycles, key=lambda cycle: cycle.component[0])
+
+
+class RuleSources:
+    """
+    Finds which rule sources make a mod load after another, for diagnostics.
+
+    Compiled metadata only keeps the resulting load order rules, so the sources
+    are looked up again in the About.xml tags of the mods, the Community Rules
+    and the User Rules.
+
+    :param rule_snapshot: The rules sorted with, for dependencies. Defaults to
+        the current rules.
+    """
+
+    def __init__(self, rule_snapshot: RuleSnapshot | None = None) -> None:
+        metadata_manager = MetadataManager.instance()
+        self.metadata = metadata_manager.internal_local_metadata
+        self.rule_snapshot = (
+            metadata_manager.rule_snapshot if rule_snapshot is None else rule_snapshot
+        )
+        self.packageid_to_uuids = metadata_manager.packageid_to_uuids
+        self.community_rules = self._lowercase_keys(
+            metadata_manager.external_community_rules
+        )
+        self.user_rules = self._lowercase_keys(metadata_manager.external_user_rules)
+
+    @staticmethod
+    def _lowercase_keys(rules: Mapping[str, Any] | None) -> dict[str, Any]:
+        if not isinstance(rules, Mapping):
+            return {}
+        return {package_id.lower(): rule for package_id, rule in rules.items()}
+
+    def sources(self, dependent: str, dependency: str) -> list[str]:
+        """
+        :param dependent: Packageid of the mod that loads after.
+        :param dependency: Packageid of the mod that loads first.
+        :return: Names of the rule sources, or INFERRED if none are found, e.g.
+            for rules only added to sort mods into tiers.
+        """
+        sources = []
+        if self._about_lists(
+            dependent, _ABOUT_LOAD_AFTER_TAGS, "loadafterbyversion", dependency
+        ) or self._about_lists(
+            dependency, _ABOUT_LOAD_BEFORE_TAGS, "loadbeforebyversion", dependent
+        ):
+            sources.append(ABOUT_XML)
+        for name, rules in (
+            (COMMUNITY_RULES, self.community_rules),
+            (USER_RULES, self.user_rules),
+        ):
+            if self._rules_list(rules, dependent, "loadAfter", dependency) or (
+                self._rules_list(rules, dependency, "loadBefore", dependent)
+            ):
+                sources.append(name)
+        if not sources and self._depends_on(dependent, dependency):
+            sources.append(DEPENDENCIES)
+        return sources or [INFERRED]
+
+    def _mods(self, package_id: str) -> list[dict[str, Any]]:
+        return [
+            self.metadata[uuid]
+            for uuid in self.packageid_to_uuids.get(package_id, ())
+            if uuid in self.metadata
+        ]
+
+    def _about_lists(
+        self, package_id: str, tags: tuple[str, ...], by_version_tag: str, other: str
+    ) -> bool:
+        for mod_metadata in self._mods(package_id):
+            lists = [mod_metadata.get(tag) for tag in tags]
+            by_version = mod_metadata.get(by_version_tag)
+            if isinstance(by_version, dict):
+                lists.extend(by_version.values())
+            if any(other in _li_package_ids(li) for li in lists):
+                return True
+        return False
+
+    @staticmethod
+    def _rules_list(
+        rules: dict[str, Any], package_id: str, key: str, other: str
+    ) -> bool:
+        rule = rules.get(package_id)
+        if not isinstance(rule, Mapping):
+            return False
+        return any(p.lower() == other for p in rule.get(key) or ())
+
+    def _depends_on(self, dependent: str, dependency: str) -> bool:
+        for uuid in self.packageid_to_uuids.get(dependent, ()):
+            mod_rules = self.rule_snapshot.get(uuid)
+            if mod_rules is not None and any(
+                mod_dependency.package_id == dependency
+                or dependency in mod_dependency.alternatives
+                for mod_dependency in mod_rules.dependencies
+            ):
+                return True
+        return False
+
+
+def _li_package_ids(value: Any) -> set[str]:
+    """Lowercased packageids of an About.xml list tag, e.g. {"li": [...]}"""
+    if isinstance(value, dict):
+        value = value.get("li")
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list):
+        return set()
+    return {item.strip().lower() for item in value if isinstance(item, str)}
+
+
+def describe_dependency_cycle(
+    cycle: DependencyCycle, rule_sources: RuleSources | None = None
+) -> str:
+    """
+    :param cycle: The cycle to describe.
+    :param rule_sources: Looks up the rule sources of each edge, if given.
+    :return: The mods of the cycle and, for each edge, the sources of its rule.
+    """
+    lines = [" -> ".join(cycle.cycle)]
+    if len(cycle.component) > len(cycle.cycle) - 1:
+        lines.append(
+            f"({len(cycle.component)} mods in this loop: {', '.join(cycle.component)})"
+        )
+    if rule_sources is not None:
+        for dependent, dependency in cycle.edges:
+            lines.append(
+                f"  {dependent} loads after {dependency}: "
+                f"{', '.join(rule_sources.sources(dependent, dependency))}"
+            )
+    return "\n".join(lines)
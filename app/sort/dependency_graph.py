@@ -0,0 +1,262 @@
+from array import array
+from collections import deque
+from typing import Any, Iterable, Iterator, Mapping, Sequence
+
+from loguru import logger
+
+from app.utils.rule_snapshot import RuleSnapshot
+
+
+class Adjacency:
+    """
+    Compressed sparse row adjacency of an integer graph.
+
+    The targets of node ``n`` are ``targets[offsets[n]:offsets[n + 1]]``.
+
+    :param offsets: Start of each node's targets, plus the total edge count.
+    :param targets: Targets of all nodes, concatenated.
+    """
+
+    __slots__ = ("offsets", "targets")
+
+    def __init__(self, offsets: "array[int]", targets: "array[int]") -> None:
+        self.offsets = offsets
+        self.targets = targets
+
+    @classmethod
+    def from_lists(cls, adjacency_lists: Sequence[Iterable[int]]) -> "Adjacency":
+        """
+        Build the adjacency from one list of targets per node.
+
+        :param adjacency_lists: Targets of each node, in node order.
+        :return: The adjacency.
+        """
+        offsets = array("i", [0])
+        targets = array("i")
+        for node_targets in adjacency_lists:
+            targets.extend(node_targets)
+            offsets.append(len(targets))
+        return cls(offsets, targets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, node: int) -> "array[int]":
+        return self.targets[self.offsets[node] : self.offsets[node + 1]]
+
+    def reachable(self, roots: Iterable[int]) -> set[int]:
+        """
+        Find the nodes reachable from roots, including the roots themselves.
+
+        Iterative, so deep chains and cycles of rules are safe.
+
+        :param roots: Nodes to start from.
+        :return: The set of reachable nodes.
+        """
+        offsets = self.offsets
+        targets = self.targets
+        seen = set(roots)
+        stack = list(seen)
+        while stack:
+            node = stack.pop()
+            for i in range(offsets[node], offsets[node + 1]):
+                target = targets[i]
+                if target not in seen:
+                    seen.add(target)
+                    stack.append(target)
+        return seen
+
+    def closure(self, roots: Iterable[int]) -> dict[int, int]:
+        """
+        Find the nodes reachable from roots, with the node each was first
+        reached from, to explain why a node is reachable.
+
+        Breadth-first and iterative, so the explanations are shortest paths.
+
+        :param roots: Nodes to start from.
+        :return: Reachable node -> the node it was reached from. Roots map to
+            themselves.
+        """
+        offsets = self.offsets
+        targets = self.targets
+        reached_from = {root: root for root in roots}
+        queue = deque(reached_from)
+        while queue:
+            node = queue.popleft()
+            for i in range(offsets[node], offsets[node + 1]):
+                target = targets[i]
+                if target not in reached_from:
+                    reached_from[target] = node
+                    queue.append(target)
+        return reached_from
+
+
+class DependencyGraph:
+    """
+    Load order rules of the active mods, with packageids interned to ints.
+
+    Built in a single pass over the compiled rules of the active mods. The
+    tier builders in app.sort.dependencies work on the integer nodes and only
+    convert back to packageids for the graphs they return.
+
+    Every rule only references active mods. When several active mods share a
+    packageid, the rules of the last one (in iteration order) are used.
+
+    :param packageids: Packageid of each node.
+    :param uuids: Uuid of the mod providing the rules of each node.
+    :param load_before: loadTheseBefore rules: node -> nodes to load before it.
+    :param load_after: loadTheseAfter rules: node -> nodes to load after it.
+    :param about_dependencies: About.xml dependencies of each node, as
+        (dependency node or -1 if inactive, active alternative nodes) pairs.
+    :param load_bottom: Nodes with a loadBottom rule.
+    :param load_top: Nodes of packageids with a loadTop rule on any mod,
+        active or not.
+    """
+
+    def __init__(
+        self,
+        packageids: list[str],
+        uuids: list[str],
+        load_before: Adjacency,
+        load_after: Adjacency,
+        about_dependencies: list[tuple[tuple[int, tuple[int, ...]], ...]],
+        load_bottom: set[int],
+        load_top: set[int] | None = None,
+    ) -> None:
+        self.packageids = packageids
+        self.uuids = uuids
+        self.nodes = {packageid: node for node, packageid in enumerate(packageids)}
+        self.load_before = load_before
+        self.load_after = load_after
+        self.about_dependencies = about_dependencies
+        self.load_bottom = load_bottom
+        self.load_top = load_top if load_top is not None else set()
+
+    @classmethod
+    def from_metadata(
+        cls,
+        metadata: Mapping[str, Mapping[str, Any]],
+        active_mods_uuids: Iterable[str],
+    ) -> "DependencyGraph":
+        """
+        Build the graph of the active mods' rules from their metadata.
+
+        :param metadata: Mod metadata by uuid, e.g. internal_local_metadata.
+        :param active_mods_uuids: Uuids of the active mods.
+        :return: The dependency graph.
+        """
+        return cls.from_rules(RuleSnapshot.from_metadata(metadata), active_mods_uuids)
+
+    @classmethod
+    def from_rules(
+        cls, rules: RuleSnapshot, active_mods_uuids: Iterable[str]
+    ) -> "DependencyGraph":
+        """
+        Build the graph of the active mods' rules.
+
+        :param rules: Compiled rules of the mods, e.g.
+            MetadataManager.rule_snapshot.
+        :param active_mods_uuids: Uuids of the active mods.
+        :return: The dependency graph.
+        """
+        nodes: dict[str, int] = {}
+        packageids: list[str] = []
+        uuids: list[str] = []
+        load_bottom: set[int] = set()
+        for uuid in active_mods_uuids:
+            mod_rules = rules[uuid]
+            package_id = mod_rules.package_id
+            node = nodes.get(package_id)
+            if node is None:
+                node = nodes[package_id] = len(packageids)
+                packageids.append(package_id)
+                uuids.append(uuid)
+            else:
+                uuids[node] = uuid
+            if mod_rules.load_bottom:
+                load_bottom.add(node)
+
+        load_before: list[list[int]] = []
+        load_after: list[list[int]] = []
+        about_dependencies: list[tuple[tuple[int, tuple[int, ...]], ...]] = []
+        for uuid in uuids:
+            mod_rules = rules[uuid]
+            load_before.append(
+                [nodes[p] for p in mod_rules.load_these_before if p in nodes]
+            )
+            load_after.append(
+                [nodes[p] for p in mod_rules.load_these_after if p in nodes]
+            )
+            about_dependencies.append(
+                tuple(
+                    (
+                        nodes.get(dependency.package_id, -1),
+                        tuple(
+                            nodes[alternative]
+                            for alternative in dependency.alternatives
+                            if alternative in nodes
+                        ),
+                    )
+                    for dependency in mod_rules.dependencies
+                )
+            )
+        graph = cls(
+            packageids,
+            uuids,
+            Adjacency.from_lists(load_before),
+            Adjacency.from_lists(load_after),
+            about_dependencies,
+            load_bottom,
+            {nodes[p] for p in rules.load_top_package_ids if p in nodes},
+        )
+        logger.info(
+            f"Generated dependency graph of {len(packageids)} mods with "
+            f"{len(graph.load_before.targets)} loadTheseBefore and "
+            f"{len(graph.load_after.targets)} loadTheseAfter rules"
+        )
+        return graph
+
+    def __len__(self) -> int:
+        return len(self.packageids)
+
+    def __contains__(self, package_id: object) -> bool:
+        return package_id in self.nodes
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.packageids)
+
+    def node_set(self, package_ids: Iterable[str]) -> set[int]:
+        """
+        Intern packageids, skipping those of inactive mods.
+
+        :param package_ids: Packageids to look up.
+        :return: The set of nodes.
+        """
+        nodes = self.nodes
+        return {nodes[p] for p in package_ids if p in nodes}
+
+    def package_id_set(self, nodes: Iterable[int]) -> set[str]:
+        packageids = self.packageids
+        return {packageids[node] for node in nodes}
+
+    def subgraph(self, nodes: Iterable[int], trim: bool = False) -> dict[str, set[str]]:
+        """
+        Convert the loadTheseBefore rules of some nodes to a packageid graph.
+
+        :param nodes: Nodes to include.
+        :param trim: If True, drop rules referencing nodes outside of ``nodes``.
+        :return: Schema: {item: {dependency1, dependency2, ...}}
+        """
+        packageids = self.packageids
+        offsets = self.load_before.offsets
+        targets = self.load_before.targets
+        included = nodes if isinstance(nodes, (set, frozenset)) else set(nodes)
+        graph: dict[str, set[str]] = {}
+        for node in included:
+            node_targets = targets[offsets[node] : offsets[node + 1]]
+            graph[packageids[node]] = {
+                packageids[target]
+                for target in node_targets
+                if not trim or target in included
+            }
+        return graph
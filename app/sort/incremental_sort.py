@@ -0,0 +1,165 @@
+from typing import Callable
+
+from loguru import logger
+
+from app.sort.topo_sort import CircularDependencyError
+
+
+class DynamicTopologicalOrder:
+    """
+    A topological order maintained while rules are added one at a time, with
+    the Pearce-Kelly algorithm: when a new rule is violated, only the mods
+    between the two ends of the rule that are connected to them are moved.
+
+    Rules are (dependency, dependent) pairs: the dependency loads first.
+
+    :param order: Initial order of the mods, without any rules.
+    """
+
+    def __init__(self, order: list[str]) -> None:
+        self.order = list(order)
+        self.positions = {package_id: i for i, package_id in enumerate(order)}
+        self._dependencies: dict[str, set[str]] = {p: set() for p in order}
+        self._dependents: dict[str, set[str]] = {p: set() for p in order}
+        self.moved = 0
+
+    def add_rule(self, dependency: str, dependent: str) -> None:
+        """
+        Add a rule, reordering the mods if it is violated.
+
+        :param dependency: Packageid of the mod to load first.
+        :param dependent: Packageid of the mod to load after it.
+        :raises CircularDependencyError: If the rule closes a cycle. The rule
+            is not added, and the order is left as it was.
+        """
+        if dependency == dependent:
+            # Self references are ignored, as with toposort
+            return
+        lower_bound = self.positions[dependent]
+        upper_bound = self.positions[dependency]
+        if lower_bound < upper_bound:
+            # Discovery: mods that must load after the dependent, up to the
+            # dependency, and mods that must load before the dependency, down
+            # to the dependent.
+            forward = self._reachable(
+                dependent, self._dependents, lambda p: p <= upper_bound
+            )
+            if dependency in forward:
+                raise CircularDependencyError({dependent: {dependency}})
+            backward = self._reachable(
+                dependency, self._dependencies, lambda p: p >= lower_bound
+            )
+            self._reassign(backward, forward)
+        self._dependencies[dependent].add(dependency)
+        self._dependents[dependency].add(dependent)
+
+    def _reachable(
+        self, start: str, edges: dict[str, set[str]], in_bounds: Callable[[int], bool]
+    ) -> list[str]:
+        positions = self.positions
+        seen = {start}
+        stack = [start]
+        while stack:
+            for package_id in edges[stack.pop()]:
+                if package_id not in seen and in_bounds(positions[package_id]):
+                    seen.add(package_id)
+                    stack.append(package_id)
+        return list(seen)
+
+    def _reassign(self, backward: list[str], forward: list[str]) -> None:
+        """
+        Reorder: the backward set takes the first of the affected positions,
+        the forward set the rest, each keeping its relative order.
+        """
+        positions = self.positions
+        backward.sort(key=positions.__getitem__)
+        forward.sort(key=positions.__getitem__)
+        affected = sorted(positions[p] for p in backward + forward)
+        for position, package_id in zip(affected, backward + forward):
+            if positions[package_id] != position:
+                self.moved += 1
+            positions[package_id] = position
+            self.order[position] = package_id
+
+
+def do_incremental_sort(
+    dependency_graph: dict[str, set[str]], previous_order: list[str]
+) -> list[str]:
+    """
+    Re-sort a dependency graph, changing a previous order as little as possible.
+
+    Mods of the previous order keep their relative order unless a rule requires
+    otherwise. New mods are placed right before the first mod that depends on
+    them, else right after the last mod they depend on, else at the end.
+
+    :param dependency_graph: Schema: {item: {dependency1, dependency2, ...}}
+    :param previous_order: Packageids in their previous order.
+    :return: The packageids of the graph in their new order.
+    :raises CircularDependencyError: If the graph has a cycle.
+    """
+    previous_positions = {package_id: i for i, package_id in enumerate(previous_order)}
+    kept = sorted(
+        (p for p in dependency_graph if p in previous_positions),
+        key=previous_positions.__getitem__,
+    )
+    added = sorted(p for p in dependency_graph if p not in previous_positions)
+    dependency_graph = {
+        package_id: dependencies & dependency_graph.keys()
+        for package_id, dependencies in dependency_graph.items()
+    }
+    dynamic_order = DynamicTopologicalOrder(
+        _place_added_mods(dependency_graph, kept, added)
+    )
+    positions = dynamic_order.positions
+
+    # Rules the order already satisfies are added first, so that they cannot
+    # be broken when mods move to satisfy the others
+    violated_rules: list[tuple[str, str]] = []
+    for dependent in dynamic_order.order:
+        for dependency in sorted(
+            dependency_graph[dependent], key=positions.__getitem__
+        ):
+            if positions[dependency] < positions[dependent]:
+                dynamic_order.add_rule(dependency, dependent)
+            else:
+                violated_rules.append((dependency, dependent))
+    for dependency, dependent in violated_rules:
+        dynamic_order.add_rule(dependency, dependent)
+    logger.info(
+        f"Incrementally sorted {len(dynamic_order.order)} mods: {len(added)} added, "
+        f"{len(violated_rules)} rules violated, {dynamic_order.moved} moves"
+    )
+    return dynamic_order.order
+
+
+def _place_added_mods(
+    dependency_graph: dict[str, set[str]], kept: list[str], added: list[str]
+) -> list[str]:
+    kept_positions = {package_id: i for i, package_id in enumerate(kept)}
+    first_dependent: dict[str, int] = {}
+    for package_id in kept:
+        for dependency in dependency_graph[package_id]:
+            if dependency not in kept_positions:
+                first_dependent.setdefault(dependency, kept_positions[package_id])
+    before: dict[int, list[str]] = {}
+    after: dict[int, list[str]] = {}
+    at_end: list[str] = []
+    for package_id in added:
+        if package_id in first_dependent:
+            before.setdefault(first_dependent[package_id], []).append(package_id)
+            continue
+        kept_dependencies = [
+            kept_positions[dependency]
+            for dependency in dependency_graph[package_id]
+            if dependency in kept_positions
+        ]
+        if kept_dependencies:
+            after.setdefault(max(kept_dependencies), []).append(package_id)
+        else:
+            at_end.append(package_id)
+    order: list[str] = []
+    for i, package_id in enumerate(kept):
+        order += before.get(i, ())
+        order.append(package_id)
+        order += after.get(i, ())
+    return order + at_end
@@ -1,8 +1,14 @@
-import networkx as nx
 from loguru import logger
-from PySide6.QtCore import QCoreApplication
+from PySide6.QtCore import QCoreApplication, QThread
+from PySide6.QtWidgets import QApplication
 from toposort import CircularDependencyError, toposort
 
+from app.sort.cycles import (
+    DependencyCycle,
+    RuleSources,
+    describe_dependency_cycle,
+    find_dependency_cycles,
+)
 from app.utils.metadata import MetadataManager
 from app.views.dialogue import show_warning
 
@@ -57,20 +63,38 @@ def do_topo_sort(
     return reordered
 
 
-def find_circular_dependencies(dependency_graph: dict[str, set[str]]) -> None:
-    graph = nx.DiGraph(dependency_graph)  # type: ignore # A set is fine, but linters warn about it
-    cycles = list(nx.simple_cycles(graph))  # find all cycles in the graph
+def find_circular_dependencies(
+    dependency_graph: dict[str, set[str]],
+) -> list[DependencyCycle]:
+    """
+    Log and show the circular dependencies of a graph that cannot be sorted:
+    every group of mods in a loop, one shortest loop per group, and which rule
+    sources make each mod of the loop load after the next.
+
+    :param dependency_graph: Schema: {item: {dependency1, dependency2, ...}}
+    :return: The cycles found.
+    """
+    cycles = find_dependency_cycles(dependency_graph)
 
     cycle_strings = []
     if cycles:
         logger.info("Circular dependencies detected:")
+        rule_sources = RuleSources()
         for cycle in cycles:
-            loop = " -> ".join(cycle)
+            loop = describe_dependency_cycle(cycle, rule_sources)
             logger.info(loop)
             cycle_strings.append(loop)
     else:
         logger.info("No circular dependencies found.")
 
+    # Dialogs can only be shown from the GUI thread, not e.g. while a sort is
+    # pre-computed in the background or run from the command line
+    app = QCoreApplication.instance()
+    if app is not None and (
+        not isinstance(app, QApplication) or QThread.currentThread() != app.thread()
+    ):
+        return cycles
+
     show_warning(
         title=QCoreApplication.translate(
             "find_circular_dependencies", "Unable to Sort"
@@ -82,3 +106,4 @@ def find_circular_dependencies(dependency_graph: dict[str, set[str]]) -> None:
         ),
         details="\n\n".join(cycle_strings),
     )
+    return cycles
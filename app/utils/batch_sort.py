@@ -0,0 +1,369 @@
+"""
+Sort the active mods of RimSort instances from the command line, without
+starting the GUI:
+
+    python -m app sort --instance NAME [--instance NAME ...]
+    python -m app sort --all
+
+Metadata is loaded once per set of mod folders: instances sharing their game,
+local and Workshop folders reuse the same refresh, and the About.xml parse
+cache of an instance is carried over to the next one, so mods in shared
+folders are not parsed again. Each instance's ModsConfig.xml is then sorted
+and written in a worker process.
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, cast
+
+from loguru import logger
+from PySide6.QtCore import QCoreApplication
+
+from app.controllers.settings_controller import SettingsController
+from app.controllers.sort_controller import Sorter
+from app.models.instance import Instance
+from app.models.settings import Settings
+from app.utils.app_info import AppInfo
+from app.utils.constants import SortMethod
+from app.utils.metadata import MetadataManager, get_mods_from_list
+from app.utils.metadata_cache import ABOUT_PARSE_CACHE_FILE_NAME, AboutXmlParseCache
+from app.utils.rule_snapshot import RuleSnapshot
+from app.utils.schema import generate_rimworld_mods_list
+from app.utils.steam.steamcmd.wrapper import SteamcmdInterface
+from app.utils.xml import json_to_xml_write
+
+# Keeps the headless application of this process alive
+_core_application: QCoreApplication | None = None
+
+
+class HeadlessSettingsController:
+    """
+    The part of SettingsController that MetadataManager uses, without the
+    settings dialog.
+
+    :param settings: The loaded settings.
+    """
+
+    def __init__(self, settings: Settings) -> None:
+        self.settings = settings
+
+
+@dataclass(frozen=True)
+class InstanceSortJob:
+    """
+    Everything a worker process needs to sort the active mods of an instance.
+
+    :param instance: Name of the instance.
+    :param mods_config_path: Path of its ModsConfig.xml.
+    :param game_version: Game version to write to ModsConfig.xml.
+    :param active_uuids: Uuids of the active mods, in their current order.
+    :param mods_config_entries: ModsConfig.xml entry of each active mod: its
+        packageid, with a _steam suffix for Workshop copies of duplicates.
+    :param metadata: Metadata of the active mods, by uuid.
+    :param rule_snapshot: Compiled rules of all mods.
+    :param sort_method: The sorting algorithm setting.
+    :param use_moddependencies_as_loadTheseBefore: The setting of the same name.
+    :param missing_mods: Packageids in ModsConfig.xml that are not installed.
+    :param dry_run: Sort, but do not write ModsConfig.xml.
+    """
+
+    instance: str
+    mods_config_path: str
+    game_version: str
+    active_uuids: list[str]
+    mods_config_entries: dict[str, str]
+    metadata: dict[str, dict[str, Any]]
+    rule_snapshot: RuleSnapshot
+    sort_method: SortMethod
+    use_moddependencies_as_loadTheseBefore: bool
+    missing_mods: list[str]
+    dry_run: bool = False
+
+
+@dataclass(frozen=True)
+class InstanceSortResult:
+    """
+    :param instance: Name of the instance.
+    :param success: Whether the mods were sorted.
+    :param message: What happened, for the command line output.
+    """
+
+    instance: str
+    success: bool
+    message: str
+
+
+def init_headless(settings: Settings | None = None) -> MetadataManager:
+    """
+    Initialize the Qt core application, SteamcmdInterface and MetadataManager
+    of this process without any widgets, if they are not already.
+
+    :param settings: The loaded settings, loaded from settings.json if None.
+    :return: The metadata manager.
+    """
+    global _core_application
+    if QCoreApplication.instance() is None:
+        _core_application = QCoreApplication([])
+    if MetadataManager._instance is not None:
+        return MetadataManager.instance()
+    if settings is None:
+        settings = Settings()
+        settings.load()
+    if SteamcmdInterface._instance is None:
+        SteamcmdInterface.instance(
+            settings.instances[settings.current_instance].steamcmd_install_path,
+            settings.steamcmd_validate_downloads,
+        )
+    metadata_manager = MetadataManager.instance(
+        settings_controller=cast(
+            SettingsController, HeadlessSettingsController(settings)
+        )
+    )
+    # There is no GUI to show warnings in
+    metadata_manager.show_warning_signal.disconnect()
+    metadata_manager.show_warning_signal.connect(_log_warning)
+    return metadata_manager
+
+
+def _log_warning(title: str, text: str, information: str, details: str) -> None:
+    logger.warning(f"{title}: {text} {information} {details}".strip())
+
+
+def _mod_folders(instance: Instance) -> tuple[str, str, str]:
+    """:return: The folders mods of an instance are parsed from."""
+    return (
+        str(instance.workshop_folder),
+        str(instance.local_folder),
+        str(instance.game_folder),
+    )
+
+
+def _switch_instance(
+    settings: Settings, metadata_manager: MetadataManager, name: str
+) -> None:
+    """
+    Make an instance the current one for this process only, carrying the
+    About.xml parse cache of the previous instance over for the mod folders
+    they share. settings.json is not saved.
+    """
+    previous_cache = metadata_manager.about_parse_cache
+    settings.current_instance = name
+    settings.current_instance_path = str(
+        Path(AppInfo().app_storage_folder) / "instances" / name
+    )
+    if previous_cache is None:
+        return
+    cache = AboutXmlParseCache(
+        Path(settings.current_instance_path) / ABOUT_PARSE_CACHE_FILE_NAME
+    )
+    cache.load()
+    # Entries are only used while their About.xml fingerprint matches, so
+    # those of the previous instance are as good as the instance's own
+    carried = {
+        path: entry
+        for path, entry in previous_cache.entries_for(
+            metadata_manager.mod_metadata_dir_mapper
+        ).items()
+        if path not in cache.entries
+    }
+    cache.merge(carried, 0, 0)
+    metadata_manager.about_parse_cache = cache
+    logger.info(f"Carried {len(carried)} parsed mods over to instance {name}")
+
+
+def load_instance_jobs(
+    settings: Settings,
+    metadata_manager: MetadataManager,
+    names: list[str],
+    dry_run: bool = False,
+) -> tuple[list[InstanceSortJob], list[InstanceSortResult]]:
+    """
+    Load the metadata and active mods of instances, refreshing the metadata
+    only when the mod folders change from one instance to the next.
+
+    :param settings: The loaded settings.
+    :param metadata_manager: The metadata manager.
+    :param names: Names of the instances.
+    :param dry_run: Sort, but do not write ModsConfig.xml.
+    :return: The sort jobs, and the results of instances that cannot be sorted.
+    """
+    jobs: list[InstanceSortJob] = []
+    failures: list[InstanceSortResult] = []
+    loaded_folders: tuple[str, str, str] | None = None
+    # Instances sharing mod folders are loaded one after another
+    for name in sorted(names, key=lambda n: _mod_folders(settings.instances[n])):
+        instance = settings.instances[name]
+        mods_config_path = Path(instance.config_folder) / "ModsConfig.xml"
+        if not instance.config_folder or not mods_config_path.is_file():
+            failures.append(
+                InstanceSortResult(
+                    name, False, f"ModsConfig.xml not found at {mods_config_path}"
+                )
+            )
+            continue
+        folders = _mod_folders(instance)
+        if folders != loaded_folders:
+            logger.info(f"Loading metadata of instance {name}")
+            _switch_instance(settings, metadata_manager, name)
+            metadata_manager.refresh_cache(is_initial=loaded_folders is None)
+            loaded_folders = folders
+        else:
+            logger.info(f"Reusing the metadata loaded for instance {name}")
+        active_uuids, _, duplicate_mods, missing_mods = get_mods_from_list(
+            str(mods_config_path)
+        )
+        metadata = metadata_manager.internal_local_metadata
+        mods_config_entries: dict[str, str] = {}
+        for uuid in active_uuids:
+            package_id = metadata[uuid]["packageid"]
+            if (
+                package_id in duplicate_mods
+                and metadata[uuid]["data_source"] == "workshop"
+            ):
+                package_id += "_steam"
+            mods_config_entries[uuid] = package_id
+        jobs.append(
+            InstanceSortJob(
+                instance=name,
+                mods_config_path=str(mods_config_path),
+                game_version=metadata_manager.game_version,
+                active_uuids=active_uuids,
+                mods_config_entries=mods_config_entries,
+                # Copies, as the next refresh recompiles the shared mods
+                metadata={uuid: dict(metadata[uuid]) for uuid in active_uuids},
+                rule_snapshot=metadata_manager.rule_snapshot,
+                sort_method=settings.sorting_algorithm,
+                use_moddependencies_as_loadTheseBefore=settings.use_moddependencies_as_loadTheseBefore,
+                missing_mods=missing_mods,
+                dry_run=dry_run,
+            )
+        )
+    return jobs, failures
+
+
+def sort_instance(job: InstanceSortJob) -> InstanceSortResult:
+    """
+    Sort the active mods of an instance and write them to its ModsConfig.xml.
+    Runs in a worker process.
+
+    :param job: The instance to sort.
+    :return: The result.
+    """
+    metadata_manager = init_headless()
+    metadata_manager.internal_local_metadata = job.metadata
+    metadata_manager.rule_snapshot = job.rule_snapshot
+    try:
+        sorter = Sorter(
+            job.sort_method,
+            active_package_ids={
+                mod_metadata["packageid"] for mod_metadata in job.metadata.values()
+            },
+            active_uuids=set(job.active_uuids),
+            use_moddependencies_as_loadTheseBefore=job.use_moddependencies_as_loadTheseBefore,
+        )
+        success, new_order = sorter.sort()
+    except Exception as e:
+        logger.exception(f"Failed to sort instance {job.instance}")
+        return InstanceSortResult(job.instance, False, f"sort failed: {e}")
+    if not success:
+        return InstanceSortResult(
+            job.instance,
+            False,
+            "circular dependencies found, see the log for the dependency loops",
+        )
+    missing = (
+        f", {len(job.missing_mods)} mods in ModsConfig.xml are not installed"
+        if job.missing_mods
+        else ""
+    )
+    if new_order == job.active_uuids:
+        return InstanceSortResult(
+            job.instance, True, f"{len(new_order)} mods already sorted{missing}"
+        )
+    if job.dry_run:
+        return InstanceSortResult(
+            job.instance, True, f"{len(new_order)} mods sorted, not written{missing}"
+        )
+    json_to_xml_write(
+        generate_rimworld_mods_list(
+            job.game_version, [job.mods_config_entries[uuid] for uuid in new_order]
+        ),
+        job.mods_config_path,
+    )
+    return InstanceSortResult(
+        job.instance,
+        True,
+        f"{len(new_order)} mods sorted into {job.mods_config_path}{missing}",
+    )
+
+
+def sort_instances(
+    jobs: list[InstanceSortJob], workers: int | None = None
+) -> list[InstanceSortResult]:
+    """
+    Sort instances in parallel worker processes.
+
+    :param jobs: The instances to sort.
+    :param workers: Maximum number of worker processes, defaults to the
+        number of CPUs. With a single worker or job, sorts in this process.
+    :return: The results, in the order of the jobs.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        return [sort_instance(job) for job in jobs]
+    logger.info(f"Sorting {len(jobs)} instances with {workers} worker processes")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(sort_instance, jobs))
+
+
+def main(argv: list[str]) -> int:
+    """
+    Entry point of `python -m app sort`.
+
+    :param argv: Arguments after "sort".
+    :return: Exit code: 0 if every instance was sorted, else 1.
+    """
+    parser = argparse.ArgumentParser(
+        prog="RimSort sort",
+        description="Sort the active mods of RimSort instances, without the GUI.",
+    )
+    selection = parser.add_mutually_exclusive_group(required=True)
+    selection.add_argument(
+        "--instance",
+        action="append",
+        metavar="NAME",
+        help="instance to sort, can be repeated",
+    )
+    selection.add_argument("--all", action="store_true", help="sort every instance")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="maximum number of worker processes, defaults to the number of CPUs",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="sort, but do not write ModsConfig.xml",
+    )
+    args = parser.parse_args(argv)
+
+    settings = Settings()
+    settings.load()
+    names = list(settings.instances) if args.all else list(dict.fromkeys(args.instance))
+    unknown = [name for name in names if name not in settings.instances]
+    if unknown:
+        parser.error(
+            f"unknown instance(s): {', '.join(unknown)}. "
+            f"Instances: {', '.join(settings.instances)}"
+        )
+
+    metadata_manager = init_headless(settings)
+    jobs, results = load_instance_jobs(settings, metadata_manager, names, args.dry_run)
+    results += sort_instances(jobs, args.workers)
+    for result in sorted(results, key=lambda r: names.index(r.instance)):
+        print(f"{result.instance}: {result.message}")
+    return 0 if all(result.success for result in results) else 1
@@ -6,6 +6,7 @@ from sqlalchemy.orm.session import Session
 
 from app.controllers.metadata_db_controller import AuxMetadataController
 from app.controllers.settings_controller import SettingsController
+from app.models.metadata.metadata_db import AuxMetadataEntry
 from app.utils.aux_db_utils import (
     get_mod_color,
     get_mod_user_notes,
@@ -37,6 +38,7 @@ class CustomListWidgetItemMetadata:
         list_type: str | None = None,
         aux_metadata_controller: AuxMetadataController | None = None,
         aux_metadata_session: Session | None = None,
+        aux_metadata_entry: AuxMetadataEntry | None = None,
     ) -> None:
         """
         Must provide a uuid, the rest is optional.
@@ -58,6 +60,7 @@ class CustomListWidgetItemMetadata:
         :param alternative: a bool representing whether the widget's item has an alternative mod in the "Use This Instead" database
         :param aux_metadata_controller: AuxMetadataController, an instance of the controller used for fetching mod color
         :param aux_metadata_session: Session, an instance of the session used for fetching mod color
+        :param aux_metadata_entry: AuxMetadataEntry, the prefetched Aux DB entry of the mod. If provided, the Aux DB is not queried
         """
         # Do not cache the metadata manager, aux metadata controller or settings controller
         # They will cause freezes/crashes when dragging mods from inactive->active or vice versa
@@ -70,8 +73,15 @@ class CustomListWidgetItemMetadata:
         self.filtered = filtered
         self.hidden_by_filter = hidden_by_filter
         if not warning_toggled:
-            self.warning_toggled = get_mod_warning_toggled(
-                settings_controller, uuid, aux_metadata_controller, aux_metadata_session
+            self.warning_toggled = (
+                aux_metadata_entry.ignore_warnings
+                if aux_metadata_entry is not None
+                else get_mod_warning_toggled(
+                    settings_controller,
+                    uuid,
+                    aux_metadata_controller,
+                    aux_metadata_session,
+                )
             )
         else:
             self.warning_toggled = warning_toggled
@@ -81,10 +91,21 @@ class CustomListWidgetItemMetadata:
         self.mismatch = (
             mismatch if mismatch is not None else self.get_mismatch_by_uuid(uuid)
         )
+        self.mod_color: QColor | None
         if mod_color is None:
-            self.mod_color = get_mod_color(
-                settings_controller, uuid, aux_metadata_controller, aux_metadata_session
-            )
+            if aux_metadata_entry is not None:
+                self.mod_color = (
+                    QColor(aux_metadata_entry.color_hex)
+                    if aux_metadata_entry.color_hex is not None
+                    else None
+                )
+            else:
+                self.mod_color = get_mod_color(
+                    settings_controller,
+                    uuid,
+                    aux_metadata_controller,
+                    aux_metadata_session,
+                )
         else:
             self.mod_color = mod_color
         self.alternative = (
@@ -99,8 +120,15 @@ class CustomListWidgetItemMetadata:
             f"Finished initializing CustomListWidgetItemMetadata for uuid: {uuid}"
         )
         if user_notes == "":
-            self.user_notes = get_mod_user_notes(
-                settings_controller, uuid, aux_metadata_controller, aux_metadata_session
+            self.user_notes = (
+                aux_metadata_entry.user_notes
+                if aux_metadata_entry is not None
+                else get_mod_user_notes(
+                    settings_controller,
+                    uuid,
+                    aux_metadata_controller,
+                    aux_metadata_session,
+                )
             )
         else:
             self.user_notes = user_notes
@@ -0,0 +1,201 @@
+import os
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Iterable
+
+from loguru import logger
+
+ABOUT_FOLDER_NAME = "about"
+ABOUT_FILE_NAME = "about.xml"
+PUBLISHED_FILE_ID_FILE_NAME = "publishedfileid.txt"
+PREVIEW_FILE_NAME = "preview.png"
+ASSEMBLIES_FOLDER_NAME = "assemblies"
+
+
+@dataclass(frozen=True, slots=True)
+class FileSnapshot:
+    """
+    A file found while scanning a mod directory.
+
+    :param path: Path of the file.
+    :param stat: stat result of the file, taken while scanning.
+    """
+
+    path: str
+    stat: os.stat_result
+
+
+@dataclass(frozen=True, slots=True)
+class ModDirectorySnapshot:
+    """
+    The parts of a mod directory RimSort reads, scanned once with os.scandir.
+
+    Names are matched case-insensitively, the first match in scandir order wins.
+
+    :param path: Path of the mod directory.
+    :param stat: stat result of the mod directory.
+    :param names: Lowercased name -> name of the entries in the mod directory.
+    :param subdirectories: Names of the subdirectories of the mod directory.
+    :param about_folder: Path of the About folder, if any.
+    :param about_file: About/About.xml, if any.
+    :param published_file_id_file: About/PublishedFileId.txt, if any.
+    :param preview_file: Path of About/Preview.png, if any.
+    :param rsc_file: Name of a .rsc scenario file in the mod directory, if any.
+    """
+
+    path: str
+    stat: os.stat_result
+    names: dict[str, str] = field(default_factory=dict)
+    subdirectories: tuple[str, ...] = ()
+    about_folder: str | None = None
+    about_file: FileSnapshot | None = None
+    published_file_id_file: FileSnapshot | None = None
+    preview_file: str | None = None
+    rsc_file: str | None = None
+
+    @property
+    def mtime(self) -> int:
+        """The modification time of the mod directory, in whole seconds"""
+        return int(self.stat.st_mtime)
+
+    def has_csharp_assemblies(self) -> bool:
+        """
+        Check for .dll files in the mod's Assemblies folder or, if it has none,
+        in the Assemblies folders of its subdirectories (e.g. version folders).
+        """
+        assemblies_folder_name = next(
+            (
+                subdirectory
+                for subdirectory in self.subdirectories
+                if subdirectory.lower() == ASSEMBLIES_FOLDER_NAME
+            ),
+            None,
+        )
+        if assemblies_folder_name is not None:
+            return _contains_dll(os.path.join(self.path, assemblies_folder_name))
+        return any(
+            _contains_dll(os.path.join(self.path, subdirectory, "Assemblies"))
+            for subdirectory in self.subdirectories
+        )
+
+
+def _contains_dll(folder: str) -> bool:
+    try:
+        with os.scandir(folder) as entries:
+            return any(entry.name.lower().endswith(".dll") for entry in entries)
+    except OSError:
+        # Missing folders are expected, when checking subdirectories
+        return False
+
+
+def scan_mod_directory(mod_directory: str) -> ModDirectorySnapshot | None:
+    """
+    Scan a mod directory and its About folder once each.
+
+    :param mod_directory: Path of the mod directory.
+    :return: The snapshot, or None if the directory cannot be read.
+    """
+    try:
+        directory_stat = os.stat(mod_directory)
+        names: dict[str, str] = {}
+        subdirectories: list[str] = []
+        about_folder_name = None
+        rsc_file = None
+        with os.scandir(mod_directory) as entries:
+            for entry in entries:
+                name = entry.name.lower()
+                names.setdefault(name, entry.name)
+                if entry.is_dir():
+                    subdirectories.append(entry.name)
+                    if about_folder_name is None and name == ABOUT_FOLDER_NAME:
+                        about_folder_name = entry.name
+                elif rsc_file is None and name.endswith(".rsc"):
+                    rsc_file = entry.name
+    except OSError as e:
+        logger.warning(f"Unable to scan mod directory {mod_directory}: {e}")
+        return None
+
+    about_folder = None
+    about_file = None
+    published_file_id_file = None
+    preview_file = None
+    if about_folder_name is not None:
+        about_folder = os.path.join(mod_directory, about_folder_name)
+        try:
+            with os.scandir(about_folder) as entries:
+                for entry in entries:
+                    name = entry.name.lower()
+                    if name == ABOUT_FILE_NAME:
+                        if about_file is None and entry.is_file():
+                            about_file = FileSnapshot(entry.path, entry.stat())
+                    elif name == PUBLISHED_FILE_ID_FILE_NAME:
+                        if published_file_id_file is None and entry.is_file():
+                            published_file_id_file = FileSnapshot(
+                                entry.path, entry.stat()
+                            )
+                    elif name == PREVIEW_FILE_NAME:
+                        if preview_file is None and entry.is_file():
+                            preview_file = entry.path
+        except OSError as e:
+            logger.warning(f"Unable to scan About folder {about_folder}: {e}")
+
+    return ModDirectorySnapshot(
+        path=mod_directory,
+        stat=directory_stat,
+        names=names,
+        subdirectories=tuple(subdirectories),
+        about_folder=about_folder,
+        about_file=about_file,
+        published_file_id_file=published_file_id_file,
+        preview_file=preview_file,
+        rsc_file=rsc_file,
+    )
+
+
+class DirectorySnapshots:
+    """
+    Thread-safe store of mod directory snapshots.
+
+    MetadataManager clears it at the start of each refresh, so the parser,
+    sorting by modification time and the mod info panel all share one scan of
+    each mod directory per refresh. Mods updated outside of a refresh are
+    invalidated individually.
+    """
+
+    def __init__(self) -> None:
+        self._snapshots: dict[str, ModDirectorySnapshot] = {}
+        self._lock = Lock()
+
+    def get(self, mod_directory: str) -> ModDirectorySnapshot | None:
+        """
+        Return the snapshot of a mod directory, scanning it if needed.
+
+        :param mod_directory: Path of the mod directory.
+        :return: The snapshot, or None if the directory cannot be read.
+        """
+        with self._lock:
+            snapshot = self._snapshots.get(mod_directory)
+        if snapshot is None:
+            snapshot = scan_mod_directory(mod_directory)
+            if snapshot is not None:
+                self.put(snapshot)
+        return snapshot
+
+    def put(self, snapshot: ModDirectorySnapshot) -> None:
+        with self._lock:
+            self._snapshots[snapshot.path] = snapshot
+
+    def update(self, snapshots: Iterable[ModDirectorySnapshot]) -> None:
+        """
+        Store snapshots taken elsewhere, e.g. by a parser worker process.
+        """
+        with self._lock:
+            self._snapshots.update((snapshot.path, snapshot) for snapshot in snapshots)
+
+    def invalidate(self, mod_directory: str) -> None:
+        with self._lock:
+            self._snapshots.pop(mod_directory, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._snapshots.clear()
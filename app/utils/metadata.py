@@ -1,14 +1,20 @@
+import hashlib
 import json
 import os
 import traceback
-from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from math import ceil
 from pathlib import Path
 from re import match
+from threading import Event, Lock
 from time import localtime, strftime, time
-from typing import Any, Iterable, Union
+from typing import Any, Iterable, Mapping, MutableMapping, Protocol, Union
 from uuid import uuid4
 
+import msgspec
 from loguru import logger
+from lxml import etree
 from natsort import natsorted
 from PySide6.QtCore import (
     QCoreApplication,
@@ -20,6 +26,7 @@ from PySide6.QtCore import (
 )
 
 from app.controllers.settings_controller import SettingsController
+from app.models.metadata.metadata_structure import ExternalRulesSchema, SteamDbSchema
 from app.utils.app_info import AppInfo
 from app.utils.constants import (
     DB_BUILDER_PRUNE_EXCEPTIONS,
@@ -27,7 +34,22 @@ from app.utils.constants import (
     DEFAULT_USER_RULES,
     RIMWORLD_DLC_METADATA,
 )
-from app.utils.generic import directories
+from app.utils.directory_snapshot import (
+    DirectorySnapshots,
+    ModDirectorySnapshot,
+    scan_mod_directory,
+)
+from app.utils.generic import chunks, directories
+from app.utils.metadata_cache import (
+    ABOUT_PARSE_CACHE_FILE_NAME,
+    USE_THIS_INSTEAD_INDEX_FILE_NAME,
+    AboutXmlCacheEntry,
+    AboutXmlParseCache,
+    ModReplacement,
+    UseThisInsteadIndex,
+    about_fingerprint,
+)
+from app.utils.rule_snapshot import RuleSnapshot
 from app.utils.schema import generate_rimworld_mods_list, validate_rimworld_mods_list
 from app.utils.steam.steamcmd.wrapper import SteamcmdInterface
 from app.utils.steam.steamfiles.wrapper import acf_to_dict, dict_to_acf
@@ -35,7 +57,18 @@ from app.utils.steam.webapi.wrapper import (
     DynamicQuery,
     ISteamRemoteStorage_GetPublishedFileDetails,
 )
-from app.utils.xml import json_to_xml_write, xml_path_to_json
+from app.utils.steam_db_index import (
+    STEAM_DB_INDEX_FOLDER_NAME,
+    SteamDbEntries,
+    SteamDbIndex,
+    open_steam_db_index,
+    steam_db_index_path,
+)
+from app.utils.xml import (
+    extract_about_xml_metadata,
+    json_to_xml_write,
+    xml_path_to_json,
+)
 from app.views.dialogue import (
     show_dialogue_conditional,
     show_dialogue_file,
@@ -45,17 +78,72 @@ from app.views.dialogue import (
 # Locally installed mod metadata
 
 
-class ModReplacement:
-    def __init__(self, name: str, author: str, pfid: str):
-        self.name = name
-        self.author = author
-        self.pfid = pfid
-
-
 # TODO: Someday, it is probably worth typing out the keys
 # For now, I'm creating this alias to make it clear in new code what this represents.
 ModMetadata = dict[str, Any]
 
+# Keys compile_metadata adds to a mod's metadata. loadTheseBefore/loadTheseAfter
+# also hold reverse rules ((packageid, False) entries) added by other mods.
+COMPILED_METADATA_KEYS = (
+    "dependencies",
+    "incompatibilities",
+    "loadTheseBefore",
+    "loadTheseAfter",
+    "loadTop",
+    "loadBottom",
+)
+# About.xml tags that reference other mods by packageid
+ABOUT_XML_REFERENCE_TAGS = (
+    "moddependencies",
+    "moddependenciesbyversion",
+    "incompatiblewith",
+    "incompatiblewithbyversion",
+    "loadafter",
+    "loadafterbyversion",
+    "loadbefore",
+    "loadbeforebyversion",
+    "forceloadafter",
+    "forceloadbefore",
+)
+# Community Rules / User Rules keys that reference other mods by packageid
+RULES_REFERENCE_KEYS = ("loadBefore", "loadAfter", "incompatibleWith")
+
+
+class ModParserContext(Protocol):
+    """
+    The state a mod parser reads while parsing a mod directory.
+
+    MetadataManager provides this directly for the thread pool backend, while
+    ProcessParserContext carries a picklable copy of it to worker processes.
+    """
+
+    external_steam_metadata: MutableMapping[str, Any] | None
+    workshop_acf_data: dict[str, Any]
+    steamcmd_acf_data: dict[str, Any]
+    about_parse_cache: AboutXmlParseCache | None
+
+    @property
+    def directory_snapshots(self) -> DirectorySnapshots | None: ...
+
+
+@dataclass
+class LocalMetadataState:
+    """
+    Copy of the local mod metadata and its indexes, taken before a refresh
+    parses the mods so that a cancelled refresh can restore it.
+
+    The mods' metadata dicts are not copied: parsing replaces them rather
+    than changing them.
+    """
+
+    internal_local_metadata: dict[str, Any]
+    packageid_to_uuids: dict[str, set[str]]
+    parsed_metadata_fingerprints: dict[str, bytes]
+    dirty_uuids: set[str]
+    mod_metadata_file_mapper: dict[str, str]
+    mod_metadata_dir_mapper: dict[str, str]
+    game_version: str
+
 
 class MetadataManager(QObject):
     _instance: "None | MetadataManager" = None
@@ -63,6 +151,8 @@ class MetadataManager(QObject):
     mod_deleted_signal = Signal(str)
     mod_metadata_updated_signal = Signal(str)
     show_warning_signal = Signal(str, str, str, str)
+    # (parsed mods, mods to parse) while refreshing, see refresh_cache
+    parse_progress_signal = Signal(int, int)
 
     def __new__(cls, *args: Any, **kwargs: Any) -> "MetadataManager":
         if cls._instance is None:
@@ -79,29 +169,67 @@ class MetadataManager(QObject):
 
             # Initialize our threadpool for multithreaded parsing
             self.parser_threadpool = QThreadPool.globalInstance()
+            # Process pool for the "process" parser backend, started on demand
+            self._parser_process_pool: ProcessPoolExecutor | None = None
+            # Parsing progress of the running refresh, whether it is parsing mods
+            # and whether it was cancelled
+            self._refresh_cancelled = Event()
+            self._parsing_refresh = False
+            self._parse_progress_lock = Lock()
+            self._parsed_count = 0
+            self._parse_total = 0
+            self._reported_parsed_count = 0
 
             # Connect a warning signal for thread-safe prompts
             self.show_warning_signal.connect(show_warning)
 
             # Store parsed metadata & paths
-            self.external_steam_metadata: dict[str, Any] | None = None
+            self.external_steam_metadata: MutableMapping[str, Any] | None = None
             self.external_steam_metadata_path: str | None = None
             self.external_community_rules: dict[str, Any] | None = None
             self.external_community_rules_path: str | None = None
             self.external_no_version_warning: list[str] | None = None
             self.external_no_version_warning_path: str | None = None
-            # self.external_use_this_instead_replacements: dict[str, ModReplacement] | None = None
+            # "Use This Instead" replacements, loaded on first use
+            self.use_this_instead_index: UseThisInsteadIndex | None = None
             self.external_user_rules: dict[str, Any] | None = None
             self.external_user_rules_path: str = str(
                 AppInfo().databases_folder / "userRules.json"
             )
             # Local metadata
             self.internal_local_metadata: dict[str, Any] = {}
+            # Compiled rules of internal_local_metadata, replaced on each compile
+            self.rule_snapshot = RuleSnapshot()
             # Mappers
             self.mod_metadata_file_mapper: dict[str, str] = {}
             self.mod_metadata_dir_mapper: dict[str, str] = {}
             self.packageid_to_uuids: dict[str, set[str]] = {}
+            # Guards packageid_to_uuids, which parser threads update
+            self._packageid_index_lock = Lock()
             self.steamdb_packageid_to_name: dict[str, str] = {}
+            # SteamDB PublishedFileId -> lowercased packageid, rebuilt when the DB changes
+            self.steamdb_publishedfileid_to_packageid: dict[str, str] = {}
+            self._steamdb_index_source: MutableMapping[str, Any] | None = None
+            # Incremental compilation state, see compile_metadata
+            # Mods that were (re-)parsed with changed metadata since the last compile
+            self.dirty_uuids: set[str] = set()
+            # packageids (and Steam PublishedFileIds) with changed external data
+            self.dirty_packageids: set[str] = set()
+            # packageid / PublishedFileId -> uuids whose compiled metadata references it
+            self.referencing_uuids: dict[str, set[str]] = {}
+            # uuid -> the keys it is indexed under in referencing_uuids, and the
+            # packageid it had when it was last compiled
+            self.compiled_references: dict[str, set[str]] = {}
+            self.compiled_packageids: dict[str, str] = {}
+            # uuid -> fingerprint of the metadata as parsed, before compilation
+            self.parsed_metadata_fingerprints: dict[str, bytes] = {}
+            # (game version, prefer versioned About.xml tags) of the last compile
+            self._compiled_settings: tuple[str, bool] | None = None
+            # Persistent About.xml parse cache, stored per instance
+            self.about_parse_cache: AboutXmlParseCache | None = None
+            # Scans of the mod directories, shared by the parser and the UI and
+            # cleared on each refresh
+            self.directory_snapshots = DirectorySnapshots()
             # Empty game version string unless the data is populated
             self.game_version: str = ""
             # SteamCMD .acf file data
@@ -166,9 +294,52 @@ class MetadataManager(QObject):
 
             return True
 
+        def warn_if_steam_db_expired(life: int, db_time: int) -> None:
+            elapsed = int(time()) - db_time
+            if (
+                elapsed <= life
+            ):  # If the duration elapsed since db creation is less than expiry than expiry
+                # The data is valid
+                logger.info("Cached Steam DB is valid! Returning data to RimSort...")
+            elif life != 0:  # Disable Notification if value is 0
+                # If the cached db data is expired but NOT missing
+                # Fallback to the expired metadata
+                self.show_warning_signal.emit(
+                    self.tr("Steam DB metadata expired"),
+                    self.tr("Steam DB is expired! Consider updating!\n"),
+                    self.tr(
+                        "Steam DB last updated: {last_updated}\n\n"
+                        + "Falling back to cached, but EXPIRED Steam Database..."
+                    ).format(
+                        last_updated=strftime(
+                            "%Y-%m-%d %H:%M:%S",
+                            localtime(db_time),
+                        )
+                    ),
+                    "",
+                )
+
+        def get_configured_steam_db_index(path: str) -> SteamDbIndex | None:
+            index_folder = AppInfo().databases_folder / STEAM_DB_INDEX_FOLDER_NAME
+            try:
+                # Keep the loaded index (and its decoded entries) if the JSON
+                # did not change since it was opened
+                if isinstance(
+                    self.external_steam_metadata, SteamDbIndex
+                ) and self.external_steam_metadata.index_path == steam_db_index_path(
+                    Path(path), index_folder
+                ):
+                    return self.external_steam_metadata
+                return open_steam_db_index(Path(path), index_folder)
+            except (OSError, ValueError, KeyError, msgspec.DecodeError) as e:
+                logger.warning(
+                    f"Unable to use SteamDB index, loading the JSON instead: {e}"
+                )
+                return None
+
         def get_configured_steam_db(
             life: int, path: str
-        ) -> tuple[dict[str, Any] | None, str | None]:
+        ) -> tuple[MutableMapping[str, Any] | None, str | None]:
             logger.info(f"Checking for Steam DB at: {path}")
             if not validate_db_path(path, "Steam"):
                 return None, None
@@ -177,57 +348,36 @@ class MetadataManager(QObject):
             logger.info(
                 "Steam DB exists!",
             )
-            with open(path, encoding="utf-8") as f:
-                json_string = f.read()
-                logger.info("Checking metadata expiry against database...")
-                db_data = json.loads(json_string)
-                current_time = int(time())
-                db_time = int(db_data["version"])
-                elapsed = current_time - db_time
-                if (
-                    elapsed <= life
-                ):  # If the duration elapsed since db creation is less than expiry than expiry
-                    # The data is valid
-                    db_json_data = db_data[
-                        "database"
-                    ]  # TODO: additional check to verify integrity of this data's schema
+            if self.settings_controller.settings.use_steam_db_index:
+                steam_db_index = get_configured_steam_db_index(path)
+                if steam_db_index is not None:
+                    logger.info("Checking metadata expiry against database index...")
+                    warn_if_steam_db_expired(life, steam_db_index.version)
                     logger.info(
-                        "Cached Steam DB is valid! Returning data to RimSort..."
+                        f"Loaded index of {len(steam_db_index)} Steam Workshop mods from Steam DB"
                     )
-                    total_entries = len(db_json_data)
-                    logger.info(
-                        f"Loaded metadata for {total_entries} Steam Workshop mods from Steam DB"
-                    )
-                else:  # If the cached db data is expired but NOT missing
-                    # Fallback to the expired metadata
-                    if life != 0:  # Disable Notification if value is 0
-                        self.show_warning_signal.emit(
-                            self.tr("Steam DB metadata expired"),
-                            self.tr("Steam DB is expired! Consider updating!\n"),
-                            self.tr(
-                                "Steam DB last updated: {last_updated}\n\n"
-                                + "Falling back to cached, but EXPIRED Steam Database..."
-                            ).format(
-                                last_updated=strftime(
-                                    "%Y-%m-%d %H:%M:%S",
-                                    localtime(db_time),
-                                )
-                            ),
-                            "",
-                        )
-                    db_json_data = db_data[
-                        "database"
-                    ]  # TODO: additional check to verify integrity of this data's schema
-                    total_entries = len(db_json_data)
-                    logger.info(
-                        f"Loaded metadata for {total_entries} Steam Workshop mods from Steam DB"
+                    self.steamdb_packageid_to_name = dict(
+                        steam_db_index.packageid_to_name
                     )
+                    return steam_db_index, path
+            with open(path, "rb") as f:
+                json_bytes = f.read()
+            logger.info("Checking metadata expiry against database...")
+            db_version, db_json_data = decode_steam_db(json_bytes)
+            warn_if_steam_db_expired(life, db_version)
+            total_entries = len(db_json_data)
+            logger.info(
+                f"Loaded metadata for {total_entries} Steam Workshop mods from Steam DB"
+            )
+            if isinstance(db_json_data, SteamDbEntries):
+                self.steamdb_packageid_to_name = dict(db_json_data.packageid_to_name)
+            else:
                 self.steamdb_packageid_to_name = {
                     metadata["packageid"]: metadata["name"]
-                    for metadata in db_data.get("database", {}).values()
+                    for metadata in db_json_data.values()
                     if metadata.get("packageid") and metadata.get("name")
                 }
-                return db_json_data, path
+            return db_json_data, path
 
         def get_configured_community_rules_db(
             path: str,
@@ -241,16 +391,15 @@ class MetadataManager(QObject):
             logger.info(
                 "Community Rules DB exists!",
             )
-            with open(path, encoding="utf-8") as f:
-                json_string = f.read()
-                logger.info("Reading info from communityRules.json")
-                rule_data = json.loads(json_string)
-                community_rules_json_data = rule_data["rules"]
-                total_entries = len(community_rules_json_data)
-                logger.info(
-                    f"Loaded {total_entries} additional sorting rules from Community Rules"
-                )
-                return community_rules_json_data, path
+            with open(path, "rb") as f:
+                json_bytes = f.read()
+            logger.info("Reading info from communityRules.json")
+            community_rules_json_data = decode_rules_db(json_bytes)
+            total_entries = len(community_rules_json_data or {})
+            logger.info(
+                f"Loaded {total_entries} additional sorting rules from Community Rules"
+            )
+            return community_rules_json_data, path
 
         def get_configured_no_version_warning_db(
             path: str,
@@ -268,6 +417,11 @@ class MetadataManager(QObject):
                 map(str.lower, no_version_warning_json_data["ModIdsToFix"]["li"])
             ), path
 
+        # Keep the previously loaded DBs to find the entries that changed
+        previous_steam_metadata = self.external_steam_metadata
+        previous_community_rules = self.external_community_rules
+        previous_user_rules = self.external_user_rules
+
         # Load external metadata
 
         # External Steam metadata
@@ -347,9 +501,8 @@ class MetadataManager(QObject):
         # External User Rules metadata
         if os.path.exists(self.external_user_rules_path):
             logger.info("Loading userRules.json")
-            with open(self.external_user_rules_path, encoding="utf-8") as f:
-                json_string = f.read()
-                self.external_user_rules = json.loads(json_string)["rules"]
+            with open(self.external_user_rules_path, "rb") as f:
+                self.external_user_rules = decode_rules_db(f.read())
             total_entries = 0
             if self.external_user_rules is not None:
                 total_entries = len(self.external_user_rules)
@@ -411,6 +564,19 @@ class MetadataManager(QObject):
                 '"No Version Warning" override disabled by user. Please choose a metadata source in settings.'
             )
 
+        # Mark the mods affected by changed external entries for compile_metadata.
+        # SteamDB entries are keyed by PublishedFileId, rules by packageid.
+        self.dirty_packageids.update(
+            changed_keys(previous_steam_metadata, self.external_steam_metadata)
+        )
+        for previous_rules, rules in (
+            (previous_community_rules, self.external_community_rules),
+            (previous_user_rules, self.external_user_rules),
+        ):
+            self.dirty_packageids.update(
+                package_id.lower() for package_id in changed_keys(previous_rules, rules)
+            )
+
     def __refresh_internal_metadata(self, is_initial: bool = False) -> None:
         def batch_by_data_source(
             data_source: str, mod_directories: list[str]
@@ -466,14 +632,24 @@ class MetadataManager(QObject):
                         )
                         continue
 
-                    deleted_mod_packageid = deleted_mod.get("packageid")
                     self.internal_local_metadata.pop(uuid)
+                    with self._packageid_index_lock:
+                        self.__remove_from_packageid_index(
+                            deleted_mod.get("packageid"), uuid
+                        )
 
-                    if deleted_mod_packageid and self.packageid_to_uuids.get(
-                        deleted_mod_packageid
-                    ):
-                        self.packageid_to_uuids[deleted_mod_packageid].remove(uuid)
-
+        # Load the persistent About.xml parse cache for the current instance
+        about_parse_cache_path = (
+            Path(self.settings_controller.settings.current_instance_path)
+            / ABOUT_PARSE_CACHE_FILE_NAME
+        )
+        if (
+            self.about_parse_cache is None
+            or self.about_parse_cache.cache_path != about_parse_cache_path
+        ):
+            self.about_parse_cache = AboutXmlParseCache(about_parse_cache_path)
+            self.about_parse_cache.load()
+        self.about_parse_cache.reset_stats()
         # Get & set Rimworld version string
         game_folder = self.settings_controller.settings.instances[
             self.settings_controller.settings.current_instance
@@ -587,6 +763,7 @@ class MetadataManager(QObject):
         # Wait for pool to complete
         self.parser_threadpool.waitForDone()
         self.parser_threadpool.clear()
+        self.__shutdown_parser_process_pool()
         # Generate our file <-> UUID mappers for Watchdog and friends
         # Map mod uuid to metadata file path
         self.mod_metadata_file_mapper = {
@@ -606,6 +783,16 @@ class MetadataManager(QObject):
                 for uuid, metadata in self.internal_local_metadata.items()
             },
         }
+        # Persist the About.xml parse cache, dropping mods that no longer exist
+        self.about_parse_cache.log_stats()
+        if self.refresh_cancelled:
+            # Mods that were not parsed are still installed, keep their entries
+            logger.warning(
+                f"Refresh was cancelled after parsing {self._parsed_count} of {self._parse_total} mods"
+            )
+        else:
+            self.about_parse_cache.prune(self.mod_metadata_dir_mapper.keys())
+        self.about_parse_cache.save()
 
     def __update_from_settings(self) -> None:
         self.community_rules_repo = (
@@ -672,11 +859,18 @@ class MetadataManager(QObject):
             }
         )
 
-    def compile_metadata(self, uuids: list[str] = []) -> None:
+    def compile_metadata(self, uuids: list[str] | None = None) -> None:
         """
         Iterate through each expansion or mod and add new key-values describing the
         dependencies, incompatibilities, and load order rules compiled from metadata.
 
+        Compilation is incremental. Only the mods in `uuids` or `self.dirty_uuids`,
+        the mods whose packageid (or PublishedFileId) is in `self.dirty_packageids`,
+        and the mods whose rules reference any of those (see
+        `self.referencing_uuids`) are recompiled. Every mod is recompiled on the
+        first call, and whenever the game version or the ByVersion precedence
+        setting changes.
+
         About.xml ByVersion precedence (controlled by settings.prefer_versioned_about_tags):
         - Toggle OFF: Ignore all ByVersion tags entirely; use only base tags
           (preserves pre-ByVersion behavior).
@@ -693,9 +887,33 @@ class MetadataManager(QObject):
         All collections (dependencies, incompatibilities, load rules) are sets, so
         repeated additions from base/versioned paths do not duplicate.
         """
-        # Compile metadata for all mods if uuids is None
-        uuids = uuids or list(self.internal_local_metadata.keys())
-        logger.info(f"Started compiling metadata for {len(uuids)} mods")
+        if uuids:
+            self.dirty_uuids.update(uuids)
+        compile_settings = (
+            self.game_version,
+            bool(self.settings_controller.settings.prefer_versioned_about_tags),
+        )
+        if compile_settings != self._compiled_settings:
+            # Compiled metadata depends on these, so every mod needs recompiling
+            self.dirty_uuids.update(self.internal_local_metadata.keys())
+            self._compiled_settings = compile_settings
+        # Mods that were compiled before, but no longer exist
+        removed_uuids = (
+            self.compiled_packageids.keys() - self.internal_local_metadata.keys()
+        )
+        compile_uuids = self.__collect_uuids_to_compile(removed_uuids)
+        self.__reset_compiled_metadata(compile_uuids, removed_uuids)
+        # Keep the metadata order, so results do not depend on set ordering
+        uuids = [uuid for uuid in self.internal_local_metadata if uuid in compile_uuids]
+        # Mods to compile, grouped by packageid for the external rules below
+        compile_packageid_to_uuids: dict[str, set[str]] = {}
+        for uuid in uuids:
+            compile_packageid_to_uuids.setdefault(
+                self.internal_local_metadata[uuid]["packageid"], set()
+            ).add(uuid)
+        logger.info(
+            f"Started compiling metadata for {len(uuids)} of {len(self.internal_local_metadata)} mods"
+        )
 
         # Add dependencies to installed mods based on dependencies listed in About.xml TODO manifest.xml
         logger.info("Started compiling metadata from About.xml")
@@ -1088,29 +1306,23 @@ class MetadataManager(QObject):
         if self.external_steam_metadata:
             logger.info("Started compiling metadata from configured SteamDB")
             tracking_dict: dict[str, set[str]] = {}
-            steam_id_to_package_id: dict[str, str] = {}
-            for publishedfileid, mod_data in self.external_steam_metadata.items():
-                db_packageid = mod_data.get("packageid")
+            steam_id_to_package_id = self.__get_steamdb_publishedfileid_index()
+            for uuid in uuids:
+                publishedfileid = self.internal_local_metadata[uuid].get(
+                    "publishedfileid"
+                )
                 # If our DB has a packageid for this
-                if db_packageid:
-                    db_packageid = db_packageid.lower()  # Normalize packageid
-                    steam_id_to_package_id[publishedfileid] = db_packageid
-                    self.steamdb_packageid_to_name[db_packageid] = mod_data.get("name")
-                    potential_uuids = self.packageid_to_uuids.get(db_packageid)
-                    if potential_uuids:  # Potential uuids is a set
-                        for uuid in potential_uuids:
-                            if (
-                                uuid
-                                and self.internal_local_metadata[uuid].get(
-                                    "publishedfileid"
-                                )
-                                == publishedfileid
-                            ):
-                                dependencies = mod_data.get("dependencies")
-                                if dependencies:
-                                    tracking_dict.setdefault(uuid, set()).update(
-                                        dependencies.keys()
-                                    )
+                db_packageid = steam_id_to_package_id.get(publishedfileid or "")
+                if db_packageid and uuid in self.packageid_to_uuids.get(
+                    db_packageid, set()
+                ):
+                    dependencies = self.external_steam_metadata[publishedfileid].get(
+                        "dependencies"
+                    )
+                    if dependencies:
+                        tracking_dict.setdefault(uuid, set()).update(
+                            dependencies.keys()
+                        )
             logger.debug(
                 f"Tracking {len(steam_id_to_package_id)} SteamDB packageids for lookup"
             )
@@ -1151,10 +1363,8 @@ class MetadataManager(QObject):
                 # Note: requiring the package be in self.internal_local_metadata should be fine, as
                 # if the mod doesn't exist self.internal_local_metadata, then either mod_data or dependency_id
                 # will be None, and then we don't insert a dependency
-                if package_id.lower() in self.packageid_to_uuids:
-                    potential_uuids = self.packageid_to_uuids.get(
-                        package_id.lower(), set()
-                    )
+                if package_id.lower() in compile_packageid_to_uuids:
+                    potential_uuids = compile_packageid_to_uuids[package_id.lower()]
                     load_these_after = self.external_community_rules[package_id].get(
                         "loadBefore"
                     )
@@ -1242,10 +1452,8 @@ class MetadataManager(QObject):
                 # Note: requiring the package be in self.internal_local_metadata should be fine, as
                 # if the mod doesn't exist self.internal_local_metadata, then either mod_data or dependency_id
                 # will be None, and then we don't insert a dependency
-                if package_id.lower() in self.packageid_to_uuids:
-                    potential_uuids = self.packageid_to_uuids.get(
-                        package_id.lower(), set()
-                    )
+                if package_id.lower() in compile_packageid_to_uuids:
+                    potential_uuids = compile_packageid_to_uuids[package_id.lower()]
                     load_these_after = self.external_user_rules[package_id].get(
                         "loadBefore"
                     )
@@ -1329,7 +1537,241 @@ class MetadataManager(QObject):
         # logger.info("Flagging obsoleted mods from the Use This Instead database")
         # if self.settings_controller.settings.external_use_this_instead_metadata_source != "None":
 
-        logger.info("Finished compiling internal metadata with external metadata")
+        self.__index_references(uuids, removed_uuids)
+        # Rules added to a mod also change the mods they point to, so the
+        # snapshot is rebuilt from every mod
+        self.rule_snapshot = RuleSnapshot.from_metadata(
+            self.internal_local_metadata, version=self.rule_snapshot.version + 1
+        )
+        logger.info(
+            "Finished compiling internal metadata with external metadata, "
+            f"rule snapshot version {self.rule_snapshot.version}"
+        )
+
+    def update_parsed_metadata(self, uuid: str, mod_metadata: ModMetadata) -> None:
+        """
+        Store freshly parsed metadata for a mod, and mark the mod dirty so that
+        the next compile_metadata call recompiles it.
+
+        If the parsed metadata is unchanged since the mod was last parsed, the
+        existing metadata (including its compiled keys) is kept instead.
+
+        :param uuid: The uuid of the parsed mod.
+        :param mod_metadata: The metadata returned by parse_mod_metadata for the mod.
+        """
+        fingerprint = metadata_fingerprint(mod_metadata)
+        previous_metadata = self.internal_local_metadata.get(uuid)
+        if (
+            previous_metadata is not None
+            and fingerprint is not None
+            and self.parsed_metadata_fingerprints.get(uuid) == fingerprint
+        ):
+            return
+        if fingerprint is None:
+            self.parsed_metadata_fingerprints.pop(uuid, None)
+        else:
+            self.parsed_metadata_fingerprints[uuid] = fingerprint
+        packageid = mod_metadata["packageid"]
+        with self._packageid_index_lock:
+            if previous_metadata is not None:
+                previous_packageid = previous_metadata.get("packageid")
+                if previous_packageid != packageid:
+                    self.__remove_from_packageid_index(previous_packageid, uuid)
+            self.internal_local_metadata[uuid] = mod_metadata
+            # Track packageid -> uuid relationships for future uses
+            self.packageid_to_uuids.setdefault(packageid, set()).add(uuid)
+        self.dirty_uuids.add(uuid)
+
+    def __remove_from_packageid_index(self, packageid: str | None, uuid: str) -> None:
+        """
+        Remove a mod from packageid_to_uuids. The caller holds
+        _packageid_index_lock.
+
+        :param packageid: The packageid the mod was indexed under.
+        :param uuid: The uuid of the mod.
+        """
+        if not packageid or packageid not in self.packageid_to_uuids:
+            return
+        uuids = self.packageid_to_uuids[packageid]
+        uuids.discard(uuid)
+        if not uuids:
+            # No mod with this packageid is installed anymore
+            self.packageid_to_uuids.pop(packageid, None)
+
+    def __collect_uuids_to_compile(self, removed_uuids: set[str]) -> set[str]:
+        """
+        Resolve the dirty uuids and packageids into the set of mods to recompile,
+        and clear them.
+
+        :param removed_uuids: Previously compiled mods that no longer exist.
+        :return: The uuids of the mods to recompile.
+        """
+        compile_uuids = {
+            uuid for uuid in self.dirty_uuids if uuid in self.internal_local_metadata
+        }
+        packageids = set(self.dirty_packageids)
+        for uuid in compile_uuids | removed_uuids:
+            for packageid in (
+                self.internal_local_metadata.get(uuid, {}).get("packageid"),
+                self.compiled_packageids.get(uuid),
+            ):
+                if packageid:
+                    packageids.add(packageid)
+        for packageid in packageids:
+            compile_uuids.update(self.packageid_to_uuids.get(packageid, set()))
+            compile_uuids.update(self.referencing_uuids.get(packageid, set()))
+        compile_uuids.intersection_update(self.internal_local_metadata.keys())
+        # Mods sharing a packageid add the same reverse load rules to other mods,
+        # so they are always compiled together
+        for uuid in list(compile_uuids):
+            compile_uuids.update(
+                self.packageid_to_uuids.get(
+                    self.internal_local_metadata[uuid]["packageid"], set()
+                )
+            )
+        compile_uuids.intersection_update(self.internal_local_metadata.keys())
+        self.dirty_uuids.clear()
+        self.dirty_packageids.clear()
+        return compile_uuids
+
+    def __reset_compiled_metadata(
+        self, compile_uuids: set[str], removed_uuids: set[str]
+    ) -> None:
+        """
+        Remove the compiled keys of the mods about to be recompiled, along with the
+        reverse load rules they (or removed mods) added to other mods. Reverse load
+        rules added by mods that are not recompiled are kept.
+        """
+        source_uuids = compile_uuids | removed_uuids
+        source_packageids = {
+            packageid
+            for uuid in source_uuids
+            for packageid in (
+                self.compiled_packageids.get(uuid),
+                self.internal_local_metadata.get(uuid, {}).get("packageid"),
+            )
+            if packageid
+        }
+
+        def is_stale_rule(rule: tuple[str, bool]) -> bool:
+            return not rule[1] and rule[0] in source_packageids
+
+        # Reverse load rules only ever point at mods referenced by the source mod
+        for uuid in source_uuids:
+            for key in self.compiled_references.get(uuid, set()):
+                for target_uuid in self.packageid_to_uuids.get(key, set()):
+                    if target_uuid in compile_uuids:
+                        continue
+                    target_metadata = self.internal_local_metadata.get(target_uuid)
+                    if not target_metadata:
+                        continue
+                    for rule_key in ("loadTheseBefore", "loadTheseAfter"):
+                        rules = target_metadata.get(rule_key)
+                        if rules:
+                            rules.difference_update(
+                                [rule for rule in rules if is_stale_rule(rule)]
+                            )
+        for uuid in compile_uuids:
+            mod_metadata = self.internal_local_metadata[uuid]
+            for key in COMPILED_METADATA_KEYS:
+                if key in ("loadTheseBefore", "loadTheseAfter"):
+                    rules = mod_metadata.get(key)
+                    if rules:
+                        # Keep the reverse rules added by mods that are not recompiled
+                        rules.difference_update(
+                            [rule for rule in rules if rule[1] or is_stale_rule(rule)]
+                        )
+                else:
+                    mod_metadata.pop(key, None)
+        for uuid in removed_uuids:
+            self.parsed_metadata_fingerprints.pop(uuid, None)
+
+    def __get_steamdb_publishedfileid_index(self) -> dict[str, str]:
+        """
+        Return the SteamDB PublishedFileId -> lowercased packageid index, rebuilding
+        it (and steamdb_packageid_to_name) if the SteamDB was reloaded.
+        """
+        if (
+            self.external_steam_metadata is not None
+            and self.external_steam_metadata is not self._steamdb_index_source
+        ):
+            if isinstance(self.external_steam_metadata, (SteamDbIndex, SteamDbEntries)):
+                # Only the few entries with a "packageid" need to be decoded
+                self.steamdb_publishedfileid_to_packageid = (
+                    self.external_steam_metadata.publishedfileid_to_packageid
+                )
+                for (
+                    publishedfileid,
+                    db_packageid,
+                ) in self.steamdb_publishedfileid_to_packageid.items():
+                    self.steamdb_packageid_to_name[db_packageid] = (
+                        self.external_steam_metadata[publishedfileid].get("name")
+                    )
+            else:
+                self.steamdb_publishedfileid_to_packageid = {}
+                for publishedfileid, mod_data in self.external_steam_metadata.items():
+                    db_packageid = mod_data.get("packageid")
+                    if db_packageid:
+                        db_packageid = db_packageid.lower()  # Normalize packageid
+                        self.steamdb_publishedfileid_to_packageid[publishedfileid] = (
+                            db_packageid
+                        )
+                        self.steamdb_packageid_to_name[db_packageid] = mod_data.get(
+                            "name"
+                        )
+            self._steamdb_index_source = self.external_steam_metadata
+        return self.steamdb_publishedfileid_to_packageid
+
+    def __index_references(self, uuids: list[str], removed_uuids: set[str]) -> None:
+        """
+        Update the packageid / PublishedFileId -> referencing uuids index for
+        freshly compiled mods, and drop removed mods from it.
+        """
+        for uuid in removed_uuids | set(uuids):
+            for key in self.compiled_references.pop(uuid, set()):
+                referencing = self.referencing_uuids.get(key)
+                if referencing is not None:
+                    referencing.discard(uuid)
+                    if not referencing:
+                        del self.referencing_uuids[key]
+            self.compiled_packageids.pop(uuid, None)
+        if not uuids:
+            return
+        # Rule targets of the compiled mods, from Community Rules and User Rules
+        uuids_by_packageid: dict[str, list[str]] = {}
+        for uuid in uuids:
+            uuids_by_packageid.setdefault(
+                self.internal_local_metadata[uuid]["packageid"], []
+            ).append(uuid)
+        rule_references: dict[str, set[str]] = {}
+        for rules in (self.external_community_rules, self.external_user_rules):
+            for package_id, rule in (rules or {}).items():
+                if package_id.lower() not in uuids_by_packageid:
+                    continue
+                targets = rule_references.setdefault(package_id.lower(), set())
+                for rule_key in RULES_REFERENCE_KEYS:
+                    for referenced_id in rule.get(rule_key) or []:
+                        targets.add(str(referenced_id).lower())
+        for uuid in uuids:
+            mod_metadata = self.internal_local_metadata[uuid]
+            packageid = mod_metadata["packageid"]
+            references: set[str] = set(rule_references.get(packageid, set()))
+            for tag in ABOUT_XML_REFERENCE_TAGS:
+                collect_reference_keys(mod_metadata.get(tag), references)
+            publishedfileid = mod_metadata.get("publishedfileid")
+            if publishedfileid:
+                # Changes to the mod's own SteamDB entry, or the entries of its
+                # SteamDB dependencies, affect its compiled dependencies
+                references.add(publishedfileid)
+                steam_metadata = (self.external_steam_metadata or {}).get(
+                    publishedfileid
+                )
+                if steam_metadata and steam_metadata.get("dependencies"):
+                    references.update(steam_metadata["dependencies"].keys())
+            self.compiled_references[uuid] = references
+            self.compiled_packageids[uuid] = packageid
+            for key in references:
+                self.referencing_uuids.setdefault(key, set()).add(uuid)
 
     def is_version_mismatch(self, uuid: str) -> bool:
         """
@@ -1388,35 +1830,23 @@ class MetadataManager(QObject):
         # Return result
         return result
 
-    @lru_cache
-    def has_alternative_mod(self, uuid: str) -> ModReplacement | None:
+    def __get_use_this_instead_folder(self) -> Path | None:
         """
-        If the use has configured a "Use This Instead" database, this function checks if a given mod has
-        a recommended alternative.
-
-        If the user does not, it always returns false
+        Return the Replacements folder of the configured "Use This Instead"
+        database, or None if the user has not configured one.
         """
-
-        if (
-            self.settings_controller.settings.external_use_this_instead_metadata_source
-            == "None"
-        ):
-            return None
-
-        path: Path
-
         if (
             self.settings_controller.settings.external_use_this_instead_metadata_source
             == "Configured file path"
         ):
-            path = Path(
+            return Path(
                 self.settings_controller.settings.external_use_this_instead_folder_path
             )
         elif (
             self.settings_controller.settings.external_use_this_instead_metadata_source
             == "Configured git repository"
         ):
-            path = (
+            return (
                 AppInfo().databases_folder
                 / Path(
                     os.path.split(
@@ -1425,41 +1855,86 @@ class MetadataManager(QObject):
                 )
                 / "Replacements"
             )
-        else:
-            return None
+        return None
 
-        # At this point, path points to a directory of xml files, each named for a mod.
-        mod_data = self.internal_local_metadata.get(uuid, False)
-        if not mod_data or "publishedfileid" not in mod_data:
-            return None
+    def get_use_this_instead_index(self) -> UseThisInsteadIndex | None:
+        """
+        Return the index of the configured "Use This Instead" database, loading
+        it if the configuration or the game version changed since it was loaded.
 
-        check_path = path / Path(mod_data["publishedfileid"] + ".xml")
-        if not check_path.exists():
+        :return: The index, or None if the user has not configured a database.
+        """
+        folder = self.__get_use_this_instead_folder()
+        if folder is None:
+            self.use_this_instead_index = None
             return None
-        replacement_data = xml_path_to_json(str(check_path))["ModReplacement"]
-
-        # check if replacement supports the game version
-        try:
-            major, minor = self.game_version.split(".")[:2]
-            version_regex = rf"{major}.{minor}"
-        except Exception:
-            version_regex = None
-        if not version_regex or version_regex not in replacement_data.get(
-            "ReplacementVersions", {}
+        index = self.use_this_instead_index
+        if (
+            index is None
+            or index.folder != folder
+            or index.game_version != self.game_version
         ):
+            index = UseThisInsteadIndex(
+                folder,
+                self.game_version,
+                AppInfo().databases_folder / USE_THIS_INSTEAD_INDEX_FILE_NAME,
+            )
+            index.load()
+            self.use_this_instead_index = index
+        return index
+
+    def reset_use_this_instead_index(self) -> None:
+        """
+        Drop the loaded "Use This Instead" index, so that it is revalidated
+        against the database on next use.
+        """
+        self.use_this_instead_index = None
+
+    def has_alternative_mod(self, uuid: str) -> ModReplacement | None:
+        """
+        If the use has configured a "Use This Instead" database, this function checks if a given mod has
+        a recommended alternative.
+
+        If the user does not, it always returns None
+        """
+        index = self.get_use_this_instead_index()
+        if index is None:
             return None
 
-        return ModReplacement(
-            name=replacement_data["ReplacementName"],
-            author=replacement_data["ReplacementAuthor"],
-            pfid=replacement_data["ReplacementSteamId"],
-        )
+        mod_data = self.internal_local_metadata.get(uuid, False)
+        if not mod_data or "publishedfileid" not in mod_data:
+            return None
+        return index.get(mod_data["publishedfileid"])
 
     def process_batch(
         self,
         batch: dict[str, str],  # Batch is a mapper of mod directory <-> UUID to parse
         data_source: str,
     ) -> None:
+        with self._parse_progress_lock:
+            self._parse_total += len(batch)
+        if (
+            self.settings_controller.settings.metadata_parser_backend == "process"
+            and len(batch) >= PARSER_PROCESS_MIN_BATCH_SIZE
+        ):
+            # Mod directories whose parsed chunk was merged and reported
+            merged: set[str] = set()
+            try:
+                self.__process_batch_in_processes(
+                    batch=batch, data_source=data_source, merged=merged
+                )
+                return
+            except Exception as e:
+                logger.warning(
+                    f"[{data_source}] Process pool parsing failed, falling back to thread pool "
+                    f"for the {len(batch) - len(merged)} mods not parsed yet: {e}"
+                )
+                self.__shutdown_parser_process_pool()
+            batch = {
+                directory: uuid
+                for directory, uuid in batch.items()
+                if directory not in merged
+            }
         for directory, uuid in batch.items():
             self.process_update(
                 batch=True,
@@ -1469,6 +1944,66 @@ class MetadataManager(QObject):
                 uuid=uuid,
             )
 
+    def __process_batch_in_processes(
+        self,
+        batch: dict[str, str],  # Batch is a mapper of mod directory <-> UUID to parse
+        data_source: str,
+        merged: set[str],
+    ) -> None:
+        """
+        Parse a batch of mod directories in worker processes, then merge the
+        results into the internal metadata. Blocks until the batch is parsed.
+
+        :param batch: Mapper of mod directory <-> uuid to parse.
+        :param data_source: The data source of the mods in the batch.
+        :param merged: Filled with the mod directories of each chunk once it is
+            merged and counted, so that a failure part way only re-parses the
+            others.
+        """
+        if self._parser_process_pool is None:
+            self._parser_process_pool = ProcessPoolExecutor(
+                initializer=_init_parser_process,
+                initargs=(ProcessParserContext.from_context(self),),
+            )
+        num_workers = os.cpu_count() or 1
+        items = list(batch.items())
+        chunk_size = ceil(len(items) / (num_workers * PARSER_PROCESS_CHUNKS_PER_WORKER))
+        logger.info(
+            f"[{data_source}] Parsing {len(items)} mods with process pool in chunks of {chunk_size}"
+        )
+        futures = [
+            (
+                chunk,
+                self._parser_process_pool.submit(
+                    _parse_mod_batch_in_process,
+                    data_source,
+                    chunk,
+                    self.about_parse_cache.entries_for(path for path, _ in chunk)
+                    if self.about_parse_cache is not None
+                    else {},
+                ),
+            )
+            for chunk in chunks(items, chunk_size)
+        ]
+        for chunk, future in futures:
+            if self.refresh_cancelled:
+                future.cancel()
+                continue
+            metadata, cache_entries, hits, misses, snapshots = future.result()
+            self.directory_snapshots.update(snapshots)
+            for uuid, mod_metadata in metadata.items():
+                self.update_parsed_metadata(uuid, mod_metadata)
+            if self.about_parse_cache is not None:
+                self.about_parse_cache.merge(cache_entries, hits, misses)
+            merged.update(directory for directory, _ in chunk)
+            # Mods that failed to parse are done too, like in ModParser.run
+            self.report_parsed_mods(len(chunk))
+
+    def __shutdown_parser_process_pool(self) -> None:
+        if self._parser_process_pool is not None:
+            self._parser_process_pool.shutdown(cancel_futures=True)
+            self._parser_process_pool = None
+
     def process_creation(self, data_source: str, mod_directory: str, uuid: str) -> None:
         logger.debug(
             f"Processing creation of {data_source + ' mod' if data_source != 'expansion' else data_source} for {mod_directory}"
@@ -1486,6 +2021,7 @@ class MetadataManager(QObject):
         logger.debug(
             f"Processing deletion for {self.internal_local_metadata.get(uuid, {}).get('name', 'Unknown')}: {mod_directory}"
         )
+        self.directory_snapshots.invalidate(mod_directory)
         deleted_mod = self.internal_local_metadata.get(uuid)
         if deleted_mod is None:
             logger.debug(
@@ -1493,10 +2029,9 @@ class MetadataManager(QObject):
             )
             return
 
-        deleted_mod_packageid = deleted_mod.get("packageid")
         self.internal_local_metadata.pop(uuid, None)
-        if deleted_mod_packageid and self.packageid_to_uuids.get(deleted_mod_packageid):
-            self.packageid_to_uuids[deleted_mod_packageid].remove(uuid)
+        with self._packageid_index_lock:
+            self.__remove_from_packageid_index(deleted_mod.get("packageid"), uuid)
         self.mod_deleted_signal.emit(uuid)
 
     def process_update(
@@ -1508,6 +2043,7 @@ class MetadataManager(QObject):
         uuid: str,
     ) -> None:
         # logger.warning(exists)
+        self.directory_snapshots.invalidate(mod_directory)
         parser = ModParser(
             mod_directory=mod_directory,
             data_source=data_source,
@@ -1525,6 +2061,75 @@ class MetadataManager(QObject):
             self.compile_metadata(uuids=[uuid])
             self.mod_metadata_updated_signal.emit(uuid)
 
+    def report_parsed_mods(self, count: int) -> None:
+        """
+        Count mods parsed by the running refresh, and emit parse_progress_signal
+        every PARSE_PROGRESS_STEP mods. Safe to call from parser threads.
+
+        :param count: The number of mods that finished parsing.
+        """
+        with self._parse_progress_lock:
+            self._parsed_count += count
+            parsed, total = self._parsed_count, self._parse_total
+            if parsed < total and parsed - self._reported_parsed_count < (
+                PARSE_PROGRESS_STEP
+            ):
+                return
+            self._reported_parsed_count = parsed
+        self.parse_progress_signal.emit(parsed, total)
+
+    def cancel_refresh(self) -> None:
+        """
+        Cancel the running refresh. Mods that are not parsed yet are skipped,
+        and refresh_cache then restores the metadata of the last refresh.
+        Has no effect once the mods are parsed.
+        """
+        with self._parse_progress_lock:
+            if not self._parsing_refresh:
+                logger.info("Not cancelling refresh, the mods are already parsed")
+                return
+            logger.warning("Cancelling refresh, skipping mods that are not parsed yet")
+            self._refresh_cancelled.set()
+
+    def __save_local_metadata(self) -> LocalMetadataState:
+        with self._packageid_index_lock:
+            packageid_to_uuids = {
+                packageid: set(uuids)
+                for packageid, uuids in self.packageid_to_uuids.items()
+            }
+        return LocalMetadataState(
+            internal_local_metadata=dict(self.internal_local_metadata),
+            packageid_to_uuids=packageid_to_uuids,
+            parsed_metadata_fingerprints=dict(self.parsed_metadata_fingerprints),
+            dirty_uuids=set(self.dirty_uuids),
+            mod_metadata_file_mapper=self.mod_metadata_file_mapper,
+            mod_metadata_dir_mapper=self.mod_metadata_dir_mapper,
+            game_version=self.game_version,
+        )
+
+    def __restore_local_metadata(self, state: LocalMetadataState) -> None:
+        """
+        Restore the local metadata saved by __save_local_metadata, in place as
+        other objects hold references to it. Parser threads must be done.
+        """
+        logger.warning(
+            f"Restoring the metadata of {len(state.internal_local_metadata)} mods from before the refresh"
+        )
+        self.internal_local_metadata.clear()
+        self.internal_local_metadata.update(state.internal_local_metadata)
+        with self._packageid_index_lock:
+            self.packageid_to_uuids.clear()
+            self.packageid_to_uuids.update(state.packageid_to_uuids)
+        self.parsed_metadata_fingerprints = state.parsed_metadata_fingerprints
+        self.dirty_uuids = state.dirty_uuids
+        self.mod_metadata_file_mapper = state.mod_metadata_file_mapper
+        self.mod_metadata_dir_mapper = state.mod_metadata_dir_mapper
+        self.game_version = state.game_version
+
+    @property
+    def refresh_cancelled(self) -> bool:
+        return self._refresh_cancelled.is_set()
+
     def refresh_acf_metadata(
         self, steamclient: bool = True, steamcmd: bool = True
     ) -> None:
@@ -1556,7 +2161,7 @@ class MetadataManager(QObject):
                     f"Failed to parse SteamCMD appworkshop.acf metadata from: {self.steamcmd_wrapper.steamcmd_appworkshop_acf_path}. Error: {e}"
                 )
 
-    def refresh_cache(self, is_initial: bool = False) -> None:
+    def refresh_cache(self, is_initial: bool = False) -> bool:
         """
         This function contains expensive calculations for getting workshop
         mods, known expansions, community rules, and most importantly, calculating
@@ -1566,8 +2171,21 @@ class MetadataManager(QObject):
         and whenever the refresh button is pressed (mostly after changing the workshop
         somehow, e.g. re-setting workshop path, mods config path, or downloading another mod,
         but also after ModsConfig.xml path has been changed).
+
+        Mod parsing progress is reported through parse_progress_signal, and
+        the refresh can be cancelled with cancel_refresh while the mods are
+        parsed. A cancelled refresh keeps the metadata of the last refresh, as
+        the mods parsed so far are only part of the installed mods.
+
+        :return: False if the refresh was cancelled, else True.
         """
         logger.info("Refreshing metadata cache...")
+        self._refresh_cancelled.clear()
+        self.directory_snapshots.clear()
+        with self._parse_progress_lock:
+            self._parsed_count = 0
+            self._parse_total = 0
+            self._reported_parsed_count = 0
 
         # If we are refreshing cache from user action, update user paths as well in case of change
         if not is_initial:
@@ -1577,9 +2195,29 @@ class MetadataManager(QObject):
 
         # Populate metadata
         self.refresh_acf_metadata(steamclient=True, steamcmd=True)
-        self.__refresh_internal_metadata(is_initial=is_initial)
+        previous_metadata = self.__save_local_metadata()
+        with self._parse_progress_lock:
+            self._parsing_refresh = True
+        try:
+            self.__refresh_internal_metadata(is_initial=is_initial)
+        finally:
+            with self._parse_progress_lock:
+                self._parsing_refresh = False
+        cancelled = self.refresh_cancelled
+        # Mods parsed outside of a refresh, e.g. by the watchdog, are never skipped
+        self._refresh_cancelled.clear()
+        if cancelled:
+            self.__restore_local_metadata(previous_metadata)
+            return False
         self.__refresh_external_metadata()
-        self.compile_metadata(uuids=list(self.internal_local_metadata.keys()))
+        self.compile_metadata()
+        # Pick up changes to the "Use This Instead" database, e.g. a pulled repository
+        if (
+            self.use_this_instead_index is not None
+            and not self.use_this_instead_index.is_current()
+        ):
+            self.reset_use_this_instead_index()
+        return True
 
     def steamcmd_purge_mods(self, publishedfileids: set[str]) -> None:
         """
@@ -1658,41 +2296,28 @@ class MetadataManager(QObject):
         Returns a dict mapping mod package IDs to sets of missing dependency package IDs
         """
         missing_deps = {}
+        rule_snapshot = self.rule_snapshot.covering(
+            self.internal_local_metadata, active_mods_uuids
+        )
         active_mod_ids = {
             self.internal_local_metadata[uuid]["packageid"]
             for uuid in active_mods_uuids
         }
+        consider_alternatives = (
+            self.settings_controller.settings.consider_alternative_package_ids
+        )
 
-        # check each active mod's dependencies
+        # check each active mod's dependencies, honoring alternativePackageIds
         for uuid in active_mods_uuids:
-            mod_data = self.internal_local_metadata[uuid]
-            mod_id = mod_data["packageid"]
-
-            # get mod's dependencies
-            if mod_data.get("dependencies"):
-                # check which dependencies are missing, honoring alternativePackageIds
-                missing: set[str] = set()
-                for dep_entry in mod_data["dependencies"]:
-                    alt_ids: set[str] = set()
-                    if isinstance(dep_entry, tuple):
-                        dep_id = dep_entry[0]
-                        if (
-                            len(dep_entry) > 1
-                            and isinstance(dep_entry[1], dict)
-                            and isinstance(dep_entry[1].get("alternatives"), set)
-                        ):
-                            alt_ids = dep_entry[1]["alternatives"]
-                    else:
-                        dep_id = dep_entry
-
-                    consider_alternatives = self.settings_controller.settings.consider_alternative_package_ids
-                    satisfied = dep_id in active_mod_ids
-                    if not satisfied and consider_alternatives:
-                        satisfied = any(alt in active_mod_ids for alt in alt_ids)
-                    if not satisfied:
-                        missing.add(dep_id)
-                if missing:
-                    missing_deps[mod_id] = missing
+            mod_rules = rule_snapshot[uuid]
+            missing = {
+                dependency.package_id
+                for dependency in mod_rules.unsatisfied_dependencies(
+                    active_mod_ids, consider_alternatives
+                )
+            }
+            if missing:
+                missing_deps[mod_rules.package_id] = missing
 
         return missing_deps
 
@@ -1716,454 +2341,503 @@ class ModParser(QRunnable):
         # Set autoDelete to True
         self.setAutoDelete(True)
 
-    def __parse_mod_metadata(
-        self,
-        data_source: str,
-        mod_directory: str,
-        metadata_manager: MetadataManager,
-        uuid: str,
-    ) -> dict[str, Any]:
-        logger.debug(f"Parsing [{data_source}] directory: {mod_directory}")
-        metadata = {}
-        # Populate a UUID for the directory we are populating - re-use the same UUID
-        # if passed as the "data_source" parameter for single-mod updates
-        uuid = uuid
-        directory_path = Path(mod_directory)
-        directory_name = str(directory_path.name)
-        # Use this to trigger invalid clause intentionally, i.e. when handling exceptions
-        data_malformed = None
-        # Any pfid parsed will be stored here locally
-        pfid = None
-        # Define defaults for scenario
-        scenario_rsc_found = False
-        scenario_rsc_file = ""
-        scenario_data = {}
-        scenario_metadata = {}
-        # Define defaults for "About" folder and "About.xml" file
-        invalid_about_folder_path_found = True
-        invalid_about_file_path_found = True
-        about_folder_name = "About"
-        about_file_name = "About.xml"
-        # Look for a case-insensitive "About" folder
-        for temp_file in os.scandir(mod_directory):
-            if (
-                temp_file.name.lower() == about_folder_name.lower()
-                and temp_file.is_dir()
+    def run(self) -> None:
+        if self.metadata_manager.refresh_cancelled:
+            return
+        try:
+            mod_metadata = parse_mod_metadata(
+                self.data_source, self.mod_directory, self.metadata_manager, self.uuid
+            )
+            self.metadata_manager.update_parsed_metadata(
+                self.uuid, mod_metadata[self.uuid]
+            )
+        except Exception as e:
+            error_message = f"{type(e).__name__}: {str(e)}\n{traceback.format_exc()}"
+            logger.error(f"ERROR: Unable to initialize ModParser {error_message}")
+        self.metadata_manager.report_parsed_mods(1)
+
+
+def _read_about_xml_fallback(mod_data_path: str) -> dict[str, Any] | None:
+    """
+    Parse an About.xml file with the generic (and more lenient) XML parser.
+
+    :param mod_data_path: Path to the About.xml file.
+    :return: Metadata dict with lowercased keys, or None if the file is malformed.
+    """
+    try:
+        # Try to parse .xml
+        mod_data = xml_path_to_json(mod_data_path)
+    except Exception:
+        # If there was an issue parsing the .xml, track and exit
+        logger.error(
+            f"Unable to parse {Path(mod_data_path).name} with the exception: {traceback.format_exc()}"
+        )
+        return None
+    # Case-insensitive `ModMetaData` key.
+    mod_data = {k.lower(): v for k, v in mod_data.items()}
+    if not mod_data.get("modmetadata"):
+        logger.error(f"Key <modmetadata> does not exist in this data: {mod_data}")
+        return None
+    # Case-insensitive metadata keys, rename author tag appropriately to normalize
+    # it in usage and lookups
+    mod_metadata = {}
+    for key, value in mod_data["modmetadata"].items():
+        key = key.lower()
+        mod_metadata["authors" if key == "author" else key] = value
+    return mod_metadata
+
+
+def read_about_xml(mod_data_path: str) -> dict[str, Any] | None:
+    """
+    Parse and normalize an About.xml file.
+
+    Only normalization that depends on the file contents alone happens here,
+    so that the result can be stored in the persistent About.xml parse cache.
+
+    :param mod_data_path: Path to the About.xml file.
+    :return: Normalized metadata dict, or None if the file is malformed.
+    """
+    try:
+        mod_metadata = extract_about_xml_metadata(mod_data_path)
+    except (etree.LxmlError, OSError) as e:
+        # Malformed XML, retry with the more lenient generic parser
+        logger.debug(f"Falling back to generic XML parser for {mod_data_path}: {e}")
+        mod_metadata = _read_about_xml_fallback(mod_data_path)
+    if mod_metadata is None:
+        return None
+    # Make sure <supportedversions> or <targetversion> is correct format
+    if mod_metadata.get("supportedversions") and not isinstance(
+        mod_metadata.get("supportedversions"), dict
+    ):
+        logger.error(
+            f"About.xml syntax error. Unable to read <supportedversions> tag from XML: {mod_data_path}"
+        )
+        mod_metadata.pop("supportedversions", None)
+
+    if mod_metadata.get("supportedversions", {}).get("li"):
+        li = mod_metadata["supportedversions"]["li"]
+        if isinstance(li, str):
+            mod_metadata["supportedversions"]["li"] = li.strip()
+        elif isinstance(li, list):
+            for i, version in enumerate(li):
+                if not isinstance(version, str):
+                    logger.error(f"Failed to parse {version} as a string")
+                    continue
+                li[i] = version.strip()
+
+    if mod_metadata.get("targetversion"):
+        mod_metadata["targetversion"] = mod_metadata["targetversion"]
+        mod_metadata["targetversion"] = (
+            ".".join(mod_metadata["targetversion"].split(".")[:2])
+            if mod_metadata["targetversion"].count(".") > 1
+            and isinstance(mod_metadata["targetversion"], str)
+            else mod_metadata["targetversion"]
+        )
+    # If we parsed a packageid from modmetadata...
+    if mod_metadata.get("packageid"):
+        # ...check type of packageid, use first packageid parsed
+        if isinstance(mod_metadata["packageid"], list):
+            # Loop through the list and find str. If we find one, use it.
+            for potential_packageid in mod_metadata["packageid"]:
+                if potential_packageid and isinstance(potential_packageid, str):
+                    mod_metadata["packageid"] = potential_packageid
+                    break
+        # Normalize package ID in metadata
+        if isinstance(mod_metadata["packageid"], str):
+            mod_metadata["packageid"] = mod_metadata["packageid"].lower()
+        else:
+            mod_metadata["packageid"] = "packageid error in mod about.xml"
+    return mod_metadata
+
+
+def parse_mod_metadata(
+    data_source: str,
+    mod_directory: str,
+    context: ModParserContext,
+    uuid: str,
+) -> dict[str, Any]:
+    """
+    Parse the metadata of a single mod directory.
+
+    :param data_source: The data source of the mod ("expansion", "local" or "workshop").
+    :param mod_directory: The mod directory to parse.
+    :param context: Steam DB / ACF data and parse cache used to supplement the metadata.
+    :param uuid: The uuid to assign to the parsed metadata.
+    :return: A dict mapping the uuid to the parsed metadata.
+    """
+    logger.debug(f"Parsing [{data_source}] directory: {mod_directory}")
+    metadata = {}
+    # Populate a UUID for the directory we are populating - re-use the same UUID
+    # if passed as the "data_source" parameter for single-mod updates
+    uuid = uuid
+    directory_path = Path(mod_directory)
+    directory_name = str(directory_path.name)
+    # Use this to trigger invalid clause intentionally, i.e. when handling exceptions
+    data_malformed = None
+    # Any pfid parsed will be stored here locally
+    pfid = None
+    # Define defaults for scenario
+    scenario_rsc_found = False
+    scenario_rsc_file = ""
+    scenario_data = {}
+    scenario_metadata = {}
+    # Scan the mod directory (or reuse this refresh's scan of it) for a
+    # case-insensitive "About" folder, its "About.xml" and "PublishedFileId.txt"
+    # files, and .rsc scenario files
+    snapshot = (
+        context.directory_snapshots.get(mod_directory)
+        if context.directory_snapshots is not None
+        else scan_mod_directory(mod_directory)
+    )
+    if snapshot is None:
+        raise OSError(f"Unable to scan mod directory: {mod_directory}")
+    about_file_entry = snapshot.about_file
+    pfid_file_entry = snapshot.published_file_id_file
+    invalid_about_file_path_found = about_file_entry is None
+    # Load metadata from .rsc scenario files if we didn't find About.xml
+    if invalid_about_file_path_found and snapshot.rsc_file is not None:
+        scenario_rsc_file = snapshot.rsc_file
+        scenario_rsc_found = True
+    # Check the persistent parse cache before touching About.xml / PublishedFileId.txt
+    parse_cache = context.about_parse_cache
+    cache_entry = None
+    fingerprint = None
+    if about_file_entry is not None and parse_cache is not None:
+        fingerprint = about_fingerprint(
+            about_file_entry.stat,
+            pfid_file_entry.stat if pfid_file_entry is not None else None,
+        )
+        cache_entry = parse_cache.get(mod_directory, fingerprint)
+    # Read PublishedFileId.txt contents, unless the cache already has them
+    pfid_from_file = None
+    if cache_entry is not None:
+        pfid_from_file = cache_entry.pfid
+    elif pfid_file_entry is not None:
+        try:
+            with open(pfid_file_entry.path, encoding="utf-8-sig") as pfid_file:
+                pfid_from_file = pfid_file.read().strip()
+        except Exception:
+            logger.error(f"Failed to read pfid from {pfid_file_entry.path}")
+    # If a mod's folder name is a valid PublishedFileId in SteamDB
+    if (
+        context.external_steam_metadata
+        and directory_name in context.external_steam_metadata.keys()
+    ):
+        pfid = directory_name
+    # ...otherwise use the pfid from PublishedFileId.txt if we found one
+    elif pfid_from_file is not None:
+        pfid = pfid_from_file
+    # If we were able to find an About.xml, populate mod data...
+    if about_file_entry is not None:
+        mod_data_path = about_file_entry.path
+        if cache_entry is not None:
+            mod_metadata = cache_entry.metadata
+        else:
+            logger.debug(f"Found mod metadata at: {mod_data_path}")
+            mod_metadata = read_about_xml(mod_data_path)
+            if parse_cache is not None and fingerprint is not None:
+                parse_cache.put(
+                    mod_directory, fingerprint, mod_metadata, pfid_from_file
+                )
+        if mod_metadata is None:
+            data_malformed = True
+        else:
+            if (  # If we don't have a <name>
+                not mod_metadata.get("name")
+                and context.external_steam_metadata  # ... try to find it in Steam DB
+                and pfid
+                and context.external_steam_metadata.get(pfid, {}).get("steamName")
             ):
-                about_folder_name = temp_file.name
-                invalid_about_folder_path_found = False
-                break
-            # Look for a case-insensitive "About.xml" file
-        if not invalid_about_folder_path_found:
-            for temp_file in os.scandir(str((directory_path / about_folder_name))):
+                mod_metadata.setdefault(
+                    "name",
+                    context.external_steam_metadata[pfid]["steamName"],
+                )
+                # This is so that DB builder shows we do not have local metadata
+                mod_metadata.setdefault("DB_BUILDER_NO_NAME", True)
+            else:
+                mod_metadata.setdefault("name", "Missing XML: <name>")
+            # If we didn't parse a packageid from About.xml, we can check Steam DB...
+            # ...this can be needed if a mod depends on a RW generated packageid via built-in hashing mechanism.
+            if not mod_metadata.get("packageid"):
                 if (
-                    temp_file.name.lower() == about_file_name.lower()
-                    and temp_file.is_file()
+                    pfid
+                    and context.external_steam_metadata
+                    and context.external_steam_metadata.get(pfid, {}).get("packageId")
                 ):
-                    about_file_name = temp_file.name
-                    invalid_about_file_path_found = False
-                    break
-        # Look for .rsc scenario files to load metadata from if we didn't find About.xml
-        if invalid_about_file_path_found:
-            for temp_file in os.scandir(mod_directory):
-                if temp_file.name.lower().endswith(".rsc") and not temp_file.is_dir():
-                    scenario_rsc_file = temp_file.name
-                    scenario_rsc_found = True
-                    break
-        # If a mod's folder name is a valid PublishedFileId in SteamDB
-        if (
-            self.metadata_manager.external_steam_metadata
-            and directory_name in self.metadata_manager.external_steam_metadata.keys()
-        ):
-            pfid = directory_name
-        # Look for a case-insensitive "PublishedFileId.txt" file if we didn't find a pfid
-        elif not pfid and not invalid_about_folder_path_found:
-            pfid_file_name = "PublishedFileId.txt"
-            for temp_file in os.scandir(str((directory_path / about_folder_name))):
+                    mod_metadata["packageid"] = context.external_steam_metadata[pfid][
+                        "packageId"
+                    ].lower()
+                else:
+                    mod_metadata.setdefault("packageid", "missing.packageid")
+            # Track pfid if we parsed one earlier
+            if pfid:  # Make some assumptions if we have a pfid
+                mod_metadata["publishedfileid"] = pfid
+                mod_metadata["steam_uri"] = f"steam://url/CommunityFilePage/{pfid}"
+                mod_metadata["steam_url"] = (
+                    f"https://steamcommunity.com/sharedfiles/filedetails/?id={pfid}"
+                )
+            # If a mod contains C# assemblies, we want to tag the mod
+            if snapshot.has_csharp_assemblies():
+                mod_metadata["csharp"] = True
+            # data_source will be used with setIcon later
+            mod_metadata["data_source"] = data_source
+            mod_metadata["folder"] = directory_name
+            # This is overwritten if acf data is parsed for Steam/SteamCMD mods
+            mod_metadata["internal_time_touched"] = snapshot.mtime
+            mod_metadata["path"] = mod_directory
+            mod_metadata["metadata_file_mtime"] = int(about_file_entry.stat.st_mtime)
+            mod_metadata["metadata_file_path"] = mod_data_path
+            # Grab our mod's publishedfileid
+            publishedfileid = mod_metadata.get("publishedfileid")
+            if publishedfileid:
+                # Get our metadata based on data source
+                workshop_acf_data = (
+                    context.workshop_acf_data
+                    if data_source == "workshop"
+                    else context.steamcmd_acf_data
+                )
+                workshop_item_details = workshop_acf_data.get("AppWorkshop", {}).get(
+                    "WorkshopItemDetails", {}
+                )
+                workshop_items_installed = workshop_acf_data.get("AppWorkshop", {}).get(
+                    "WorkshopItemsInstalled", {}
+                )
+                # Edit our metadata, append values
                 if (
-                    temp_file.name.lower() == pfid_file_name.lower()
-                    and temp_file.is_file()
-                ):
-                    pfid_file_name = temp_file.name
-                    pfid_path = str(
-                        (directory_path / about_folder_name / pfid_file_name)
+                    workshop_item_details.get(publishedfileid, {}).get("timetouched")
+                    and workshop_item_details.get(publishedfileid, {}).get(
+                        "timetouched"
                     )
-                    try:
-                        with open(pfid_path, encoding="utf-8-sig") as pfid_file:
-                            pfid = pfid_file.read()
-                            pfid = pfid.strip()
-                    except Exception:
-                        logger.error(f"Failed to read pfid from {pfid_path}")
-                    break
-        # If we were able to find an About.xml, populate mod data...
-        if not invalid_about_file_path_found:
-            mod_data_path = str((directory_path / about_folder_name / about_file_name))
-            logger.debug(f"Found mod metadata at: {mod_data_path}")
-            mod_data = {}
-            try:
-                # Try to parse .xml
-                mod_data = xml_path_to_json(mod_data_path)
-            except Exception:
-                # If there was an issue parsing the .xml, track and exit
-                logger.error(
-                    f"Unable to parse {about_file_name} with the exception: {traceback.format_exc()}"
-                )
-                data_malformed = True
-            else:
-                # Case-insensitive `ModMetaData` key.
-                mod_data = {k.lower(): v for k, v in mod_data.items()}
-                if mod_data.get("modmetadata"):
-                    # Initialize our dict from the formatted About.xml metadata
-                    mod_metadata = mod_data["modmetadata"]
-                    # Case-insensitive metadata keys
-                    mod_metadata = {k.lower(): v for k, v in mod_metadata.items()}
-                    if (  # If we don't have a <name>
-                        not mod_metadata.get("name")
-                        and self.metadata_manager.external_steam_metadata  # ... try to find it in Steam DB
-                        and pfid
-                        and self.metadata_manager.external_steam_metadata.get(
-                            pfid, {}
-                        ).get("steamName")
-                    ):
-                        mod_metadata.setdefault(
-                            "name",
-                            self.metadata_manager.external_steam_metadata[pfid][
-                                "steamName"
-                            ],
-                        )
-                        # This is so that DB builder shows we do not have local metadata
-                        mod_metadata.setdefault("DB_BUILDER_NO_NAME", True)
-                    else:
-                        mod_metadata.setdefault("name", "Missing XML: <name>")
-                    # Rename author tag appropriately to normalize it in usage and lookups
-                    mod_metadata = {
-                        ("authors" if key.lower() == "author" else key): value
-                        for key, value in mod_metadata.items()
-                    }
-                    # Make sure <supportedversions> or <targetversion> is correct format
-                    if mod_metadata.get("supportedversions") and not isinstance(
-                        mod_metadata.get("supportedversions"), dict
-                    ):
-                        logger.error(
-                            f"About.xml syntax error. Unable to read <supportedversions> tag from XML: {mod_data_path}"
-                        )
-                        mod_metadata.pop("supportedversions", None)
-                    elif mod_data.get("supportedversions", {}).get("li"):
-                        if isinstance(mod_data["supportedversions"]["li"], str):
-                            mod_data["supportedversions"]["li"] = (
-                                ".".join(
-                                    mod_data["supportedversions"]["li"].split(".")[:2]
-                                )
-                                if mod_data["supportedversions"]["li"].count(".") > 1
-                                else mod_data["supportedversions"]["li"]
-                            )
-                        elif isinstance(mod_data["supportedversions"]["li"], list):
-                            for mod_data["supportedversions"]["li"] in mod_data[
-                                "supportedversions"
-                            ]["li"]:
-                                li = mod_data["supportedversions"]["li"]
-                                if not isinstance(li, str):
-                                    logger.error(f"Failed to parse {li} as a string")
-                                    continue
-                                mod_data["supportedversions"]["li"] = (
-                                    ".".join(li.split(".")[:2])
-                                    if li.count(".") > 1 and isinstance(li, str)
-                                    else li
-                                )
-
-                    if mod_metadata.get("supportedversions", {}).get("li"):
-                        li = mod_metadata["supportedversions"]["li"]
-                        if isinstance(li, str):
-                            mod_metadata["supportedversions"]["li"] = li.strip()
-                        elif isinstance(li, list):
-                            for i, version in enumerate(li):
-                                if not isinstance(version, str):
-                                    logger.error(
-                                        f"Failed to parse {version} as a string"
-                                    )
-                                    continue
-                                li[i] = version.strip()
-
-                    if mod_metadata.get("targetversion"):
-                        mod_metadata["targetversion"] = mod_metadata["targetversion"]
-                        mod_metadata["targetversion"] = (
-                            ".".join(mod_metadata["targetversion"].split(".")[:2])
-                            if mod_metadata["targetversion"].count(".") > 1
-                            and isinstance(mod_metadata["targetversion"], str)
-                            else mod_metadata["targetversion"]
-                        )
-                    # If we parsed a packageid from modmetadata...
-                    if mod_metadata.get("packageid"):
-                        # ...check type of packageid, use first packageid parsed
-                        if isinstance(mod_metadata["packageid"], list):
-                            # Loop through the list and find str. If we find one, use it.
-                            for potential_packageid in mod_metadata["packageid"]:
-                                if potential_packageid and isinstance(
-                                    potential_packageid, str
-                                ):
-                                    mod_metadata["packageid"] = potential_packageid
-                                    break
-                        # Normalize package ID in metadata
-                        if isinstance(mod_metadata["packageid"], str):
-                            mod_metadata["packageid"] = mod_metadata[
-                                "packageid"
-                            ].lower()
-                        else:
-                            mod_metadata["packageid"] = (
-                                "packageid error in mod about.xml"
-                            )
-                    else:  # ...otherwise, we don't have one from About.xml, and we can check Steam DB...
-                        # ...this can be needed if a mod depends on a RW generated packageid via built-in hashing mechanism.
-                        if (
-                            pfid
-                            and self.metadata_manager.external_steam_metadata
-                            and self.metadata_manager.external_steam_metadata.get(
-                                pfid, {}
-                            ).get("packageId")
-                        ):
-                            mod_metadata["packageid"] = (
-                                self.metadata_manager.external_steam_metadata[pfid][
-                                    "packageId"
-                                ].lower()
-                            )
-                        else:
-                            mod_metadata.setdefault("packageid", "missing.packageid")
-                    # Track pfid if we parsed one earlier
-                    if pfid:  # Make some assumptions if we have a pfid
-                        mod_metadata["publishedfileid"] = pfid
-                        mod_metadata["steam_uri"] = (
-                            f"steam://url/CommunityFilePage/{pfid}"
-                        )
-                        mod_metadata["steam_url"] = (
-                            f"https://steamcommunity.com/sharedfiles/filedetails/?id={pfid}"
-                        )
-                    # If a mod contains C# assemblies, we want to tag the mod
-                    assemblies_path = str(directory_path / "Assemblies")
-                    # Check if the 'Assemblies' directory exists and is a directory
-                    if os.path.exists(assemblies_path) and os.path.isdir(
-                        assemblies_path
-                    ):
-                        try:
-                            # Check if there are any .dll files in the 'Assemblies' directory
-                            if any(
-                                filename.endswith((".dll", ".DLL"))
-                                for filename in os.listdir(assemblies_path)
-                            ):
-                                mod_metadata["csharp"] = (
-                                    True  # Tag the mod as containing C# code
-                                )
-                        except Exception as e:
-                            logger.error(
-                                f"Failed to list directory {assemblies_path}: {e}"
-                            )
-                    else:
-                        # If no 'Assemblies' directory in the main folder, check in subfolders
-                        subfolder_paths = [
-                            str(directory_path / folder)
-                            for folder in os.listdir(mod_directory)
-                            if os.path.isdir(str(directory_path / folder))
-                        ]
-                        for subfolder_path in subfolder_paths:
-                            assemblies_path = str(Path(subfolder_path) / "Assemblies")
-                            # Check if the 'Assemblies' directory exists in the subfolder
-                            if os.path.exists(assemblies_path):
-                                # Check if there are any .dll files in this 'Assemblies' directory
-                                if any(
-                                    filename.endswith((".dll", ".DLL"))
-                                    for filename in os.listdir(assemblies_path)
-                                ):
-                                    mod_metadata["csharp"] = (
-                                        True  # Tag the mod as containing C# code
-                                    )
-                    # data_source will be used with setIcon later
-                    mod_metadata["data_source"] = data_source
-                    mod_metadata["folder"] = directory_name
-                    # This is overwritten if acf data is parsed for Steam/SteamCMD mods
+                    != 0
+                ):
+                    # The last time SteamCMD/Steam client touched a mod according to its entry
                     mod_metadata["internal_time_touched"] = int(
-                        os.path.getmtime(mod_directory)
+                        workshop_item_details[publishedfileid]["timetouched"]
                     )
-                    mod_metadata["path"] = mod_directory
-                    mod_metadata["metadata_file_mtime"] = int(
-                        os.path.getmtime(mod_data_path)
+                if publishedfileid and workshop_item_details.get(
+                    publishedfileid, {}
+                ).get("timeupdated"):
+                    # The last time SteamCMD/Steam client updated a mod according to its entry
+                    mod_metadata["internal_time_updated"] = int(
+                        workshop_item_details[publishedfileid]["timeupdated"]
                     )
-                    mod_metadata["metadata_file_path"] = mod_data_path
-                    # Grab our mod's publishedfileid
-                    publishedfileid = mod_metadata.get("publishedfileid")
-                    if publishedfileid:
-                        # Get our metadata based on data source
-                        workshop_acf_data = (
-                            self.metadata_manager.workshop_acf_data
-                            if data_source == "workshop"
-                            else self.metadata_manager.steamcmd_acf_data
-                        )
-                        workshop_item_details = workshop_acf_data.get(
-                            "AppWorkshop", {}
-                        ).get("WorkshopItemDetails", {})
-                        workshop_items_installed = workshop_acf_data.get(
-                            "AppWorkshop", {}
-                        ).get("WorkshopItemsInstalled", {})
-                        # Edit our metadata, append values
-                        if (
-                            workshop_item_details.get(publishedfileid, {}).get(
-                                "timetouched"
-                            )
-                            and workshop_item_details.get(publishedfileid, {}).get(
-                                "timetouched"
-                            )
-                            != 0
-                        ):
-                            # The last time SteamCMD/Steam client touched a mod according to its entry
-                            mod_metadata["internal_time_touched"] = int(
-                                workshop_item_details[publishedfileid]["timetouched"]
-                            )
-                        if publishedfileid and workshop_item_details.get(
-                            publishedfileid, {}
-                        ).get("timeupdated"):
-                            # The last time SteamCMD/Steam client updated a mod according to its entry
-                            mod_metadata["internal_time_updated"] = int(
-                                workshop_item_details[publishedfileid]["timeupdated"]
-                            )
-                        if publishedfileid and workshop_items_installed.get(
-                            publishedfileid, {}
-                        ).get("timeupdated"):
-                            # The last time SteamCMD/Steam client updated a mod according to its entry
-                            mod_metadata["internal_time_updated"] = int(
-                                workshop_items_installed[publishedfileid]["timeupdated"]
-                            )
-                    # Assign our metadata to the UUID
-                    metadata[uuid] = mod_metadata
-                else:
-                    logger.error(
-                        f"Key <modmetadata> does not exist in this data: {mod_data}"
+                if publishedfileid and workshop_items_installed.get(
+                    publishedfileid, {}
+                ).get("timeupdated"):
+                    # The last time SteamCMD/Steam client updated a mod according to its entry
+                    mod_metadata["internal_time_updated"] = int(
+                        workshop_items_installed[publishedfileid]["timeupdated"]
                     )
-                    data_malformed = True
-        # ...or, if we didn't find an About.xml, but we have a RimWorld scenario .rsc to parse...
-        elif invalid_about_file_path_found and scenario_rsc_found:
-            scenario_data_path = str((directory_path / scenario_rsc_file))
-            logger.debug(f"Found scenario metadata at: {scenario_data_path}")
-            try:
-                # Try to parse .rsc
-                scenario_data = xml_path_to_json(scenario_data_path)
-            except Exception:
-                # If there was an issue parsing the .rsc, track and exit
-                logger.error(
-                    f"Unable to parse {scenario_rsc_file} with the exception: {traceback.format_exc()}"
-                )
-                data_malformed = True
-            else:
-                # Case-insensitive `savedscenario` key.
-                scenario_data = {k.lower(): v for k, v in scenario_data.items()}
-                if scenario_data.get("savedscenario", {}).get(
-                    "scenario"
-                ):  # If our .rsc metadata has a packageid key
-                    # Initialize our dict from the formatted .rsc metadata
-                    scenario_metadata = scenario_data["savedscenario"]["scenario"]
-                    # Case-insensitive keys.
-                    scenario_metadata = {
-                        k.lower(): v for k, v in scenario_metadata.items()
+            # Assign our metadata to the UUID
+            metadata[uuid] = mod_metadata
+    # ...or, if we didn't find an About.xml, but we have a RimWorld scenario .rsc to parse...
+    elif invalid_about_file_path_found and scenario_rsc_found:
+        scenario_data_path = str((directory_path / scenario_rsc_file))
+        logger.debug(f"Found scenario metadata at: {scenario_data_path}")
+        try:
+            # Try to parse .rsc
+            scenario_data = xml_path_to_json(scenario_data_path)
+        except Exception:
+            # If there was an issue parsing the .rsc, track and exit
+            logger.error(
+                f"Unable to parse {scenario_rsc_file} with the exception: {traceback.format_exc()}"
+            )
+            data_malformed = True
+        else:
+            # Case-insensitive `savedscenario` key.
+            scenario_data = {k.lower(): v for k, v in scenario_data.items()}
+            if scenario_data.get("savedscenario", {}).get(
+                "scenario"
+            ):  # If our .rsc metadata has a packageid key
+                # Initialize our dict from the formatted .rsc metadata
+                scenario_metadata = scenario_data["savedscenario"]["scenario"]
+                # Case-insensitive keys.
+                scenario_metadata = {k.lower(): v for k, v in scenario_metadata.items()}
+                scenario_metadata.setdefault("packageid", "scenario.rsc")
+                scenario_metadata["scenario"] = True
+                scenario_metadata.pop("playerfaction", None)
+                scenario_metadata.pop("parts", None)
+                if scenario_data["savedscenario"].get("meta", {}).get("gameVersion"):
+                    scenario_metadata["supportedversions"] = {
+                        "li": scenario_data["savedscenario"]["meta"]["gameVersion"]
                     }
-                    scenario_metadata.setdefault("packageid", "scenario.rsc")
-                    scenario_metadata["scenario"] = True
-                    scenario_metadata.pop("playerfaction", None)
-                    scenario_metadata.pop("parts", None)
-                    if (
-                        scenario_data["savedscenario"]
-                        .get("meta", {})
-                        .get("gameVersion")
-                    ):
-                        scenario_metadata["supportedversions"] = {
-                            "li": scenario_data["savedscenario"]["meta"]["gameVersion"]
-                        }
-                    else:
-                        logger.warning(
-                            f"Unable to parse [gameversion] from this scenario [meta] tag: {scenario_data}"
-                        )
-                    # Track pfid if we parsed one earlier and don't already have one from metadata
-                    if pfid and not scenario_data.get("publishedfileid"):
-                        scenario_data["publishedfileid"] = pfid
-                    if scenario_metadata.get(
-                        "publishedfileid"
-                    ):  # Make some assumptions if we have a pfid
-                        scenario_metadata["steam_uri"] = (
-                            f"steam://url/CommunityFilePage/{pfid}"
-                        )
-                        scenario_metadata["steam_url"] = (
-                            f"https://steamcommunity.com/sharedfiles/filedetails/?id={pfid}"
-                        )
-                    # data_source will be used with setIcon later
-                    scenario_metadata["data_source"] = data_source
-                    scenario_metadata["folder"] = directory_name
-                    scenario_metadata["path"] = mod_directory
-                    # This is overwritten if acf data is parsed for Steam/SteamCMD mods
-                    scenario_metadata["internal_time_touched"] = int(
-                        os.path.getmtime(mod_directory)
+                else:
+                    logger.warning(
+                        f"Unable to parse [gameversion] from this scenario [meta] tag: {scenario_data}"
                     )
-                    scenario_metadata["metadata_file_path"] = scenario_data_path
-                    scenario_metadata["metadata_file_mtime"] = int(
-                        os.path.getmtime(scenario_data_path)
+                # Track pfid if we parsed one earlier and don't already have one from metadata
+                if pfid and not scenario_data.get("publishedfileid"):
+                    scenario_data["publishedfileid"] = pfid
+                if scenario_metadata.get(
+                    "publishedfileid"
+                ):  # Make some assumptions if we have a pfid
+                    scenario_metadata["steam_uri"] = (
+                        f"steam://url/CommunityFilePage/{pfid}"
                     )
-                    # Track source & uuid in case metadata becomes detached
-                    scenario_metadata["uuid"] = uuid
-                    # Assign our metadata to the UUID
-                    metadata[uuid] = scenario_metadata
-                else:
-                    logger.error(
-                        f"Key <savedscenario><scenario> does not exist in this data: {scenario_metadata}"
+                    scenario_metadata["steam_url"] = (
+                        f"https://steamcommunity.com/sharedfiles/filedetails/?id={pfid}"
                     )
-                    data_malformed = True
-        if (
-            (invalid_about_file_path_found and not scenario_rsc_found) or data_malformed
-        ):  # ...finally, if we don't have any metadata parsed, populate invalid mod entry for visibility
-            logger.debug(
-                f"Invalid dir. Populating invalid mod for path: {mod_directory}"
-            )
-            # Assign our metadata to the UUID
-            metadata[uuid] = {
-                "invalid": True,
-                "name": "Invalid item",
-                "packageid": "invalid.item",
-                "authors": "Not found",
-                "description": (
-                    "This mod is considered invalid by RimSort (and the RimWorld game)."
-                    + "\n\nThis mod does NOT contain an ./About/About.xml and is likely leftover from previous usage."
-                    + "\n\nThis can happen sometimes with Steam mods if there are leftover .dds textures or unexpected data."
-                ),
-                "data_source": data_source,
-                "folder": directory_name,
-                "path": mod_directory,
+                # data_source will be used with setIcon later
+                scenario_metadata["data_source"] = data_source
+                scenario_metadata["folder"] = directory_name
+                scenario_metadata["path"] = mod_directory
                 # This is overwritten if acf data is parsed for Steam/SteamCMD mods
-                "internal_time_touched": int(os.path.getmtime(mod_directory)),
-                "uuid": uuid,
+                scenario_metadata["internal_time_touched"] = snapshot.mtime
+                scenario_metadata["metadata_file_path"] = scenario_data_path
+                scenario_metadata["metadata_file_mtime"] = int(
+                    os.path.getmtime(scenario_data_path)
+                )
+                # Track source & uuid in case metadata becomes detached
+                scenario_metadata["uuid"] = uuid
+                # Assign our metadata to the UUID
+                metadata[uuid] = scenario_metadata
+            else:
+                logger.error(
+                    f"Key <savedscenario><scenario> does not exist in this data: {scenario_metadata}"
+                )
+                data_malformed = True
+    if (
+        (invalid_about_file_path_found and not scenario_rsc_found) or data_malformed
+    ):  # ...finally, if we don't have any metadata parsed, populate invalid mod entry for visibility
+        logger.debug(f"Invalid dir. Populating invalid mod for path: {mod_directory}")
+        # Assign our metadata to the UUID
+        metadata[uuid] = {
+            "invalid": True,
+            "name": "Invalid item",
+            "packageid": "invalid.item",
+            "authors": "Not found",
+            "description": (
+                "This mod is considered invalid by RimSort (and the RimWorld game)."
+                + "\n\nThis mod does NOT contain an ./About/About.xml and is likely leftover from previous usage."
+                + "\n\nThis can happen sometimes with Steam mods if there are leftover .dds textures or unexpected data."
+            ),
+            "data_source": data_source,
+            "folder": directory_name,
+            "path": mod_directory,
+            # This is overwritten if acf data is parsed for Steam/SteamCMD mods
+            "internal_time_touched": snapshot.mtime,
+            "uuid": uuid,
+        }
+        if pfid:
+            metadata[uuid].update({"publishedfileid": pfid})
+    # Additional checks for local mods
+    if data_source == "local":
+        local_mod_metadata = metadata[uuid]
+        # Check for git repository inside local mods, tag appropriately
+        if ".git" in snapshot.names:
+            local_mod_metadata["git_repo"] = True
+        # Check for local mods that are SteamCMD mods, tag appropriately
+        if local_mod_metadata.get("folder") == local_mod_metadata.get(
+            "publishedfileid"
+        ):
+            local_mod_metadata["steamcmd"] = True
+    return metadata
+
+
+# Mod directory batches smaller than this are always parsed on the thread pool,
+# as the cost of starting worker processes outweighs the parallel speedup
+PARSER_PROCESS_MIN_BATCH_SIZE = 64
+# Number of chunks submitted per worker process, to balance uneven parse times
+PARSER_PROCESS_CHUNKS_PER_WORKER = 4
+# parse_progress_signal is emitted once every this many parsed mods
+PARSE_PROGRESS_STEP = 25
+
+
+@dataclass
+class ProcessParserContext:
+    """
+    Picklable copy of the MetadataManager state read by mod parsers, handed to
+    parser worker processes once when the process pool starts.
+    """
+
+    external_steam_metadata: MutableMapping[str, Any] | None
+    workshop_acf_data: dict[str, Any]
+    steamcmd_acf_data: dict[str, Any]
+    about_parse_cache: AboutXmlParseCache | None = None
+    directory_snapshots: DirectorySnapshots | None = None
+
+    @classmethod
+    def from_context(cls, context: ModParserContext) -> "ProcessParserContext":
+        """
+        Create a worker context from a parser context, keeping only the Steam DB
+        fields used while parsing to reduce the amount of data to pickle.
+        """
+        external_steam_metadata: MutableMapping[str, Any] | None = None
+        if isinstance(context.external_steam_metadata, SteamDbIndex):
+            # The index is pickled by path and memory-mapped again by the workers
+            external_steam_metadata = context.external_steam_metadata
+        elif context.external_steam_metadata is not None:
+            external_steam_metadata = {
+                pfid: {
+                    key: value
+                    for key, value in entry.items()
+                    if key in ("steamName", "packageId")
+                }
+                for pfid, entry in context.external_steam_metadata.items()
             }
-            if pfid:
-                metadata[uuid].update({"publishedfileid": pfid})
-        # Additional checks for local mods
-        if data_source == "local":
-            local_mod_metadata = metadata[uuid]
-            # Check for git repository inside local mods, tag appropriately
-            if os.path.exists(str((directory_path / ".git"))):
-                local_mod_metadata["git_repo"] = True
-            # Check for local mods that are SteamCMD mods, tag appropriately
-            if local_mod_metadata.get("folder") == local_mod_metadata.get(
-                "publishedfileid"
-            ):
-                local_mod_metadata["steamcmd"] = True
-        return metadata
+        return cls(
+            external_steam_metadata=external_steam_metadata,
+            workshop_acf_data=context.workshop_acf_data,
+            steamcmd_acf_data=context.steamcmd_acf_data,
+        )
 
-    def run(self) -> None:
+
+# Parser context of the current worker process, set by the process pool initializer
+_process_parser_context: ProcessParserContext | None = None
+
+
+def _init_parser_process(context: ProcessParserContext) -> None:
+    global _process_parser_context
+    _process_parser_context = context
+
+
+def _parse_mod_batch_in_process(
+    data_source: str,
+    batch: list[tuple[str, str]],
+    cache_entries: dict[str, AboutXmlCacheEntry],
+) -> tuple[
+    dict[str, ModMetadata],
+    dict[str, AboutXmlCacheEntry],
+    int,
+    int,
+    list[ModDirectorySnapshot],
+]:
+    """
+    Parse a batch of mod directories inside a parser worker process.
+
+    :param data_source: The data source of the mods in the batch.
+    :param batch: List of (mod directory, uuid) pairs to parse.
+    :param cache_entries: About.xml parse cache entries for the mods in the batch.
+    :return: Tuple of (parsed metadata by uuid, new or updated cache entries,
+        cache hits, cache misses, scans of the mod directories).
+    """
+    context = _process_parser_context
+    if context is None:
+        raise RuntimeError("Parser worker process was not initialized")
+    parse_cache = AboutXmlParseCache()
+    parse_cache.entries = dict(cache_entries)
+    context.about_parse_cache = parse_cache
+    directory_snapshots = DirectorySnapshots()
+    context.directory_snapshots = directory_snapshots
+    metadata: dict[str, ModMetadata] = {}
+    snapshots: list[ModDirectorySnapshot] = []
+    for mod_directory, uuid in batch:
         try:
-            mod_metadata = self.__parse_mod_metadata(
-                self.data_source, self.mod_directory, self.metadata_manager, self.uuid
-            )
-            packageid = mod_metadata[self.uuid].get("packageid")
-            self.metadata_manager.internal_local_metadata.update(mod_metadata)
-            # Track packageid -> uuid relationships for future uses
-            self.metadata_manager.packageid_to_uuids.setdefault(packageid, set()).add(
-                self.uuid
+            metadata.update(
+                parse_mod_metadata(data_source, mod_directory, context, uuid)
             )
+            snapshot = directory_snapshots.get(mod_directory)
+            if snapshot is not None:
+                snapshots.append(snapshot)
         except Exception as e:
             error_message = f"{type(e).__name__}: {str(e)}\n{traceback.format_exc()}"
-            logger.error(f"ERROR: Unable to initialize ModParser {error_message}")
+            logger.error(f"ERROR: Unable to parse {mod_directory} {error_message}")
+    updated_entries = {
+        path: entry
+        for path, entry in parse_cache.entries.items()
+        if entry is not cache_entries.get(path)
+    }
+    return metadata, updated_entries, parse_cache.hits, parse_cache.misses, snapshots
 
 
 # Mod helper functions
@@ -2453,6 +3127,98 @@ def add_load_rule_to_mod(
                 )
 
 
+def metadata_fingerprint(mod_metadata: ModMetadata) -> bytes | None:
+    """
+    Digest of a mod's parsed metadata, used to tell whether a re-parsed mod
+    changed since it was last parsed.
+
+    :param mod_metadata: The parsed (not yet compiled) metadata of a mod.
+    :return: The digest, or None if the metadata could not be serialized.
+    """
+    try:
+        encoded = msgspec.msgpack.encode(mod_metadata, order="deterministic")
+    except (TypeError, msgspec.EncodeError):
+        return None
+    return hashlib.blake2b(encoded, digest_size=16).digest()
+
+
+def collect_reference_keys(value: Any, keys: set[str]) -> None:
+    """
+    Add every string in an About.xml value to keys, lowercased. This is a superset
+    of the packageids the value references, which is all the reverse index needs.
+
+    :param value: An About.xml value as returned by read_about_xml.
+    :param keys: The set to add the strings to.
+    """
+    if isinstance(value, str):
+        keys.add(value.lower())
+    elif isinstance(value, dict):
+        for item in value.values():
+            collect_reference_keys(item, keys)
+    elif isinstance(value, list):
+        for item in value:
+            collect_reference_keys(item, keys)
+
+
+def decode_steam_db(json_bytes: bytes) -> tuple[int, MutableMapping[str, Any]]:
+    """
+    Decode a steamDB.json with the SteamDbSchema.
+
+    A DB that does not match the schema is decoded without validation instead,
+    so that an unexpected entry does not disable the whole DB.
+
+    :param json_bytes: Contents of the steamDB.json.
+    :return: Tuple of (DB version, PublishedFileId -> entry mapping).
+    """
+    try:
+        steam_db = msgspec.json.decode(json_bytes, type=SteamDbSchema)
+    except msgspec.ValidationError as e:
+        logger.warning(f"Steam DB does not match the expected schema: {e}")
+        db_data = msgspec.json.decode(json_bytes)
+        return int(db_data["version"]), db_data["database"]
+    return steam_db.version, SteamDbEntries(steam_db.database)
+
+
+def decode_rules_db(json_bytes: bytes) -> dict[str, Any] | None:
+    """
+    Decode a communityRules.json / userRules.json with the ExternalRulesSchema.
+
+    Rules are returned as dicts, with the rules left at their defaults omitted.
+    A DB that does not match the schema is decoded without validation instead.
+
+    :param json_bytes: Contents of the rules DB.
+    :return: Dict of packageid -> rules, or None if the DB has no rules.
+    """
+    try:
+        rules_db = msgspec.json.decode(json_bytes, type=ExternalRulesSchema)
+    except msgspec.ValidationError as e:
+        logger.warning(f"Rules DB does not match the expected schema: {e}")
+        return msgspec.json.decode(json_bytes)["rules"]
+    return {package_id: rule.to_dict() for package_id, rule in rules_db.rules.items()}
+
+
+def changed_keys(
+    old: MutableMapping[str, Any] | None, new: MutableMapping[str, Any] | None
+) -> set[str]:
+    """
+    Return the keys that were added, removed or changed between two versions of
+    an external metadata DB.
+
+    :param old: The previously loaded DB, if any.
+    :param new: The newly loaded DB, if any.
+    :return: The keys whose entries differ.
+    """
+    if old is new:
+        return set()
+    if isinstance(old, SteamDbIndex) and isinstance(new, SteamDbIndex):
+        return old.changed_keys(new)
+    if isinstance(old, SteamDbEntries) and isinstance(new, SteamDbEntries):
+        return old.changed_keys(new)
+    old = old or {}
+    new = new or {}
+    return {key for key in old.keys() | new.keys() if old.get(key) != new.get(key)}
+
+
 def get_mods_from_list(
     mod_list: Union[str, list[str]],
 ) -> tuple[list[str], list[str], dict[str, Any], list[str]]:
@@ -2469,21 +3235,31 @@ def get_mods_from_list(
     duplicate mods dict, and missing mods list
     """
     all_mods = MetadataManager.instance().internal_local_metadata
+    packageid_to_uuids = MetadataManager.instance().packageid_to_uuids
+    # Position of each mod, to return uuids in the order of all_mods
+    mod_order = {uuid: index for index, uuid in enumerate(all_mods)}
+
+    def uuids_in_order(uuids: Iterable[str]) -> list[str]:
+        return sorted(
+            (uuid for uuid in uuids if uuid in mod_order), key=mod_order.__getitem__
+        )
 
     active_mods_uuids: list[str] = []
     inactive_mods_uuids: list[str] = []
     duplicate_mods: dict[str, Any] = {}
-    duplicates_processed = []
+    duplicates_processed: set[str] = set()
     missing_mods: list[str] = []
     populated_mods = []
     to_populate = []
     logger.debug("Started generating active and inactive mods")
     # Calculate duplicate mods (SCHEMA: {str packageid: list[str duplicate uuids]})
-    for mod_uuid, mod_data in all_mods.items():
-        # Using setdefault() to initialize the dictionary and then assigning the value
-        duplicate_mods.setdefault(mod_data["packageid"], []).append(mod_uuid)
-    # Filter out non-duplicate mods
-    duplicate_mods = {k: v for k, v in duplicate_mods.items() if len(v) > 1}
+    for packageid, uuids in packageid_to_uuids.items():
+        duplicate_uuids = uuids_in_order(uuids) if len(uuids) > 1 else []
+        if len(duplicate_uuids) > 1:
+            duplicate_mods[packageid] = duplicate_uuids
+    duplicate_mods = dict(
+        sorted(duplicate_mods.items(), key=lambda item: mod_order[item[1][0]])
+    )
     # Calculate mod lists
     if isinstance(mod_list, str):
         # Handle the mod list not existing
@@ -2531,62 +3307,58 @@ def get_mods_from_list(
             # ... otherwise, we use standard data source priority if suffix not used
             else ["expansion", "local", "workshop"]
         )
-        # Loop through all mods
-        for uuid, metadata in all_mods.items():
-            metadata_package_id = metadata["packageid"]
-            if (
-                metadata_package_id
-                in [  # If we have a match with or without _steam present
-                    package_id_normalized,
-                    package_id_normalized_stripped,
-                ]
-            ):
-                # Add non-duplicates to active mods
-                if target_id not in duplicate_mods.keys():
-                    populated_mods.append(target_id)
-                    active_mods_uuids.append(uuid)
-                else:  # Otherwise, duplicate needs calculated
-                    if (
-                        target_id in duplicates_processed
-                    ):  # Skip duplicates that have already been processed
-                        continue
-                    logger.info(
-                        f"Found duplicate mod present in active mods list: {target_id}"
-                    )
-                    # Loop through sorted paths and determine which duplicate to used based on priority
-                    for source in sources_order:
-                        logger.debug(f"Checking for duplicate with source: {source}")
-                        # Sort duplicate mod paths by source priority
-                        paths_to_uuid = {}
-                        for duplicate_uuid in duplicate_mods[target_id]:
-                            if source in all_mods[duplicate_uuid]["data_source"]:
-                                paths_to_uuid[all_mods[duplicate_uuid]["path"]] = (
-                                    duplicate_uuid
-                                )
-                        # Sort duplicate mod paths from current source priority using natsort
-                        source_paths_sorted = natsorted(paths_to_uuid.keys())
-                        if source_paths_sorted:  # If we have paths returned
-                            # If we are here, we've found our calculated duplicate, log and use this mod
-                            calculated_duplicate_uuid = paths_to_uuid[
-                                source_paths_sorted[0]
-                            ]
-                            logger.debug(
-                                f"Using duplicate {source} mod for {target_id}: {all_mods[calculated_duplicate_uuid]['path']}"
+        # Look up the mods with a matching packageid, with or without _steam present
+        matching_uuids = packageid_to_uuids.get(package_id_normalized, set()) | (
+            packageid_to_uuids.get(package_id_normalized_stripped, set())
+        )
+        for uuid in uuids_in_order(matching_uuids):
+            # Add non-duplicates to active mods
+            if target_id not in duplicate_mods.keys():
+                populated_mods.append(target_id)
+                active_mods_uuids.append(uuid)
+            else:  # Otherwise, duplicate needs calculated
+                if (
+                    target_id in duplicates_processed
+                ):  # Skip duplicates that have already been processed
+                    continue
+                logger.info(
+                    f"Found duplicate mod present in active mods list: {target_id}"
+                )
+                # Loop through sorted paths and determine which duplicate to used based on priority
+                for source in sources_order:
+                    logger.debug(f"Checking for duplicate with source: {source}")
+                    # Sort duplicate mod paths by source priority
+                    paths_to_uuid = {}
+                    for duplicate_uuid in duplicate_mods[target_id]:
+                        if source in all_mods[duplicate_uuid]["data_source"]:
+                            paths_to_uuid[all_mods[duplicate_uuid]["path"]] = (
+                                duplicate_uuid
                             )
-                            populated_mods.append(target_id)
-                            duplicates_processed.append(target_id)
-                            active_mods_uuids.append(calculated_duplicate_uuid)
-                            break
-                        else:  # Skip this source priority if no paths
-                            logger.debug(f"No paths returned for {source}")
-                            continue
+                    # Sort duplicate mod paths from current source priority using natsort
+                    source_paths_sorted = natsorted(paths_to_uuid.keys())
+                    if source_paths_sorted:  # If we have paths returned
+                        # If we are here, we've found our calculated duplicate, log and use this mod
+                        calculated_duplicate_uuid = paths_to_uuid[
+                            source_paths_sorted[0]
+                        ]
+                        logger.debug(
+                            f"Using duplicate {source} mod for {target_id}: {all_mods[calculated_duplicate_uuid]['path']}"
+                        )
+                        populated_mods.append(target_id)
+                        duplicates_processed.add(target_id)
+                        active_mods_uuids.append(calculated_duplicate_uuid)
+                        break
+                    else:  # Skip this source priority if no paths
+                        logger.debug(f"No paths returned for {source}")
+                        continue
     # Calculate missing mods from the difference
     missing_mods = list(set(to_populate) - set(populated_mods))
     logger.debug(f"Generated active mods dict with {len(active_mods_uuids)} mods")
     # Get the inactive mods by subtracting active mods from workshop + expansions
     logger.info("Generating inactive mod list")
+    active_mods_uuids_set = set(active_mods_uuids)
     inactive_mods_uuids = [
-        uuid for uuid in all_mods.keys() if uuid not in active_mods_uuids
+        uuid for uuid in all_mods.keys() if uuid not in active_mods_uuids_set
     ]
     logger.info(f"# active mods: {len(active_mods_uuids)}")
     logger.info(f"# inactive mods: {len(inactive_mods_uuids)}")
@@ -2907,7 +3679,7 @@ class SteamDatabaseBuilder(QThread):
 
 
 def check_if_pfids_blacklisted(
-    publishedfileids: list[str], steamdb: dict[str, Any]
+    publishedfileids: list[str], steamdb: Mapping[str, Any]
 ) -> list[str]:
     # None-check for steamdb
     if not steamdb:
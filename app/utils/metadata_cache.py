@@ -0,0 +1,451 @@
+import copy
+import hashlib
+import os
+from pathlib import Path
+from threading import Lock
+from typing import Any, Iterable
+
+import msgspec
+import pygit2
+from loguru import logger
+
+from app.utils.xml import xml_path_to_json
+
+# Bump this whenever the shape of the cached About.xml metadata changes, so that
+# stale caches written by older versions are discarded instead of reused.
+ABOUT_PARSE_CACHE_VERSION = 2
+ABOUT_PARSE_CACHE_FILE_NAME = "about_parse_cache.json"
+
+# Sentinel mtime used in fingerprints when a mod has no PublishedFileId.txt
+NO_FILE_MTIME = -1
+
+# Bump this whenever the shape of the persisted "Use This Instead" index changes
+USE_THIS_INSTEAD_INDEX_VERSION = 1
+USE_THIS_INSTEAD_INDEX_FILE_NAME = "use_this_instead_index.json"
+
+
+class AboutXmlCacheEntry(msgspec.Struct):
+    """
+    A single cached About.xml parse result for a mod directory.
+
+    :param about_mtime_ns: About.xml modification time (ns) at parse time.
+    :param about_size: About.xml size (bytes) at parse time.
+    :param pfid_mtime_ns: PublishedFileId.txt modification time (ns), or -1 if absent.
+    :param pfid: Contents of PublishedFileId.txt, if any.
+    :param metadata: Normalized About.xml metadata, or None if the file was malformed.
+    """
+
+    about_mtime_ns: int
+    about_size: int
+    pfid_mtime_ns: int
+    pfid: str | None = None
+    metadata: dict[str, Any] | None = None
+
+
+class AboutXmlCacheSchema(msgspec.Struct):
+    version: int
+    entries: dict[str, AboutXmlCacheEntry] = {}
+
+
+def about_fingerprint(
+    about_stat: os.stat_result, pfid_stat: os.stat_result | None
+) -> tuple[int, int, int]:
+    """
+    Build the cache fingerprint for a mod's About.xml and PublishedFileId.txt.
+
+    :param about_stat: stat result of the About.xml file.
+    :param pfid_stat: stat result of the PublishedFileId.txt file, or None if absent.
+    :return: Tuple of (About.xml mtime_ns, About.xml size, PublishedFileId.txt mtime_ns).
+    """
+    return (
+        about_stat.st_mtime_ns,
+        about_stat.st_size,
+        pfid_stat.st_mtime_ns if pfid_stat is not None else NO_FILE_MTIME,
+    )
+
+
+class AboutXmlParseCache:
+    """
+    Persistent on-disk cache of normalized About.xml metadata.
+
+    Entries are keyed by mod directory path and validated against the About.xml
+    mtime/size and the PublishedFileId.txt mtime, so only mods that changed on
+    disk need to be re-parsed. The cache is safe to use from ModParser threads.
+
+    Passing no cache path creates an in-memory cache that is never saved, which
+    is used to carry entries into parser worker processes.
+    """
+
+    def __init__(self, cache_path: Path | None = None) -> None:
+        self.cache_path = cache_path
+        self.entries: dict[str, AboutXmlCacheEntry] = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._lock = Lock()
+
+    def load(self) -> None:
+        """
+        Load the cache from disk. A missing, unreadable or outdated cache file
+        results in an empty cache.
+        """
+        self.entries = {}
+        self._dirty = False
+        if self.cache_path is None:
+            return
+        if not self.cache_path.exists():
+            logger.debug(f"No About.xml parse cache found at: {self.cache_path}")
+            return
+        try:
+            data = msgspec.json.decode(
+                self.cache_path.read_bytes(), type=AboutXmlCacheSchema
+            )
+        except (OSError, msgspec.DecodeError, msgspec.ValidationError) as e:
+            logger.warning(
+                f"Discarding unreadable About.xml parse cache at {self.cache_path}: {e}"
+            )
+            self._dirty = True
+            return
+        if data.version != ABOUT_PARSE_CACHE_VERSION:
+            logger.info(
+                f"Discarding About.xml parse cache with version {data.version} (expected {ABOUT_PARSE_CACHE_VERSION})"
+            )
+            self._dirty = True
+            return
+        self.entries = data.entries
+        logger.info(
+            f"Loaded About.xml parse cache with {len(self.entries)} entries from: {self.cache_path}"
+        )
+
+    def save(self) -> None:
+        """
+        Write the cache to disk if it changed since it was loaded.
+        """
+        if self.cache_path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = AboutXmlCacheSchema(
+                version=ABOUT_PARSE_CACHE_VERSION, entries=dict(self.entries)
+            )
+            self._dirty = False
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(".tmp")
+            tmp_path.write_bytes(msgspec.json.encode(data))
+            os.replace(tmp_path, self.cache_path)
+        except (OSError, TypeError) as e:
+            logger.error(
+                f"Unable to write About.xml parse cache to {self.cache_path}: {e}"
+            )
+
+    def get(
+        self, mod_path: str, fingerprint: tuple[int, int, int]
+    ) -> AboutXmlCacheEntry | None:
+        """
+        Return a cached entry for a mod directory if its fingerprint still matches.
+
+        The returned entry holds a private copy of the metadata, so callers may
+        freely mutate it.
+
+        :param mod_path: The mod directory path.
+        :param fingerprint: The current fingerprint, see `about_fingerprint`.
+        :return: The cached entry, or None on a cache miss.
+        """
+        with self._lock:
+            entry = self.entries.get(mod_path)
+            if (
+                entry is None
+                or (
+                    entry.about_mtime_ns,
+                    entry.about_size,
+                    entry.pfid_mtime_ns,
+                )
+                != fingerprint
+            ):
+                self.misses += 1
+                return None
+            self.hits += 1
+        return AboutXmlCacheEntry(
+            about_mtime_ns=entry.about_mtime_ns,
+            about_size=entry.about_size,
+            pfid_mtime_ns=entry.pfid_mtime_ns,
+            pfid=entry.pfid,
+            metadata=copy.deepcopy(entry.metadata),
+        )
+
+    def put(
+        self,
+        mod_path: str,
+        fingerprint: tuple[int, int, int],
+        metadata: dict[str, Any] | None,
+        pfid: str | None,
+    ) -> None:
+        """
+        Store the parse result for a mod directory.
+
+        :param mod_path: The mod directory path.
+        :param fingerprint: The fingerprint at parse time, see `about_fingerprint`.
+        :param metadata: Normalized About.xml metadata, or None if malformed.
+        :param pfid: Contents of PublishedFileId.txt, if any.
+        """
+        entry = AboutXmlCacheEntry(
+            about_mtime_ns=fingerprint[0],
+            about_size=fingerprint[1],
+            pfid_mtime_ns=fingerprint[2],
+            pfid=pfid,
+            metadata=copy.deepcopy(metadata),
+        )
+        with self._lock:
+            self.entries[mod_path] = entry
+            self._dirty = True
+
+    def entries_for(self, mod_paths: Iterable[str]) -> dict[str, AboutXmlCacheEntry]:
+        """
+        Return the cached entries for the given mod directories, e.g. to hand
+        them to a parser running in another process.
+
+        :param mod_paths: The mod directory paths to look up.
+        :return: Mapping of mod directory path to cached entry, for paths in the cache.
+        """
+        with self._lock:
+            return {
+                path: self.entries[path] for path in mod_paths if path in self.entries
+            }
+
+    def merge(
+        self, entries: dict[str, AboutXmlCacheEntry], hits: int, misses: int
+    ) -> None:
+        """
+        Merge entries and hit/miss counts collected by another cache instance,
+        e.g. one used by a parser running in another process.
+
+        :param entries: New or updated entries to store.
+        :param hits: Number of cache hits to add to the stats.
+        :param misses: Number of cache misses to add to the stats.
+        """
+        with self._lock:
+            self.entries.update(entries)
+            self.hits += hits
+            self.misses += misses
+            if entries:
+                self._dirty = True
+
+    def prune(self, live_paths: Iterable[str]) -> None:
+        """
+        Drop entries for mod directories that no longer exist.
+
+        :param live_paths: The mod directory paths that are currently known.
+        """
+        live = set(live_paths)
+        with self._lock:
+            stale = [path for path in self.entries if path not in live]
+            for path in stale:
+                del self.entries[path]
+            if stale:
+                self._dirty = True
+                logger.debug(f"Pruned {len(stale)} stale About.xml parse cache entries")
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    def log_stats(self) -> None:
+        logger.info(
+            f"About.xml parse cache: {self.hits} hits, {self.misses} misses ({len(self.entries)} entries)"
+        )
+
+
+class ModReplacement(msgspec.Struct, frozen=True):
+    """
+    A "Use This Instead" replacement for a Workshop mod.
+
+    :param name: Name of the replacement mod.
+    :param author: Author of the replacement mod.
+    :param pfid: PublishedFileId of the replacement mod.
+    """
+
+    name: str
+    author: str
+    pfid: str
+
+
+class UseThisInsteadIndexSchema(msgspec.Struct):
+    version: int
+    folder: str
+    source_stamp: str
+    game_version: str
+    replacements: dict[str, ModReplacement] = {}
+
+
+def use_this_instead_source_stamp(folder: Path) -> str | None:
+    """
+    Identify the current contents of a "Use This Instead" Replacements folder.
+
+    The stamp combines the HEAD commit of the git repository the folder is in, if
+    any, with the folder mtime and the mtime and size of every replacement file.
+    Pulling the repository changes the commit, adding or removing replacement
+    files changes the folder mtime, and editing one in place, committed or not,
+    changes its own stat. One scandir of the folder is cheap next to parsing the
+    XML files.
+
+    :param folder: The Replacements folder.
+    :return: The stamp, or None if the folder does not exist.
+    """
+    try:
+        folder_mtime_ns = os.stat(folder).st_mtime_ns
+        files = hashlib.sha256()
+        for entry in sorted(os.scandir(folder), key=lambda entry: entry.name):
+            if not entry.name.endswith(".xml") or not entry.is_file():
+                continue
+            file_stat = entry.stat()
+            files.update(
+                f"{entry.name}:{file_stat.st_mtime_ns}:{file_stat.st_size}\n".encode()
+            )
+    except OSError:
+        return None
+    commit = ""
+    try:
+        repository_path = pygit2.discover_repository(str(folder))
+        if repository_path:
+            commit = str(pygit2.Repository(repository_path).head.target)
+    except pygit2.GitError:
+        # Not a repository, or one without commits
+        pass
+    return f"{commit}:{folder_mtime_ns}:{files.hexdigest()}"
+
+
+class UseThisInsteadIndex:
+    """
+    In-memory index of a "Use This Instead" Replacements folder.
+
+    Replacements are keyed by the PublishedFileId of the mod they replace, and
+    only those supporting the current game version are kept. Every replacement
+    XML file is parsed once when the index is built, after which lookups never
+    touch the disk. The index is persisted, and reused for as long as the
+    folder's source stamp and the game version are unchanged, see
+    `use_this_instead_source_stamp`.
+    """
+
+    def __init__(
+        self, folder: Path, game_version: str, cache_path: Path | None = None
+    ) -> None:
+        self.folder = folder
+        self.game_version = game_version
+        self.cache_path = cache_path
+        self.source_stamp: str | None = None
+        self.replacements: dict[str, ModReplacement] = {}
+
+    def get(self, publishedfileid: str) -> ModReplacement | None:
+        """
+        Return the replacement for a mod, if any.
+
+        :param publishedfileid: PublishedFileId of the mod.
+        :return: The replacement, or None if the mod has none for the game version.
+        """
+        return self.replacements.get(publishedfileid)
+
+    def is_current(self) -> bool:
+        """
+        Check whether the Replacements folder is unchanged since the index was
+        loaded. This costs a scandir and a git HEAD lookup, not an XML parse.
+        """
+        return use_this_instead_source_stamp(self.folder) == self.source_stamp
+
+    def load(self) -> None:
+        """
+        Load the index from the persisted cache if it is still current, otherwise
+        build it from the Replacements folder and persist it.
+        """
+        self.replacements = {}
+        self.source_stamp = use_this_instead_source_stamp(self.folder)
+        if self.source_stamp is None:
+            logger.warning(
+                f'"Use This Instead" Replacements folder does not exist: {self.folder}'
+            )
+            return
+        if self._load_cache():
+            return
+        self.replacements = self._build()
+        self._save_cache()
+
+    def _build(self) -> dict[str, ModReplacement]:
+        try:
+            major, minor = self.game_version.split(".")[:2]
+            version_regex = rf"{major}.{minor}"
+        except Exception:
+            # Without a game version, no replacement can be checked for support
+            return {}
+
+        replacements: dict[str, ModReplacement] = {}
+        try:
+            xml_files = [
+                entry
+                for entry in os.scandir(self.folder)
+                if entry.name.endswith(".xml") and entry.is_file()
+            ]
+        except OSError as e:
+            logger.error(f'Unable to read "Use This Instead" folder {self.folder}: {e}')
+            return {}
+        for entry in xml_files:
+            try:
+                replacement_data = xml_path_to_json(entry.path)["ModReplacement"]
+                # check if replacement supports the game version
+                if version_regex not in replacement_data.get("ReplacementVersions", {}):
+                    continue
+                replacements[entry.name.removesuffix(".xml")] = ModReplacement(
+                    name=replacement_data["ReplacementName"] or "",
+                    author=replacement_data["ReplacementAuthor"] or "",
+                    pfid=replacement_data["ReplacementSteamId"] or "",
+                )
+            except Exception as e:
+                logger.warning(f"Skipping malformed replacement {entry.path}: {e}")
+        logger.info(
+            f'Indexed {len(replacements)} of {len(xml_files)} "Use This Instead" replacements for game version {version_regex}'
+        )
+        return replacements
+
+    def _load_cache(self) -> bool:
+        if self.cache_path is None or not self.cache_path.exists():
+            return False
+        try:
+            data = msgspec.json.decode(
+                self.cache_path.read_bytes(), type=UseThisInsteadIndexSchema
+            )
+        except (OSError, msgspec.DecodeError, msgspec.ValidationError) as e:
+            logger.warning(
+                f'Discarding unreadable "Use This Instead" index at {self.cache_path}: {e}'
+            )
+            return False
+        if (
+            data.version != USE_THIS_INSTEAD_INDEX_VERSION
+            or data.folder != str(self.folder)
+            or data.source_stamp != self.source_stamp
+            or data.game_version != self.game_version
+        ):
+            logger.debug(f'"Use This Instead" index is outdated: {self.cache_path}')
+            return False
+        self.replacements = data.replacements
+        return True
+
+    def _save_cache(self) -> None:
+        if self.cache_path is None or self.source_stamp is None:
+            return
+        data = UseThisInsteadIndexSchema(
+            version=USE_THIS_INSTEAD_INDEX_VERSION,
+            folder=str(self.folder),
+            source_stamp=self.source_stamp,
+            game_version=self.game_version,
+            replacements=self.replacements,
+        )
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(".tmp")
+            tmp_path.write_bytes(msgspec.json.encode(data))
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.error(
+                f'Unable to write "Use This Instead" index to {self.cache_path}: {e}'
+            )
@@ -0,0 +1,252 @@
+from dataclasses import dataclass, field
+from typing import Callable
+
+from loguru import logger
+
+from app.utils.rule_snapshot import ModRules, RuleSnapshot
+
+# Kinds of load order rules, keyed like the compiled metadata
+LOAD_THESE_BEFORE = "loadTheseBefore"
+LOAD_THESE_AFTER = "loadTheseAfter"
+
+
+@dataclass(slots=True)
+class ModIssues:
+    """
+    Errors and load order warnings of a mod in the active mods list.
+
+    :param missing_dependencies: Packageids of dependencies that are not active.
+    :param alternative_dependencies: Packageids of alternatives to the missing
+        dependencies, if alternative packageids are considered.
+    :param conflicting_incompatibilities: Packageids of active mods the mod is
+        incompatible with.
+    :param load_before_violations: Packageids of mods that should load before
+        the mod, but load after it.
+    :param load_after_violations: Packageids of mods that should load after the
+        mod, but load before it.
+    """
+
+    missing_dependencies: set[str] = field(default_factory=set)
+    alternative_dependencies: set[str] = field(default_factory=set)
+    conflicting_incompatibilities: set[str] = field(default_factory=set)
+    load_before_violations: set[str] = field(default_factory=set)
+    load_after_violations: set[str] = field(default_factory=set)
+
+    @property
+    def has_errors(self) -> bool:
+        return bool(self.missing_dependencies or self.conflicting_incompatibilities)
+
+    @property
+    def has_load_order_warnings(self) -> bool:
+        return bool(self.load_before_violations or self.load_after_violations)
+
+
+class ModListValidator:
+    """
+    Checks the dependencies, incompatibilities and load order rules of every
+    mod of the active mods list in one pass, with the position of each mod
+    looked up in a map built once per pass.
+
+    The last validated order is kept: when it changes by a single mod moving,
+    only the load order rules from and to that mod are checked again.
+    Dependencies and incompatibilities do not depend on the order. Every mod
+    is checked again when the rule snapshot is a new version.
+
+    :param has_replacement: Called with (packageid, dependency, active
+        packageids), returns whether an active mod replaces a missing
+        dependency.
+    """
+
+    def __init__(
+        self,
+        has_replacement: Callable[[str, str, set[str]], bool],
+    ) -> None:
+        self.has_replacement = has_replacement
+        self.issues: dict[str, ModIssues] = {}
+        self._rules: RuleSnapshot = RuleSnapshot()
+        self._uuids: list[str] = []
+        self._positions: dict[str, int] = {}
+        self._packageid_to_uuid: dict[str, str] = {}
+        # Packageids of more than one mod of the list
+        self._duplicates: set[str] = set()
+        # Target packageid -> (uuid, rule kind) of the rules pointing to it
+        self._rules_to: dict[str, list[tuple[str, str]]] = {}
+        self._consider_alternatives: bool | None = None
+
+    def invalidate(self) -> None:
+        """Check every mod on the next validation"""
+        self._uuids = []
+        self._consider_alternatives = None
+
+    def validate(
+        self,
+        uuids: list[str],
+        rules: RuleSnapshot,
+        consider_alternatives: bool,
+    ) -> dict[str, ModIssues]:
+        """
+        :param uuids: Uuids of the active mods, in load order.
+        :param rules: Compiled rules of the mods, e.g.
+            MetadataManager.rule_snapshot.
+        :param consider_alternatives: Whether an active alternative packageid
+            satisfies a dependency.
+        :return: The issues of each mod, by uuid. Mods without a packageid
+            or rules have no issues.
+        """
+        if (
+            consider_alternatives == self._consider_alternatives
+            and rules.version == self._rules.version
+        ):
+            moved = _single_move(self._uuids, uuids)
+            # With duplicate packageids, the last of the mods is the one rules
+            # point to, which a move can change
+            if moved is not None and (
+                self._package_id(uuids[moved[1]]) not in self._duplicates
+            ):
+                self._move(uuids, *moved)
+                return self.issues
+        self._rules = rules
+        self._validate_all(uuids, consider_alternatives)
+        return self.issues
+
+    def _package_id(self, uuid: str) -> str:
+        mod_rules = self._rules.get(uuid)
+        return mod_rules.package_id if mod_rules is not None else ""
+
+    def _validate_all(self, uuids: list[str], consider_alternatives: bool) -> None:
+        rules = self._rules
+        self._uuids = list(uuids)
+        self._consider_alternatives = consider_alternatives
+        self._positions = {uuid: i for i, uuid in enumerate(uuids)}
+        self._packageid_to_uuid = {}
+        self._duplicates = set()
+        for uuid in uuids:
+            package_id = self._package_id(uuid)
+            if package_id in self._packageid_to_uuid:
+                self._duplicates.add(package_id)
+            self._packageid_to_uuid[package_id] = uuid
+        package_ids = set(self._packageid_to_uuid)
+        self._rules_to = {}
+        self.issues = {}
+        missing_rules = 0
+        for uuid in uuids:
+            issues = self.issues[uuid] = ModIssues()
+            mod_rules = rules.get(uuid)
+            if mod_rules is None:
+                missing_rules += 1
+                continue
+            if not mod_rules.package_id:
+                continue
+            self._check_dependencies(
+                mod_rules, package_ids, consider_alternatives, issues
+            )
+            issues.conflicting_incompatibilities = set(
+                mod_rules.incompatibilities & package_ids
+            )
+            for kind, targets in (
+                (LOAD_THESE_BEFORE, mod_rules.explicit_load_these_before),
+                (LOAD_THESE_AFTER, mod_rules.explicit_load_these_after),
+            ):
+                for target in targets:
+                    if target in self._packageid_to_uuid:
+                        self._rules_to.setdefault(target, []).append((uuid, kind))
+                        self._check_rule(uuid, kind, target)
+        if missing_rules:
+            logger.debug(
+                f"{missing_rules} mods are not in rule snapshot version "
+                f"{rules.version} and were not checked"
+            )
+
+    def _check_dependencies(
+        self,
+        mod_rules: ModRules,
+        package_ids: set[str],
+        consider_alternatives: bool,
+        issues: ModIssues,
+    ) -> None:
+        # Note: dependency replacements are NOT assumed to be subject to the
+        # same load order rules as the original mods!
+        for dependency in mod_rules.unsatisfied_dependencies(
+            package_ids, consider_alternatives
+        ):
+            # If not satisfied, also consider external replacement mapping
+            if self.has_replacement(
+                mod_rules.package_id, dependency.package_id, package_ids
+            ):
+                continue
+            issues.missing_dependencies.add(dependency.package_id)
+            # Only record alternatives if the advanced option is enabled
+            if consider_alternatives:
+                # Prefer to show only alternatives not already installed
+                alt_candidates = dependency.alternatives - package_ids
+                issues.alternative_dependencies.update(
+                    alt_candidates if alt_candidates else dependency.alternatives
+                )
+
+    def _check_rule(self, uuid: str, kind: str, target: str) -> None:
+        """Record or clear the violation of a rule of a mod on a target packageid"""
+        position = self._positions[uuid]
+        target_position = self._positions[self._packageid_to_uuid[target]]
+        issues = self.issues[uuid]
+        if kind == LOAD_THESE_BEFORE:
+            violations = issues.load_before_violations
+            violated = position <= target_position
+        else:
+            violations = issues.load_after_violations
+            violated = position >= target_position
+        if violated:
+            violations.add(target)
+        else:
+            violations.discard(target)
+
+    def _move(self, uuids: list[str], old_row: int, new_row: int) -> None:
+        moved_uuid = uuids[new_row]
+        self._uuids = list(uuids)
+        for row in range(min(old_row, new_row), max(old_row, new_row) + 1):
+            self._positions[uuids[row]] = row
+        # Only the order of the moved mod relative to the mods it moved past
+        # has changed, so only rules from and to the moved mod are checked
+        checked = 0
+        mod_rules = self._rules.get(moved_uuid)
+        if mod_rules is not None and mod_rules.package_id:
+            for kind, targets in (
+                (LOAD_THESE_BEFORE, mod_rules.explicit_load_these_before),
+                (LOAD_THESE_AFTER, mod_rules.explicit_load_these_after),
+            ):
+                for target in targets:
+                    if target in self._packageid_to_uuid:
+                        self._check_rule(moved_uuid, kind, target)
+                        checked += 1
+            package_id = mod_rules.package_id
+            if self._packageid_to_uuid.get(package_id) == moved_uuid:
+                for uuid, kind in self._rules_to.get(package_id, ()):
+                    self._check_rule(uuid, kind, package_id)
+                    checked += 1
+        logger.debug(
+            f"Validated move of {moved_uuid} from row {old_row} to {new_row}: "
+            f"checked {checked} rules"
+        )
+
+
+def _single_move(old: list[str], new: list[str]) -> tuple[int, int] | None:
+    """
+    :return: (old row, new row) if new is old with a single mod moved, else
+        None. Identical lists are not a move, so that they are checked again.
+    """
+    if len(old) != len(new) or not old:
+        return None
+    first = 0
+    while first < len(old) and old[first] == new[first]:
+        first += 1
+    if first == len(old):
+        return None
+    last = len(old) - 1
+    while old[last] == new[last]:
+        last -= 1
+    if old[first] == new[last] and old[first + 1 : last + 1] == new[first:last]:
+        # Moved down
+        return first, last
+    if old[last] == new[first] and old[first:last] == new[first + 1 : last + 1]:
+        # Moved up
+        return last, first
+    return None
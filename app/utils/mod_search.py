@@ -0,0 +1,391 @@
+import heapq
+import re
+from collections import Counter
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import Any, Iterable, Mapping
+
+# Search bar filters that search a text field of the mod
+TEXT_SEARCH_FIELDS = ("name", "packageid", "authors", "publishedfileid")
+
+# Fields of the ranked search, with the weight of a word matching in them
+RANKED_SEARCH_FIELDS = {
+    "name": 3.0,
+    "packageid": 2.0,
+    "authors": 2.0,
+    "description": 1.0,
+}
+# Words less similar than this to a searched word do not match it. The
+# similarity of two words is the Jaccard index of their trigrams.
+MIN_WORD_SIMILARITY = 0.3
+# Similarity of a word that starts with the searched word
+PREFIX_SIMILARITY = 0.8
+# Shorter searched words only match the start of words of the name,
+# packageid and authors, not of the description
+MIN_DESCRIPTION_PREFIX_LENGTH = 3
+
+_WORD_PATTERN = re.compile(r"[^\W_]+")
+
+
+@dataclass(frozen=True, slots=True)
+class ModSearchEntry:
+    """
+    Lowercased search fields of a mod. Text fields are None when the mod does
+    not have them, such mods are not filtered out by a search of that field.
+
+    :param name: Name of the mod.
+    :param packageid: Packageid of the mod.
+    :param authors: Authors of the mod, comma separated.
+    :param publishedfileid: Steam Workshop id of the mod.
+    :param versions: Supported game versions.
+    :param description: Description of the mod.
+    """
+
+    name: str | None = None
+    packageid: str | None = None
+    authors: str | None = None
+    publishedfileid: str | None = None
+    versions: tuple[str, ...] = ()
+    description: str | None = None
+
+    @classmethod
+    def from_metadata(cls, mod_metadata: Mapping[str, Any]) -> "ModSearchEntry":
+        """
+        :param mod_metadata: Compiled metadata of a mod.
+        :return: Its search fields.
+        """
+        versions = (mod_metadata.get("supportedversions") or {}).get("li") or []
+        if isinstance(versions, str):
+            versions = [versions]
+        return cls(
+            name=_search_text(mod_metadata.get("name")),
+            packageid=_search_text(mod_metadata.get("packageid")),
+            authors=_search_text(_authors(mod_metadata.get("authors"))),
+            publishedfileid=_search_text(mod_metadata.get("publishedfileid")),
+            versions=tuple(str(version).lower() for version in versions),
+            description=_search_text(mod_metadata.get("description")),
+        )
+
+
+def _search_text(value: Any) -> str | None:
+    return str(value).lower() if value else None
+
+
+def _trigrams(word: str) -> set[str]:
+    """
+    :param word: Lowercased word.
+    :return: Trigrams of the word, padded so that short words have some.
+    """
+    padded = f"  {word} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _authors(authors: Any) -> Any:
+    """
+    :param authors: authors tag of About.xml, a string or {"li": [...]}.
+    :return: The authors, comma separated.
+    """
+    if isinstance(authors, dict):
+        authors = authors.get("li")
+    if isinstance(authors, list):
+        return ", ".join(str(author) for author in authors)
+    return authors
+
+
+class ModSearchIndex:
+    """
+    Search fields and filter sets of the mods of a mod list, built once per
+    list refresh so that filtering on each keystroke does not read the
+    metadata again. Filters intersect sets of uuids.
+
+    The ranked search uses an inverted index from the words of the mods to
+    their uuids, and from trigrams to the words, so that misspelled words
+    still find similar ones. Call index_words when the list is rebuilt, so
+    that the first ranked search does not build it. It is kept when the index
+    is invalidated: a mod's words are only indexed again if its search fields
+    changed.
+
+    Mods are indexed by update, at the latest the first time the list is
+    filtered with them. Call invalidate when their metadata changes.
+    """
+
+    def __init__(self) -> None:
+        self.entries: dict[str, ModSearchEntry] = {}
+        # uuids by data source ("expansion", "local" or "workshop")
+        self.data_sources: dict[str, set[str]] = {}
+        self.git_repos: set[str] = set()
+        self.steamcmd: set[str] = set()
+        self.csharp: set[str] = set()
+        # Last text search, as (field, pattern, matching uuids). Searches
+        # usually narrow the previous one as the user types.
+        self._last_search: tuple[str, str, set[str]] | None = None
+        # Ranked search index, from field weight to {word: uuids}
+        self._word_uuids: dict[float, dict[str, set[str]]] = {
+            weight: {} for weight in RANKED_SEARCH_FIELDS.values()
+        }
+        # Trigram to words, and words to their number of trigrams
+        self._trigram_words: dict[str, set[str]] = {}
+        self._word_trigram_counts: dict[str, int] = {}
+        # uuids in the ranked search index, with the entry and the words
+        # they were indexed with
+        self._indexed_words: dict[str, tuple[ModSearchEntry, set[str]]] = {}
+        # uuids of the entries not checked against the ranked search index
+        self._unindexed: set[str] = set()
+        # Scores of the mods by searched word, as the user types a query
+        # the words before the last one are the same
+        self._word_scores: dict[str, dict[str, float]] = {}
+
+    def invalidate(self, uuid: str | None = None) -> None:
+        """
+        :param uuid: Mod to index again, defaults to every mod.
+        """
+        self._last_search = None
+        if uuid is None:
+            self.entries.clear()
+            self.data_sources.clear()
+        else:
+            self.entries.pop(uuid, None)
+        for uuids in (
+            self._unindexed,
+            *self.data_sources.values(),
+            self.git_repos,
+            self.steamcmd,
+            self.csharp,
+        ):
+            if uuid is None:
+                uuids.clear()
+            else:
+                uuids.discard(uuid)
+
+    def update(
+        self, uuids: Iterable[str], metadata: Mapping[str, Mapping[str, Any]]
+    ) -> None:
+        """
+        Index the mods that are not indexed yet.
+
+        :param uuids: uuids of the mods of the list.
+        :param metadata: Compiled metadata by uuid.
+        """
+        for uuid in uuids:
+            if uuid in self.entries:
+                continue
+            mod_metadata = metadata.get(uuid, {})
+            self.entries[uuid] = ModSearchEntry.from_metadata(mod_metadata)
+            self.data_sources.setdefault(
+                str(mod_metadata.get("data_source")), set()
+            ).add(uuid)
+            if mod_metadata.get("git_repo"):
+                self.git_repos.add(uuid)
+            if mod_metadata.get("steamcmd"):
+                self.steamcmd.add(uuid)
+            if mod_metadata.get("csharp"):
+                self.csharp.add(uuid)
+            self._unindexed.add(uuid)
+            # Not part of the last search
+            self._last_search = None
+
+    def matching(
+        self,
+        uuids: Iterable[str],
+        search_field: str | None,
+        pattern: str,
+        source_filter: str,
+        type_filter_index: int,
+    ) -> set[str]:
+        """
+        :param uuids: uuids of the mods to filter, indexed with update.
+        :param search_field: One of TEXT_SEARCH_FIELDS, "version", or None to
+            not search.
+        :param pattern: Text to search for.
+        :param source_filter: A SEARCH_DATA_SOURCE_FILTER_INDEXES value.
+        :param type_filter_index: 1 to keep C# mods only, 2 to keep XML mods
+            only, else keep both.
+        :return: uuids of the mods that pass the search and the filters.
+        """
+        passing = set(uuids)
+        if pattern and search_field is not None:
+            passing &= self._search(search_field, pattern.lower())
+
+        if source_filter == "all":
+            pass
+        elif source_filter == "git_repo":
+            passing &= self.git_repos
+        elif source_filter == "steamcmd":
+            passing &= self.steamcmd
+        else:
+            passing &= self.data_sources.get(source_filter, set())
+
+        if type_filter_index == 1:
+            passing &= self.csharp
+        elif type_filter_index == 2:
+            passing -= self.csharp
+        return passing
+
+    def _search(self, search_field: str, pattern: str) -> set[str]:
+        """
+        :param search_field: Field to search.
+        :param pattern: Lowercased text to search for.
+        :return: uuids of the indexed mods that match.
+        """
+        candidates: Iterable[str] = self.entries
+        if self._last_search is not None:
+            last_field, last_pattern, last_matching = self._last_search
+            # Mods that do not match a pattern do not match a longer one
+            if last_field == search_field and last_pattern in pattern:
+                candidates = last_matching
+
+        entries = self.entries
+        if search_field == "version":
+            matching = {
+                uuid
+                for uuid in candidates
+                if any(pattern in version for version in entries[uuid].versions)
+            }
+        elif search_field in TEXT_SEARCH_FIELDS:
+            matching = set()
+            for uuid in candidates:
+                text = getattr(entries[uuid], search_field)
+                if text is None or pattern in text:
+                    matching.add(uuid)
+        else:
+            matching = set(candidates)
+        self._last_search = (search_field, pattern, matching)
+        return matching
+
+    def ranked(
+        self, uuids: Iterable[str], query: str, limit: int | None = None
+    ) -> list[tuple[str, float]]:
+        """
+        Rank mods by how well their name, packageid, authors and description
+        match the words of a query. Every word of the query must match a
+        word of the mod, exactly, as a prefix or with a few typos.
+
+        :param uuids: uuids of the mods to rank, indexed with update.
+        :param query: Words to search for.
+        :param limit: Maximum number of mods to return, defaults to all of
+            the mods that match.
+        :return: (uuid, score) of the matching mods, best match first. Mods
+            with the same score are in the order of uuids.
+        """
+        words = _WORD_PATTERN.findall(query.lower())
+        if not words:
+            return []
+        # Only the mods indexed since the last index_words, if any
+        self.index_words()
+        word_scores = []
+        for word in words:
+            scores = self._word_scores.get(word)
+            if scores is None:
+                scores = self._word_scores[word] = self._score_word(word)
+            word_scores.append(scores)
+        if len(word_scores) == 1:
+            totals = word_scores[0]
+        else:
+            # Mods matching every word, from the word matching the fewest
+            word_scores.sort(key=len)
+            totals = {
+                uuid: sum(scores[uuid] for scores in word_scores)
+                for uuid in set(word_scores[0]).intersection(*word_scores[1:])
+            }
+        ranking = [(uuid, totals[uuid]) for uuid in uuids if uuid in totals]
+        # Both sorts are stable
+        if limit is None:
+            return sorted(ranking, key=itemgetter(1), reverse=True)
+        return heapq.nlargest(limit, ranking, key=itemgetter(1))
+
+    def index_words(self) -> None:
+        """
+        Add the new and changed entries to the ranked search index.
+        """
+        for uuid in self._unindexed:
+            entry = self.entries[uuid]
+            indexed = self._indexed_words.get(uuid)
+            if indexed is not None:
+                if indexed[0] == entry:
+                    continue
+                # Words left without mods stay in the trigram index, they do
+                # not match anything
+                for word_uuids in self._word_uuids.values():
+                    for word in indexed[1]:
+                        if word in word_uuids:
+                            word_uuids[word].discard(uuid)
+            uuid_words: set[str] = set()
+            for field, weight in RANKED_SEARCH_FIELDS.items():
+                text = getattr(entry, field)
+                if text is None:
+                    continue
+                # Fields are by decreasing weight, a word scores for the
+                # first field it is in
+                words = set(_WORD_PATTERN.findall(text))
+                words -= uuid_words
+                uuid_words |= words
+                word_uuids = self._word_uuids[weight]
+                for word in words:
+                    uuids = word_uuids.get(word)
+                    if uuids is None:
+                        word_uuids[word] = {uuid}
+                        self._index_trigrams(word)
+                    else:
+                        uuids.add(uuid)
+            self._indexed_words[uuid] = (entry, uuid_words)
+            self._word_scores.clear()
+        self._unindexed.clear()
+
+    def _index_trigrams(self, word: str) -> None:
+        """
+        :param word: New word of the ranked search index.
+        """
+        if word in self._word_trigram_counts:
+            return
+        trigrams = _trigrams(word)
+        self._word_trigram_counts[word] = len(trigrams)
+        for trigram in trigrams:
+            self._trigram_words.setdefault(trigram, set()).add(word)
+
+    def _score_word(self, word: str) -> dict[str, float]:
+        """
+        :param word: Lowercased searched word.
+        :return: Score of the mods that have a word similar to it, the
+            similarity of their most similar word times its field weight.
+        """
+        trigrams = _trigrams(word)
+        shared: Counter[str] = Counter()
+        for trigram in trigrams:
+            shared.update(self._trigram_words.get(trigram, ()))
+        # Scores of the words of the mods that are similar enough
+        word_scores: list[tuple[float, set[str]]] = []
+        for candidate, count in shared.items():
+            prefix = False
+            if candidate == word:
+                similarity = 1.0
+            elif candidate.startswith(word):
+                similarity = PREFIX_SIMILARITY
+                prefix = True
+            else:
+                similarity = count / (
+                    len(trigrams) + self._word_trigram_counts[candidate] - count
+                )
+                if similarity < MIN_WORD_SIMILARITY:
+                    continue
+            for weight, word_uuids in self._word_uuids.items():
+                if (
+                    prefix
+                    and len(word) < MIN_DESCRIPTION_PREFIX_LENGTH
+                    and weight == RANKED_SEARCH_FIELDS["description"]
+                ):
+                    continue
+                uuids = word_uuids.get(candidate)
+                if uuids:
+                    word_scores.append((similarity * weight, uuids))
+        # A mod scores for its best word, so going from the best score down
+        # only the mods without a score yet are added
+        word_scores.sort(key=itemgetter(0), reverse=True)
+        scores: dict[str, float] = {}
+        scored: set[str] = set()
+        for score, uuids in word_scores:
+            if len(scored) == len(self._indexed_words):
+                break
+            new_uuids = uuids - scored
+            scored |= new_uuids
+            scores.update(dict.fromkeys(new_uuids, score))
+        return scores
@@ -1,4 +1,5 @@
 import os
+from collections.abc import Mapping
 from typing import Union
 
 from loguru import logger
@@ -91,7 +92,7 @@ def get_mod_path_from_pfid(pfid: Union[str, int, None]) -> str:
         # Check external steam metadata if available
         if hasattr(metadata_manager, "external_steam_metadata"):
             steam_metadata = getattr(metadata_manager, "external_steam_metadata", {})
-            if isinstance(steam_metadata, dict):
+            if isinstance(steam_metadata, Mapping):
                 match = steam_metadata.get(pfid_str, {})
                 if match and "path" in match:
                     logger.debug(
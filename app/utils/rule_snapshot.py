@@ -0,0 +1,220 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping
+
+from loguru import logger
+
+
+@dataclass(frozen=True, slots=True)
+class ModDependency:
+    """
+    A dependency of a mod, from About.xml or the Steam DB.
+
+    :param package_id: Packageid of the dependency.
+    :param alternatives: Packageids that can replace it, from
+        alternativePackageIds.
+    """
+
+    package_id: str
+    alternatives: frozenset[str] = frozenset()
+
+
+@dataclass(frozen=True, slots=True)
+class ModRules:
+    """
+    The compiled rules of a mod, normalized once per compilation.
+
+    :param package_id: Packageid of the mod.
+    :param dependencies: Dependencies, in metadata order.
+    :param incompatibilities: Packageids the mod is incompatible with.
+    :param load_these_before: Packageids to load before the mod, from its own
+        rules and from rules of other mods.
+    :param load_these_after: Packageids to load after the mod, likewise.
+    :param explicit_load_these_before: Packageids the mod's own rules load
+        before it.
+    :param explicit_load_these_after: Packageids the mod's own rules load
+        after it.
+    :param load_top: Whether the mod has a loadTop rule.
+    :param load_bottom: Whether the mod has a loadBottom rule.
+    """
+
+    package_id: str
+    dependencies: tuple[ModDependency, ...] = ()
+    incompatibilities: frozenset[str] = frozenset()
+    load_these_before: frozenset[str] = frozenset()
+    load_these_after: frozenset[str] = frozenset()
+    explicit_load_these_before: frozenset[str] = frozenset()
+    explicit_load_these_after: frozenset[str] = frozenset()
+    load_top: bool = False
+    load_bottom: bool = False
+
+    @classmethod
+    def from_metadata(cls, mod_metadata: Mapping[str, Any]) -> "ModRules":
+        """
+        :param mod_metadata: Compiled metadata of a mod.
+        :return: Its rules.
+        """
+        load_these_before, explicit_load_these_before = _load_rules(
+            mod_metadata.get("loadTheseBefore")
+        )
+        load_these_after, explicit_load_these_after = _load_rules(
+            mod_metadata.get("loadTheseAfter")
+        )
+        return cls(
+            package_id=mod_metadata.get("packageid", ""),
+            dependencies=_dependencies(mod_metadata.get("dependencies")),
+            incompatibilities=frozenset(mod_metadata.get("incompatibilities") or ()),
+            load_these_before=load_these_before,
+            load_these_after=load_these_after,
+            explicit_load_these_before=explicit_load_these_before,
+            explicit_load_these_after=explicit_load_these_after,
+            load_top=bool(mod_metadata.get("loadTop")),
+            load_bottom=bool(mod_metadata.get("loadBottom")),
+        )
+
+    def unsatisfied_dependencies(
+        self, package_ids: set[str] | frozenset[str], consider_alternatives: bool
+    ) -> list[ModDependency]:
+        """
+        :param package_ids: Packageids of the active mods.
+        :param consider_alternatives: Whether an active alternative satisfies
+            a dependency.
+        :return: The dependencies that are not active.
+        """
+        return [
+            dependency
+            for dependency in self.dependencies
+            if dependency.package_id not in package_ids
+            and not (
+                consider_alternatives
+                and not dependency.alternatives.isdisjoint(package_ids)
+            )
+        ]
+
+
+def _load_rules(rules: Any) -> tuple[frozenset[str], frozenset[str]]:
+    """
+    :param rules: loadTheseBefore/loadTheseAfter rules, as (packageid,
+        explicit) tuples.
+    :return: All packageids, and those of explicit rules.
+    """
+    if not rules:  # Will either be None, or a set
+        return frozenset(), frozenset()
+    package_ids: set[str] = set()
+    explicit: set[str] = set()
+    for rule in rules:
+        if not isinstance(rule, tuple):
+            logger.error(f"Expected load order rule to be a tuple: [{rule}]")
+            continue
+        package_ids.add(rule[0])
+        if rule[1]:
+            explicit.add(rule[0])
+    return frozenset(package_ids), frozenset(explicit)
+
+
+def _dependencies(dependencies: Any) -> tuple[ModDependency, ...]:
+    """
+    Normalize dependencies, which are either packageids or
+    (packageid, {"alternatives": set[str]}) tuples.
+    """
+    if not dependencies or not isinstance(dependencies, (set, list)):
+        return ()
+    normalized: list[ModDependency] = []
+    for dependency in dependencies:
+        if isinstance(dependency, str):
+            normalized.append(ModDependency(dependency))
+        elif isinstance(dependency, tuple):
+            alternatives: frozenset[str] = frozenset()
+            if (
+                len(dependency) > 1
+                and isinstance(dependency[1], dict)
+                and isinstance(dependency[1].get("alternatives"), set)
+            ):
+                alternatives = frozenset(dependency[1]["alternatives"])
+            normalized.append(ModDependency(dependency[0], alternatives))
+        else:
+            logger.error(f"Dependency is not a string or tuple: [{dependency}]")
+    return tuple(normalized)
+
+
+class RuleSnapshot:
+    """
+    The compiled rules of every mod, built at the end of each metadata
+    compilation and never changed afterwards. The sorter, the active list
+    errors / warnings and the missing dependencies check all read it instead
+    of normalizing the metadata dicts themselves.
+
+    :param rules: Rules by uuid.
+    :param version: Increases with every compilation, so consumers can tell
+        when the rules may have changed.
+    """
+
+    __slots__ = ("rules", "version", "load_top_package_ids")
+
+    def __init__(self, rules: Mapping[str, ModRules] | None = None, version: int = 0):
+        self.rules: Mapping[str, ModRules] = MappingProxyType(dict(rules or {}))
+        self.version = version
+        # loadTop rules of all mods, active or not, decide tier one
+        self.load_top_package_ids = frozenset(
+            mod_rules.package_id
+            for mod_rules in self.rules.values()
+            if mod_rules.load_top
+        )
+
+    @classmethod
+    def from_metadata(
+        cls,
+        metadata: Mapping[str, Mapping[str, Any]],
+        version: int = 0,
+        uuids: Iterable[str] | None = None,
+    ) -> "RuleSnapshot":
+        """
+        :param metadata: Compiled metadata by uuid, e.g. internal_local_metadata.
+        :param version: Version of the snapshot.
+        :param uuids: Only include these mods, defaults to all of them.
+        :return: The snapshot.
+        """
+        return cls(
+            {
+                uuid: ModRules.from_metadata(metadata[uuid])
+                for uuid in (metadata if uuids is None else uuids)
+            },
+            version,
+        )
+
+    def covering(
+        self, metadata: Mapping[str, Mapping[str, Any]], uuids: Iterable[str]
+    ) -> "RuleSnapshot":
+        """
+        :param metadata: Compiled metadata by uuid, for mods missing from the
+            snapshot.
+        :param uuids: Uuids of the mods that must be in the snapshot.
+        :return: This snapshot if it has the rules of every mod, else a copy of
+            the same version with the missing mods added.
+        """
+        missing = [uuid for uuid in uuids if uuid not in self.rules]
+        if not missing:
+            return self
+        logger.warning(
+            f"{len(missing)} mods are not in rule snapshot version {self.version}"
+        )
+        rules = dict(self.rules)
+        rules.update((uuid, ModRules.from_metadata(metadata[uuid])) for uuid in missing)
+        return RuleSnapshot(rules, self.version)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # The rules mapping is read-only, so pickle a copy, e.g. for the batch
+        # sort worker processes
+        return (RuleSnapshot, (dict(self.rules), self.version))
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def __contains__(self, uuid: object) -> bool:
+        return uuid in self.rules
+
+    def __getitem__(self, uuid: str) -> ModRules:
+        return self.rules[uuid]
+
+    def get(self, uuid: str) -> ModRules | None:
+        return self.rules.get(uuid)
@@ -0,0 +1,491 @@
+import hashlib
+import mmap
+import os
+import struct
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Iterable, Iterator, MutableMapping
+
+import msgspec
+from loguru import logger
+
+from app.models.metadata.metadata_structure import SteamDbEntry
+
+# Bump this whenever the binary layout changes, so that indexes written by older
+# versions are rebuilt instead of misread.
+STEAM_DB_INDEX_FORMAT_VERSION = 1
+STEAM_DB_INDEX_FOLDER_NAME = "steam_db_index"
+
+_MAGIC = b"RSSTMDB\x00"
+# magic, format version, DB "version", source mtime_ns, source size,
+# entry count, packageId count, extras offset, extras length
+_HEADER = struct.Struct("<8sIqqqIIQQ")
+# key offset, key length, value offset, value length
+_RECORD = struct.Struct("<QIQI")
+
+
+def _entry_packageid(entry: Any) -> str | None:
+    """The lowercased "packageId" of a SteamDB entry, as matched by the UI."""
+    if isinstance(entry, dict) and isinstance(entry.get("packageId"), str):
+        return entry["packageId"].lower()
+    return None
+
+
+def build_steam_db_index(db_path: Path, index_path: Path) -> None:
+    """
+    Compile a steamDB.json into the binary index format read by SteamDbIndex.
+
+    The file holds a header, a table of fixed-width records sorted by
+    PublishedFileId, a table sorted by lowercased packageId that points back to
+    PublishedFileIds, and a blob with the keys and the msgpack-encoded entries.
+
+    :param db_path: Path to the steamDB.json to compile.
+    :param index_path: Path to write the index to. Written atomically.
+    """
+    db_stat = os.stat(db_path)
+    with open(db_path, "rb") as f:
+        db_data = msgspec.json.decode(f.read())
+    database: dict[str, Any] = db_data.get("database") or {}
+
+    # Small maps used by compile_metadata, kept decoded when the index is opened
+    publishedfileid_to_packageid: dict[str, str] = {}
+    packageid_to_name: dict[str, Any] = {}
+    for publishedfileid, entry in database.items():
+        if isinstance(entry, dict) and entry.get("packageid"):
+            publishedfileid_to_packageid[publishedfileid] = entry["packageid"].lower()
+            if entry.get("name"):
+                packageid_to_name[entry["packageid"]] = entry["name"]
+
+    blob = bytearray()
+    entry_records: list[tuple[int, int, int, int]] = []
+    key_refs: dict[str, tuple[int, int]] = {}
+    for publishedfileid in sorted(database, key=lambda key: key.encode("utf-8")):
+        key = publishedfileid.encode("utf-8")
+        key_refs[publishedfileid] = (len(blob), len(key))
+        blob += key
+        value = msgspec.msgpack.encode(database[publishedfileid], order="deterministic")
+        entry_records.append((*key_refs[publishedfileid], len(blob), len(value)))
+        blob += value
+
+    packageid_records: list[tuple[bytes, int, int, int, int]] = []
+    for publishedfileid, entry in database.items():
+        packageid = _entry_packageid(entry)
+        if packageid:
+            key = packageid.encode("utf-8")
+            packageid_records.append(
+                (key, len(blob), len(key), *key_refs[publishedfileid])
+            )
+            blob += key
+    packageid_records.sort(key=lambda record: (record[0], record[3]))
+
+    extras = msgspec.msgpack.encode([publishedfileid_to_packageid, packageid_to_name])
+    data_offset = _HEADER.size + _RECORD.size * (
+        len(entry_records) + len(packageid_records)
+    )
+    extras_offset = data_offset + len(blob)
+
+    tmp_path = index_path.with_name(index_path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(
+            _HEADER.pack(
+                _MAGIC,
+                STEAM_DB_INDEX_FORMAT_VERSION,
+                int(db_data.get("version", 0)),
+                db_stat.st_mtime_ns,
+                db_stat.st_size,
+                len(entry_records),
+                len(packageid_records),
+                extras_offset,
+                len(extras),
+            )
+        )
+        for key_offset, key_length, value_offset, value_length in entry_records:
+            f.write(
+                _RECORD.pack(
+                    data_offset + key_offset,
+                    key_length,
+                    data_offset + value_offset,
+                    value_length,
+                )
+            )
+        for _, key_offset, key_length, value_offset, value_length in packageid_records:
+            f.write(
+                _RECORD.pack(
+                    data_offset + key_offset,
+                    key_length,
+                    data_offset + value_offset,
+                    value_length,
+                )
+            )
+        f.write(blob)
+        f.write(extras)
+    os.replace(tmp_path, index_path)
+    logger.info(
+        f"Compiled SteamDB index with {len(entry_records)} entries: {index_path}"
+    )
+
+
+def steam_db_index_path(db_path: Path, index_folder: Path) -> Path:
+    """
+    Return the index path for the current contents of a steamDB.json.
+
+    The name includes the JSON's mtime and size, so a changed DB always gets a
+    new index file and an index still mapped by a previous load is never
+    overwritten.
+
+    :param db_path: Path to the steamDB.json.
+    :param index_folder: Folder the indexes are stored in.
+    :return: The path of the index for this version of the DB.
+    """
+    db_stat = os.stat(db_path)
+    return index_folder / (
+        f"{_index_prefix(db_path)}{db_stat.st_mtime_ns}-{db_stat.st_size}.bin"
+    )
+
+
+def _index_prefix(db_path: Path) -> str:
+    digest = hashlib.sha1(str(db_path.resolve()).encode("utf-8")).hexdigest()[:16]
+    return f"steamDB-{digest}-"
+
+
+def open_steam_db_index(db_path: Path, index_folder: Path) -> "SteamDbIndex":
+    """
+    Open the index of a steamDB.json, compiling it first if it is missing or was
+    written for an older version of the JSON.
+
+    Indexes of previous versions of the same JSON are removed, unless they are
+    still in use.
+
+    :param db_path: Path to the steamDB.json.
+    :param index_folder: Folder the indexes are stored in.
+    :return: The opened index.
+    """
+    index_folder.mkdir(parents=True, exist_ok=True)
+    index_path = steam_db_index_path(db_path, index_folder)
+    index = None
+    if index_path.exists():
+        try:
+            index = SteamDbIndex(index_path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable SteamDB index {index_path}: {e}")
+    if index is None:
+        build_steam_db_index(db_path, index_path)
+        index = SteamDbIndex(index_path)
+
+    for stale_path in index_folder.glob(f"{_index_prefix(db_path)}*"):
+        if stale_path != index_path:
+            try:
+                stale_path.unlink()
+            except OSError:
+                # Still memory-mapped by a previous load on Windows
+                pass
+    return index
+
+
+class SteamDbIndex(MutableMapping[str, Any]):
+    """
+    Read-mostly mapping of PublishedFileId -> SteamDB entry, backed by a
+    memory-mapped index written by build_steam_db_index.
+
+    Entries are decoded on first access and kept, so lookups of installed mods
+    stay cheap and in-place edits of an entry (such as blacklisting) persist.
+    Assignments and deletions only change this object, not the index file.
+    Iterating items() or values() decodes entries without keeping them.
+
+    The index can be pickled, which re-opens the same file in the receiving
+    process instead of copying the entries.
+    """
+
+    def __init__(self, index_path: Path) -> None:
+        self.index_path = index_path
+        with open(index_path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (
+                magic,
+                format_version,
+                self.version,
+                self.source_mtime_ns,
+                self.source_size,
+                self._entry_count,
+                self._packageid_count,
+                extras_offset,
+                extras_length,
+            ) = _HEADER.unpack_from(self._mmap, 0)
+            if magic != _MAGIC or format_version != STEAM_DB_INDEX_FORMAT_VERSION:
+                raise ValueError("Not a SteamDB index, or an unsupported format")
+            self._packageid_table = _HEADER.size + _RECORD.size * self._entry_count
+            extras = msgspec.msgpack.decode(
+                self._mmap[extras_offset : extras_offset + extras_length]
+            )
+        except (struct.error, msgspec.DecodeError) as e:
+            self._mmap.close()
+            raise ValueError(f"Corrupt SteamDB index: {e}") from e
+        except ValueError:
+            self._mmap.close()
+            raise
+        self.publishedfileid_to_packageid: dict[str, str] = extras[0]
+        self.packageid_to_name: dict[str, Any] = extras[1]
+        self._entries: dict[str, Any] = {}
+        self._added: set[str] = set()
+        self._deleted: set[str] = set()
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (SteamDbIndex, (self.index_path,))
+
+    def _record(self, table_offset: int, position: int) -> tuple[int, int, int, int]:
+        return _RECORD.unpack_from(self._mmap, table_offset + position * _RECORD.size)
+
+    def _key(self, table_offset: int, position: int) -> bytes:
+        key_offset, key_length, _, _ = self._record(table_offset, position)
+        return self._mmap[key_offset : key_offset + key_length]
+
+    def _find(self, key: str) -> int:
+        """Position of a PublishedFileId in the index file, or -1."""
+        encoded = key.encode("utf-8")
+        position = bisect_left(
+            range(self._entry_count),
+            encoded,
+            key=lambda i: self._key(_HEADER.size, i),
+        )
+        if (
+            position < self._entry_count
+            and self._key(_HEADER.size, position) == encoded
+        ):
+            return position
+        return -1
+
+    def raw(self, key: str) -> bytes | None:
+        """
+        Return the msgpack encoding of an entry as stored in the index file.
+
+        :param key: The PublishedFileId.
+        :return: The encoded entry, or None if the file has no such entry.
+        """
+        position = self._find(key) if isinstance(key, str) else -1
+        if position < 0:
+            return None
+        _, _, value_offset, value_length = self._record(_HEADER.size, position)
+        return self._mmap[value_offset : value_offset + value_length]
+
+    def _decode(self, key: str) -> Any:
+        if key in self._entries:
+            return self._entries[key]
+        if key in self._deleted:
+            raise KeyError(key)
+        value = self.raw(key)
+        if value is None:
+            raise KeyError(key)
+        return msgspec.msgpack.decode(value)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._entries:
+            return self._entries[key]
+        # setdefault, so concurrent ModParser threads share one decoded entry
+        return self._entries.setdefault(key, self._decode(key))
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str) or key in self._deleted:
+            return False
+        return key in self._entries or self._find(key) >= 0
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self._deleted or self._find(key) < 0:
+            self._added.add(key)
+        self._deleted.discard(key)
+        self._entries[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._entries.pop(key, None)
+        if key in self._added:
+            self._added.discard(key)
+        else:
+            self._deleted.add(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for position in range(self._entry_count):
+            key = self._key(_HEADER.size, position).decode("utf-8")
+            if key not in self._deleted:
+                yield key
+        yield from list(self._added)
+
+    def __len__(self) -> int:
+        return self._entry_count - len(self._deleted) + len(self._added)
+
+    def items(self) -> Iterator[tuple[str, Any]]:  # type: ignore[override]
+        for key in self:
+            yield key, self._decode(key)
+
+    def values(self) -> Iterator[Any]:  # type: ignore[override]
+        for key in self:
+            yield self._decode(key)
+
+    def publishedfileids_for_packageid(self, packageid: str) -> list[str]:
+        """
+        Return the PublishedFileIds of the entries with a given "packageId".
+
+        :param packageid: The packageId, matched case-insensitively.
+        :return: The matching PublishedFileIds.
+        """
+        encoded = packageid.lower().encode("utf-8")
+        position = bisect_left(
+            range(self._packageid_count),
+            encoded,
+            key=lambda i: self._key(self._packageid_table, i),
+        )
+        publishedfileids = []
+        while (
+            position < self._packageid_count
+            and self._key(self._packageid_table, position) == encoded
+        ):
+            _, _, key_offset, key_length = self._record(self._packageid_table, position)
+            publishedfileid = self._mmap[key_offset : key_offset + key_length].decode(
+                "utf-8"
+            )
+            # Entries changed in memory are matched below
+            if publishedfileid not in self._entries and (
+                publishedfileid not in self._deleted
+            ):
+                publishedfileids.append(publishedfileid)
+            position += 1
+        for publishedfileid, entry in list(self._entries.items()):
+            if _entry_packageid(entry) == packageid.lower():
+                publishedfileids.append(publishedfileid)
+        return publishedfileids
+
+    def changed_keys(self, other: "SteamDbIndex") -> set[str]:
+        """
+        Return the PublishedFileIds whose entries differ from another index,
+        comparing the encoded entries instead of decoding them.
+
+        :param other: The index to compare with.
+        :return: The keys that were added, removed or changed.
+        """
+        overlay = set(self._entries) | set(other._entries)
+        if (
+            not overlay
+            and self.source_mtime_ns == other.source_mtime_ns
+            and self.source_size == other.source_size
+            and self.index_path == other.index_path
+        ):
+            return set()
+        keys = set(self) | set(other)
+        return {
+            key
+            for key in keys
+            if (
+                self.get(key) != other.get(key)
+                if key in overlay
+                else self.raw(key) != other.raw(key)
+            )
+        }
+
+    def close(self) -> None:
+        """Unmap the index file."""
+        self._mmap.close()
+
+
+class SteamDbEntries(MutableMapping[str, Any]):
+    """
+    Mapping of PublishedFileId -> SteamDB entry, backed by the SteamDbEntry
+    structs decoded with the SteamDbSchema.
+
+    Structs are converted to the dicts used by the rest of RimSort on first
+    access and kept, so in-place edits of an entry (such as blacklisting)
+    persist. Iterating items() or values() converts entries without keeping
+    them, like SteamDbIndex.
+    """
+
+    def __init__(self, database: dict[str, SteamDbEntry]) -> None:
+        self._entries: dict[str, Any] = dict(database)
+        # Same small maps as SteamDbIndex, for entries with a lowercase "packageid"
+        self.publishedfileid_to_packageid: dict[str, str] = {
+            publishedfileid: entry.packageid.lower()
+            for publishedfileid, entry in database.items()
+            if entry.packageid
+        }
+        self.packageid_to_name: dict[str, Any] = {
+            entry.packageid: entry.name
+            for entry in database.values()
+            if entry.packageid and entry.name
+        }
+
+    def __getitem__(self, key: str) -> Any:
+        entry = self._entries[key]
+        if isinstance(entry, SteamDbEntry):
+            entry = self._entries[key] = entry.to_dict()
+        return entry
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._entries[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self._entries[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def items(self) -> Iterator[tuple[str, Any]]:  # type: ignore[override]
+        for key, entry in list(self._entries.items()):
+            if isinstance(entry, SteamDbEntry):
+                entry = entry.to_dict()
+            yield key, entry
+
+    def values(self) -> Iterator[Any]:  # type: ignore[override]
+        for _, entry in self.items():
+            yield entry
+
+    def changed_keys(self, other: "SteamDbEntries") -> set[str]:
+        """
+        Return the PublishedFileIds whose entries differ from another DB,
+        comparing the decoded structs directly where neither was converted.
+
+        :param other: The DB to compare with.
+        :return: The keys that were added, removed or changed.
+        """
+        changed = set()
+        for key in self._entries.keys() | other._entries.keys():
+            entry = self._entries.get(key)
+            other_entry = other._entries.get(key)
+            if isinstance(entry, SteamDbEntry) and isinstance(
+                other_entry, SteamDbEntry
+            ):
+                if entry != other_entry:
+                    changed.add(key)
+            elif self.get(key) != other.get(key):
+                changed.add(key)
+        return changed
+
+
+def find_publishedfileids_by_packageid(
+    steam_db: MutableMapping[str, Any], packageids: Iterable[str]
+) -> dict[str, list[str]]:
+    """
+    Return the PublishedFileIds of the SteamDB entries with the given
+    "packageId"s, using the SteamDB index if available.
+
+    :param steam_db: The loaded SteamDB, either a dict or a SteamDbIndex.
+    :param packageids: The lowercased packageIds to look up.
+    :return: Dict of packageId -> PublishedFileIds, for packageIds that were found.
+    """
+    found: dict[str, list[str]] = {}
+    if isinstance(steam_db, SteamDbIndex):
+        for packageid in packageids:
+            publishedfileids = steam_db.publishedfileids_for_packageid(packageid)
+            if publishedfileids:
+                found[packageid] = publishedfileids
+        return found
+    packageids = set(packageids)
+    for publishedfileid, entry in steam_db.items():
+        entry_packageid = _entry_packageid(entry)
+        if entry_packageid in packageids:
+            found.setdefault(entry_packageid, []).append(publishedfileid)
+    return found
@@ -72,6 +72,121 @@ def json_to_xml_write(
     logger.debug("Finished writing JSON to XML")
 
 
+# Lowercased About.xml <ModMetaData> tags consumed by RimSort. Other tags are skipped
+# by extract_about_xml_metadata. <author> is stored under "authors".
+ABOUT_XML_TAGS = frozenset(
+    {
+        "authors",
+        "description",
+        "descriptionsbyversion",
+        "forceloadafter",
+        "forceloadbefore",
+        "incompatiblewith",
+        "incompatiblewithbyversion",
+        "loadafter",
+        "loadafterbyversion",
+        "loadbefore",
+        "loadbeforebyversion",
+        "moddependencies",
+        "moddependenciesbyversion",
+        "modiconpath",
+        "modversion",
+        "name",
+        "packageid",
+        "supportedversions",
+        "targetversion",
+        "url",
+    }
+)
+
+
+def _element_to_json(element: etree._Element) -> Any:
+    """
+    Convert an element to the same structure xmltodict.parse produces for it.
+
+    :param element: The element to convert.
+    :return: The element text, None if the element is empty, or a dict of
+        attributes (@-prefixed), children and text (#text).
+    """
+    text = element.text
+    attrib = element.attrib
+    if not attrib and not len(element):
+        # Fast path for leaf elements such as <li>, which make up most of About.xml
+        return (text.strip() or None) if text else None
+    result: dict[str, Any] = {f"@{str(key)}": value for key, value in attrib.items()}
+    text_parts = [text] if text else []
+    for child in element:
+        if child.tail:
+            text_parts.append(child.tail)
+        value = _element_to_json(child)
+        if child.tag in result:
+            # Repeated tags are collected into a list
+            existing = result[child.tag]
+            if isinstance(existing, list):
+                existing.append(value)
+            else:
+                result[child.tag] = [existing, value]
+        else:
+            result[child.tag] = value
+    joined_text = "".join(text_parts).strip()
+    if not result:
+        return joined_text or None
+    if joined_text:
+        result["#text"] = joined_text
+    return result
+
+
+def extract_about_xml_metadata(path: str) -> dict[str, Any] | None:
+    """
+    Extract the <ModMetaData> tags RimSort consumes from an About.xml file.
+
+    The file is streamed once, and only the tags in ABOUT_XML_TAGS are converted.
+    Keys are lowercased and <author> is stored as "authors". Values have the same
+    structure as xml_path_to_json produces.
+
+    :param path: Path to the About.xml file.
+    :return: Dict of the extracted tags, or None if the root element is not
+        <ModMetaData> or has no children.
+    :raises etree.XMLSyntaxError: If the file is not well-formed XML.
+    """
+    metadata: dict[str, Any] = {}
+    # Original tag of each key, to tell repeated tags apart from case variants
+    source_tags: dict[str, str] = {}
+    found_tags = False
+    depth = 0
+    context = etree.iterparse(
+        path, events=("start", "end"), remove_comments=True, remove_pis=True
+    )
+    for event, elem in context:
+        if event == "start":
+            if depth == 0 and str(elem.tag).lower() != "modmetadata":
+                logger.error(f"Root element <modmetadata> does not exist in: {path}")
+                return None
+            depth += 1
+            continue
+        depth -= 1
+        if depth != 1:
+            continue
+        found_tags = True
+        key = str(elem.tag).lower()
+        if key == "author":
+            key = "authors"
+        if key in ABOUT_XML_TAGS:
+            value = _element_to_json(elem)
+            if source_tags.get(key) == elem.tag:
+                # Repeated tags are collected into a list
+                existing = metadata[key]
+                if isinstance(existing, list):
+                    existing.append(value)
+                else:
+                    metadata[key] = [existing, value]
+            else:
+                metadata[key] = value
+                source_tags[key] = str(elem.tag)
+        elem.clear()
+    return metadata if found_tags else None
+
+
 def extract_xml_package_ids(path: str) -> set[str]:
     """
     Extracts package ids between <modIds> and </modIds>.
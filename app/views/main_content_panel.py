@@ -31,9 +31,11 @@ from PySide6.QtCore import (
     Qt,
     QThread,
     Signal,
+    SignalInstance,
     Slot,
 )
 from PySide6.QtWidgets import (
+    QApplication,
     QFrame,
     QHBoxLayout,
     QLabel,
@@ -48,6 +50,7 @@ from PySide6.QtWidgets import (
 import app.utils.constants as app_constants
 import app.utils.metadata as metadata
 import app.views.dialogue as dialogue
+from app.controllers.sort_cache_controller import CachedSort, SortCacheController
 from app.controllers.sort_controller import Sorter
 from app.models.animations import LoadingAnimation
 from app.utils.app_info import AppInfo
@@ -338,10 +341,21 @@ class MainContent(QObject):
             self.active_mods_uuids_last_save: list[str] = []
             self.active_mods_uuids_restore_state: list[str] = []
             self.inactive_mods_uuids_restore_state: list[str] = []
+            # Whether the lists were populated from ModsConfig.xml. Not until a
+            # refresh completes, so the empty lists of a cancelled initial
+            # refresh are not saved.
+            self.mod_lists_loaded = False
 
             # Store duplicate_mods for global access
             self.duplicate_mods: dict[str, Any] = {}
 
+            # Sorter of the last successful sort, the start of incremental sorts
+            self.last_sorter: Sorter | None = None
+            # Full sorts of the active list, pre-computed in the background
+            self.sort_cache = SortCacheController(self.settings_controller)
+            EventBus().list_updated_signal.connect(self._schedule_sort_precompute)
+            EventBus().settings_have_changed.connect(self._schedule_sort_precompute)
+
             # Instantiate query runner
             self.query_runner: RunnerPanel | None = None
 
@@ -653,6 +667,7 @@ class MainContent(QObject):
             self.inactive_mods_uuids_restore_state = inactive_mods_uuids
 
         self._insert_data_into_lists(active_mods_uuids, inactive_mods_uuids)
+        self.mod_lists_loaded = True
 
     #########
     # SLOTS # Can this be cleaned up & moved to own module...?
@@ -1216,7 +1231,12 @@ class MainContent(QObject):
     # INFO PANEL ANIMATIONS
 
     def do_threaded_loading_animation(
-        self, gif_path: str, target: Callable[..., Any], text: str | None = None
+        self,
+        gif_path: str,
+        target: Callable[..., Any],
+        text: str | None = None,
+        progress_signal: SignalInstance | None = None,
+        cancel: Callable[[], None] | None = None,
     ) -> Any:
         # Hide the info panel widgets
         self.mod_info_panel.info_panel_frame.hide()
@@ -1235,6 +1255,30 @@ class MainContent(QObject):
             loading_animation_text_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
             loading_animation_text_label.setObjectName("loadingAnimationString")
             self.mod_info_panel.panel.addWidget(loading_animation_text_label)
+        # If a progress signal is specified, display its (done, total) counts
+        if progress_signal is not None:
+            self.loading_animation_progress_label = QLabel()
+            self.loading_animation_progress_label.setAlignment(
+                Qt.AlignmentFlag.AlignCenter
+            )
+            self.loading_animation_progress_label.setObjectName(
+                "loadingAnimationString"
+            )
+            self.mod_info_panel.panel.addWidget(self.loading_animation_progress_label)
+            progress_signal.connect(self._on_loading_animation_progress)
+        # If the target can be cancelled, add a button for it that stays enabled
+        loading_animation_cancel_button = None
+        if cancel is not None:
+            loading_animation_cancel_button = QPushButton(self.tr("Cancel"))
+            loading_animation_cancel_button.clicked.connect(cancel)
+            loading_animation_cancel_button.clicked.connect(
+                partial(loading_animation_cancel_button.setEnabled, False)
+            )
+            self.mod_info_panel.panel.addWidget(loading_animation_cancel_button)
+            parent = loading_animation_cancel_button.parentWidget()
+            while parent is not None:
+                parent.setEnabled(True)
+                parent = parent.parentWidget()
         loop = QEventLoop()
         loading_animation.finished.connect(loop.quit)
         loop.exec_()
@@ -1243,6 +1287,15 @@ class MainContent(QObject):
         if text and loading_animation_text_label is not None:
             self.mod_info_panel.panel.removeWidget(loading_animation_text_label)
             loading_animation_text_label.close()
+        if progress_signal is not None:
+            progress_signal.disconnect(self._on_loading_animation_progress)
+            self.mod_info_panel.panel.removeWidget(
+                self.loading_animation_progress_label
+            )
+            self.loading_animation_progress_label.close()
+        if loading_animation_cancel_button is not None:
+            self.mod_info_panel.panel.removeWidget(loading_animation_cancel_button)
+            loading_animation_cancel_button.close()
         # Enable widgets again after loading
         self.disable_enable_widgets_signal.emit(True)
         # Show the info panel widgets
@@ -1250,6 +1303,12 @@ class MainContent(QObject):
         logger.debug(f"Returning {type(data)}")
         return data
 
+    @Slot(int, int)
+    def _on_loading_animation_progress(self, done: int, total: int) -> None:
+        self.loading_animation_progress_label.setText(
+            self.tr("{done} of {total} mods").format(done=done, total=total)
+        )
+
     # ACTIONS PANEL
 
     def _do_refresh(self, is_initial: bool = False) -> None:
@@ -1281,7 +1340,7 @@ class MainContent(QObject):
         # Check if paths are set
         if self.check_if_essential_paths_are_set(prompt=is_initial):
             # Run expensive calculations to set cache data
-            self.do_threaded_loading_animation(
+            refreshed = self.do_threaded_loading_animation(
                 gif_path=str(
                     AppInfo().theme_data_folder / "default-icons" / "rimsort.gif"
                 ),
@@ -1289,7 +1348,14 @@ class MainContent(QObject):
                     self.metadata_manager.refresh_cache, is_initial=is_initial
                 ),
                 text=self.tr("Scanning mod sources and populating metadata..."),
+                progress_signal=self.metadata_manager.parse_progress_signal,
+                cancel=self.metadata_manager.cancel_refresh,
             )
+            if not refreshed:
+                # The metadata of the last refresh was kept, and so are the lists
+                logger.warning("Refresh was cancelled, keeping the current mod lists")
+                EventBus().refresh_finished.emit()
+                return
 
             # Insert mod data into list
             self.__repopulate_lists(is_initial=is_initial)
@@ -1396,6 +1462,10 @@ class MainContent(QObject):
         # Re-enable widgets after inserting
         self.disable_enable_widgets_signal.emit(True)
 
+    @Slot()
+    def _schedule_sort_precompute(self) -> None:
+        self.sort_cache.schedule(self.mods_panel.active_mods_list.uuids)
+
     def _do_sort(self, check_deps: bool = True) -> None:
         """
         Trigger sorting of all active mods using user-configured algorithm
@@ -1470,7 +1540,26 @@ class MainContent(QObject):
             logger.error(f"Sort failed. Sorting algorithm not implemented: {e}")
             return
 
-        success, new_order = sorter.sort()
+        # Holding Shift while sorting always does a full sort
+        if (
+            self.settings_controller.settings.incremental_sort
+            and self.last_sorter is not None
+            and not QApplication.keyboardModifiers() & Qt.KeyboardModifier.ShiftModifier
+        ):
+            success, new_order = sorter.sort_incrementally(self.last_sorter)
+        else:
+            # Full sorts are pre-computed in the background when the list changes
+            sort_cache_key = self.sort_cache.key(active_mods, sorter.rule_snapshot)
+            cached_sort = self.sort_cache.get(sort_cache_key)
+            if cached_sort is not None:
+                sorter = cached_sort.sorter
+                success, new_order = True, list(cached_sort.order)
+            else:
+                success, new_order = sorter.sort()
+                if success:
+                    self.sort_cache.put(sort_cache_key, CachedSort(new_order, sorter))
+        if success:
+            self.last_sorter = sorter
 
         # Log the sort result and the order
         logger.debug(
@@ -2258,6 +2347,18 @@ class MainContent(QObject):
         """
         Method to save the current list of active mods to the selected ModsConfig.xml
         """
+        if not self.mod_lists_loaded:
+            logger.warning("Not saving, the mod lists were not loaded by a refresh")
+            dialogue.show_warning(
+                title=self.tr("Unable to save"),
+                text=self.tr("The mod lists have not been loaded."),
+                information=self.tr(
+                    "The refresh was cancelled before your mods were loaded. "
+                    "Refresh to load them before saving, so that ModsConfig.xml "
+                    "keeps your active mods."
+                ),
+            )
+            return
         logger.info("Saving current active mods to ModsConfig.xml")
         active_mods = []
         for uuid in self.mods_panel.active_mods_list.uuids:
@@ -3074,7 +3175,7 @@ class MainContent(QObject):
                             time.time()
                             + self.settings_controller.settings.database_expiry
                         ),
-                        "database": self.metadata_manager.external_steam_metadata,
+                        "database": dict(self.metadata_manager.external_steam_metadata),
                     },
                     output,
                     indent=4,
@@ -883,9 +883,11 @@ class MainWindow(QMainWindow):
                         steam_install_path,
                         target_steam_install_path,
                         symlinks=True,
-                        ignore=lambda d, names: ["steamapps/workshop/content/294100"]
-                        if d == steam_install_path
-                        else [],
+                        ignore=lambda d, names: (
+                            ["steamapps/workshop/content/294100"]
+                            if d == steam_install_path
+                            else []
+                        ),
                     )
                     # Unlink steam/workshop/content/294100 symlink if it exists, and relink it to our new target local mods folder
                     link_path = str(
@@ -1038,6 +1040,7 @@ class MainWindow(QMainWindow):
                         instance_path / "aux_metadata.db"
                     )
                 )
+                aux_metadata_controller.close()
                 aux_metadata_controller.engine.dispose()
                 try:
                     rmtree(
@@ -1061,6 +1064,8 @@ class MainWindow(QMainWindow):
 
     def __switch_to_instance(self, instance: str) -> None:
         self.stop_watchdog_if_running()
+        # Commit queued Aux DB updates of the previous instance
+        AuxMetadataController.flush_all()
         # Set current instance
         self.settings_controller.settings.current_instance = instance
         instance_path = str(Path(AppInfo().app_storage_folder) / "instances" / instance)
@@ -1,4 +1,3 @@
-import os
 from datetime import datetime
 from pathlib import Path
 from re import match
@@ -341,14 +340,10 @@ class ModInfo:
         if not uuid:
             logger.error("Unable to retrieve uuid when saving user notes to Aux DB.")
             return
-        with aux_metadata_controller.Session() as aux_metadata_session:
-            mod_path = self.metadata_manager.internal_local_metadata[uuid]["path"]
-            aux_metadata_controller.update(
-                aux_metadata_session,
-                mod_path,
-                user_notes=new_notes,
-            )
-        logger.debug(f"Finished updating notes for UUID: {mod_data['uuid']}")
+        # Notes are saved as they are typed, let the writer batch the commits
+        mod_path = self.metadata_manager.internal_local_metadata[uuid]["path"]
+        aux_metadata_controller.queue_update(mod_path, user_notes=new_notes)
+        logger.debug(f"Queued notes update for UUID: {mod_data['uuid']}")
 
     def show_user_mod_notes(self, item: CustomListWidgetItem) -> None:
         # Only show notes tab when a mod is selected
@@ -491,13 +486,15 @@ class ModInfo:
 
             # Set filesystem modification time
             mod_path = mod_info.get("path")
-            if (
-                self.settings_controller.settings.enable_advanced_filtering
+            snapshot = (
+                self.metadata_manager.directory_snapshots.get(mod_path)
+                if self.settings_controller.settings.enable_advanced_filtering
                 and mod_path
-                and os.path.exists(mod_path)
-            ):
+                else None
+            )
+            if snapshot is not None:
                 try:
-                    fs_time = int(os.path.getmtime(mod_path))
+                    fs_time = snapshot.mtime
                     dt_fs = datetime.fromtimestamp(fs_time)
                     formatted_fs_time = dt_fs.strftime("%Y-%m-%d %H:%M:%S")
                     self.mod_info_filesystem_time_value.setText(formatted_fs_time)
@@ -601,67 +598,22 @@ class ModInfo:
             logger.debug(
                 f"Retrieved mod path to parse preview image: {workshop_folder_path}"
             )
-            if os.path.exists(workshop_folder_path):
-                about_folder_name = "About"
-                about_folder_target_path = str(
-                    (Path(workshop_folder_path) / about_folder_name)
+            snapshot = (
+                self.metadata_manager.directory_snapshots.get(workshop_folder_path)
+                if workshop_folder_path
+                else None
+            )
+            # Look for a case-insensitive "Preview.png" in a case-insensitive About folder
+            if snapshot is None or snapshot.preview_file is None:
+                logger.debug("No preview image found for the mod")
+                pixmap = QPixmap(self.missing_image_path)
+            else:
+                logger.debug("Preview image found")
+                pixmap = QPixmap(snapshot.preview_file)
+            self.preview_picture.setPixmap(
+                pixmap.scaled(
+                    self.preview_picture.size(),
+                    Qt.AspectRatioMode.KeepAspectRatio,
                 )
-                if os.path.exists(about_folder_target_path):
-                    # Look for a case-insensitive About folder
-                    invalid_folder_path_found = True
-                    for temp_file in os.scandir(workshop_folder_path):
-                        if (
-                            temp_file.name.lower() == about_folder_name.lower()
-                            and temp_file.is_dir()
-                        ):
-                            about_folder_name = temp_file.name
-                            invalid_folder_path_found = False
-                            break
-                    # Look for a case-insensitive "Preview.png" file
-                    invalid_file_path_found = True
-                    preview_file_name = "Preview.png"
-                    for temp_file in os.scandir(
-                        str((Path(workshop_folder_path) / about_folder_name))
-                    ):
-                        if (
-                            temp_file.name.lower() == preview_file_name.lower()
-                            and temp_file.is_file()
-                        ):
-                            preview_file_name = temp_file.name
-                            invalid_file_path_found = False
-                            break
-                    # If there was an issue getting the expected path, track and exit
-                    if invalid_folder_path_found or invalid_file_path_found:
-                        logger.debug("No preview image found for the mod")
-                        pixmap = QPixmap(self.missing_image_path)
-                        self.preview_picture.setPixmap(
-                            pixmap.scaled(
-                                self.preview_picture.size(),
-                                Qt.AspectRatioMode.KeepAspectRatio,
-                            )
-                        )
-                    else:
-                        logger.debug("Preview image found")
-                        image_path = str(
-                            (
-                                Path(workshop_folder_path)
-                                / about_folder_name
-                                / preview_file_name
-                            )
-                        )
-                        pixmap = QPixmap(image_path)
-                        self.preview_picture.setPixmap(
-                            pixmap.scaled(
-                                self.preview_picture.size(),
-                                Qt.AspectRatioMode.KeepAspectRatio,
-                            )
-                        )
-                else:
-                    pixmap = QPixmap(self.missing_image_path)
-                    self.preview_picture.setPixmap(
-                        pixmap.scaled(
-                            self.preview_picture.size(),
-                            Qt.AspectRatioMode.KeepAspectRatio,
-                        )
-                    )
+            )
         logger.debug("Finished displaying mod info")
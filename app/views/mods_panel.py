@@ -1,24 +1,26 @@
 import json
 import os
+import time
 from datetime import datetime
 from enum import Enum
 from functools import partial
 from pathlib import Path
 from shutil import copy2, copytree
 from traceback import format_exc
-from typing import Optional, cast
+from typing import NamedTuple, Optional, cast
 
 from loguru import logger
 from PySide6.QtCore import (
+    QAbstractItemModel,
     QEvent,
-    QItemSelection,
     QModelIndex,
     QObject,
-    QPoint,
-    QRectF,
+    QPersistentModelIndex,
+    QRect,
     QSize,
     Qt,
     QThread,
+    QTimer,
     Signal,
     Slot,
 )
@@ -27,13 +29,15 @@ from PySide6.QtGui import (
     QColor,
     QCursor,
     QDropEvent,
-    QEnterEvent,
     QFocusEvent,
     QFontMetrics,
+    QHelpEvent,
     QIcon,
     QKeyEvent,
     QKeySequence,
-    QResizeEvent,
+    QMouseEvent,
+    QPainter,
+    QPalette,
 )
 from PySide6.QtWidgets import (
     QAbstractItemView,
@@ -49,7 +53,11 @@ from PySide6.QtWidgets import (
     QMessageBox,
     QProgressDialog,
     QPushButton,
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionViewItem,
     QToolButton,
+    QToolTip,
     QVBoxLayout,
     QWidget,
 )
@@ -63,7 +71,7 @@ from app.utils.constants import (
 )
 from app.utils.custom_list_widget_item import CustomListWidgetItem
 from app.utils.custom_list_widget_item_metadata import CustomListWidgetItemMetadata
-from app.utils.custom_qlabels import AdvancedClickableQLabel, ClickableQLabel
+from app.utils.custom_qlabels import AdvancedClickableQLabel
 from app.utils.event_bus import EventBus
 from app.utils.generic import (
     copy_to_clipboard_safely,
@@ -75,6 +83,8 @@ from app.utils.generic import (
     sanitize_filename,
 )
 from app.utils.metadata import MetadataManager, ModMetadata
+from app.utils.mod_list_validation import ModListValidator
+from app.utils.mod_search import ModSearchIndex
 from app.utils.xml import extract_xml_package_ids, fast_rimworld_xml_save_validation
 from app.views.deletion_menu import ModDeletionMenu
 from app.views.dialogue import (
@@ -121,12 +131,12 @@ def uuid_to_filesystem_modified_time(uuid: str) -> int:
     Returns:
         int: The filesystem modification time, or 0 if not available.
     """
-    import os
-
-    metadata = MetadataManager.instance().internal_local_metadata[uuid]
+    metadata_manager = MetadataManager.instance()
+    metadata = metadata_manager.internal_local_metadata[uuid]
     mod_path = metadata.get("path")
-    if mod_path and os.path.exists(mod_path):
-        fs_time = int(os.path.getmtime(mod_path))
+    snapshot = metadata_manager.directory_snapshots.get(mod_path) if mod_path else None
+    if snapshot is not None:
+        fs_time = snapshot.mtime
         mod_name = metadata.get("name", "Unknown")
         logger.debug(f"Mod: {mod_name}, Filesystem time: {fs_time}")
         return fs_time
@@ -162,14 +172,13 @@ def uuid_to_folder_size(uuid: str) -> int:
     Calculate the total size in bytes of the mod folder for the given UUID.
     Returns 0 if the path is missing.
     """
-    metadata = MetadataManager.instance().internal_local_metadata[uuid]
+    metadata_manager = MetadataManager.instance()
+    metadata = metadata_manager.internal_local_metadata[uuid]
     mod_path = metadata.get("path")
-    if not mod_path or not os.path.isdir(mod_path):
-        return 0
-    try:
-        mtime = int(os.path.getmtime(mod_path))
-    except OSError:
+    snapshot = metadata_manager.directory_snapshots.get(mod_path) if mod_path else None
+    if snapshot is None:
         return 0
+    mtime = snapshot.mtime
 
     cached = _FOLDER_SIZE_CACHE.get(mod_path)
     if cached and cached[0] == mtime:
@@ -269,571 +278,6 @@ class FolderSizeWorker(QObject):
         self.finished.emit(sizes)
 
 
-class ModListItemInner(QWidget):
-    """
-    Subclass for QWidget. Used to store data for a single
-    mod and display relevant data on a mod list.
-    """
-
-    toggle_warning_signal = Signal(str, str)
-    toggle_error_signal = Signal(str, str)
-
-    def __init__(
-        self,
-        errors_warnings: str,
-        errors: str,
-        warnings: str,
-        filtered: bool,
-        invalid: bool,
-        mismatch: bool,
-        alternative: bool,
-        settings_controller: SettingsController,
-        uuid: str,
-        mod_color: QColor,
-    ) -> None:
-        """
-        Initialize the QWidget with mod uuid. Metadata can be accessed via MetadataManager.
-
-        All metadata tags are set to the corresponding field if it
-        exists in the metadata dict. See tags:
-        https://rimworldwiki.com/wiki/About.xml
-
-        :param errors_warnings: a string of errors and warnings
-        :param errors: a string of errors for the notification tooltip
-        :param warnings: a string of warnings for the notification tooltip
-        :param filtered: a bool representing whether the widget's item is filtered
-        :param invalid: a bool representing whether the widget's item is an invalid mod
-        :param mismatch: a bool representing whether the widget's item has a version mismatch
-        :param alternative: a bool representing whether the widget's item has a recommended alternative mod
-        :param settings_controller: an instance of SettingsController for accessing settings
-        :param uuid: str, the uuid of the mod which corresponds to a mod's metadata
-        :param mod_color: QColor, the color of the mod's text/background in the modlist
-        """
-
-        super(ModListItemInner, self).__init__()
-
-        # Used to handle hover, select etc. behavior for this custom widget
-        self.setAttribute(Qt.WidgetAttribute.WA_Hover)
-        self._selected = False
-        self._hovered = False
-
-        # Cache MetadataManager instance
-        self.metadata_manager = MetadataManager.instance()
-
-        # Cache error and warning strings for tooltips
-        self.errors_warnings = errors_warnings
-        self.errors = errors
-        self.warnings = warnings
-        # Cache filtered state of widget's item - used to determine styling of widget
-        self.filtered = filtered
-        # Cache invalid state of widget's item - used to determine styling of widget
-        self.invalid = invalid
-        # Cache mismatch state of widget's item - used to determine warning icon visibility
-        self.mismatch = mismatch
-        # Cache alternative state of widget's item - used to determine warning icon visibility
-        self.alternative = alternative
-        # Cache SettingsManager instance
-        self.settings_controller = settings_controller
-        # Cache the mod color
-        self.mod_color: QColor | None = mod_color
-
-        # All data, including name, author, package id, dependencies,
-        # whether the mod is a workshop mod or expansion, etc is encapsulated
-        # in this variable. This is exactly equal to the dict value of a
-        # single all_mods key-value
-        self.uuid = uuid
-        name_value = self.metadata_manager.internal_local_metadata.get(
-            self.uuid, {}
-        ).get("name")
-        if not isinstance(name_value, str):
-            name_value = "name error in mod about.xml"
-        self.list_item_name = name_value
-        self.main_label = QLabel()
-
-        # Visuals
-        self.setToolTip(self.get_tool_tip_text())
-        self.main_item_layout = QHBoxLayout()
-        self.main_item_layout.setContentsMargins(0, 0, 0, 0)
-        self.main_item_layout.setSpacing(0)
-        self.font_metrics = QFontMetrics(self.font())
-
-        # Icons that are conditional
-        self.csharp_icon = None
-        self.xml_icon = None
-        if self.settings_controller.settings.mod_type_filter_toggle:
-            if (
-                self.metadata_manager.internal_local_metadata.get(self.uuid, {}).get(
-                    "csharp"
-                )
-            ) is not None:
-                self.csharp_icon = QLabel()
-                self.csharp_icon.setPixmap(
-                    ModListIcons.csharp_icon().pixmap(QSize(20, 20))
-                )
-                self.csharp_icon.setToolTip(
-                    self.tr("Contains custom C# assemblies (custom code)")
-                )
-            else:
-                self.xml_icon = QLabel()
-                self.xml_icon.setPixmap(ModListIcons.xml_icon().pixmap(QSize(20, 20)))
-                self.xml_icon.setToolTip(
-                    self.tr("Contains custom content (textures / XML)")
-                )
-        self.git_icon = None
-        if (
-            self.metadata_manager.internal_local_metadata[self.uuid]["data_source"]
-            == "local"
-            and self.metadata_manager.internal_local_metadata[self.uuid].get("git_repo")
-            and not self.metadata_manager.internal_local_metadata[self.uuid].get(
-                "steamcmd"
-            )
-        ):
-            self.git_icon = QLabel()
-            self.git_icon.setPixmap(ModListIcons.git_icon().pixmap(QSize(20, 20)))
-            self.git_icon.setToolTip(
-                self.tr("Local mod that contains a git repository")
-            )
-        self.steamcmd_icon = None
-        if self.metadata_manager.internal_local_metadata[self.uuid][
-            "data_source"
-        ] == "local" and self.metadata_manager.internal_local_metadata[self.uuid].get(
-            "steamcmd"
-        ):
-            self.steamcmd_icon = QLabel()
-            self.steamcmd_icon.setPixmap(
-                ModListIcons.steamcmd_icon().pixmap(QSize(20, 20))
-            )
-            self.steamcmd_icon.setToolTip(
-                self.tr("Local mod that can be used with SteamCMD")
-            )
-        # Warning icon hidden by default
-        self.warning_icon_label = ClickableQLabel()
-        self.warning_icon_label.clicked.connect(
-            partial(
-                self.toggle_warning_signal.emit,
-                self.metadata_manager.internal_local_metadata[self.uuid]["packageid"],
-                self.uuid,
-            )
-        )
-        self.warning_icon_label.setPixmap(
-            ModListIcons.warning_icon().pixmap(QSize(20, 20))
-        )
-        # Default to hidden to avoid showing early
-        self.warning_icon_label.setHidden(True)
-        # New icon hidden by default
-        self.new_icon_label = QLabel()
-        self.new_icon_label.setPixmap(ModListIcons.new_icon().pixmap(QSize(20, 20)))
-        self.new_icon_label.setToolTip(self.tr("Not in latest save"))
-        # Default to hidden to avoid showing early
-        self.new_icon_label.setHidden(True)
-        # In-save icon (for inactive list items): hidden by default
-        self.in_save_icon_label = QLabel()
-        self.in_save_icon_label.setPixmap(
-            ModListIcons.clear_icon().pixmap(QSize(20, 20))
-        )
-        self.in_save_icon_label.setToolTip(self.tr("In latest save"))
-        self.in_save_icon_label.setHidden(True)
-        # Error icon hidden by default
-        self.error_icon_label = ClickableQLabel()
-        self.error_icon_label.clicked.connect(
-            partial(
-                self.toggle_error_signal.emit,
-                self.metadata_manager.internal_local_metadata[self.uuid]["packageid"],
-                self.uuid,
-            )
-        )
-        self.error_icon_label.setPixmap(ModListIcons.error_icon().pixmap(QSize(20, 20)))
-        # Default to hidden to avoid showing early
-        self.error_icon_label.setHidden(True)
-        # Icons by mod source
-        self.mod_source_icon = None
-        if not self.git_icon and not self.steamcmd_icon:
-            self.mod_source_icon = QLabel()
-            self.mod_source_icon.setPixmap(self.get_icon().pixmap(QSize(20, 20)))
-            # Set tooltip based on mod source
-            data_source = self.metadata_manager.internal_local_metadata[self.uuid].get(
-                "data_source"
-            )
-            if data_source == "expansion":
-                self.mod_source_icon.setObjectName("expansion")
-                self.mod_source_icon.setToolTip(
-                    self.tr("Official RimWorld content by Ludeon Studios")
-                )
-            elif data_source == "local":
-                if self.metadata_manager.internal_local_metadata[self.uuid].get(
-                    "git_repo"
-                ):
-                    self.mod_source_icon.setObjectName("git_repo")
-                elif self.metadata_manager.internal_local_metadata[self.uuid].get(
-                    "steamcmd"
-                ):
-                    self.mod_source_icon.setObjectName("steamcmd")
-                else:
-                    self.mod_source_icon.setObjectName("local")
-                    self.mod_source_icon.setToolTip(self.tr("Installed locally"))
-            elif data_source == "workshop":
-                self.mod_source_icon.setObjectName("workshop")
-                self.mod_source_icon.setToolTip(self.tr("Subscribed via Steam"))
-        # Set label color if mod has errors/warnings
-        if self.mod_color is not None:
-            self.main_label.setObjectName("ListItemLabelCustomColor")
-            self.handle_mod_color_change(init=True)
-        elif self.filtered:
-            self.main_label.setObjectName("ListItemLabelFiltered")
-        elif errors_warnings:
-            self.main_label.setObjectName("ListItemLabelInvalid")
-        else:
-            self.main_label.setObjectName("ListItemLabel")
-        # Add icons
-        if self.git_icon:
-            self.main_item_layout.addWidget(self.git_icon, Qt.AlignmentFlag.AlignRight)
-        if self.steamcmd_icon:
-            self.main_item_layout.addWidget(
-                self.steamcmd_icon, Qt.AlignmentFlag.AlignRight
-            )
-        if self.mod_source_icon:
-            self.main_item_layout.addWidget(
-                self.mod_source_icon, Qt.AlignmentFlag.AlignRight
-            )
-        if self.csharp_icon:
-            self.main_item_layout.addWidget(
-                self.csharp_icon, Qt.AlignmentFlag.AlignRight
-            )
-        if self.xml_icon:
-            self.main_item_layout.addWidget(self.xml_icon, Qt.AlignmentFlag.AlignRight)
-        # Compose the layout of our widget and set it to the main layout
-        self.main_item_layout.addWidget(self.main_label, Qt.AlignmentFlag.AlignCenter)
-        if self.settings_controller.settings.show_save_comparison_indicators:
-            self.main_item_layout.addWidget(
-                self.in_save_icon_label, Qt.AlignmentFlag.AlignRight
-            )
-            self.main_item_layout.addWidget(
-                self.new_icon_label, Qt.AlignmentFlag.AlignRight
-            )
-        self.main_item_layout.addWidget(
-            self.warning_icon_label, Qt.AlignmentFlag.AlignRight
-        )
-        self.main_item_layout.addWidget(
-            self.error_icon_label, Qt.AlignmentFlag.AlignRight
-        )
-        self.main_item_layout.addStretch()
-        self.setLayout(self.main_item_layout)
-
-        # Reveal if errors or warnings exist
-        if self.warnings:
-            self.warning_icon_label.setToolTip(self.warnings)
-            self.warning_icon_label.setHidden(False)
-        if self.errors:
-            self.error_icon_label.setToolTip(self.errors)
-            self.error_icon_label.setHidden(False)
-
-    def enterEvent(self, event: QEnterEvent) -> None:
-        self._hovered = True
-        if self._selected:
-            return
-        self.setStyleSheet("")
-        super().enterEvent(event)
-
-    def leaveEvent(self, event: QEvent) -> None:
-        self._hovered = False
-        if self._selected:
-            return
-        if self.mod_color is None:
-            self.setStyleSheet("")
-        else:
-            self.handle_mod_color_change(init=True)
-        super().leaveEvent(event)
-
-    def set_selected(self, selected: bool) -> None:
-        self._selected = selected
-        self.handle_selected()
-
-    def handle_selected(self) -> None:
-        if self._selected:
-            self.setStyleSheet("")
-        elif not self._selected:
-            if self.mod_color:
-                self.handle_mod_color_change(init=True)
-            else:
-                self.setStyleSheet("")
-
-    def count_icons(self, widget: QObject) -> int:
-        count = 0
-        if isinstance(widget, QLabel):
-            pixmap = widget.pixmap()
-            if pixmap and not pixmap.isNull():
-                count += 1
-
-        if isinstance(widget, QWidget):
-            for child in widget.children():
-                count += self.count_icons(child)
-
-        return count
-
-    def get_tool_tip_text(self) -> str:
-        """
-        Compose a mod_list_item's tool_tip_text
-
-        :return: string containing the tool_tip_text
-        """
-        metadata = self.metadata_manager.internal_local_metadata.get(self.uuid, {})
-
-        name_line = f"Mod: {metadata.get('name', 'Not specified')}\n"
-
-        authors_tag = metadata.get("authors")
-        authors_text = (
-            ", ".join(authors_tag.get("li", ["Not specified"]))
-            if isinstance(authors_tag, dict)
-            else authors_tag or "Not specified"
-        )
-        author_line = f"Authors: {authors_text}\n"
-
-        package_id = metadata.get("packageid", "Not specified")
-        package_id_line = f"PackageID: {package_id}\n"
-
-        mod_version = metadata.get("modversion", "Not specified")
-        modversion_line = f"Mod Version: {mod_version}\n"
-
-        supported_versions_tag = metadata.get("supportedversions", {})
-        supported_versions_list = supported_versions_tag.get("li")
-        supported_versions_text = (
-            ", ".join(supported_versions_list)
-            if isinstance(supported_versions_list, list)
-            else supported_versions_list or "Not specified"
-        )
-        supported_versions_line = f"Supported Versions: {supported_versions_text}\n"
-
-        path = metadata.get("path", "Not specified")
-        path_line = f"Path: {path}\n"
-
-        # Add folder size and filesystem modification time information without heavy IO on hover
-        mod_path = metadata.get("path")
-        # Folder size: read from in-memory cache only; avoid computing on tooltip
-        folder_size_line = "Folder Size: Not available\n"
-        if self.settings_controller.settings.enable_advanced_filtering:
-            if isinstance(mod_path, str):
-                cached = _FOLDER_SIZE_CACHE.get(mod_path)
-                if cached:
-                    folder_size_line = f"Folder Size: {format_file_size(cached[1])}\n"
-
-        # Filesystem modified time: prefer cached metadata value
-        fs_time_val = metadata.get("internal_time_touched")
-        if isinstance(fs_time_val, int) and fs_time_val > 0:
-            try:
-                dt_fs = datetime.fromtimestamp(fs_time_val)
-                formatted_time = dt_fs.strftime("%Y-%m-%d %H:%M:%S")
-                last_touched_line = f"Filesystem Modified: {formatted_time}"
-            except (ValueError, OSError, OverflowError):
-                last_touched_line = "Filesystem Modified: Invalid timestamp"
-        else:
-            last_touched_line = "Filesystem Modified: Not available"
-
-        return "".join(
-            [
-                name_line,
-                author_line,
-                package_id_line,
-                modversion_line,
-                folder_size_line,
-                supported_versions_line,
-                path_line,
-                last_touched_line,
-            ]
-        )
-
-    def get_icon(self) -> QIcon:  # type: ignore
-        """
-        Check custom tags added to mod metadata upon initialization, and return the corresponding
-        QIcon for the mod's source type (expansion, workshop, or local mod?)
-
-        :return: QIcon object set to the path of the corresponding icon image
-        """
-        if (
-            self.metadata_manager.internal_local_metadata[self.uuid].get("data_source")
-            == "expansion"
-        ):
-            return ModListIcons.ludeon_icon()
-        elif (
-            self.metadata_manager.internal_local_metadata[self.uuid].get("data_source")
-            == "local"
-        ):
-            return ModListIcons.local_icon()
-        elif (
-            self.metadata_manager.internal_local_metadata[self.uuid].get("data_source")
-            == "workshop"
-        ):
-            return ModListIcons.steam_icon()
-        else:
-            logger.error(
-                f"No type found for ModListItemInner with package id {self.metadata_manager.internal_local_metadata[self.uuid].get('packageid')}"
-            )
-
-    def resizeEvent(self, event: QResizeEvent) -> None:
-        """
-        When the label is resized (as the window is resized),
-        also elide the label if needed.
-
-        :param event: the resize event
-        """
-
-        # Count the number of QLabel widgets with QIcon and calculate total icon width
-        icon_count = self.count_icons(self)
-        icon_width = icon_count * 20
-        self.item_width = super().width()
-        text_width_needed = QRectF(
-            self.font_metrics.boundingRect(self.list_item_name)
-        ).width()
-        if text_width_needed > self.item_width - icon_width:
-            available_width = self.item_width - icon_width
-            shortened_text = self.font_metrics.elidedText(
-                self.list_item_name, Qt.TextElideMode.ElideRight, int(available_width)
-            )
-            self.main_label.setText(str(shortened_text))
-        else:
-            self.main_label.setText(self.list_item_name)
-        return super().resizeEvent(event)
-
-    def repolish(self, item: CustomListWidgetItem) -> None:
-        """
-        Repolish the widget items
-        """
-        item_data = item.data(Qt.ItemDataRole.UserRole)
-        error_tooltip = item_data["errors"]
-        warning_tooltip = item_data["warnings"]
-        # If an error exists we show an error icon with error tooltip
-        # If a warning exists we show a warning icon with warning tooltip
-        if error_tooltip:
-            self.error_icon_label.setHidden(False)
-            self.error_icon_label.setToolTip(error_tooltip)
-        else:  # Hide the error icon if no error tool tip text
-            self.error_icon_label.setHidden(True)
-            self.error_icon_label.setToolTip("")
-        if warning_tooltip:
-            self.warning_icon_label.setHidden(False)
-            self.warning_icon_label.setToolTip(warning_tooltip)
-        else:  # Hide the warning icon if no warning tool tip text
-            self.warning_icon_label.setHidden(True)
-            self.warning_icon_label.setToolTip("")
-        # New / In-save icon visibility depends on list type and user setting
-        is_new = bool(item_data.__dict__.get("is_new", False))
-        in_save = bool(item_data.__dict__.get("in_save", False))
-        # Read list_type from persisted item metadata instead of Qt widget to satisfy static typing
-        list_type = cast(str | None, item_data.__dict__.get("list_type"))
-        # Respect setting toggle
-        show_indicators = (
-            self.settings_controller.settings.show_save_comparison_indicators
-        )
-        if not show_indicators:
-            self.new_icon_label.setHidden(True)
-            self.in_save_icon_label.setHidden(True)
-        elif list_type == "Active":
-            self.new_icon_label.setHidden(not is_new)
-            self.in_save_icon_label.setHidden(True)
-        elif list_type == "Inactive":
-            self.new_icon_label.setHidden(True)
-            self.in_save_icon_label.setHidden(not in_save)
-        else:
-            self.new_icon_label.setHidden(True)
-            self.in_save_icon_label.setHidden(True)
-        # Recalculate the widget label's styling based on item data
-        widget_object_name = self.main_label.objectName()
-        if item_data["mod_color"] is not None:
-            self.handle_mod_color_change(item)
-            new_widget_object_name = "ListItemLabelCustomColor"
-        elif item_data["filtered"]:
-            new_widget_object_name = "ListItemLabelFiltered"
-            self.handle_mod_color_reset()
-        elif error_tooltip or warning_tooltip:
-            new_widget_object_name = "ListItemLabelInvalid"
-            self.handle_mod_color_reset()
-        else:
-            new_widget_object_name = "ListItemLabel"
-            self.handle_mod_color_reset()
-        if widget_object_name != new_widget_object_name:
-            logger.debug("Repolishing: " + new_widget_object_name)
-            self.main_label.setObjectName(new_widget_object_name)
-            self.main_label.style().unpolish(self.main_label)
-            self.main_label.style().polish(self.main_label)
-
-    def handle_mod_color_change(
-        self, item: CustomListWidgetItem | None = None, init: bool = False
-    ) -> None:
-        """
-        Handle mod color change (Background or Text).
-
-        :param item: CustomListWidgetItem, instance of CustomListWidgetItem.
-
-        :param init: bool, if running inside __init__ method, uses class attribute.
-
-        """
-        new_mod_color_name: Optional[str] = None
-        if self.settings_controller.settings.color_background_instead_of_text_toggle:
-            # Color background
-            if init:
-                if self.mod_color:
-                    new_mod_color_name = self.mod_color.name()
-                    self.setStyleSheet(f"background: {new_mod_color_name};")
-            elif item:
-                item_data = item.data(Qt.ItemDataRole.UserRole)
-                new_mod_color_name = item_data["mod_color"].name()
-                self.mod_color = item_data[
-                    "mod_color"
-                ]  # Update mod color in ModListItemInner
-                self.setStyleSheet(f"background: {new_mod_color_name};")
-        else:
-            # Color text
-            if init:
-                if self.mod_color:
-                    new_mod_color_name = self.mod_color.name()
-                    self.setStyleSheet(f"color: {new_mod_color_name};")
-            elif item:
-                item_data = item.data(Qt.ItemDataRole.UserRole)
-                new_mod_color_name = item_data["mod_color"].name()
-                self.mod_color = item_data[
-                    "mod_color"
-                ]  # Update mod color in ModListItemInner
-                self.setStyleSheet(f"color: {new_mod_color_name};")
-
-        # Update Aux DB
-        if not init and new_mod_color_name is not None:
-            instance_path = Path(
-                self.settings_controller.settings.current_instance_path
-            )
-            aux_metadata_controller = (
-                AuxMetadataController.get_or_create_cached_instance(
-                    instance_path / "aux_metadata.db"
-                )
-            )
-            with aux_metadata_controller.Session() as aux_metadata_session:
-                mod_path = self.metadata_manager.internal_local_metadata[self.uuid][
-                    "path"
-                ]
-                aux_metadata_controller.update(
-                    aux_metadata_session,
-                    mod_path,
-                    color_hex=new_mod_color_name,
-                )
-
-    def handle_mod_color_reset(self) -> None:
-        # Need to reset custom colors this way because the color is set using setStyleSheet
-        # After reseting, the behavior for unpolish() and polish() works as expected
-        self.setStyleSheet("")
-        # Update ModListItemInner color
-        self.mod_color = None
-        # Update Aux DB
-        instance_path = Path(self.settings_controller.settings.current_instance_path)
-        aux_metadata_controller = AuxMetadataController.get_or_create_cached_instance(
-            instance_path / "aux_metadata.db"
-        )
-        with aux_metadata_controller.Session() as aux_metadata_session:
-            mod_path = self.metadata_manager.internal_local_metadata[self.uuid]["path"]
-            aux_metadata_controller.update(
-                aux_metadata_session,
-                mod_path,
-                color_hex=None,
-            )
-
-
 class ModListIcons:
     _data_path: Path = AppInfo().theme_data_folder / "default-icons"
     _ludeon_icon_path: str = str(_data_path / "ludeon_icon.png")
@@ -936,6 +380,368 @@ class ModListIcons:
         return cls._clear_icon
 
 
+class _ModListRow(NamedTuple):
+    """
+    Layout of a painted mod list row.
+
+    :param name: Mod name, elided to the space left by the icons.
+    :param name_rect: Where the name is drawn.
+    :param icons: Rect, icon, tool tip and badge kind ("warning", "error" or
+        "" if the icon is not clickable) of each icon, from left to right.
+    """
+
+    name: str
+    name_rect: QRect
+    icons: list[tuple[QRect, QIcon, str, str]]
+
+
+class ModListItemDelegate(QStyledItemDelegate):
+    """
+    Paints the rows of a ModListWidget from the item data: the mod name, its
+    source and type icons, and its save comparison, warning and error badges.
+    Replaces a widget per row, so long mod lists scroll without creating
+    widgets.
+    """
+
+    ICON_SIZE = 20
+
+    toggle_warning_signal = Signal(str, str)
+
+    def __init__(
+        self, parent: QWidget, settings_controller: SettingsController
+    ) -> None:
+        """
+        :param parent: The mod list.
+        :param settings_controller: an instance of SettingsController for accessing settings
+        """
+        super().__init__(parent)
+        self.metadata_manager = MetadataManager.instance()
+        self.settings_controller = settings_controller
+        # Name colors come from the theme, which styles labels by object name.
+        # Keep a hidden label per object name and read its palette.
+        self._name_labels: dict[str, QLabel] = {}
+        for object_name in (
+            "ListItemLabel",
+            "ListItemLabelFiltered",
+            "ListItemLabelInvalid",
+        ):
+            label = QLabel(parent)
+            label.setObjectName(object_name)
+            label.hide()
+            self._name_labels[object_name] = label
+
+    def sizeHint(
+        self,
+        option: QStyleOptionViewItem,
+        index: QModelIndex | QPersistentModelIndex,
+    ) -> QSize:
+        return QSize(
+            super().sizeHint(option, index).width(),
+            max(self.ICON_SIZE, option.fontMetrics.height()),
+        )
+
+    def paint(
+        self,
+        painter: QPainter,
+        option: QStyleOptionViewItem,
+        index: QModelIndex | QPersistentModelIndex,
+    ) -> None:
+        # Background, hover and selection as styled by the theme
+        super().paint(painter, option, index)
+        row = self._row(option, index)
+        if row is None:
+            return
+        item_data = index.data(Qt.ItemDataRole.UserRole)
+        state = option.state
+        highlighted = bool(
+            state & (QStyle.StateFlag.State_Selected | QStyle.StateFlag.State_MouseOver)
+        )
+        # Custom mod colors are not shown on hovered or selected rows
+        mod_color = None if highlighted else item_data["mod_color"]
+        color_background = (
+            self.settings_controller.settings.color_background_instead_of_text_toggle
+        )
+        painter.save()
+        if mod_color is not None and color_background:
+            painter.fillRect(option.rect, mod_color)
+        for rect, icon, _, _ in row.icons:
+            icon.paint(painter, rect)
+        if mod_color is not None and not color_background:
+            name_color = mod_color
+        elif item_data["filtered"]:
+            name_color = self._name_color("ListItemLabelFiltered")
+        elif item_data["errors"] or item_data["warnings"]:
+            name_color = self._name_color("ListItemLabelInvalid")
+        else:
+            name_color = self._name_color("ListItemLabel")
+        painter.setFont(option.font)
+        painter.setPen(name_color)
+        painter.drawText(
+            row.name_rect,
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            row.name,
+        )
+        painter.restore()
+
+    def helpEvent(
+        self,
+        event: QHelpEvent,
+        view: QAbstractItemView,
+        option: QStyleOptionViewItem,
+        index: QModelIndex | QPersistentModelIndex,
+    ) -> bool:
+        if event.type() == QEvent.Type.ToolTip:
+            row = self._row(option, index)
+            if row is not None:
+                tool_tip = next(
+                    (
+                        icon_tool_tip
+                        for rect, _, icon_tool_tip, _ in row.icons
+                        if rect.contains(event.pos())
+                    ),
+                    "",
+                )
+                if not tool_tip:
+                    item_data = index.data(Qt.ItemDataRole.UserRole)
+                    tool_tip = self.get_tool_tip_text(item_data["uuid"])
+                QToolTip.showText(event.globalPos(), tool_tip, view)
+                return True
+        return super().helpEvent(event, view, option, index)
+
+    def editorEvent(
+        self,
+        event: QEvent,
+        model: QAbstractItemModel,
+        option: QStyleOptionViewItem,
+        index: QModelIndex | QPersistentModelIndex,
+    ) -> bool:
+        # Clicking the warning or error badge toggles the warnings of the mod.
+        # The click still selects the row.
+        if (
+            event.type() == QEvent.Type.MouseButtonPress
+            and cast(QMouseEvent, event).button() == Qt.MouseButton.LeftButton
+        ):
+            row = self._row(option, index)
+            position = cast(QMouseEvent, event).position().toPoint()
+            if row is not None and any(
+                kind and rect.contains(position) for rect, _, _, kind in row.icons
+            ):
+                uuid = index.data(Qt.ItemDataRole.UserRole)["uuid"]
+                self.toggle_warning_signal.emit(
+                    self.metadata_manager.internal_local_metadata[uuid]["packageid"],
+                    uuid,
+                )
+        return super().editorEvent(event, model, option, index)
+
+    def _name_color(self, object_name: str) -> QColor:
+        label = self._name_labels[object_name]
+        label.ensurePolished()
+        return label.palette().color(QPalette.ColorRole.WindowText)
+
+    def _row(
+        self, option: QStyleOptionViewItem, index: QModelIndex | QPersistentModelIndex
+    ) -> _ModListRow | None:
+        """
+        Lay out a row, for painting and for finding the icon under the mouse.
+
+        :param option: Style option of the row.
+        :param index: Index of the row.
+        :return: The layout, None if the row has no mod.
+        """
+        item_data = index.data(Qt.ItemDataRole.UserRole)
+        if item_data is None:
+            return None
+        metadata = self.metadata_manager.internal_local_metadata.get(item_data["uuid"])
+        if metadata is None:
+            return None
+        leading = self._mod_icons(metadata)
+        trailing = self._badges(item_data)
+
+        rect: QRect = option.rect
+        font_metrics: QFontMetrics = option.fontMetrics
+        top = rect.top() + (rect.height() - self.ICON_SIZE) // 2
+        x = rect.left()
+        icons: list[tuple[QRect, QIcon, str, str]] = []
+        for icon, tool_tip, kind in leading:
+            icons.append(
+                (QRect(x, top, self.ICON_SIZE, self.ICON_SIZE), icon, tool_tip, kind)
+            )
+            x += self.ICON_SIZE
+        name = metadata.get("name")
+        if not isinstance(name, str):
+            name = "name error in mod about.xml"
+        available_width = rect.width() - self.ICON_SIZE * (len(leading) + len(trailing))
+        name = font_metrics.elidedText(
+            name, Qt.TextElideMode.ElideRight, max(available_width, 0)
+        )
+        name_width = font_metrics.horizontalAdvance(name)
+        name_rect = QRect(x, rect.top(), name_width, rect.height())
+        x += name_width
+        for icon, tool_tip, kind in trailing:
+            icons.append(
+                (QRect(x, top, self.ICON_SIZE, self.ICON_SIZE), icon, tool_tip, kind)
+            )
+            x += self.ICON_SIZE
+        return _ModListRow(name, name_rect, icons)
+
+    def _mod_icons(self, metadata: ModMetadata) -> list[tuple[QIcon, str, str]]:
+        """
+        :param metadata: Metadata of the mod.
+        :return: Icon, tool tip and badge kind of the icons left of the name:
+            the mod source, then the mod type if enabled.
+        """
+        icons: list[tuple[QIcon, str, str]] = []
+        data_source = metadata.get("data_source")
+        if data_source == "local" and metadata.get("steamcmd"):
+            icons.append(
+                (
+                    ModListIcons.steamcmd_icon(),
+                    self.tr("Local mod that can be used with SteamCMD"),
+                    "",
+                )
+            )
+        elif data_source == "local" and metadata.get("git_repo"):
+            icons.append(
+                (
+                    ModListIcons.git_icon(),
+                    self.tr("Local mod that contains a git repository"),
+                    "",
+                )
+            )
+        elif data_source == "local":
+            icons.append((ModListIcons.local_icon(), self.tr("Installed locally"), ""))
+        elif data_source == "expansion":
+            icons.append(
+                (
+                    ModListIcons.ludeon_icon(),
+                    self.tr("Official RimWorld content by Ludeon Studios"),
+                    "",
+                )
+            )
+        elif data_source == "workshop":
+            icons.append(
+                (ModListIcons.steam_icon(), self.tr("Subscribed via Steam"), "")
+            )
+        if self.settings_controller.settings.mod_type_filter_toggle:
+            if metadata.get("csharp") is not None:
+                icons.append(
+                    (
+                        ModListIcons.csharp_icon(),
+                        self.tr("Contains custom C# assemblies (custom code)"),
+                        "",
+                    )
+                )
+            else:
+                icons.append(
+                    (
+                        ModListIcons.xml_icon(),
+                        self.tr("Contains custom content (textures / XML)"),
+                        "",
+                    )
+                )
+        return icons
+
+    def _badges(
+        self, item_data: CustomListWidgetItemMetadata
+    ) -> list[tuple[QIcon, str, str]]:
+        """
+        :param item_data: Data of the item.
+        :return: Icon, tool tip and badge kind of the icons right of the name:
+            the save comparison indicator, then warnings and errors.
+        """
+        badges: list[tuple[QIcon, str, str]] = []
+        if self.settings_controller.settings.show_save_comparison_indicators:
+            # Read list_type from persisted item metadata, items move between lists
+            list_type = item_data.__dict__.get("list_type")
+            if list_type == "Active" and item_data.__dict__.get("is_new", False):
+                badges.append(
+                    (ModListIcons.new_icon(), self.tr("Not in latest save"), "")
+                )
+            elif list_type == "Inactive" and item_data.__dict__.get("in_save", False):
+                badges.append(
+                    (ModListIcons.clear_icon(), self.tr("In latest save"), "")
+                )
+        if item_data["warnings"]:
+            badges.append(
+                (ModListIcons.warning_icon(), item_data["warnings"], "warning")
+            )
+        if item_data["errors"]:
+            badges.append((ModListIcons.error_icon(), item_data["errors"], "error"))
+        return badges
+
+    def get_tool_tip_text(self, uuid: str) -> str:
+        """
+        Compose the tool tip of a mod list row
+
+        :param uuid: str, the uuid of the mod
+        :return: string containing the tool_tip_text
+        """
+        metadata = self.metadata_manager.internal_local_metadata.get(uuid, {})
+
+        name_line = f"Mod: {metadata.get('name', 'Not specified')}\n"
+
+        authors_tag = metadata.get("authors")
+        authors_text = (
+            ", ".join(authors_tag.get("li", ["Not specified"]))
+            if isinstance(authors_tag, dict)
+            else authors_tag or "Not specified"
+        )
+        author_line = f"Authors: {authors_text}\n"
+
+        package_id = metadata.get("packageid", "Not specified")
+        package_id_line = f"PackageID: {package_id}\n"
+
+        mod_version = metadata.get("modversion", "Not specified")
+        modversion_line = f"Mod Version: {mod_version}\n"
+
+        supported_versions_tag = metadata.get("supportedversions", {})
+        supported_versions_list = supported_versions_tag.get("li")
+        supported_versions_text = (
+            ", ".join(supported_versions_list)
+            if isinstance(supported_versions_list, list)
+            else supported_versions_list or "Not specified"
+        )
+        supported_versions_line = f"Supported Versions: {supported_versions_text}\n"
+
+        path = metadata.get("path", "Not specified")
+        path_line = f"Path: {path}\n"
+
+        # Add folder size and filesystem modification time information without heavy IO on hover
+        mod_path = metadata.get("path")
+        # Folder size: read from in-memory cache only; avoid computing on tooltip
+        folder_size_line = "Folder Size: Not available\n"
+        if self.settings_controller.settings.enable_advanced_filtering:
+            if isinstance(mod_path, str):
+                cached = _FOLDER_SIZE_CACHE.get(mod_path)
+                if cached:
+                    folder_size_line = f"Folder Size: {format_file_size(cached[1])}\n"
+
+        # Filesystem modified time: prefer cached metadata value
+        fs_time_val = metadata.get("internal_time_touched")
+        if isinstance(fs_time_val, int) and fs_time_val > 0:
+            try:
+                dt_fs = datetime.fromtimestamp(fs_time_val)
+                formatted_time = dt_fs.strftime("%Y-%m-%d %H:%M:%S")
+                last_touched_line = f"Filesystem Modified: {formatted_time}"
+            except (ValueError, OSError, OverflowError):
+                last_touched_line = "Filesystem Modified: Invalid timestamp"
+        else:
+            last_touched_line = "Filesystem Modified: Not available"
+
+        return "".join(
+            [
+                name_line,
+                author_line,
+                package_id_line,
+                modversion_line,
+                folder_size_line,
+                supported_versions_line,
+                path_line,
+                last_touched_line,
+            ]
+        )
+
+
 class ModListWidget(QListWidget):
     """
     Subclass for QListWidget. Used to store lists for
@@ -974,8 +780,10 @@ class ModListWidget(QListWidget):
 
         super(ModListWidget, self).__init__()
 
-        # Track when a custom widget (ModListItemInner) is selected/not selected
-        self.selectionModel().selectionChanged.connect(self.on_selection_changed)
+        # Rows are painted by a delegate rather than a widget per mod
+        self.item_delegate = ModListItemDelegate(self, self.settings_controller)
+        self.item_delegate.toggle_warning_signal.connect(self.toggle_warning)
+        self.setItemDelegate(self.item_delegate)
 
         # Allow for dragging and dropping between lists
         self.setDefaultDropAction(Qt.DropAction.MoveAction)
@@ -998,10 +806,10 @@ class ModListWidget(QListWidget):
         self.horizontalScrollBar().setEnabled(False)
         self.horizontalScrollBar().setVisible(False)
 
-        # Optimizes performance
-        # self.setUniformItemSizes(True)
+        # Optimizes performance, every row has the delegate's height
+        self.setUniformItemSizes(True)
 
-        # Slot to handle item widgets when itemChanged()
+        # Slot to repaint items when itemChanged()
         self.itemChanged.connect(self.handle_item_data_changed)
 
         # Allow inserting custom list items
@@ -1014,13 +822,14 @@ class ModListWidget(QListWidget):
             self.handle_rows_removed, Qt.ConnectionType.QueuedConnection
         )
 
-        # Lazy load ModListItemInner
-        self.verticalScrollBar().valueChanged.connect(self.check_widgets_visible)
-
-        # This set is used to keep track of mods that have been loaded
-        # into widgets. Used for an optimization strategy for `handle_rows_inserted`
+        # This list is used to keep track of mods that have been inserted
+        # into the list. Used for an optimization strategy for `handle_rows_inserted`
         self.uuids: list[str] = []
         self.ignore_warning_list: list[str] = []
+        # Checks the errors and warnings of the active mods list
+        self.validator = ModListValidator(self._has_replacement)
+        # Search fields of the mods, for the filter bar
+        self.search_index = ModSearchIndex()
         # Cache of latest save package ids to check new mods
         self._latest_save_package_ids: set[str] | None = None
 
@@ -1031,24 +840,6 @@ class ModListWidget(QListWidget):
         )  # TODO: should we enable items conditionally? For now use all
         logger.debug("Finished ModListW`idget initialization")
 
-    def on_selection_changed(
-        self, selected: QItemSelection, deselected: QItemSelection
-    ) -> None:
-        """
-        Used to indicate when the custom widget is selected/not selected.
-        """
-        for index in selected.indexes():
-            item = self.item(index.row())
-            widget = self.itemWidget(item)
-            if widget:
-                widget.set_selected(True)  # type: ignore
-
-        for index in deselected.indexes():
-            item = self.item(index.row())
-            widget = self.itemWidget(item)
-            if widget:
-                widget.set_selected(False)  # type: ignore
-
     def item(self, row: int) -> CustomListWidgetItem:
         """
         Return the currently selected item.
@@ -1986,22 +1777,14 @@ class ModListWidget(QListWidget):
         else:
             return super().keyPressEvent(event)
 
-    def resizeEvent(self, e: QResizeEvent) -> None:
-        """
-        When the list widget is resized (as the window is resized),
-        ensure that all visible items have widgets loaded.
-
-        :param event: the resize event
-        """
-        self.check_widgets_visible()
-        return super().resizeEvent(e)
-
     def append_new_item(self, uuid: str) -> None:
         mod_path = self.metadata_manager.internal_local_metadata[uuid]["path"]
         instance_path = Path(self.settings_controller.settings.current_instance_path)
         aux_metadata_controller = AuxMetadataController.get_or_create_cached_instance(
             instance_path / "aux_metadata.db"
         )
+        # Read queued updates too
+        aux_metadata_controller.flush()
         with aux_metadata_controller.Session() as aux_metadata_session:
             aux_metadata_controller.get_or_create(aux_metadata_session, mod_path)
             aux_metadata_controller.update(
@@ -2030,21 +1813,6 @@ class ModListWidget(QListWidget):
             mod_list_items.append(item)
         return mod_list_items
 
-    def get_all_loaded_mod_list_items(self) -> list[ModListItemInner]:
-        """
-        This gets all modlist items as ModListItemInner.
-        Mods that have not been loaded or lazy loaded will not be returned.
-
-        :return: List of all modlist items as ModListItemInner
-        """
-        mod_list_items = []
-        for index in range(self.count()):
-            item = self.item(index)
-            widget = self.itemWidget(item)
-            if isinstance(widget, ModListItemInner):
-                mod_list_items.append(widget)
-        return mod_list_items
-
     def get_all_loaded_and_toggled_mod_list_items(self) -> list[CustomListWidgetItem]:
         """
         This returns all modlist items that have their warnings toggled.
@@ -2059,86 +1827,13 @@ class ModListWidget(QListWidget):
                 mod_list_items.append(item)
         return mod_list_items
 
-    def check_item_visible(self, item: CustomListWidgetItem) -> bool:
-        # Determines if the item is currently visible in the viewport.
-        rect = self.visualItemRect(item)
-        return rect.top() < self.viewport().height() and rect.bottom() > 0
-
-    def create_widget_for_item(self, item: CustomListWidgetItem) -> None:
-        data = item.data(Qt.ItemDataRole.UserRole)
-        if data is None:
-            logger.debug("Attempted to create widget for item with None data")
-            return
-        errors_warnings = data["errors_warnings"]
-        errors = data["errors"]
-        warnings = data["warnings"]
-        filtered = data["filtered"]
-        invalid = data["invalid"]
-        mismatch = data["mismatch"]
-        alternative = data["alternative"]
-        uuid = data["uuid"]
-        mod_color = data["mod_color"]
-        if uuid:
-            widget = ModListItemInner(
-                errors_warnings=errors_warnings,
-                errors=errors,
-                warnings=warnings,
-                filtered=filtered,
-                invalid=invalid,
-                mismatch=mismatch,
-                alternative=alternative,
-                settings_controller=self.settings_controller,
-                uuid=uuid,
-                mod_color=mod_color,
-            )
-            widget.toggle_warning_signal.connect(self.toggle_warning)
-            widget.toggle_error_signal.connect(self.toggle_warning)
-            item.setSizeHint(widget.sizeHint())
-            self.setItemWidget(item, widget)
-            # Ensure initial icon states reflect current item data
-            widget.repolish(item)
-
-    def check_widgets_visible(self) -> None:
-        # This function checks the visibility of each item and creates a widget if the item is visible and not already setup.
-        indexes = self.get_visible_indexes()
-        for idx in indexes:
-            item = self.item(idx)
-            # Check for visible item without a widget set
-            if item and self.check_item_visible(item) and self.itemWidget(item) is None:
-                self.create_widget_for_item(item)
-
-    def get_visible_indexes(self) -> set[int]:
-        """
-        Tries to go through the viewport and find the indexes for all visible items.
-        """
-        indexes: set[int] = set()
-        model = self.model()
-        if not model:
-            return indexes
-
-        viewport_rect = self.viewport().rect()
-
-        y = viewport_rect.top()
-        while y <= viewport_rect.bottom():
-            idx = self.indexAt(QPoint(0, y))
-            if not idx.isValid():
-                break
-
-            indexes.add(idx.row())
-            rect = self.visualRect(idx)
-            if rect.height() <= 0:
-                break  # This shouldn't happen
-            y += rect.height()
-
-        return indexes
-
     def handle_item_data_changed(self, item: CustomListWidgetItem) -> None:
         """
-        This slot is called when an item's data changes
+        This slot is called when an item's data changes.
+
+        The item data is updated in place, so the model may not repaint the row.
         """
-        widget = self.itemWidget(item)
-        if widget is not None and isinstance(widget, ModListItemInner):
-            widget.repolish(item)
+        self.update(self.indexFromItem(item))
 
     def handle_other_list_row_added(self, uuid: str) -> None:
         """
@@ -2158,25 +1853,25 @@ class ModListWidget(QListWidget):
         and dropping on the UI, this function is called. For single-item
         inserts, which happens through the above method or through dragging
         and dropping individual mods, `first` equals `last` and the below
-        loop is just run once. In this loop, a custom widget is created,
-        which displays the text, icons, etc, and is added to the list item.
+        loop is just run once. In this loop, the uuid of the item is
+        recorded. The item itself is painted by ModListItemDelegate.
 
         For dragging and dropping multiple items, the loop is run multiple
         times. Importantly, even for multiple items, the number of list items
         is set BEFORE the loop starts running, e.g. if we were dragging 3 mods
         onto a list of 100 mods, this method is called once and by the start
         of this method, `self.count()` is already 103; there are 3 "empty"
-        list items that do not have widgets assigned to them.
+        list items that have not been recorded yet.
 
         However, inserting the initial `n` mods with `recreate_mod_list` has
         an inefficiency: it is only able to insert one at a time. This means
         this method is called `n` times for the first `n` mods.
         One optimization here (saving about 1 second with a 200 mod list) is
-        to not emit the list update signal until the number of widgets is
-        equal to the number of items. If widgets < items, that means
-        widgets are still being added. Only when widgets == items does it mean
+        to not emit the list update signal until the number of recorded uuids
+        is equal to the number of items. If uuids < items, that means
+        items are still being added. Only when uuids == items does it mean
         we are done with adding the initial set of mods. We can do this
-        by keeping track of the number of widgets currently loaded in the list
+        by keeping track of the items currently inserted in the list
         through a set of UUIDs which we can compare to the number of items
         directly, as this set will equate to the items in the list.
 
@@ -2184,8 +1879,8 @@ class ModListWidget(QListWidget):
         :param first: index of first item inserted
         :param last: index of last item inserted
         """
-        # Loop through the indexes of inserted items, load widgets if not
-        # already loaded. Each item index corresponds to a UUID index.
+        # Loop through the indexes of inserted items. Each item index
+        # corresponds to a UUID index.
         for idx in range(first, last + 1):
             item = self.item(idx)
             if item:
@@ -2235,12 +1930,6 @@ class ModListWidget(QListWidget):
             )
             self.list_update_signal.emit(str(self.count()))
 
-    def get_item_widget_at_index(self, idx: int) -> QWidget | None:
-        item = self.item(idx)
-        if item:
-            return self.itemWidget(item)
-        return None
-
     def mod_changed_to(
         self, current: CustomListWidgetItem, previous: CustomListWidgetItem
     ) -> None:
@@ -2274,20 +1963,16 @@ class ModListWidget(QListWidget):
         """
         Method to handle double clicking on a row.
         """
-        # widget = ModListItemInner = self.itemWidget(item)
         self.key_press_signal.emit("DoubleClick")
 
-    def rebuild_item_widget_from_uuid(self, uuid: str) -> None:
+    def refresh_item_from_uuid(self, uuid: str) -> None:
         item_index = self.uuids.index(uuid)
         item = self.item(item_index)
-        logger.debug(f"Rebuilding widget for item {uuid} at index {item_index}")
-        # Destroy the item's previous widget immediately. Recreate if the item is visible.
-        widget = self.itemWidget(item)
-        if widget:
-            self.removeItemWidget(item)
-        # If it is visible, create a new widget. Otherwise, allow lazy loading to handle this.
-        if self.check_item_visible(item):
-            self.create_widget_for_item(item)
+        logger.debug(f"Refreshing item {uuid} at index {item_index}")
+        # The metadata of the mod may have changed
+        self.validator.invalidate()
+        self.search_index.invalidate(uuid)
+        self.update(self.indexFromItem(item))
         # If the current item is selected, update the info panel
         if self.currentItem() == item:
             self.mod_info_signal.emit(uuid, item)
@@ -2305,27 +1990,21 @@ class ModListWidget(QListWidget):
         packageid_to_uuid = {
             internal_local_metadata[uuid]["packageid"]: uuid for uuid in self.uuids
         }
-        package_ids_set = set(packageid_to_uuid.keys())
-
-        package_id_to_errors: dict[str, dict[str, None | set[str] | bool]] = {
-            uuid: {
-                "missing_dependencies": set() if self.list_type == "Active" else None,
-                "alternative_dependencies": set()
-                if self.list_type == "Active"
-                else None,
-                "conflicting_incompatibilities": (
-                    set() if self.list_type == "Active" else None
-                ),
-                "load_before_violations": set() if self.list_type == "Active" else None,
-                "load_after_violations": set() if self.list_type == "Active" else None,
-                "version_mismatch": True,
-                "use_this_instead": set()
-                if self.settings_controller.settings.external_use_this_instead_metadata_source
-                != "None"
-                else None,
-            }
-            for uuid in self.uuids
-        }
+        # Dependencies, incompatibilities and load order rules are only
+        # checked for the active mods list
+        mods_issues = (
+            self.validator.validate(
+                self.uuids,
+                self.metadata_manager.rule_snapshot,
+                self.metadata_manager.settings_controller.settings.consider_alternative_package_ids,
+            )
+            if self.list_type == "Active"
+            else {}
+        )
+        use_this_instead_enabled = (
+            self.settings_controller.settings.external_use_this_instead_metadata_source
+            != "None"
+        )
 
         num_warnings = 0
         total_warning_text = ""
@@ -2341,8 +2020,7 @@ class ModListWidget(QListWidget):
         else:
             latest_save_ids = None
 
-        for uuid, mod_errors in package_id_to_errors.items():
-            current_mod_index = self.uuids.index(uuid)
+        for current_mod_index, uuid in enumerate(self.uuids):
             current_item = self.item(current_mod_index)
             if current_item is None:
                 continue
@@ -2372,6 +2050,14 @@ class ModListWidget(QListWidget):
                 current_item_data.__dict__["is_new"] = False
                 current_item_data.__dict__["in_save"] = False
             mod_data = internal_local_metadata[uuid]
+            mod_errors: dict[str, None | set[str] | bool] = {
+                "missing_dependencies": None,
+                "alternative_dependencies": None,
+                "conflicting_incompatibilities": None,
+                "load_before_violations": None,
+                "load_after_violations": None,
+                "use_this_instead": set() if use_this_instead_enabled else None,
+            }
             # Check mod supportedversions against currently loaded version of game
             mod_errors["version_mismatch"] = self.metadata_manager.is_version_mismatch(
                 uuid
@@ -2398,79 +2084,14 @@ class ModListWidget(QListWidget):
                 and mod_data.get("packageid")
                 and mod_data["packageid"] not in self.ignore_warning_list
             ):
-                # Check dependencies (and replacements for dependencies)
-                # Note: dependency replacements are NOT assumed to be subject
-                # to the same load order rules as the orignal mods!
-                # Build missing dependencies set while honoring alternativePackageIds
-                missing_deps: set[str] = set()
-                alternative_deps: set[str] = set()
-                consider_alternatives = self.metadata_manager.settings_controller.settings.consider_alternative_package_ids
-                for dep_entry in mod_data.get("dependencies", []):
-                    alt_ids: set[str] = set()
-                    if isinstance(dep_entry, tuple):
-                        dep_id = dep_entry[0]
-                        if (
-                            len(dep_entry) > 1
-                            and isinstance(dep_entry[1], dict)
-                            and isinstance(dep_entry[1].get("alternatives"), set)
-                        ):
-                            alt_ids = dep_entry[1]["alternatives"]
-                    else:
-                        dep_id = dep_entry
-
-                    # Consider satisfied if main dep is present; optionally consider alternatives
-                    satisfied = dep_id in package_ids_set
-                    if not satisfied and consider_alternatives:
-                        satisfied = any(alt in package_ids_set for alt in alt_ids)
-                    # If not satisfied, also consider external replacement mapping
-                    if not satisfied and self._has_replacement(
-                        mod_data["packageid"], dep_id, package_ids_set
-                    ):
-                        satisfied = True
-
-                    if not satisfied:
-                        missing_deps.add(dep_id)
-                        # Only record alternatives if the advanced option is enabled
-                        if consider_alternatives:
-                            # Prefer to show only alternatives not already installed
-                            alt_candidates = {
-                                a for a in alt_ids if a not in package_ids_set
-                            }
-                            alternative_deps.update(
-                                alt_candidates if alt_candidates else alt_ids
-                            )
-
-                mod_errors["missing_dependencies"] = missing_deps
-                mod_errors["alternative_dependencies"] = alternative_deps
-
-                # Check incompatibilities
-                mod_errors["conflicting_incompatibilities"] = {
-                    incomp
-                    for incomp in mod_data.get("incompatibilities", [])
-                    if incomp in package_ids_set
-                }
-
-                # Check loadTheseBefore
-                for load_this_before in mod_data.get("loadTheseBefore", []):
-                    if (
-                        load_this_before[1]
-                        and load_this_before[0] in packageid_to_uuid
-                        and current_mod_index
-                        <= self.uuids.index(packageid_to_uuid[load_this_before[0]])
-                    ):
-                        assert isinstance(mod_errors["load_before_violations"], set)
-                        mod_errors["load_before_violations"].add(load_this_before[0])
-
-                # Check loadTheseAfter
-                for load_this_after in mod_data.get("loadTheseAfter", []):
-                    if (
-                        load_this_after[1]
-                        and load_this_after[0] in packageid_to_uuid
-                        and current_mod_index
-                        >= self.uuids.index(packageid_to_uuid[load_this_after[0]])
-                    ):
-                        assert isinstance(mod_errors["load_after_violations"], set)
-                        mod_errors["load_after_violations"].add(load_this_after[0])
+                issues = mods_issues[uuid]
+                mod_errors["missing_dependencies"] = issues.missing_dependencies
+                mod_errors["alternative_dependencies"] = issues.alternative_dependencies
+                mod_errors["conflicting_incompatibilities"] = (
+                    issues.conflicting_incompatibilities
+                )
+                mod_errors["load_before_violations"] = issues.load_before_violations
+                mod_errors["load_after_violations"] = issues.load_after_violations
             # Calculate any needed string for errors
             tool_tip_text = ""
             # Build tooltip sections, conditionally include alternatives
@@ -2690,45 +2311,71 @@ class ModListWidget(QListWidget):
         :param mods: dict of mod data
         """
         logger.info(f"Internally recreating {list_type} mod list")
+        self.validator.invalidate()
+        self.search_index.invalidate()
         # Disable updates
         self.setUpdatesEnabled(False)
         # Clear list
         self.clear()
         self.uuids = list()
         if uuids:  # Insert data...
+            mod_paths = {
+                uuid_key: self.metadata_manager.internal_local_metadata[uuid_key][
+                    "path"
+                ]
+                for uuid_key in uuids
+            }
+            instance_path = Path(
+                self.settings_controller.settings.current_instance_path
+            )
+            aux_metadata_controller = (
+                AuxMetadataController.get_or_create_cached_instance(
+                    instance_path / "aux_metadata.db"
+                )
+            )
+            # Read queued updates too
+            aux_metadata_controller.flush()
+            with aux_metadata_controller.Session() as aux_metadata_session:
+                # Prefetch the Aux DB entries of all mods at once rather than
+                # querying them per mod
+                aux_metadata_entries = aux_metadata_controller.get_or_create_many(
+                    aux_metadata_session, mod_paths.values()
+                )
+                aux_metadata_controller.update_many(
+                    aux_metadata_session,
+                    [
+                        mod_path
+                        for mod_path in mod_paths.values()
+                        if aux_metadata_entries[mod_path].outdated
+                    ],
+                    outdated=False,
+                )
+                aux_metadata_session.commit()
             for uuid_key in uuids:
                 # Build foldersize cache at cost of load time
                 if filtering:
                     uuid_to_folder_size(uuid_key)
-                mod_path = self.metadata_manager.internal_local_metadata[uuid_key][
-                    "path"
-                ]
-                instance_path = Path(
-                    self.settings_controller.settings.current_instance_path
-                )
-                aux_metadata_controller = (
-                    AuxMetadataController.get_or_create_cached_instance(
-                        instance_path / "aux_metadata.db"
-                    )
+                list_item = CustomListWidgetItem(self)
+                data = CustomListWidgetItemMetadata(
+                    uuid=uuid_key,
+                    list_type=self.list_type,
+                    settings_controller=self.settings_controller,
+                    aux_metadata_entry=aux_metadata_entries[mod_paths[uuid_key]],
                 )
-                with aux_metadata_controller.Session() as aux_metadata_session:
-                    aux_metadata_controller.get_or_create(
-                        aux_metadata_session, mod_path
-                    )
-                    aux_metadata_controller.update(
-                        aux_metadata_session, mod_path, outdated=False
-                    )
-                    list_item = CustomListWidgetItem(self)
-                    data = CustomListWidgetItemMetadata(
-                        uuid=uuid_key,
-                        list_type=self.list_type,
-                        aux_metadata_controller=aux_metadata_controller,
-                        aux_metadata_session=aux_metadata_session,
-                        settings_controller=self.settings_controller,
-                    )
                 list_item.setData(Qt.ItemDataRole.UserRole, data)
                 self.addItem(list_item)
                 # When refreshing, update entry if needed?
+            # Build the search index now, rather than on the first keystroke
+            # of a Smart search
+            start = time.perf_counter()
+            self.search_index.update(
+                uuids, self.metadata_manager.internal_local_metadata
+            )
+            self.search_index.index_words()
+            logger.debug(
+                f"Indexed {len(uuids)} mods of the {list_type} list for search in "
+                f"{(time.perf_counter() - start) * 1000:.0f} ms"
+            )
 
         else:  # ...unless we don't have mods, at which point reenable updates and exit
             self.setUpdatesEnabled(True)
@@ -2759,13 +2406,10 @@ class ModListWidget(QListWidget):
                 "Unable to retrieve uuid when saving toggle_warning to Aux DB."
             )
             return
-        with aux_metadata_controller.Session() as aux_metadata_session:
-            mod_path = self.metadata_manager.internal_local_metadata[uuid]["path"]
-            aux_metadata_controller.update(
-                aux_metadata_session,
-                mod_path,
-                ignore_warnings=item_data["warning_toggled"],
-            )
+        mod_path = self.metadata_manager.internal_local_metadata[uuid]["path"]
+        aux_metadata_controller.queue_update(
+            mod_path, ignore_warnings=item_data["warning_toggled"]
+        )
         item.setData(Qt.ItemDataRole.UserRole, item_data)
         self.recalculate_warnings_signal.emit()
 
@@ -2775,6 +2419,7 @@ class ModListWidget(QListWidget):
         item_data = item.data(Qt.ItemDataRole.UserRole)
         item_data["mod_color"] = new_color
         item.setData(Qt.ItemDataRole.UserRole, item_data)
+        self._save_mod_color(uuid, new_color.name())
 
     def reset_mod_color(self, uuid: str) -> None:
         current_mod_index = self.uuids.index(uuid)
@@ -2782,6 +2427,21 @@ class ModListWidget(QListWidget):
         item_data = item.data(Qt.ItemDataRole.UserRole)
         item_data["mod_color"] = None
         item.setData(Qt.ItemDataRole.UserRole, item_data)
+        self._save_mod_color(uuid, None)
+
+    def _save_mod_color(self, uuid: str, color_hex: str | None) -> None:
+        """
+        Update the mod color in the Aux DB.
+
+        :param uuid: str, the uuid of the mod
+        :param color_hex: the color name, None to reset it
+        """
+        instance_path = Path(self.settings_controller.settings.current_instance_path)
+        aux_metadata_controller = AuxMetadataController.get_or_create_cached_instance(
+            instance_path / "aux_metadata.db"
+        )
+        mod_path = self.metadata_manager.internal_local_metadata[uuid]["path"]
+        aux_metadata_controller.queue_update(mod_path, color_hex=color_hex)
 
     def replaceItemAtIndex(self, index: int, item: CustomListWidgetItem) -> None:
         """
@@ -2823,6 +2483,11 @@ class ModsPanel(QWidget):
     active/inactive mods list panel on the GUI.
     """
 
+    # Delay after the last keystroke in a search bar before filtering
+    SEARCH_DEBOUNCE_MS = 200
+    # Number of best matches the "Smart" search keeps
+    SMART_SEARCH_LIMIT = 100
+
     list_updated_signal = Signal()
     save_btn_animation_signal = Signal()
     check_dependencies_signal = Signal()
@@ -2846,6 +2511,18 @@ class ModsPanel(QWidget):
         self._size_worker: Optional[FolderSizeWorker] = None
         self._size_current_uuids: list[str] = []
 
+        # Search bar keystrokes are debounced, the list is filtered once
+        # typing pauses
+        self._search_timers: dict[str, QTimer] = {}
+        for list_type in ("Active", "Inactive"):
+            search_timer = QTimer(self)
+            search_timer.setSingleShot(True)
+            search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+            search_timer.timeout.connect(
+                partial(self._on_search_timer_timeout, list_type)
+            )
+            self._search_timers[list_type] = search_timer
+
         # Base layout horizontal, sub-layouts vertical
         self.panel = QVBoxLayout()
         self.lists_panel = QHBoxLayout()
@@ -3033,6 +2710,7 @@ class ModsPanel(QWidget):
                 self.tr("Author(s)"),
                 self.tr("PublishedFileId"),
                 self.tr("Version"),
+                self.tr("Smart"),
             ]
         )
         # Active mods search layouts
@@ -3176,6 +2854,7 @@ class ModsPanel(QWidget):
                 self.tr("Author(s)"),
                 self.tr("PublishedFileId"),
                 self.tr("Version"),
+                self.tr("Smart"),
             ]
         )
         self.inactive_mods_sort_combobox: QComboBox = QComboBox()
@@ -3404,10 +3083,7 @@ class ModsPanel(QWidget):
         self.mod_list_updated(count=count, list_type="Active")
 
     def on_active_mods_search(self, pattern: str) -> None:
-        self.signal_search_and_filters(
-            list_type="Active",
-            pattern=pattern,
-        )
+        self._search_timers["Active"].start()
 
     def on_active_mods_search_clear(self) -> None:
         self.signal_clear_search(
@@ -3427,10 +3103,15 @@ class ModsPanel(QWidget):
         self.mod_list_updated(count=count, list_type="Inactive")
 
     def on_inactive_mods_search(self, pattern: str) -> None:
-        self.signal_search_and_filters(
-            list_type="Inactive",
-            pattern=pattern,
+        self._search_timers["Inactive"].start()
+
+    def _on_search_timer_timeout(self, list_type: str) -> None:
+        search = (
+            self.active_mods_search
+            if list_type == "Active"
+            else self.inactive_mods_search
         )
+        self.signal_search_and_filters(list_type=list_type, pattern=search.text())
 
     def on_inactive_mods_search_clear(self) -> None:
         self.signal_clear_search(
@@ -3450,8 +3131,6 @@ class ModsPanel(QWidget):
         self.inactive_mods_list.append_new_item(uuid)
 
     def apply_mods_filter_type(self, list_type: str) -> None:
-        # Define the mod types
-        mod_types = ["csharp", "xml"]
         source_filter_index: int = (
             self.active_data_source_filter_type_index
             or self.inactive_data_source_filter_type_index
@@ -3489,26 +3168,6 @@ class ModsPanel(QWidget):
                 SEARCH_DATA_SOURCE_FILTER_INDEXES[source_index]
             )
 
-        mod_list = (
-            self.active_mods_list if list_type == "Active" else self.inactive_mods_list
-        )
-
-        # Apply filtering based on the selected type
-        for uuid in mod_list.uuids:
-            item = mod_list.item(mod_list.uuids.index(uuid))
-            item_data = item.data(Qt.ItemDataRole.UserRole)
-
-            # Determine the mod type
-            mod_type = (
-                "csharp"
-                if self.metadata_manager.internal_local_metadata.get(uuid, {}).get(
-                    "csharp"
-                )
-                else "xml"
-            )
-            if mod_type and mod_types:
-                item.setData(Qt.ItemDataRole.UserRole, item_data)
-
         if source_index == 0:
             filters_active = False
         else:
@@ -3534,14 +3193,12 @@ class ModsPanel(QWidget):
 
     def on_mod_metadata_updated(self, uuid: str) -> None:
         if uuid in self.active_mods_list.uuids:
-            self.active_mods_list.rebuild_item_widget_from_uuid(uuid=uuid)
+            self.active_mods_list.refresh_item_from_uuid(uuid=uuid)
         elif uuid in self.inactive_mods_list.uuids:
-            self.inactive_mods_list.rebuild_item_widget_from_uuid(uuid=uuid)
+            self.inactive_mods_list.refresh_item_from_uuid(uuid=uuid)
 
     def recalculate_list_errors_warnings(self, list_type: str) -> None:
         if list_type == "Active":
-            # Check if all visible items have their widgets loaded
-            self.active_mods_list.check_widgets_visible()
             # Calculate internal errors and warnings for all mods in the respective mod list
             total_error_text, total_warning_text, num_errors, num_warnings = (
                 self.active_mods_list.recalculate_internal_errors_warnings()
@@ -3601,8 +3258,6 @@ class ModsPanel(QWidget):
             # The purpose of this is for the _do_save_animation slot in the main_content_panel
             EventBus().list_updated_signal.emit()
         else:
-            # Check if all visible items have their widgets loaded
-            self.inactive_mods_list.check_widgets_visible()
             # Calculate internal errors and warnings for all mods in the respective mod list
             self.inactive_mods_list.recalculate_internal_errors_warnings()
 
@@ -3642,10 +3297,8 @@ class ModsPanel(QWidget):
             filters_active (bool): If any filter is active (inc. pattern search).
         """
 
-        _filter = None
-        filter_state = None  # The 'Hide Filter' state
-        source_filter = None
-        uuids = None
+        # A direct call supersedes a pending debounced search
+        self._search_timers[list_type].stop()
         # Notify controller when search bar text or any filters change
         if list_type == "Active":
             EventBus().filters_changed_in_active_modlist.emit()
@@ -3656,14 +3309,17 @@ class ModsPanel(QWidget):
             _filter = self.active_mods_search_filter
             filter_state = self.active_mods_search_filter_state
             source_filter = self.active_mods_data_source_filter
-            uuids = self.active_mods_list.uuids
+            type_filter_index = self.active_data_source_filter_type_index
+            mod_list = self.active_mods_list
         elif list_type == "Inactive":
             _filter = self.inactive_mods_search_filter
             filter_state = self.inactive_mods_search_filter_state
             source_filter = self.inactive_mods_data_source_filter
-            uuids = self.inactive_mods_list.uuids
+            type_filter_index = self.inactive_data_source_filter_type_index
+            mod_list = self.inactive_mods_list
         else:
             raise NotImplementedError(f"Unknown list type: {list_type}")
+        uuids = mod_list.uuids
         # Evaluate the search filter state for the list
         # consider using currentData() instead of currentText()
         search_filter = None
@@ -3677,95 +3333,86 @@ class ModsPanel(QWidget):
             search_filter = "publishedfileid"
         elif _filter.currentText() == self.tr("Version"):
             search_filter = "version"
-        # Filter the list using any search and filter state
+        elif _filter.currentText() == self.tr("Smart"):
+            search_filter = "smart"
+        if pattern != "":
+            filters_active = True
+        # Find the mods passing the search and filters in the list's index
+        mod_list.search_index.update(
+            uuids, self.metadata_manager.internal_local_metadata
+        )
+        ranking: list[tuple[str, float]] = []
+        if search_filter == "smart" and pattern:
+            # Rank the mods that pass the other filters, the list keeps its
+            # order so the best match is scrolled to below
+            passing = mod_list.search_index.matching(
+                uuids, None, "", source_filter, type_filter_index
+            )
+            ranking = mod_list.search_index.ranked(
+                [uuid for uuid in uuids if uuid in passing],
+                pattern,
+                self.SMART_SEARCH_LIMIT,
+            )
+            passing = {uuid for uuid, _ in ranking}
+        else:
+            passing = mod_list.search_index.matching(
+                uuids, search_filter, pattern, source_filter, type_filter_index
+            )
+        hide_invalid = (
+            self.settings_controller.settings.hide_invalid_mods_when_filtering_toggle
+        )
+        # Only update the items whose state changes
         num_filtered = 0
         num_unfiltered = 0
-        uuid_to_index = {u: i for i, u in enumerate(uuids)}
-        for uuid in uuids:
-            item = (
-                self.active_mods_list.item(uuid_to_index[uuid])
-                if list_type == "Active"
-                else self.inactive_mods_list.item(uuid_to_index[uuid])
-            )
+        for index, uuid in enumerate(uuids):
+            item = mod_list.item(index)
             if item is None:
                 continue
             item_data = item.data(Qt.ItemDataRole.UserRole)
-            metadata = self.metadata_manager.internal_local_metadata[uuid]
-            if pattern != "":
-                filters_active = True
+            hidden = item.isHidden()
+            filtered = item_data["filtered"]
+            hidden_by_filter = item_data["hidden_by_filter"]
+            item_filtered = uuid not in passing
             # Hide invalid items if enabled in settings
-            if self.settings_controller.settings.hide_invalid_mods_when_filtering_toggle:
-                invalid = item_data["invalid"]
+            if hide_invalid and item_data["invalid"]:
                 # TODO: I dont think filtered should be set at all for invalid items... I misunderstood what it represents
-                if invalid and filters_active:
-                    item_data["filtered"] = True
-                    item.setHidden(True)
+                if filters_active:
+                    if not hidden:
+                        item.setHidden(True)
+                    if not filtered:
+                        item_data["filtered"] = True
+                        item.setData(Qt.ItemDataRole.UserRole, item_data)
                     continue
-                elif invalid and not filters_active:
-                    item_data["filtered"] = False
+                if hidden:
                     item.setHidden(False)
-            # Check if the item is filtered
-            item_filtered = item_data["filtered"]
-            # Check if the item should be filtered or not based on search filter
-            if search_filter == "version" and pattern:
-                versions = metadata.get("supportedversions", {}).get("li", [])
-                if isinstance(versions, str):
-                    versions = [versions]
-                if not versions or not any(
-                    pattern.lower() in v.lower() for v in versions
-                ):
-                    item_filtered = True
-            elif (
-                pattern
-                and metadata.get(search_filter)
-                and pattern.lower() not in str(metadata.get(search_filter)).lower()
-            ):
-                item_filtered = True
-            elif source_filter == "all":  # or data source
-                item_filtered = False
-            elif source_filter == "git_repo":
-                item_filtered = not metadata.get("git_repo")
-            elif source_filter == "steamcmd":
-                item_filtered = not metadata.get("steamcmd")
-            elif source_filter != metadata.get("data_source"):
-                item_filtered = True
-
-            type_filter_index = (
-                self.active_data_source_filter_type_index
-                if list_type == "Active"
-                else self.inactive_data_source_filter_type_index
-            )
-
-            if type_filter_index == 1 and not metadata.get("csharp"):
-                item_filtered = True
-            elif type_filter_index == 2 and metadata.get("csharp"):
-                item_filtered = True
-
-            # Check if the item should be filtered or hidden based on filter state
+                    hidden = False
+            if item_filtered:
+                num_filtered += 1
+            else:
+                num_unfiltered += 1
             if filter_state:
-                item.setHidden(item_filtered)
-                if item_filtered:
-                    item_data["hidden_by_filter"] = True
-                    item_filtered = False
-                    num_filtered += 1
-                else:
-                    item_data["hidden_by_filter"] = False
-                    num_unfiltered += 1
+                # Hide the mods that do not pass
+                new_hidden = item_filtered
+                new_filtered = False
+                new_hidden_by_filter = item_filtered
             else:
-                if item_filtered and item.isHidden():
-                    item.setHidden(False)
-                    item_data["hidden_by_filter"] = False
-                    num_unfiltered += 1
-
-            # Update item data
-            item_data["filtered"] = item_filtered
-            item.setData(Qt.ItemDataRole.UserRole, item_data)
+                # Gray out the mods that do not pass, show those hidden by a
+                # previous search
+                new_hidden = hidden and not (item_filtered or hidden_by_filter)
+                new_filtered = item_filtered
+                new_hidden_by_filter = hidden_by_filter and new_hidden
+            if new_hidden != hidden:
+                item.setHidden(new_hidden)
+            if new_filtered != filtered or new_hidden_by_filter != hidden_by_filter:
+                item_data["filtered"] = new_filtered
+                item_data["hidden_by_filter"] = new_hidden_by_filter
+                item.setData(Qt.ItemDataRole.UserRole, item_data)
 
+        if ranking:
+            best_match = mod_list.item(uuids.index(ranking[0][0]))
+            if best_match is not None and not best_match.isHidden():
+                mod_list.scrollToItem(best_match)
         self.direct_update_count(list_type, num_filtered, num_unfiltered)
-        if list_type == "Active":
-            self.active_mods_list.check_widgets_visible()
-        else:
-            self.inactive_mods_list.check_widgets_visible()
 
     def signal_search_mode_filter(self, list_type: str) -> None:
         if list_type == "Active":
@@ -3904,12 +3551,11 @@ class ModsPanel(QWidget):
         )
         num_filtered = 0
         num_unfiltered = 0
-        for uuid in uuids:
-            item = (
-                self.active_mods_list.item(uuids.index(uuid))
-                if list_type == "Active"
-                else self.inactive_mods_list.item(uuids.index(uuid))
-            )
+        mod_list = (
+            self.active_mods_list if list_type == "Active" else self.inactive_mods_list
+        )
+        for index in range(len(uuids)):
+            item = mod_list.item(index)
             if item is None:
                 continue
             item_data = item.data(Qt.ItemDataRole.UserRole)
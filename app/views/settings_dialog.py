@@ -596,6 +596,16 @@ This basically preserves your mod coloring, user notes etc. for this many second
         )
         sort_group_box_layout.addWidget(self.use_moddependencies_as_loadTheseBefore)
 
+        self.incremental_sort_checkbox = QCheckBox(
+            self.tr("Only move mods that need to move when sorting again.")
+        )
+        self.incremental_sort_checkbox.setToolTip(
+            self.tr(
+                "If enabled, sorting starts from the order of the last sort: added mods and mods with changed rules are moved to a valid position, other mods keep their order. Hold Shift while clicking Sort for a full sort."
+            )
+        )
+        sort_group_box_layout.addWidget(self.incremental_sort_checkbox)
+
         # Dependencies group
         deps_group_box = QGroupBox()
         tab_layout.addWidget(deps_group_box)
@@ -1465,6 +1475,35 @@ This basically preserves your mod coloring, user notes etc. for this many second
         )
         group_layout.addWidget(self.prefer_versioned_about_tags_checkbox)
 
+        # Mod metadata parsing backend
+        metadata_parser_backend_layout = QHBoxLayout()
+        metadata_parser_backend_label = QLabel(self.tr("Mod metadata parsing backend:"))
+        metadata_parser_backend_layout.addWidget(metadata_parser_backend_label)
+        self.metadata_parser_backend_combobox = QComboBox()
+        self.metadata_parser_backend_combobox.addItem(self.tr("Threads"), "thread")
+        self.metadata_parser_backend_combobox.addItem(self.tr("Processes"), "process")
+        self.metadata_parser_backend_combobox.setToolTip(
+            self.tr(
+                "Threads parse mod metadata on a single CPU core. "
+                "Processes parse large mod folders on all CPU cores, which can make refreshing much faster with many mods. "
+                "If parsing with processes fails, RimSort falls back to threads."
+            )
+        )
+        metadata_parser_backend_layout.addWidget(self.metadata_parser_backend_combobox)
+        metadata_parser_backend_layout.addStretch()
+        group_layout.addLayout(metadata_parser_backend_layout)
+
+        # Steam DB index
+        self.use_steam_db_index_checkbox = QCheckBox(self.tr("Use an indexed Steam DB"))
+        self.use_steam_db_index_checkbox.setToolTip(
+            self.tr(
+                "When enabled, the Steam DB is compiled into an index file whenever it changes, "
+                "and mod information is read from it on demand instead of loading the whole database into memory. "
+                "This reduces memory usage and refresh time with large Steam DBs."
+            )
+        )
+        group_layout.addWidget(self.use_steam_db_index_checkbox)
+
         run_args_group = QGroupBox()
         tab_layout.addWidget(run_args_group)
 
@@ -9,6 +9,7 @@ from PySide6.QtWidgets import (
 )
 
 from app.utils.constants import RIMWORLD_DLC_METADATA
+from app.utils.steam_db_index import find_publishedfileids_by_packageid
 from app.windows.base_mods_panel import BaseModsPanel
 
 
@@ -117,20 +118,23 @@ class MissingModsPrompt(BaseModsPanel):
         if steam_metadata and len(steam_metadata.keys()) > 0:
             # Generate a list of all missing mods + any missing mod dependencies listed
             # in the user-configured Steam metadata.
-            for publishedfileid, metadata in steam_metadata.items():
-                name = metadata.get("steamName", metadata.get("name", "Not found"))
-                packageid = metadata.get("packageId", "None").lower()
-                game_versions = metadata.get("gameVersions", ["None listed"])
-
-                # Remove AppId dependencies from this dict. They cannot be subscribed like mods.
-                dependencies = {
-                    key: value
-                    for key, value in metadata.get("dependencies", {}).items()
-                    if key not in RIMWORLD_DLC_METADATA.keys()
-                }
-
-                # Populate data_by_variants dict
-                if packageid in self.packageids:
+            variant_publishedfileids = find_publishedfileids_by_packageid(
+                steam_metadata, self.packageids
+            )
+            for packageid, publishedfileids in variant_publishedfileids.items():
+                for publishedfileid in publishedfileids:
+                    metadata = steam_metadata[publishedfileid]
+                    name = metadata.get("steamName", metadata.get("name", "Not found"))
+                    game_versions = metadata.get("gameVersions", ["None listed"])
+
+                    # Remove AppId dependencies from this dict. They cannot be subscribed like mods.
+                    dependencies = {
+                        key: value
+                        for key, value in metadata.get("dependencies", {}).items()
+                        if key not in RIMWORLD_DLC_METADATA.keys()
+                    }
+
+                    # Populate data_by_variants dict
                     variants = self.data_by_variants.setdefault(packageid, {})
                     variants[publishedfileid] = {
                         "name": name,
@@ -1,3 +1,4 @@
+from copy import deepcopy
 from functools import partial
 from typing import Any, Callable
 
@@ -139,14 +140,16 @@ class RuleEditor(QWidget):
         self.initial_mode = initial_mode
         # THE METADATA
         self.local_rules_hidden: bool = False
+        # Deep copies, so edits are only seen by MetadataManager once saved and
+        # reloaded, where they are diffed against the loaded rules
         self.community_rules = (
-            self.metadata_manager.external_community_rules.copy()
+            deepcopy(self.metadata_manager.external_community_rules)
             if self.metadata_manager.external_community_rules
             else {}
         )
         self.community_rules_hidden: bool = False
         self.user_rules = (
-            self.metadata_manager.external_user_rules.copy()
+            deepcopy(self.metadata_manager.external_user_rules)
             if self.metadata_manager.external_user_rules
             else {}
         )
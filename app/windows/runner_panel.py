@@ -1,7 +1,7 @@
 import os
 from platform import system
 from re import compile, search
-from typing import Any, Optional, Sequence
+from typing import Any, Mapping, Optional, Sequence
 
 import psutil
 from loguru import logger
@@ -42,7 +42,7 @@ class RunnerPanel(QWidget):
         self,
         todds_dry_run_support: bool = False,
         steamcmd_download_tracking: Optional[list[str]] = None,
-        steam_db: Optional[dict[str, Any]] = None,
+        steam_db: Optional[Mapping[str, Any]] = None,
     ):
         """
         Initialize the RunnerPanel widget.
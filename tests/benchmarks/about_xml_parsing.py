@@ -0,0 +1,90 @@
+"""
+Micro-benchmark About.xml parsing: the lxml extractor against the generic
+xmltodict path previously used by the mod parser.
+
+Usage: python -m tests.benchmarks.about_xml_parsing [--repeat N]
+"""
+
+import argparse
+import tempfile
+import timeit
+from pathlib import Path
+from typing import Any, Callable
+
+from loguru import logger
+
+from app.utils.xml import extract_about_xml_metadata, xml_path_to_json
+
+MOD_EXAMPLES_PATH = Path(__file__).parent.parent / "data" / "mod_examples"
+
+
+def write_large_about_xml(path: Path) -> None:
+    """write an About.xml resembling a large, real-world mod"""
+    versions = "".join(f"<li>1.{i}</li>" for i in range(6))
+    dependencies = "".join(
+        f"<li><packageId>author.dependency{i}</packageId>"
+        f"<displayName>Dependency {i}</displayName>"
+        f"<steamWorkshopUrl>steam://url/CommunityFilePage/{i}</steamWorkshopUrl></li>"
+        for i in range(10)
+    )
+    load_after = "".join(f"<li>author.mod{i}</li>" for i in range(30))
+    description = "A long description of the mod. " * 200
+    path.write_text(
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        "<ModMetaData>"
+        "<name>Large Mod</name><author>Author</author>"
+        "<packageId>Author.LargeMod</packageId>"
+        f"<supportedVersions>{versions}</supportedVersions>"
+        f"<modDependencies>{dependencies}</modDependencies>"
+        f"<modDependenciesByVersion><v1.5>{dependencies}</v1.5></modDependenciesByVersion>"
+        f"<loadAfter>{load_after}</loadAfter>"
+        f"<description>{description}</description>"
+        f"<descriptionsByVersion><v1.5>{description}</v1.5></descriptionsByVersion>"
+        "</ModMetaData>",
+        encoding="utf-8",
+    )
+
+
+def xmltodict_path(path: str) -> dict[str, Any]:
+    """the previous pipeline: generic XML to dict, then lowercase and rename keys"""
+    mod_data = {k.lower(): v for k, v in xml_path_to_json(path).items()}
+    mod_metadata = {k.lower(): v for k, v in mod_data["modmetadata"].items()}
+    return {
+        ("authors" if key == "author" else key): value
+        for key, value in mod_metadata.items()
+    }
+
+
+def bench(func: Callable[[str], Any], paths: list[str], repeat: int) -> float:
+    """return the mean time per file in microseconds"""
+    total = timeit.timeit(lambda: [func(path) for path in paths], number=repeat)
+    return total / (repeat * len(paths)) * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    logger.remove()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        large_about = Path(tmp) / "About.xml"
+        write_large_about_xml(large_about)
+        cases = {
+            "mod_examples": [
+                str(p) for p in sorted(MOD_EXAMPLES_PATH.rglob("About.xml"))
+            ],
+            "large About.xml": [str(large_about)],
+        }
+        for name, paths in cases.items():
+            old = bench(xmltodict_path, paths, args.repeat)
+            new = bench(extract_about_xml_metadata, paths, args.repeat)
+            print(
+                f"{name} ({len(paths)} files): xmltodict {old:.1f} us/file, "
+                f"lxml {new:.1f} us/file, speedup {old / new:.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
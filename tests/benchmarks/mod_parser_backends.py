@@ -0,0 +1,125 @@
+"""
+Benchmark the thread pool and process pool mod metadata parsing backends.
+
+The mod folders in tests/data/mod_examples are copied many times into a
+temporary directory, then parsed with both backends without the About.xml
+parse cache, so every About.xml is read from disk.
+
+Usage: python -m tests.benchmarks.mod_parser_backends [--copies N] [--workers N]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from math import ceil
+from pathlib import Path
+from typing import Any, cast
+
+from loguru import logger
+
+MOD_EXAMPLES_PATH = Path(__file__).parent.parent / "data" / "mod_examples"
+
+
+def create_mod_tree(target: Path, copies: int) -> list[str]:
+    """copy every example mod folder `copies` times into target"""
+    mod_dirs = [
+        mod_dir
+        for source_dir in MOD_EXAMPLES_PATH.iterdir()
+        if source_dir.is_dir()
+        for mod_dir in source_dir.iterdir()
+        if mod_dir.is_dir()
+    ]
+    paths = []
+    for i in range(copies):
+        for mod_dir in mod_dirs:
+            path = target / f"{mod_dir.name}_{i}"
+            shutil.copytree(mod_dir, path)
+            paths.append(str(path))
+    return paths
+
+
+def bench_threads(batch: dict[str, str]) -> float:
+    from PySide6.QtCore import QThreadPool
+
+    from app.utils.metadata import ModParser, ProcessParserContext
+
+    @dataclass
+    class BenchmarkContext(ProcessParserContext):
+        internal_local_metadata: dict[str, Any] = field(default_factory=dict)
+        packageid_to_uuids: dict[str, set[str]] = field(default_factory=dict)
+
+        def update_parsed_metadata(self, uuid: str, mod_metadata: Any) -> None:
+            self.internal_local_metadata[uuid] = mod_metadata
+
+    context = BenchmarkContext(
+        external_steam_metadata=None, workshop_acf_data={}, steamcmd_acf_data={}
+    )
+    pool = QThreadPool.globalInstance()
+    start = time.perf_counter()
+    for directory, uuid in batch.items():
+        pool.start(ModParser("local", directory, cast(Any, context), uuid))
+    pool.waitForDone()
+    elapsed = time.perf_counter() - start
+    assert len(context.internal_local_metadata) == len(batch)
+    return elapsed
+
+
+def bench_processes(batch: dict[str, str], workers: int) -> float:
+    from app.utils.generic import chunks
+    from app.utils.metadata import (
+        PARSER_PROCESS_CHUNKS_PER_WORKER,
+        ProcessParserContext,
+        _init_parser_process,
+        _parse_mod_batch_in_process,
+    )
+
+    context = ProcessParserContext(
+        external_steam_metadata=None, workshop_acf_data={}, steamcmd_acf_data={}
+    )
+    items = list(batch.items())
+    chunk_size = ceil(len(items) / (workers * PARSER_PROCESS_CHUNKS_PER_WORKER))
+    metadata: dict[str, Any] = {}
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_parser_process,
+        initargs=(context,),
+    ) as pool:
+        futures = [
+            pool.submit(_parse_mod_batch_in_process, "local", chunk, {})
+            for chunk in chunks(items, chunk_size)
+        ]
+        for future in futures:
+            metadata.update(future.result()[0])
+    elapsed = time.perf_counter() - start
+    assert len(metadata) == len(batch)
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--copies", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    # Parsing logs every mod at DEBUG level, which would dominate the timings
+    logger.remove()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = create_mod_tree(Path(tmp), args.copies)
+        batch = {path: str(i) for i, path in enumerate(paths)}
+        print(f"Parsing {len(batch)} mod folders")
+
+        thread_time = bench_threads(batch)
+        print(f"thread pool:  {thread_time:.3f}s")
+        process_time = bench_processes(batch, args.workers)
+        print(f"process pool: {process_time:.3f}s ({args.workers} workers)")
+        print(f"speedup: {thread_time / process_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+"""
+Benchmark the sorter on synthetic active mod lists, by default of 100, 1000 and
+5000 mods. The mod lists have realistic rule densities: Core and DLCs, known
+tier one frameworks and loadTop mods, loadBottom mods, About.xml loadAfter and
+loadBefore rules, ByVersion rules and dependencies with alternatives.
+
+For each size, the suite times building the dependency graphs, both sort
+methods and the active list errors / warnings check, and measures the quality
+of each sort: the number of load order rules the sorted list breaks, and for
+an incremental sort after adding mods, how many mods moved.
+
+Results are printed, and written as JSON with --output, to compare them
+between releases.
+
+Usage: python -m tests.benchmarks.sort_suite [--mods N [N ...]] [--repeat N]
+    [--output results.json]
+"""
+
+import argparse
+import bisect
+import json
+import platform
+import random
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable
+from unittest.mock import MagicMock, patch
+
+from loguru import logger
+
+from app.utils.constants import KNOWN_TIER_ONE_MODS, RIMWORLD_PACKAGE_IDS
+
+DEFAULT_SIZES = [100, 1000, 5000]
+GAME_VERSION = "v1.5"
+NAMES = ["Vanilla", "Expanded", "Better", "More", "Simple", "Tweaks", "Framework"]
+
+
+def _add_load_after(
+    metadata: dict[str, dict[str, Any]], mod: str, load_first: str
+) -> None:
+    """a rule of mod to load after load_first, compiled like add_load_rule_to_mod"""
+    metadata[mod].setdefault("loadTheseBefore", set()).add((load_first, True))
+    metadata[load_first].setdefault("loadTheseAfter", set()).add((mod, False))
+
+
+def _add_load_before(
+    metadata: dict[str, dict[str, Any]], mod: str, load_after: str
+) -> None:
+    metadata[mod].setdefault("loadTheseAfter", set()).add((load_after, True))
+    metadata[load_after].setdefault("loadTheseBefore", set()).add((mod, False))
+
+
+def _li(package_ids: list[str]) -> dict[str, list[str]]:
+    return {"li": package_ids}
+
+
+def generate_mod_set(mods: int, seed: int = 0) -> dict[str, dict[str, Any]]:
+    """
+    Generate the compiled metadata of a mod list, keyed by uuid.
+
+    Mods get a hidden rank, and rules only ask mods to load after lower ranked
+    mods, so the rules have no cycles.
+
+    :param mods: Number of mods, including Core and the DLCs.
+    :param seed: Seed of the random generator.
+    :return: Metadata by uuid, with the About.xml tags the rules come from.
+    """
+    rng = random.Random(seed)
+    tier_zero = RIMWORLD_PACKAGE_IDS[: min(len(RIMWORLD_PACKAGE_IDS), mods)]
+    remaining = mods - len(tier_zero)
+    frameworks = sorted(KNOWN_TIER_ONE_MODS)[: remaining // 20] + [
+        f"framework{i}.core" for i in range(max(0, remaining // 50))
+    ]
+    bottom = ["krkr.rocketman"] + [
+        f"performance{i}.bottom" for i in range(max(0, remaining // 50 - 1))
+    ]
+    frameworks = frameworks[: max(0, remaining - len(bottom))]
+    bottom = bottom[: max(0, remaining - len(frameworks))]
+    regular = [
+        f"author{i % (mods // 3 + 1)}.mod{i}"
+        for i in range(remaining - len(frameworks) - len(bottom))
+    ]
+    ranked = tier_zero + frameworks + regular + bottom
+    by_package_id: dict[str, dict[str, Any]] = {}
+    for rank, package_id in enumerate(ranked):
+        # Few distinct names, so that name ties are common
+        by_package_id[package_id] = {
+            "packageid": package_id,
+            "name": f"{rng.choice(NAMES)} {rng.choice(NAMES)} {rank % 400}",
+        }
+        if package_id in frameworks and package_id not in KNOWN_TIER_ONE_MODS:
+            by_package_id[package_id]["loadTop"] = True
+        if package_id in bottom and package_id != "krkr.rocketman":
+            by_package_id[package_id]["loadBottom"] = True
+
+    for rank, package_id in enumerate(ranked):
+        if rank < len(tier_zero):
+            # DLCs load after Core
+            if rank:
+                _add_load_after(by_package_id, package_id, ranked[0])
+            continue
+        mod = by_package_id[package_id]
+        lower = ranked[:rank]
+        # Most mods depend on a DLC or a framework, some on other mods
+        candidates = tier_zero + frameworks[: max(0, rank - len(tier_zero))]
+        dependencies = set(rng.sample(candidates, min(len(candidates), 2)))
+        if len(lower) > len(candidates) and rng.random() < 0.3:
+            dependencies.add(rng.choice(lower[len(candidates) :]))
+        mod["dependencies"] = []
+        for dependency in sorted(dependencies):
+            alternatives: set[str] = set()
+            if rng.random() < 0.1:
+                alternatives.add(f"{dependency}.continued")
+            mod["dependencies"].append((dependency, {"alternatives": alternatives}))
+        load_after = sorted(
+            dependencies | {rng.choice(lower) for _ in range(rng.randrange(3))}
+        )
+        if rng.random() < 0.1:
+            # ByVersion rules replace the loadAfter rules for the game version
+            mod["loadafterbyversion"] = {
+                "v1.4": _li(load_after[:1]),
+                GAME_VERSION: _li(load_after),
+            }
+        else:
+            mod["loadafter"] = _li(load_after)
+        for load_first in load_after:
+            _add_load_after(by_package_id, package_id, load_first)
+        higher = ranked[rank + 1 :]
+        if higher and rng.random() < 0.1:
+            load_before = rng.choice(higher)
+            mod["loadbefore"] = _li([load_before])
+            _add_load_before(by_package_id, package_id, load_before)
+    return {f"uuid-{i}": by_package_id[p] for i, p in enumerate(ranked)}
+
+
+def best_of(repeat: int, function: Callable[[], object]) -> float:
+    """the fastest of repeat runs, in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def count_rule_violations(
+    metadata: dict[str, dict[str, Any]], sorted_uuids: list[str]
+) -> int:
+    """number of explicit load order rules broken by a sorted mod list"""
+    from app.utils.mod_list_validation import ModListValidator
+    from app.utils.rule_snapshot import RuleSnapshot
+
+    issues = ModListValidator(lambda *_: False).validate(
+        sorted_uuids, RuleSnapshot.from_metadata(metadata), False
+    )
+    return sum(
+        len(i.load_before_violations) + len(i.load_after_violations)
+        for i in issues.values()
+    )
+
+
+def count_moved(previous_order: list[str], new_order: list[str]) -> int:
+    """
+    the fewest previously sorted mods to move to get their new relative order:
+    those outside of a longest increasing subsequence of new positions
+    """
+    new_positions = {package_id: i for i, package_id in enumerate(new_order)}
+    positions = [new_positions[p] for p in previous_order if p in new_positions]
+    # Smallest last position of the increasing subsequences of each length
+    tails: list[int] = []
+    for position in positions:
+        length = bisect.bisect_left(tails, position)
+        if length == len(tails):
+            tails.append(position)
+        else:
+            tails[length] = position
+    return len(positions) - len(tails)
+
+
+def run_size(mods: int, repeat: int) -> dict[str, Any]:
+    """time and measure the sorter on a mod list of the given size"""
+    import app.sort.dependencies as sort_deps
+    from app.controllers.sort_controller import Sorter
+    from app.sort.alphabetical_sort import do_alphabetical_sort
+    from app.sort.dependency_graph import DependencyGraph
+    from app.sort.topo_sort import do_topo_sort
+    from app.utils.constants import SortMethod
+    from app.utils.mod_list_validation import ModListValidator
+    from app.utils.rule_snapshot import RuleSnapshot
+
+    metadata = generate_mod_set(mods)
+    active_uuids = set(metadata)
+    rules = RuleSnapshot.from_metadata(metadata)
+    manager = MagicMock()
+    manager.internal_local_metadata = metadata
+    manager.rule_snapshot = rules
+    manager.settings_controller.settings.consider_alternative_package_ids = False
+
+    def sorter(sort_method: SortMethod, uuids: set[str] = active_uuids) -> Sorter:
+        return Sorter(
+            sort_method,
+            {metadata[uuid]["packageid"] for uuid in uuids},
+            uuids,
+            use_moddependencies_as_loadTheseBefore=True,
+        )
+
+    timings: dict[str, float] = {}
+    quality: dict[str, Any] = {
+        "rules": sum(
+            1
+            for mod in metadata.values()
+            for key in ("loadTheseBefore", "loadTheseAfter")
+            for _, explicit in mod.get(key, ())
+            if explicit
+        )
+    }
+    with patch("app.utils.metadata.MetadataManager.instance", return_value=manager):
+        timings["rule_snapshot"] = best_of(
+            repeat, lambda: RuleSnapshot.from_metadata(metadata)
+        )
+        timings["dependency_graph"] = best_of(
+            repeat, lambda: DependencyGraph.from_rules(rules, active_uuids)
+        )
+        mod_graph = DependencyGraph.from_rules(rules, active_uuids)
+        _, tier_zero_mods = sort_deps.gen_tier_zero_deps_graph(mod_graph)
+        tier_zero_uuids = {
+            uuid for uuid, mod in metadata.items() if mod["packageid"] in tier_zero_mods
+        }
+        timings["assign_tiers"] = best_of(
+            repeat, lambda: sort_deps.assign_tiers(mod_graph)
+        )
+        tier_assignment = sort_deps.assign_tiers(mod_graph)
+        for name, gen_tier_deps_graph in (
+            ("gen_tier_zero_deps_graph", sort_deps.gen_tier_zero_deps_graph),
+            ("gen_tier_one_deps_graph", sort_deps.gen_tier_one_deps_graph),
+            ("gen_tier_three_deps_graph", sort_deps.gen_tier_three_deps_graph),
+        ):
+            timings[name] = best_of(
+                repeat, lambda: gen_tier_deps_graph(mod_graph, tier_assignment)
+            )
+        tier_one_mods = tier_assignment.tier_one_mods
+        tier_three_mods = tier_assignment.tier_three_mods
+        timings["gen_tier_two_deps_graph"] = best_of(
+            repeat,
+            lambda: sort_deps.gen_tier_two_deps_graph(
+                mod_graph, tier_one_mods, tier_three_mods, True
+            ),
+        )
+        graphs = sorter(SortMethod.TOPOLOGICAL).generate_dependency_graphs()
+        timings["do_topo_sort"] = best_of(
+            repeat, lambda: [do_topo_sort(g, active_uuids) for g in graphs]
+        )
+        timings["do_alphabetical_sort"] = best_of(
+            repeat, lambda: [do_alphabetical_sort(g, active_uuids) for g in graphs]
+        )
+
+        for name, sort_method in (
+            ("topological", SortMethod.TOPOLOGICAL),
+            ("alphabetical", SortMethod.ALPHABETICAL),
+        ):
+            timings[f"sort_{name}"] = best_of(
+                repeat, lambda: sorter(sort_method).sort()
+            )
+            success, sorted_uuids = sorter(sort_method).sort()
+            quality[f"sort_{name}"] = {
+                "sorted": success,
+                "mods": len(sorted_uuids),
+                "violations": count_rule_violations(metadata, sorted_uuids),
+            }
+
+        # Incremental sort after activating 1% more mods, compared to a full
+        # sort by how many of the previously sorted mods move
+        added = set(
+            random.Random(mods).sample(
+                [uuid for uuid in metadata if uuid not in tier_zero_uuids],
+                max(1, mods // 100),
+            )
+        )
+        previous = sorter(SortMethod.TOPOLOGICAL, active_uuids - added)
+        previous.sort()
+        previous_order = list(previous.sorted_package_ids or [])
+        timings["sort_incremental"] = best_of(
+            repeat,
+            lambda: sorter(SortMethod.TOPOLOGICAL).sort_incrementally(previous),
+        )
+        for name, resorted in (
+            ("sort_incremental", sorter(SortMethod.TOPOLOGICAL)),
+            ("sort_full_after_adding", sorter(SortMethod.TOPOLOGICAL)),
+        ):
+            if name == "sort_incremental":
+                success, sorted_uuids = resorted.sort_incrementally(previous)
+            else:
+                success, sorted_uuids = resorted.sort()
+            quality[name] = {
+                "sorted": success,
+                "mods": len(sorted_uuids),
+                "violations": count_rule_violations(metadata, sorted_uuids),
+                "moved": count_moved(previous_order, resorted.sorted_package_ids or []),
+            }
+
+        # Errors / warnings of the active list, in sorted order
+        _, sorted_uuids = sorter(SortMethod.TOPOLOGICAL).sort()
+
+        def validate_all() -> None:
+            ModListValidator(lambda *_: False).validate(sorted_uuids, rules, False)
+
+        timings["warnings_full"] = best_of(repeat, validate_all)
+        validator = ModListValidator(lambda *_: False)
+        validator.validate(sorted_uuids, rules, False)
+        moved = list(sorted_uuids)
+
+        def validate_move() -> None:
+            moved.insert(0, moved.pop())
+            validator.validate(list(moved), rules, False)
+
+        timings["warnings_move"] = best_of(repeat, validate_move)
+    return {"mods": mods, "timings_ms": timings, "quality": quality}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mods", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args()
+
+    logger.remove()
+
+    from app.utils.app_info import AppInfo
+
+    results = []
+    for mods in args.mods:
+        result = run_size(mods, args.repeat)
+        results.append(result)
+        print(f"{mods} mods, {result['quality']['rules']} rules")
+        for name, timing in result["timings_ms"].items():
+            print(f"  {name}: {timing:.1f} ms")
+        for name, measures in result["quality"].items():
+            if isinstance(measures, dict):
+                print(f"  {name}: {measures}")
+
+    if args.output:
+        report = {
+            "version": AppInfo().app_version,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "repeat": args.repeat,
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark loading a Steam Workshop DB: stdlib json into untyped dicts (the
+previous MetadataManager loader), msgspec with the SteamDbSchema, and the
+memory-mapped SteamDB index. Each loader runs in a fresh process, so that its
+peak RSS can be measured.
+
+Usage: python -m tests.benchmarks.steam_db_decoding [--entries N] [--db PATH]
+"""
+
+import argparse
+import json
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from loguru import logger
+
+LOADERS = ("json", "msgspec", "index")
+
+
+def write_steam_db(path: Path, entries: int) -> None:
+    """write a steamDB.json resembling the public Steam Workshop DB"""
+    rng = random.Random(0)
+    database = {}
+    for i in range(entries):
+        publishedfileid = str(1_000_000_000 + i)
+        database[publishedfileid] = {
+            "url": f"https://steamcommunity.com/sharedfiles/filedetails/?id={publishedfileid}",
+            "packageId": f"author{i % 5000}.mod{i}",
+            "gameVersions": ["1.4", "1.5"],
+            "steamName": f"Mod {i}",
+            "name": f"Mod {i}",
+            "authors": f"Author {i % 5000}",
+            "dependencies": {
+                str(1_000_000_000 + rng.randrange(entries)): [
+                    "Dependency",
+                    "https://steamcommunity.com/workshop/filedetails/?id=0",
+                ]
+                for _ in range(rng.randrange(3))
+            },
+        }
+    path.write_text(
+        json.dumps({"version": int(time.time()), "database": database}),
+        encoding="utf-8",
+    )
+
+
+def peak_rss_mb() -> float:
+    """return the peak resident set size of this process, in MB"""
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def run_loader(loader: str, db_path: Path, index_folder: Path) -> None:
+    """load the DB once with a loader and print its decode time and peak RSS"""
+    from app.utils.metadata import decode_steam_db
+    from app.utils.steam_db_index import open_steam_db_index
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if loader == "json":
+        with open(db_path, encoding="utf-8") as f:
+            steam_db = json.loads(f.read())["database"]
+    elif loader == "msgspec":
+        with open(db_path, "rb") as f:
+            _, steam_db = decode_steam_db(f.read())
+    else:
+        steam_db = open_steam_db_index(db_path, index_folder)
+    elapsed = time.perf_counter() - start
+    print(json.dumps([len(steam_db), elapsed, peak_rss_mb() - baseline]))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=40_000)
+    parser.add_argument("--db", type=Path, help="an existing steamDB.json to load")
+    parser.add_argument("--loader", choices=LOADERS, help=argparse.SUPPRESS)
+    parser.add_argument("--index-folder", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    logger.remove()
+
+    if args.loader:
+        run_loader(args.loader, args.db, args.index_folder)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db
+        if db_path is None:
+            db_path = Path(tmp) / "steamDB.json"
+            write_steam_db(db_path, args.entries)
+        index_folder = Path(tmp) / "index"
+        # Build the index up front, so only opening it is measured
+        from app.utils.steam_db_index import open_steam_db_index
+
+        open_steam_db_index(db_path, index_folder).close()
+
+        size = db_path.stat().st_size / (1024 * 1024)
+        print(f"{db_path.name}: {size:.1f} MB")
+        for loader in LOADERS:
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "tests.benchmarks.steam_db_decoding",
+                    "--loader",
+                    loader,
+                    "--db",
+                    str(db_path),
+                    "--index-folder",
+                    str(index_folder),
+                ],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            entries, elapsed, peak_rss = json.loads(output.splitlines()[-1])
+            print(
+                f"{loader}: {entries} entries in {elapsed * 1000:.0f} ms, "
+                f"peak RSS +{peak_rss:.1f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
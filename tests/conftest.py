@@ -1,3 +1,6 @@
+from typing import Any, Generator
+from unittest.mock import MagicMock, patch
+
 import pytest
 from PySide6.QtWidgets import QDialog
 
@@ -14,3 +17,21 @@ def auto_accept_dialogs(monkeypatch: pytest.MonkeyPatch) -> None:
 
     monkeypatch.setattr(QDialog, "exec_", fake_exec)
     monkeypatch.setattr(QDialog, "exec", fake_exec)
+
+
+@pytest.fixture
+def metadata_manager() -> Generator[MagicMock, None, None]:
+    """
+    A mock MetadataManager without mods, returned by MetadataManager.instance().
+    Test modules override this fixture to add their mods and rules to it.
+    """
+    manager = MagicMock()
+    manager.internal_local_metadata = {}
+    with patch("app.utils.metadata.MetadataManager.instance", return_value=manager):
+        yield manager
+
+
+@pytest.fixture
+def metadata(metadata_manager: MagicMock) -> dict[str, dict[str, Any]]:
+    """The internal_local_metadata of the mock MetadataManager"""
+    return metadata_manager.internal_local_metadata
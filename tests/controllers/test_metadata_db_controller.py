@@ -1,7 +1,9 @@
+import time
 from pathlib import Path
 from typing import Generator
 
 import pytest
+from sqlalchemy import text
 
 from app.controllers.metadata_db_controller import AuxMetadataController
 from app.models.metadata.metadata_db import AuxMetadataEntry, TagsEntry
@@ -74,6 +76,83 @@ def test_get_value_equals(temp_db: AuxMetadataController) -> None:
         assert Path(entries[1].path) in [item_path1, item_path2]
 
 
+def test_get_or_create_many(temp_db: AuxMetadataController) -> None:
+    item_path1 = Path("/test/path1")
+    item_path2 = Path("/test/path2")
+    with temp_db.Session() as session:
+        entry1 = temp_db.get_or_create(session, item_path1)
+        entry1.color_hex = "#ffffff"
+        entry1.outdated = True
+        session.commit()
+
+    with temp_db.Session() as session:
+        entries = temp_db.get_or_create_many(session, [item_path1, str(item_path2)])
+        assert set(entries) == {str(item_path1), str(item_path2)}
+        assert entries[str(item_path1)].color_hex == "#ffffff"
+        assert entries[str(item_path2)].color_hex is None
+        assert not entries[str(item_path2)].ignore_warnings
+
+        temp_db.update_many(session, [item_path1], outdated=False)
+        assert not entries[str(item_path1)].outdated
+
+    with temp_db.Session() as session:
+        entries_list = session.query(AuxMetadataEntry).all()
+        assert len(entries_list) == 2
+        assert not any(entry.outdated for entry in entries_list)
+
+
+def test_sqlite_pragmas(temp_db: AuxMetadataController) -> None:
+    with temp_db.Session() as session:
+        assert session.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        # NORMAL
+        assert session.execute(text("PRAGMA synchronous")).scalar() == 1
+
+    temp_db.set_performance_mode(True)
+    with temp_db.Session() as session:
+        # OFF
+        assert session.execute(text("PRAGMA synchronous")).scalar() == 0
+
+
+def test_queue_update(temp_db: AuxMetadataController) -> None:
+    item_path = Path("/test/path")
+    with temp_db.Session() as session:
+        temp_db.get_or_create(session, item_path)
+        session.commit()
+
+    temp_db.WRITE_BEHIND_DELAY = 0.05
+    temp_db.queue_update(item_path, user_notes="n")
+    temp_db.queue_update(item_path, user_notes="notes")
+    temp_db.queue_update(item_path, color_hex="#ffffff")
+    # Entries that do not exist are skipped
+    temp_db.queue_update(Path("/test/missing"), user_notes="notes")
+    temp_db.flush()
+    with temp_db.Session() as session:
+        entry = temp_db.get(session, item_path)
+        assert entry is not None
+        assert entry.user_notes == "notes"
+        assert entry.color_hex == "#ffffff"
+        assert session.query(AuxMetadataEntry).count() == 1
+
+    # Committed by the background writer
+    temp_db.queue_update(item_path, ignore_warnings=True)
+    deadline = time.monotonic() + 5
+    while True:
+        with temp_db.Session() as session:
+            entry = temp_db.get(session, item_path)
+            assert entry is not None
+            if entry.ignore_warnings or time.monotonic() > deadline:
+                break
+        time.sleep(0.01)
+    assert entry.ignore_warnings
+
+    temp_db.queue_update(item_path, user_notes="")
+    temp_db.close()
+    with temp_db.Session() as session:
+        entry = temp_db.get(session, item_path)
+        assert entry is not None
+        assert entry.user_notes == ""
+
+
 def test_tags(temp_db: AuxMetadataController) -> None:
     item_path = Path("/test/path")
     with temp_db.Session() as session:
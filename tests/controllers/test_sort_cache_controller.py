@@ -0,0 +1,150 @@
+import copy
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from pytestqt.qtbot import QtBot
+
+from app.controllers.sort_cache_controller import (
+    SORT_CACHE_SIZE,
+    CachedSort,
+    SortCacheController,
+    sort_cache_key,
+)
+from app.utils.constants import SortMethod
+from app.utils.rule_snapshot import RuleSnapshot
+
+METADATA: dict[str, dict[str, Any]] = {
+    "uuid-a": {
+        "packageid": "author.a",
+        "name": "A",
+        "loadTheseBefore": {("author.b", True), ("author.c", False)},
+        "dependencies": [("author.b", {"alternatives": {"author.c", "author.d"}})],
+    },
+    "uuid-b": {"packageid": "author.b", "name": "B"},
+    "uuid-c": {"packageid": "author.c", "name": "C", "loadBottom": True},
+    "uuid-inactive": {"packageid": "author.inactive", "name": "Inactive"},
+}
+ACTIVE_UUIDS = ["uuid-a", "uuid-b", "uuid-c"]
+
+
+def _key(
+    metadata: dict[str, dict[str, Any]] = METADATA,
+    active_uuids: list[str] = ACTIVE_UUIDS,
+    sort_method: str = SortMethod.TOPOLOGICAL,
+    use_moddependencies_as_loadTheseBefore: bool = True,
+    rule_snapshot_version: int = 1,
+) -> str:
+    return sort_cache_key(
+        metadata,
+        RuleSnapshot.from_metadata(metadata, version=rule_snapshot_version),
+        active_uuids,
+        sort_method,
+        use_moddependencies_as_loadTheseBefore,
+        consider_alternative_package_ids=False,
+    )
+
+
+@pytest.fixture
+def sort_cache(metadata_manager: MagicMock) -> SortCacheController:
+    metadata_manager.internal_local_metadata = METADATA
+    metadata_manager.rule_snapshot = RuleSnapshot.from_metadata(METADATA)
+    settings_controller = MagicMock()
+    settings_controller.settings.sorting_algorithm = SortMethod.TOPOLOGICAL
+    settings_controller.settings.use_moddependencies_as_loadTheseBefore = False
+    settings_controller.settings.consider_alternative_package_ids = False
+    return SortCacheController(settings_controller)
+
+
+def test_sort_cache_key() -> None:
+    key = _key()
+    assert key == _key(active_uuids=list(reversed(ACTIVE_UUIDS)))
+    assert key != _key(active_uuids=ACTIVE_UUIDS[:2])
+    assert key != _key(sort_method=SortMethod.ALPHABETICAL)
+    assert key != _key(use_moddependencies_as_loadTheseBefore=False)
+    assert key != _key(rule_snapshot_version=2)
+
+    for uuid, changes in (
+        ("uuid-b", {"name": "Renamed"}),
+        ("uuid-b", {"loadTheseAfter": {("author.c", True)}}),
+        ("uuid-c", {"loadBottom": False}),
+        ("uuid-a", {"dependencies": ["author.b"]}),
+        # loadTop rules of inactive mods change which active mods are tier one
+        ("uuid-inactive", {"loadTop": True}),
+    ):
+        metadata = copy.deepcopy(METADATA)
+        metadata[uuid].update(changes)
+        assert key != _key(metadata), (uuid, changes)
+
+    # Unrelated metadata does not change the key
+    metadata = copy.deepcopy(METADATA)
+    metadata["uuid-b"]["description"] = "Changed"
+    metadata["uuid-inactive"]["loadTheseBefore"] = {("author.a", True)}
+    assert key == _key(metadata)
+
+
+def test_sort_cache_key_reads_rule_snapshot() -> None:
+    rule_snapshot = RuleSnapshot.from_metadata(METADATA, version=1)
+    key = sort_cache_key(
+        METADATA, rule_snapshot, ACTIVE_UUIDS, SortMethod.TOPOLOGICAL, True, False
+    )
+    assert key == _key()
+    # Rules are read from the snapshot, not from the metadata dicts
+    metadata = copy.deepcopy(METADATA)
+    metadata["uuid-b"]["loadTheseAfter"] = {("author.c", True)}
+    assert key == sort_cache_key(
+        metadata, rule_snapshot, ACTIVE_UUIDS, SortMethod.TOPOLOGICAL, True, False
+    )
+    # Mods missing from the snapshot are added, as the Sorter does
+    partial_snapshot = RuleSnapshot.from_metadata(
+        METADATA, version=1, uuids=["uuid-a", "uuid-inactive"]
+    )
+    assert key == sort_cache_key(
+        METADATA, partial_snapshot, ACTIVE_UUIDS, SortMethod.TOPOLOGICAL, True, False
+    )
+
+
+def test_sort_cache_evicts_least_recently_used(
+    sort_cache: SortCacheController,
+) -> None:
+    sorter = MagicMock()
+    for i in range(SORT_CACHE_SIZE):
+        sort_cache.put(str(i), CachedSort([str(i)], sorter))
+    assert sort_cache.get("0") is not None
+    sort_cache.put("new", CachedSort([], sorter))
+    assert sort_cache.get("1") is None
+    assert sort_cache.get("0") is not None
+    sort_cache.clear()
+    assert sort_cache.get("0") is None
+
+
+def test_schedule_sorts_in_background(
+    sort_cache: SortCacheController, qtbot: QtBot
+) -> None:
+    sort_cache.schedule(ACTIVE_UUIDS + ["uuid-missing"])
+    key = sort_cache.key(ACTIVE_UUIDS)
+    qtbot.waitUntil(lambda: key in sort_cache._cache, timeout=5000)
+    cached = sort_cache.get(key)
+    assert cached is not None
+    assert cached.order == ["uuid-b", "uuid-a", "uuid-c"]
+    assert cached.sorter.sorted_package_ids == ["author.b", "author.a", "author.c"]
+
+
+def test_background_sort_is_keyed_by_its_rules(
+    sort_cache: SortCacheController, metadata_manager: MagicMock, qtbot: QtBot
+) -> None:
+    scheduled_rules = metadata_manager.rule_snapshot
+    sort_cache.schedule(ACTIVE_UUIDS)
+    sort_cache._start()
+    # compile_metadata replaces the rules while the sort runs
+    metadata = copy.deepcopy(METADATA)
+    metadata["uuid-a"]["loadTheseBefore"] = set()
+    metadata_manager.rule_snapshot = RuleSnapshot.from_metadata(
+        metadata, version=scheduled_rules.version + 1
+    )
+    qtbot.waitUntil(lambda: sort_cache._running_key is None, timeout=5000)
+
+    cached = sort_cache.get(sort_cache.key(ACTIVE_UUIDS, scheduled_rules))
+    assert cached is not None
+    assert cached.order == ["uuid-b", "uuid-a", "uuid-c"]
+    assert sort_cache.get(sort_cache.key(ACTIVE_UUIDS)) is None
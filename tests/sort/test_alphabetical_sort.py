@@ -0,0 +1,108 @@
+import random
+from typing import Any
+
+import pytest
+
+from app.sort.alphabetical_sort import LoadOrder, do_alphabetical_sort
+
+
+def _reference_alphabetical_sort(
+    dependency_graph: dict[str, set[str]], id_to_name: dict[str, str]
+) -> list[str]:
+    """The list based force-insert sort, which do_alphabetical_sort must match"""
+
+    def force_insert(load_order: list[str], package_id: str, index: int) -> None:
+        deps_id_to_name = {
+            dep_id: id_to_name[dep_id]
+            for dep_id in dependency_graph[package_id]
+            if dep_id in id_to_name
+        }
+        for dep_id, _ in sorted(
+            deps_id_to_name.items(), key=lambda x: x[1], reverse=True
+        ):
+            if dep_id not in load_order:
+                index_to_insert_at = index
+                for e in reversed(load_order[index : load_order.index(package_id)]):
+                    if e in dependency_graph[dep_id]:
+                        index_to_insert_at = load_order.index(e) + 1
+                        break
+                load_order.insert(index_to_insert_at, dep_id)
+                force_insert(load_order, dep_id, load_order.index(dep_id))
+
+    load_order: list[str] = []
+    for package_id, _ in sorted(id_to_name.items(), key=lambda x: x[1].lower()):
+        if package_id in dependency_graph and package_id not in load_order:
+            load_order.append(package_id)
+            force_insert(load_order, package_id, load_order.index(package_id))
+    return load_order
+
+
+def _random_graph(
+    rng: random.Random,
+) -> tuple[dict[str, set[str]], dict[str, str]]:
+    mods = rng.randrange(1, 80)
+    density = rng.choice([0.01, 0.05, 0.2])
+    packageids = [f"author.mod{i}" for i in range(mods)]
+    # Few distinct names, so that ties are common
+    id_to_name = {
+        packageid: rng.choice(["Alpha", "alpha", "Beta", "gamma", f"Mod {i}"])
+        for i, packageid in enumerate(packageids)
+    }
+    dependency_graph = {
+        packageid: {
+            dependency
+            for dependency in packageids
+            if dependency != packageid and rng.random() < density
+        }
+        for packageid in packageids
+    }
+    return dependency_graph, id_to_name
+
+
+def test_load_order() -> None:
+    load_order = LoadOrder()
+    load_order.append("b")
+    load_order.insert_after(None, "a")
+    load_order.insert_after("b", "c")
+    load_order.insert_after("a", "d")
+    assert list(load_order) == ["a", "d", "b", "c"]
+    assert len(load_order) == 4
+    assert "d" in load_order
+    assert "e" not in load_order
+    assert load_order.previous("a") is None
+    assert load_order.previous("b") == "d"
+    assert load_order.stamps == {"b": 0, "a": 1, "c": 2, "d": 3}
+
+
+def test_alphabetical_sort_inserts_dependencies_first(
+    metadata: dict[str, dict[str, Any]],
+) -> None:
+    for name in ("a", "b", "c", "d"):
+        metadata[f"uuid-{name}"] = {"packageid": f"author.{name}", "name": name}
+    dependency_graph = {
+        "author.a": {"author.c", "author.b"},
+        "author.b": set(),
+        "author.c": {"author.d"},
+        "author.d": set(),
+    }
+    assert do_alphabetical_sort(dependency_graph, set(metadata)) == [
+        "uuid-b",
+        "uuid-d",
+        "uuid-c",
+        "uuid-a",
+    ]
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_alphabetical_sort_matches_reference(
+    metadata: dict[str, dict[str, Any]], seed: int
+) -> None:
+    dependency_graph, id_to_name = _random_graph(random.Random(seed))
+    for packageid, name in id_to_name.items():
+        metadata[f"uuid-{packageid}"] = {"packageid": packageid, "name": name}
+    expected = [
+        f"uuid-{packageid}"
+        for packageid in _reference_alphabetical_sort(dependency_graph, id_to_name)
+    ]
+    # Iterating over a list of uuids keeps ties in a deterministic order
+    assert do_alphabetical_sort(dependency_graph, list(metadata)) == expected  # type: ignore[arg-type]
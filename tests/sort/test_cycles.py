@@ -0,0 +1,165 @@
+import random
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.sort.cycles import (
+    ABOUT_XML,
+    COMMUNITY_RULES,
+    DEPENDENCIES,
+    INFERRED,
+    USER_RULES,
+    DependencyCycle,
+    RuleSources,
+    describe_dependency_cycle,
+    find_dependency_cycles,
+    strongly_connected_components,
+)
+from app.sort.topo_sort import find_circular_dependencies
+from app.utils.rule_snapshot import RuleSnapshot
+
+
+def _reachable(dependency_graph: dict[str, set[str]], start: str) -> set[str]:
+    seen = {start}
+    stack = [start]
+    while stack:
+        for dependency in dependency_graph[stack.pop()]:
+            if dependency not in seen:
+                seen.add(dependency)
+                stack.append(dependency)
+    return seen
+
+
+def test_find_dependency_cycles() -> None:
+    dependency_graph = {
+        "a": {"b"},
+        "b": {"c", "d"},
+        "c": {"a"},
+        "d": {"a", "missing"},
+        "e": {"e", "a"},
+        "f": {"g"},
+        "g": {"f"},
+    }
+    assert find_dependency_cycles(dependency_graph) == [
+        DependencyCycle(["a", "b", "c", "d"], ["a", "b", "c", "a"]),
+        DependencyCycle(["f", "g"], ["f", "g", "f"]),
+    ]
+    assert find_dependency_cycles({"a": {"a"}, "b": {"a"}}) == []
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_strongly_connected_components(seed: int) -> None:
+    rng = random.Random(seed)
+    packageids = [f"author.mod{i}" for i in range(rng.randrange(1, 80))]
+    dependency_graph = {
+        package_id: {d for d in packageids if rng.random() < 0.03}
+        for package_id in packageids
+    }
+    reachable = {p: _reachable(dependency_graph, p) for p in packageids}
+    components = strongly_connected_components(dependency_graph)
+    assert sorted(p for component in components for p in component) == sorted(
+        packageids
+    )
+    seen: set[str] = set()
+    for component in components:
+        for package_id in component:
+            # Members reach each other, and only depend on earlier components
+            assert {p for p in reachable[package_id] if p in component} == set(
+                component
+            )
+            assert reachable[package_id] <= seen | set(component)
+        seen.update(component)
+
+    for cycle in find_dependency_cycles(dependency_graph):
+        assert cycle.cycle[0] == cycle.cycle[-1] == cycle.component[0]
+        for dependent, dependency in cycle.edges:
+            assert dependency in dependency_graph[dependent]
+            assert dependency in cycle.component
+
+
+@pytest.fixture
+def metadata_manager(metadata_manager: MagicMock) -> MagicMock:
+    metadata_manager.internal_local_metadata.update(
+        {
+            "uuid-a": {
+                "packageid": "author.a",
+                "loadafter": {"li": ["Author.B"]},
+            },
+            "uuid-b": {
+                "packageid": "author.b",
+                "dependencies": [("author.c", {"alternatives": set()})],
+            },
+            "uuid-c": {
+                "packageid": "author.c",
+                "loadbeforebyversion": {"v1.5": {"li": "author.b"}},
+            },
+        }
+    )
+    metadata_manager.packageid_to_uuids = {
+        "author.a": {"uuid-a"},
+        "author.b": {"uuid-b"},
+        "author.c": {"uuid-c"},
+    }
+    metadata_manager.rule_snapshot = RuleSnapshot.from_metadata(
+        metadata_manager.internal_local_metadata
+    )
+    metadata_manager.external_community_rules = {
+        "Author.C": {"loadAfter": {"Author.A": {"name": ["A"]}}}
+    }
+    metadata_manager.external_user_rules = {
+        "author.a": {"loadBefore": {"author.b": {}}}
+    }
+    return metadata_manager
+
+
+def test_rule_sources(metadata_manager: MagicMock) -> None:
+    rule_sources = RuleSources()
+    assert rule_sources.sources("author.a", "author.b") == [ABOUT_XML]
+    assert rule_sources.sources("author.c", "author.a") == [COMMUNITY_RULES]
+    assert rule_sources.sources("author.b", "author.a") == [USER_RULES]
+    assert rule_sources.sources("author.b", "author.c") == [ABOUT_XML]
+    assert rule_sources.sources("author.c", "author.b") == [INFERRED]
+    metadata_manager.internal_local_metadata["uuid-c"].pop("loadbeforebyversion")
+    assert rule_sources.sources("author.b", "author.c") == [DEPENDENCIES]
+
+
+def test_find_circular_dependencies(metadata_manager: MagicMock) -> None:
+    dependency_graph = {
+        "author.a": {"author.b"},
+        "author.b": {"author.a", "author.c"},
+        "author.c": {"author.a"},
+    }
+    with patch("app.sort.topo_sort.show_warning") as show_warning:
+        cycles = find_circular_dependencies(dependency_graph)
+    assert cycles == [
+        DependencyCycle(
+            ["author.a", "author.b", "author.c"],
+            ["author.a", "author.b", "author.a"],
+        )
+    ]
+    details = show_warning.call_args.kwargs["details"]
+    assert details == describe_dependency_cycle(cycles[0], RuleSources())
+    assert details.splitlines() == [
+        "author.a -> author.b -> author.a",
+        "(3 mods in this loop: author.a, author.b, author.c)",
+        f"  author.a loads after author.b: {ABOUT_XML}",
+        f"  author.b loads after author.a: {USER_RULES}",
+    ]
+
+
+def test_find_circular_dependencies_without_metadata() -> None:
+    metadata: dict[str, Any] = {}
+    with (
+        patch(
+            "app.utils.metadata.MetadataManager.instance",
+            return_value=MagicMock(internal_local_metadata=metadata),
+        ),
+        patch("app.sort.topo_sort.show_warning") as show_warning,
+    ):
+        cycles = find_circular_dependencies({"a": {"b"}, "b": {"a"}})
+    assert [cycle.cycle for cycle in cycles] == [["a", "b", "a"]]
+    assert show_warning.call_args.kwargs["details"].splitlines()[1:] == [
+        f"  a loads after b: {INFERRED}",
+        f"  b loads after a: {INFERRED}",
+    ]
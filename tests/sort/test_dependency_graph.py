@@ -0,0 +1,196 @@
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.controllers.sort_controller import Sorter
+from app.sort.dependencies import TierReason, assign_tiers
+from app.sort.dependency_graph import Adjacency, DependencyGraph
+from app.utils.constants import KNOWN_TIER_ONE_MODS, SortMethod
+from app.utils.rule_snapshot import RuleSnapshot
+
+
+def _mod(packageid: str, **rules: Any) -> dict[str, Any]:
+    """Compiled metadata for a mod, rules are given as packageids"""
+    mod_metadata: dict[str, Any] = {"packageid": packageid, "name": packageid}
+    for key, value in rules.items():
+        if key in ("loadTheseBefore", "loadTheseAfter"):
+            mod_metadata[key] = {(packageid, True) for packageid in value}
+        else:
+            mod_metadata[key] = value
+    return mod_metadata
+
+
+METADATA = {
+    "uuid-core": _mod("ludeon.rimworld"),
+    "uuid-harmony": _mod(
+        "brrainz.harmony", loadTheseBefore=["ludeon.rimworld", "inactive.mod"]
+    ),
+    "uuid-hugslib": _mod("unlimitedhugs.hugslib", loadTheseBefore=["brrainz.harmony"]),
+    "uuid-framework": _mod(
+        "author.framework", loadTop=True, loadTheseBefore=["author.library"]
+    ),
+    "uuid-library": _mod("author.library"),
+    "uuid-a": _mod(
+        "author.a",
+        loadTheseBefore=["author.framework", "author.b"],
+        dependencies=["author.c", ("missing.mod", {"alternatives": {"author.b"}})],
+    ),
+    "uuid-b": _mod("author.b", loadTheseBefore=["author.c"]),
+    "uuid-c": _mod("author.c", loadTheseBefore=["author.a"]),
+    "uuid-rocketman": _mod("krkr.rocketman", loadTheseAfter=["author.patch"]),
+    "uuid-patch": _mod("author.patch", loadTheseBefore=["author.a", "krkr.rocketman"]),
+    "uuid-inactive": _mod("inactive.mod", loadTop=True),
+}
+ACTIVE_UUIDS = set(METADATA) - {"uuid-inactive"}
+
+
+@pytest.fixture
+def metadata_manager(metadata_manager: MagicMock) -> MagicMock:
+    metadata_manager.internal_local_metadata = METADATA
+    metadata_manager.rule_snapshot = RuleSnapshot.from_metadata(METADATA)
+    metadata_manager.settings_controller.settings.consider_alternative_package_ids = (
+        True
+    )
+    return metadata_manager
+
+
+def test_adjacency() -> None:
+    adjacency = Adjacency.from_lists([[1], [2], [0], []])
+    assert len(adjacency) == 4
+    assert list(adjacency[0]) == [1]
+    assert list(adjacency[3]) == []
+    # Cycles are only visited once
+    assert adjacency.reachable([1]) == {0, 1, 2}
+    assert adjacency.reachable([3]) == {3}
+    assert adjacency.closure([1]) == {1: 1, 2: 1, 0: 2}
+    assert adjacency.closure([3, 2]) == {3: 3, 2: 2, 0: 2, 1: 0}
+
+
+def test_dependency_graph_from_metadata() -> None:
+    metadata = {
+        "uuid-1": _mod("author.a", loadTheseBefore=["author.b", "inactive.mod"]),
+        "uuid-2": _mod("author.b", loadBottom=True),
+        "uuid-3": _mod("author.a", loadTheseAfter=["author.b"]),
+    }
+    graph = DependencyGraph.from_metadata(metadata, ["uuid-1", "uuid-2", "uuid-3"])
+    assert len(graph) == 2
+    assert list(graph) == ["author.a", "author.b"]
+    assert "author.b" in graph
+    assert "inactive.mod" not in graph
+    a, b = graph.nodes["author.a"], graph.nodes["author.b"]
+    # The rules of the last mod with a packageid are used
+    assert graph.uuids == ["uuid-3", "uuid-2"]
+    assert list(graph.load_before[a]) == []
+    assert list(graph.load_after[a]) == [b]
+    assert graph.load_bottom == {b}
+    assert graph.node_set(["author.b", "inactive.mod"]) == {b}
+    assert graph.subgraph({a, b}) == {"author.a": set(), "author.b": set()}
+
+
+def test_about_dependencies_are_interned() -> None:
+    graph = DependencyGraph.from_metadata(METADATA, ["uuid-a", "uuid-b", "uuid-c"])
+    a = graph.nodes["author.a"]
+    assert graph.about_dependencies[a] == (
+        (graph.nodes["author.c"], ()),
+        (-1, (graph.nodes["author.b"],)),
+    )
+    assert graph.subgraph({a}) == {"author.a": {"author.b"}}
+    assert graph.subgraph({a}, trim=True) == {"author.a": set()}
+
+
+def test_generate_dependency_graphs(metadata_manager: MagicMock) -> None:
+    known_tier_one_mods = set(KNOWN_TIER_ONE_MODS)
+    sorter = Sorter(
+        SortMethod.TOPOLOGICAL,
+        {METADATA[uuid]["packageid"] for uuid in ACTIVE_UUIDS},
+        ACTIVE_UUIDS,
+    )
+    tier_zero, tier_one, tier_two, tier_three = sorter.generate_dependency_graphs()
+    assert tier_zero == {"ludeon.rimworld": set()}
+    assert tier_one == {
+        "unlimitedhugs.hugslib": {"brrainz.harmony"},
+        "brrainz.harmony": {"ludeon.rimworld"},
+        "ludeon.rimworld": set(),
+        "author.framework": {"author.library"},
+        "author.library": set(),
+    }
+    assert tier_two == {
+        "author.a": {"author.b"},
+        "author.b": {"author.c"},
+        "author.c": {"author.a"},
+    }
+    assert tier_three == {
+        "krkr.rocketman": set(),
+        "author.patch": {"krkr.rocketman"},
+    }
+    # loadTop mods are not added to the known tier one mods constant
+    assert KNOWN_TIER_ONE_MODS == known_tier_one_mods
+
+
+def test_assign_tiers(metadata_manager: MagicMock) -> None:
+    mod_graph = DependencyGraph.from_metadata(METADATA, sorted(ACTIVE_UUIDS))
+    tier_assignment = assign_tiers(mod_graph)
+    assert tier_assignment.tiers() == {
+        "ludeon.rimworld": 0,
+        "brrainz.harmony": 1,
+        "unlimitedhugs.hugslib": 1,
+        "author.framework": 1,
+        "author.library": 1,
+        "author.a": 2,
+        "author.b": 2,
+        "author.c": 2,
+        "krkr.rocketman": 3,
+        "author.patch": 3,
+    }
+    # Core is also in the tier one closure, but sorted in tier zero
+    assert "ludeon.rimworld" in tier_assignment.tier_one_mods
+    assert tier_assignment.reason("ludeon.rimworld") == TierReason(
+        0, ("ludeon.rimworld",), "known"
+    )
+    reason = tier_assignment.reason("brrainz.harmony")
+    assert reason == TierReason(
+        1, ("brrainz.harmony", "unlimitedhugs.hugslib"), "known"
+    )
+    assert str(reason) == (
+        "brrainz.harmony must load before unlimitedhugs.hugslib, which is a "
+        "known tier one mod"
+    )
+    assert str(tier_assignment.reason("author.library")) == (
+        "author.library must load before author.framework, which has a loadTop rule"
+    )
+    assert str(tier_assignment.reason("author.patch")) == (
+        "author.patch must load after krkr.rocketman, which is a known tier three mod"
+    )
+    assert str(tier_assignment.reason("author.a")) == (
+        "author.a has no rule placing it in tier zero, one or three"
+    )
+
+
+def test_generate_tier_two_graph_with_about_dependencies(
+    metadata_manager: MagicMock,
+) -> None:
+    sorter = Sorter(
+        SortMethod.TOPOLOGICAL,
+        {METADATA[uuid]["packageid"] for uuid in ACTIVE_UUIDS},
+        ACTIVE_UUIDS,
+        use_moddependencies_as_loadTheseBefore=True,
+    )
+    tier_two = sorter.generate_dependency_graphs()[2]
+    # author.c -> author.a is explicit, so the inferred author.a -> author.c is ignored
+    assert tier_two["author.a"] == {"author.b"}
+
+    metadata_manager.settings_controller.settings.consider_alternative_package_ids = (
+        False
+    )
+    with patch.dict(METADATA["uuid-c"], loadTheseBefore=set()):
+        metadata_manager.rule_snapshot = RuleSnapshot.from_metadata(METADATA)
+        # The sorter keeps the rules it was created with
+        assert sorter.generate_dependency_graphs()[2] == tier_two
+        tier_two = Sorter(
+            SortMethod.TOPOLOGICAL,
+            {METADATA[uuid]["packageid"] for uuid in ACTIVE_UUIDS},
+            ACTIVE_UUIDS,
+            use_moddependencies_as_loadTheseBefore=True,
+        ).generate_dependency_graphs()[2]
+    assert tier_two["author.a"] == {"author.b", "author.c"}
@@ -0,0 +1,170 @@
+import random
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from toposort import CircularDependencyError
+
+from app.controllers.sort_controller import Sorter
+from app.sort.incremental_sort import DynamicTopologicalOrder, do_incremental_sort
+from app.utils.constants import SortMethod
+from app.utils.metadata import MetadataManager
+from app.utils.rule_snapshot import RuleSnapshot
+
+
+def _is_valid(order: list[str], dependency_graph: dict[str, set[str]]) -> bool:
+    positions = {package_id: i for i, package_id in enumerate(order)}
+    return all(
+        positions[dependency] < positions[package_id]
+        for package_id, dependencies in dependency_graph.items()
+        for dependency in dependencies
+        if dependency != package_id
+    )
+
+
+def test_dynamic_topological_order_moves_only_affected_mods() -> None:
+    dynamic_order = DynamicTopologicalOrder(["a", "b", "c", "d", "e"])
+    dynamic_order.add_rule("a", "b")
+    assert dynamic_order.order == ["a", "b", "c", "d", "e"]
+    # d must load before b, and b before c: a and e are not affected
+    dynamic_order.add_rule("b", "c")
+    dynamic_order.add_rule("d", "b")
+    assert dynamic_order.order == ["a", "d", "b", "c", "e"]
+    assert dynamic_order.moved == 3
+
+    with pytest.raises(CircularDependencyError):
+        dynamic_order.add_rule("c", "d")
+    assert dynamic_order.order == ["a", "d", "b", "c", "e"]
+    # Self references are ignored
+    dynamic_order.add_rule("e", "e")
+
+
+def test_do_incremental_sort() -> None:
+    previous_order = ["a", "b", "removed", "c", "d"]
+    dependency_graph = {
+        "a": set(),
+        "b": set(),
+        "c": {"b"},
+        "d": {"new"},
+        "new": {"a"},
+    }
+    # The new mod is placed right before the mod depending on it
+    assert do_incremental_sort(dependency_graph, previous_order) == [
+        "a",
+        "b",
+        "c",
+        "new",
+        "d",
+    ]
+    dependency_graph["d"] = set()
+    assert do_incremental_sort(dependency_graph, previous_order) == [
+        "a",
+        "new",
+        "b",
+        "c",
+        "d",
+    ]
+    # Only the mods affected by a violated rule swap positions
+    assert do_incremental_sort(
+        {"a": {"c"}, "b": set(), "c": set()}, ["a", "b", "c"]
+    ) == ["c", "b", "a"]
+    with pytest.raises(CircularDependencyError):
+        do_incremental_sort({"a": {"b"}, "b": {"a"}}, previous_order)
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_do_incremental_sort_is_valid_and_stable(seed: int) -> None:
+    rng = random.Random(seed)
+    packageids = [f"author.mod{i}" for i in range(rng.randrange(1, 60))]
+    # Rules only point to mods earlier in a random ranking, so there are no cycles
+    ranking = packageids[:]
+    rng.shuffle(ranking)
+    dependency_graph = {
+        package_id: {
+            dependency
+            for dependency in ranking[: ranking.index(package_id)]
+            if rng.random() < 0.05
+        }
+        for package_id in packageids
+    }
+    previous_order = [p for p in packageids if rng.random() < 0.8]
+    rng.shuffle(previous_order)
+
+    order = do_incremental_sort(dependency_graph, previous_order)
+    assert sorted(order) == sorted(packageids)
+    assert _is_valid(order, dependency_graph)
+    # An order that is already valid is kept as it is
+    assert do_incremental_sort(dependency_graph, order) == order
+
+
+def _add_mod(
+    metadata: dict[str, dict[str, Any]], name: str, *load_these_before: str
+) -> None:
+    metadata[f"uuid-{name}"] = {
+        "packageid": f"author.{name}",
+        "name": name,
+        "loadTheseBefore": {(f"author.{p}", True) for p in load_these_before},
+    }
+
+
+def _sorter(
+    metadata: dict[str, dict[str, Any]],
+    sort_method: SortMethod = SortMethod.TOPOLOGICAL,
+) -> Sorter:
+    # As compile_metadata does
+    MetadataManager.instance().rule_snapshot = RuleSnapshot.from_metadata(metadata)
+    return Sorter(
+        sort_method,
+        {mod_metadata["packageid"] for mod_metadata in metadata.values()},
+        set(metadata),
+    )
+
+
+def test_sort_incrementally(metadata: dict[str, dict[str, Any]]) -> None:
+    _add_mod(metadata, "c")
+    _add_mod(metadata, "b")
+    _add_mod(metadata, "a", "c")
+    previous = _sorter(metadata)
+    assert previous.sort() == (True, ["uuid-b", "uuid-c", "uuid-a"])
+    assert previous.sorted_package_ids == ["author.b", "author.c", "author.a"]
+
+    # A new mod with no rules is added at the end, instead of by name
+    _add_mod(metadata, "0")
+    sorter = _sorter(metadata)
+    assert sorter.sort_incrementally(previous) == (
+        True,
+        ["uuid-b", "uuid-c", "uuid-a", "uuid-0"],
+    )
+    assert _sorter(metadata).sort()[1][0] == "uuid-0"
+
+    # A new mod that c must now load after is placed right before c
+    _add_mod(metadata, "d")
+    _add_mod(metadata, "c", "d")
+    incremental = _sorter(metadata)
+    assert incremental.sort_incrementally(sorter) == (
+        True,
+        ["uuid-b", "uuid-d", "uuid-c", "uuid-a", "uuid-0"],
+    )
+
+    # A cycle falls back to a full sort, which fails
+    _add_mod(metadata, "d", "a")
+    with patch("app.sort.topo_sort.show_warning") as show_warning:
+        assert _sorter(metadata).sort_incrementally(incremental) == (False, [])
+    show_warning.assert_called_once()
+
+
+def test_sort_incrementally_falls_back_to_full_sort(
+    metadata: dict[str, dict[str, Any]],
+) -> None:
+    _add_mod(metadata, "b")
+    _add_mod(metadata, "a")
+    unsorted = _sorter(metadata)
+    assert unsorted.sort_incrementally(unsorted) == (True, ["uuid-a", "uuid-b"])
+
+    previous = _sorter(metadata, SortMethod.ALPHABETICAL)
+    previous.sort()
+    previous.sorted_package_ids = ["author.b", "author.a"]
+    assert _sorter(metadata).sort_incrementally(previous) == (
+        True,
+        ["uuid-a", "uuid-b"],
+    )
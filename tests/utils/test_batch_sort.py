@@ -0,0 +1,77 @@
+import pickle
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from app.utils.batch_sort import InstanceSortJob, sort_instance
+from app.utils.constants import SortMethod
+from app.utils.rule_snapshot import RuleSnapshot
+from app.utils.schema import validate_rimworld_mods_list
+from app.utils.xml import xml_path_to_json
+
+METADATA: dict[str, dict[str, Any]] = {
+    "uuid-core": {"packageid": "ludeon.rimworld", "name": "Core"},
+    "uuid-a": {
+        "packageid": "author.a",
+        "name": "A",
+        "loadTheseBefore": {("author.b", True), ("ludeon.rimworld", False)},
+    },
+    "uuid-b": {
+        "packageid": "author.b",
+        "name": "B",
+        "loadTheseBefore": {("ludeon.rimworld", False)},
+    },
+}
+
+
+def _job(path: Path, active_uuids: list[str], dry_run: bool = False) -> InstanceSortJob:
+    return InstanceSortJob(
+        instance="Default",
+        mods_config_path=str(path),
+        game_version="1.5.4104 rev435",
+        active_uuids=active_uuids,
+        mods_config_entries={
+            "uuid-core": "ludeon.rimworld",
+            "uuid-a": "author.a",
+            "uuid-b": "author.b_steam",
+        },
+        metadata=METADATA,
+        rule_snapshot=RuleSnapshot.from_metadata(METADATA, version=1),
+        sort_method=SortMethod.TOPOLOGICAL,
+        use_moddependencies_as_loadTheseBefore=False,
+        missing_mods=[],
+        dry_run=dry_run,
+    )
+
+
+def _sort(job: InstanceSortJob, manager: MagicMock) -> Any:
+    with patch("app.utils.batch_sort.init_headless", return_value=manager):
+        # Jobs are sent to worker processes
+        return sort_instance(pickle.loads(pickle.dumps(job)))
+
+
+def test_sort_instance(tmp_path: Path, metadata_manager: MagicMock) -> None:
+    metadata_manager.settings_controller.settings.consider_alternative_package_ids = (
+        False
+    )
+    path = tmp_path / "ModsConfig.xml"
+    result = _sort(
+        _job(path, ["uuid-a", "uuid-b", "uuid-core"], dry_run=True), metadata_manager
+    )
+    assert result.success
+    assert "not written" in result.message
+    assert not path.exists()
+
+    result = _sort(_job(path, ["uuid-a", "uuid-b", "uuid-core"]), metadata_manager)
+    assert result.success
+    assert validate_rimworld_mods_list(xml_path_to_json(str(path))) == [
+        "ludeon.rimworld",
+        "author.b_steam",
+        "author.a",
+    ]
+
+    path.unlink()
+    result = _sort(_job(path, ["uuid-core", "uuid-b", "uuid-a"]), metadata_manager)
+    assert result.success
+    assert "already sorted" in result.message
+    assert not path.exists()
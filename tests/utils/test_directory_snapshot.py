@@ -0,0 +1,89 @@
+import os
+from pathlib import Path
+
+from app.utils.directory_snapshot import DirectorySnapshots, scan_mod_directory
+
+
+def _make_mod(path: Path) -> Path:
+    (path / "about").mkdir(parents=True)
+    (path / "about" / "ABOUT.xml").write_text("<ModMetaData/>")
+    (path / "about" / "PublishedFileId.txt").write_text("123")
+    (path / "about" / "preview.PNG").write_bytes(b"")
+    (path / "Textures").mkdir()
+    return path
+
+
+def test_scan_mod_directory(tmp_path: Path) -> None:
+    mod = _make_mod(tmp_path / "mod")
+    (mod / ".git").mkdir()
+    (mod / "scenario.rsc").write_text("")
+
+    snapshot = scan_mod_directory(str(mod))
+    assert snapshot is not None
+    assert snapshot.mtime == int(os.path.getmtime(mod))
+    assert snapshot.about_folder == str(mod / "about")
+    assert snapshot.about_file is not None
+    assert snapshot.about_file.path == str(mod / "about" / "ABOUT.xml")
+    assert snapshot.about_file.stat.st_size == len("<ModMetaData/>")
+    assert snapshot.published_file_id_file is not None
+    assert snapshot.preview_file == str(mod / "about" / "preview.PNG")
+    assert snapshot.rsc_file == "scenario.rsc"
+    assert ".git" in snapshot.names
+    assert sorted(snapshot.subdirectories) == [".git", "Textures", "about"]
+    assert not snapshot.has_csharp_assemblies()
+
+    assert scan_mod_directory(str(tmp_path / "missing")) is None
+
+
+def test_scan_mod_directory_without_about_folder(tmp_path: Path) -> None:
+    mod = tmp_path / "mod"
+    mod.mkdir()
+    # A file named like the About folder is ignored
+    (mod / "About").write_text("")
+
+    snapshot = scan_mod_directory(str(mod))
+    assert snapshot is not None
+    assert snapshot.about_folder is None
+    assert snapshot.about_file is None
+    assert snapshot.preview_file is None
+
+
+def test_has_csharp_assemblies(tmp_path: Path) -> None:
+    root_assemblies = _make_mod(tmp_path / "root")
+    (root_assemblies / "Assemblies").mkdir()
+    (root_assemblies / "Assemblies" / "Mod.DLL").write_bytes(b"")
+    versioned_assemblies = _make_mod(tmp_path / "versioned")
+    (versioned_assemblies / "1.5" / "Assemblies").mkdir(parents=True)
+    (versioned_assemblies / "1.5" / "Assemblies" / "Mod.dll").write_bytes(b"")
+    empty_assemblies = _make_mod(tmp_path / "empty")
+    (empty_assemblies / "Assemblies").mkdir()
+    # Only the root Assemblies folder is checked when there is one
+    (empty_assemblies / "1.5" / "Assemblies").mkdir(parents=True)
+    (empty_assemblies / "1.5" / "Assemblies" / "Mod.dll").write_bytes(b"")
+
+    for mod, expected in (
+        (root_assemblies, True),
+        (versioned_assemblies, True),
+        (empty_assemblies, False),
+    ):
+        snapshot = scan_mod_directory(str(mod))
+        assert snapshot is not None
+        assert snapshot.has_csharp_assemblies() is expected
+
+
+def test_directory_snapshots(tmp_path: Path) -> None:
+    mod = _make_mod(tmp_path / "mod")
+    snapshots = DirectorySnapshots()
+    snapshot = snapshots.get(str(mod))
+    assert snapshot is not None
+    assert snapshots.get(str(mod)) is snapshot
+
+    (mod / "about" / "preview.PNG").unlink()
+    assert snapshots.get(str(mod)) is snapshot
+    snapshots.invalidate(str(mod))
+    rescanned = snapshots.get(str(mod))
+    assert rescanned is not None
+    assert rescanned.preview_file is None
+
+    snapshots.clear()
+    assert snapshots.get(str(tmp_path / "missing")) is None
@@ -0,0 +1,450 @@
+import copy
+import json
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Generator
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.utils.metadata import (
+    COMPILED_METADATA_KEYS,
+    PARSE_PROGRESS_STEP,
+    PARSER_PROCESS_MIN_BATCH_SIZE,
+    MetadataManager,
+    ModParser,
+    add_dependency_to_mod,
+    decode_rules_db,
+    decode_steam_db,
+    get_mods_from_list,
+)
+from app.utils.steam_db_index import SteamDbEntries, open_steam_db_index
+
+DBS_PATH = Path(__file__).parent.parent / "data" / "dbs"
+
+
+def _mod(packageid: str, **about: Any) -> dict[str, Any]:
+    """Parsed (not yet compiled) metadata for a local mod"""
+    return {
+        "packageid": packageid,
+        "name": packageid,
+        "data_source": "local",
+        "path": f"/mods/{packageid}",
+        **about,
+    }
+
+
+MODS = {
+    "uuid-a": _mod("author.a", loadafter={"li": "author.b"}),
+    "uuid-b": _mod("author.b", loadbefore={"li": ["author.c"]}),
+    "uuid-c": _mod(
+        "author.c",
+        moddependencies={"li": {"packageId": "author.a"}},
+        incompatiblewith={"li": "author.d"},
+    ),
+    "uuid-d": _mod("author.d"),
+}
+
+USER_RULES = {
+    "Author.D": {"loadAfter": {"author.a": {}}, "loadBottom": {"value": True}}
+}
+
+
+@pytest.fixture
+def metadata_manager() -> Generator[MetadataManager, None, None]:
+    MetadataManager._instance = None
+    settings_controller = MagicMock()
+    settings_controller.settings.prefer_versioned_about_tags = False
+    settings_controller.settings.instances = {"Default": MagicMock()}
+    settings_controller.settings.current_instance = "Default"
+    settings_controller.settings.instances["Default"].workshop_folder = "/workshop"
+    with patch("app.utils.steam.steamcmd.wrapper.SteamcmdInterface.instance"):
+        manager = MetadataManager(settings_controller)
+    manager.game_version = "1.5.4104"
+    manager.external_user_rules = copy.deepcopy(USER_RULES)
+    for uuid, mod_metadata in MODS.items():
+        manager.update_parsed_metadata(uuid, copy.deepcopy(mod_metadata))
+    manager.compile_metadata()
+    yield manager
+    MetadataManager._instance = None
+
+
+def _compiled(manager: MetadataManager) -> dict[str, dict[str, Any]]:
+    """The non-empty compiled keys of every mod"""
+    return {
+        uuid: {
+            key: mod_metadata[key]
+            for key in COMPILED_METADATA_KEYS
+            if mod_metadata.get(key)
+        }
+        for uuid, mod_metadata in manager.internal_local_metadata.items()
+    }
+
+
+def _full_compile(manager: MetadataManager) -> dict[str, dict[str, Any]]:
+    """Compile the manager's current mods from scratch, in a fresh manager"""
+    parsed = {
+        uuid: {
+            key: value
+            for key, value in mod_metadata.items()
+            if key not in COMPILED_METADATA_KEYS
+        }
+        for uuid, mod_metadata in manager.internal_local_metadata.items()
+    }
+    user_rules = manager.external_user_rules
+    settings_controller = manager.settings_controller
+    MetadataManager._instance = None
+    with patch("app.utils.steam.steamcmd.wrapper.SteamcmdInterface.instance"):
+        fresh = MetadataManager(settings_controller)
+    fresh.game_version = manager.game_version
+    fresh.external_user_rules = user_rules
+    for uuid, mod_metadata in parsed.items():
+        fresh.update_parsed_metadata(uuid, copy.deepcopy(mod_metadata))
+    fresh.compile_metadata()
+    return _compiled(fresh)
+
+
+def test_compile_metadata_full(metadata_manager: MetadataManager) -> None:
+    compiled = _compiled(metadata_manager)
+    assert compiled["uuid-a"]["loadTheseBefore"] == {("author.b", True)}
+    assert compiled["uuid-a"]["loadTheseAfter"] == {("author.d", False)}
+    assert compiled["uuid-c"]["loadTheseBefore"] == {("author.b", False)}
+    assert compiled["uuid-c"]["dependencies"] == ["author.a"]
+    assert compiled["uuid-c"]["incompatibilities"] == {"author.d"}
+    assert compiled["uuid-d"]["loadBottom"] is True
+    assert "author.b" in metadata_manager.referencing_uuids
+    assert metadata_manager.referencing_uuids["author.b"] == {"uuid-a"}
+    assert not metadata_manager.dirty_uuids
+
+
+def test_compile_metadata_unchanged_parse_is_not_dirty(
+    metadata_manager: MetadataManager,
+) -> None:
+    compiled_metadata = metadata_manager.internal_local_metadata["uuid-a"]
+    metadata_manager.update_parsed_metadata("uuid-a", copy.deepcopy(MODS["uuid-a"]))
+    assert metadata_manager.internal_local_metadata["uuid-a"] is compiled_metadata
+    assert not metadata_manager.dirty_uuids
+
+
+def test_compile_metadata_changed_mod(metadata_manager: MetadataManager) -> None:
+    metadata_manager.update_parsed_metadata(
+        "uuid-b", _mod("author.b", loadbefore={"li": ["author.d"]})
+    )
+    assert metadata_manager.dirty_uuids == {"uuid-b"}
+    metadata_manager.compile_metadata()
+
+    compiled = _compiled(metadata_manager)
+    assert compiled["uuid-b"]["loadTheseAfter"] == {
+        ("author.d", True),
+        ("author.a", False),
+    }
+    # The reverse rule on author.c was dropped, and one was added to author.d
+    assert ("author.b", False) not in compiled["uuid-c"].get("loadTheseBefore", set())
+    assert ("author.b", False) in compiled["uuid-d"]["loadTheseBefore"]
+    assert compiled == _full_compile(metadata_manager)
+
+
+def test_compile_metadata_only_recompiles_affected_mods(
+    metadata_manager: MetadataManager,
+) -> None:
+    with patch(
+        "app.utils.metadata.add_dependency_to_mod", wraps=add_dependency_to_mod
+    ) as add_dependency:
+        metadata_manager.update_parsed_metadata(
+            "uuid-d", _mod("author.d", description="changed")
+        )
+        metadata_manager.compile_metadata()
+    # author.d is referenced by author.c, so only c and d are recompiled, and
+    # c is the only one of them with About.xml dependencies
+    assert add_dependency.call_count == 1
+    assert _compiled(metadata_manager) == _full_compile(metadata_manager)
+
+
+def test_compile_metadata_removed_mod(metadata_manager: MetadataManager) -> None:
+    metadata_manager.process_deletion("local", "/mods/author.b", "uuid-b")
+    metadata_manager.compile_metadata()
+
+    compiled = _compiled(metadata_manager)
+    assert "loadTheseBefore" not in compiled["uuid-a"]
+    assert ("author.b", False) not in compiled["uuid-c"].get("loadTheseBefore", set())
+    assert "uuid-b" not in metadata_manager.compiled_packageids
+    # author.a still references author.b, but nothing references author.c anymore
+    assert metadata_manager.referencing_uuids["author.b"] == {"uuid-a"}
+    assert "author.c" not in metadata_manager.referencing_uuids
+    assert compiled == _full_compile(metadata_manager)
+
+
+def test_compile_metadata_changed_user_rules(
+    metadata_manager: MetadataManager,
+) -> None:
+    metadata_manager.external_user_rules = {
+        "author.d": {"loadBefore": {"author.c": {}}}
+    }
+    metadata_manager.dirty_packageids.add("author.d")
+    metadata_manager.compile_metadata()
+
+    compiled = _compiled(metadata_manager)
+    assert "loadBottom" not in compiled["uuid-d"]
+    assert compiled["uuid-d"]["loadTheseAfter"] == {("author.c", True)}
+    assert "loadTheseAfter" not in compiled["uuid-a"]
+    assert compiled == _full_compile(metadata_manager)
+
+
+def test_compile_metadata_new_mod_resolves_references(
+    metadata_manager: MetadataManager,
+) -> None:
+    metadata_manager.update_parsed_metadata(
+        "uuid-e", _mod("author.e", loadafter={"li": "author.f"})
+    )
+    metadata_manager.compile_metadata()
+    assert "loadTheseBefore" not in _compiled(metadata_manager)["uuid-e"]
+
+    # Installing author.f recompiles author.e, which references it
+    metadata_manager.update_parsed_metadata("uuid-f", _mod("author.f"))
+    metadata_manager.compile_metadata()
+    compiled = _compiled(metadata_manager)
+    assert compiled["uuid-e"]["loadTheseBefore"] == {("author.f", True)}
+    assert compiled["uuid-f"]["loadTheseAfter"] == {("author.e", False)}
+    assert compiled == _full_compile(metadata_manager)
+
+
+class _YieldingSet(set[str]):
+    """Switches threads inside discard, to widen the race it is used for"""
+
+    def discard(self, element: object) -> None:
+        super().discard(element)
+        time.sleep(0.001)
+
+
+def test_update_parsed_metadata_concurrent_packageid_changes(
+    metadata_manager: MetadataManager,
+) -> None:
+    uuids = [f"uuid-{i}" for i in range(50)]
+    for uuid in uuids:
+        metadata_manager.update_parsed_metadata(uuid, _mod("author.old"))
+    metadata_manager.packageid_to_uuids["author.old"] = _YieldingSet(uuids)
+
+    # Parser threads move every mod off author.old at the same time
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(
+            executor.map(
+                lambda uuid: metadata_manager.update_parsed_metadata(
+                    uuid, _mod(f"author.new{int(uuid[5:]) % 2}")
+                ),
+                uuids,
+            )
+        )
+
+    assert "author.old" not in metadata_manager.packageid_to_uuids
+    assert metadata_manager.packageid_to_uuids["author.new0"] == set(uuids[::2])
+    assert metadata_manager.packageid_to_uuids["author.new1"] == set(uuids[1::2])
+    assert all(uuid in metadata_manager.internal_local_metadata for uuid in uuids)
+
+
+@pytest.mark.parametrize("use_steam_db_index", [False, True])
+def test_compile_metadata_steam_db_dependencies(
+    metadata_manager: MetadataManager, tmp_path: Path, use_steam_db_index: bool
+) -> None:
+    database = {
+        "10": {"packageid": "author.a", "name": "A", "dependencies": {"20": []}},
+        "20": {"packageid": "Author.B", "name": "B"},
+    }
+    steam_db: Any = database
+    if use_steam_db_index:
+        db_path = tmp_path / "steamDB.json"
+        db_path.write_text(json.dumps({"version": 0, "database": database}))
+        steam_db = open_steam_db_index(db_path, tmp_path / "index")
+    metadata_manager.external_steam_metadata = steam_db
+    metadata_manager.update_parsed_metadata(
+        "uuid-a", _mod("author.a", loadafter={"li": "author.b"}, publishedfileid="10")
+    )
+    metadata_manager.compile_metadata()
+
+    assert _compiled(metadata_manager)["uuid-a"]["dependencies"] == ["author.b"]
+    assert metadata_manager.steamdb_packageid_to_name["author.b"] == "B"
+
+
+def test_decode_steam_db() -> None:
+    json_bytes = (DBS_PATH / "steamDB.json").read_bytes()
+    database = json.loads(json_bytes)["database"]
+    version, steam_db = decode_steam_db(json_bytes)
+
+    assert version == 12345
+    assert isinstance(steam_db, SteamDbEntries)
+    assert set(steam_db) == set(database)
+    for publishedfileid, entry in database.items():
+        # Fields left at their defaults are omitted
+        assert steam_db[publishedfileid] == {
+            key: value for key, value in entry.items() if value not in ("", {})
+        }
+
+
+def test_decode_steam_db_without_schema() -> None:
+    database = {"1": {"packageId": "author.a", "dependencies": ["not", "a", "dict"]}}
+    version, steam_db = decode_steam_db(
+        json.dumps({"version": 1, "database": database}).encode()
+    )
+    assert version == 1
+    assert steam_db == database
+
+
+def test_decode_rules_db() -> None:
+    json_bytes = (DBS_PATH / "userRules.json").read_bytes()
+    rules = decode_rules_db(json_bytes)
+    assert rules is not None
+    assert set(rules) == set(json.loads(json_bytes)["rules"])
+    assert rules["test.test1"]["loadBefore"]["c.c.core"] == {"name": "test3"}
+    assert rules["test.test2"]["loadBottom"] == {
+        "value": True,
+        "comment": "It is not known.",
+    }
+    assert "loadTop" not in rules["test.test2"]
+
+    incompatible = decode_rules_db(
+        b'{"timestamp": 0, "rules": {"a.a": {"incompatibleWith": {"b.b": {}}}}}'
+    )
+    assert incompatible == {"a.a": {"incompatibleWith": {"b.b": {}}}}
+    assert decode_rules_db(b'{"rules": null}') is None
+
+
+def test_get_mods_from_list(metadata_manager: MetadataManager) -> None:
+    metadata_manager.update_parsed_metadata(
+        "uuid-b-workshop",
+        _mod("author.b", data_source="workshop", path="/workshop/author.b"),
+    )
+    metadata_manager.update_parsed_metadata(
+        "uuid-e-workshop",
+        _mod("author.e", data_source="workshop", path="/workshop/author.e"),
+    )
+    metadata_manager.update_parsed_metadata(
+        "uuid-e", _mod("author.e", path="/mods/author.e")
+    )
+
+    active, inactive, duplicates, missing = get_mods_from_list(
+        ["Author.D", "author.b", "author.e_steam", "author.missing"]
+    )
+    # Local mods are preferred, unless the packageid has a _steam suffix
+    assert active == ["uuid-d", "uuid-b", "uuid-e-workshop"]
+    assert inactive == ["uuid-a", "uuid-c", "uuid-b-workshop", "uuid-e"]
+    assert missing == ["author.missing"]
+    assert duplicates == {
+        "author.b": ["uuid-b", "uuid-b-workshop"],
+        "author.e": ["uuid-e-workshop", "uuid-e"],
+    }
+
+
+def test_parse_progress(metadata_manager: MetadataManager) -> None:
+    progress: list[tuple[int, int]] = []
+    metadata_manager.parse_progress_signal.connect(
+        lambda parsed, total: progress.append((parsed, total))
+    )
+    total = PARSE_PROGRESS_STEP * 2 + 1
+    with patch.object(metadata_manager, "_parse_total", total):
+        for _ in range(total):
+            metadata_manager.report_parsed_mods(1)
+    assert progress == [
+        (PARSE_PROGRESS_STEP, total),
+        (PARSE_PROGRESS_STEP * 2, total),
+        (total, total),
+    ]
+
+
+def test_process_batch_progress_with_failures(
+    metadata_manager: MetadataManager,
+) -> None:
+    batch = {f"/mods/mod{i}": f"uuid-{i}" for i in range(PARSER_PROCESS_MIN_BATCH_SIZE)}
+    chunks: list[list[tuple[str, str]]] = []
+
+    def submit(
+        _function: Any, _data_source: str, chunk: list[tuple[str, str]], _entries: Any
+    ) -> Future[Any]:
+        future: Future[Any] = Future()
+        chunks.append(chunk)
+        if len(chunks) == 2:
+            future.set_exception(BrokenProcessPool("worker died"))
+        else:
+            # The first mod of each chunk fails to parse
+            metadata = {uuid: _mod(f"author.{uuid}") for _, uuid in chunk[1:]}
+            future.set_result((metadata, {}, 0, 0, []))
+        return future
+
+    fallback: list[str] = []
+
+    def process_update(mod_directory: str, **_kwargs: Any) -> None:
+        fallback.append(mod_directory)
+        metadata_manager.report_parsed_mods(1)
+
+    metadata_manager.settings_controller.settings.metadata_parser_backend = "process"
+    metadata_manager.about_parse_cache = None
+    with (
+        patch("app.utils.metadata.ProcessPoolExecutor") as executor,
+        patch("os.cpu_count", return_value=2),
+        patch.object(metadata_manager, "process_update", side_effect=process_update),
+    ):
+        executor.return_value.submit.side_effect = submit
+        metadata_manager.process_batch(batch, "local")
+
+    assert len(chunks) > 2
+    # Only the chunks that were not merged are parsed again
+    assert fallback == [directory for chunk in chunks[1:] for directory, _ in chunk]
+    assert metadata_manager._parsed_count == metadata_manager._parse_total == len(batch)
+
+
+def test_cancelled_refresh_skips_parsing(
+    metadata_manager: MetadataManager, tmp_path: Path
+) -> None:
+    # Only a refresh that is parsing mods can be cancelled
+    metadata_manager.cancel_refresh()
+    assert not metadata_manager.refresh_cancelled
+    with patch.object(metadata_manager, "_parsing_refresh", True):
+        metadata_manager.cancel_refresh()
+    assert metadata_manager.refresh_cancelled
+    with patch("app.utils.metadata.parse_mod_metadata") as parse_mod_metadata:
+        ModParser("local", str(tmp_path), metadata_manager, "uuid-e").run()
+    parse_mod_metadata.assert_not_called()
+    assert "uuid-e" not in metadata_manager.internal_local_metadata
+
+
+def test_cancelled_refresh_keeps_metadata(metadata_manager: MetadataManager) -> None:
+    metadata = dict(metadata_manager.internal_local_metadata)
+    packageid_to_uuids = copy.deepcopy(metadata_manager.packageid_to_uuids)
+    rule_snapshot = metadata_manager.rule_snapshot
+
+    def refresh_internal_metadata(is_initial: bool = False) -> None:
+        # Cancelled after a changed mod and a new mod are parsed and a removed
+        # mod is purged, before the other mods are parsed
+        metadata_manager.update_parsed_metadata("uuid-a", _mod("author.a2"))
+        metadata_manager.update_parsed_metadata("uuid-e", _mod("author.e"))
+        metadata_manager.internal_local_metadata.pop("uuid-d")
+        metadata_manager.cancel_refresh()
+
+    with (
+        patch.object(metadata_manager, "refresh_acf_metadata"),
+        patch.object(
+            metadata_manager,
+            "_MetadataManager__refresh_internal_metadata",
+            side_effect=refresh_internal_metadata,
+        ),
+        patch.object(
+            metadata_manager, "_MetadataManager__refresh_external_metadata"
+        ) as refresh_external_metadata,
+        patch.object(metadata_manager, "compile_metadata") as compile_metadata,
+    ):
+        assert metadata_manager.refresh_cache(is_initial=True) is False
+
+    refresh_external_metadata.assert_not_called()
+    compile_metadata.assert_not_called()
+    assert metadata_manager.internal_local_metadata == metadata
+    assert all(
+        metadata_manager.internal_local_metadata[uuid] is mod_metadata
+        for uuid, mod_metadata in metadata.items()
+    )
+    assert metadata_manager.packageid_to_uuids == packageid_to_uuids
+    assert metadata_manager.rule_snapshot is rule_snapshot
+    assert not metadata_manager.dirty_uuids
+    # Mods parsed after the refresh are not skipped
+    assert not metadata_manager.refresh_cancelled
+    metadata_manager.cancel_refresh()
+    assert not metadata_manager.refresh_cancelled
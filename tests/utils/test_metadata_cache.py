@@ -0,0 +1,215 @@
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import msgspec
+import pygit2
+
+from app.utils.metadata_cache import (
+    ABOUT_PARSE_CACHE_FILE_NAME,
+    USE_THIS_INSTEAD_INDEX_FILE_NAME,
+    AboutXmlParseCache,
+    ModReplacement,
+    UseThisInsteadIndex,
+    about_fingerprint,
+    use_this_instead_source_stamp,
+)
+
+MOD_PATH = "/mods/example"
+METADATA = {
+    "name": "Example",
+    "packageid": "author.example",
+    "supportedversions": {"li": ["1.4", "1.5"]},
+}
+
+
+def _make_cache(tmp_path: Path) -> AboutXmlParseCache:
+    cache = AboutXmlParseCache(tmp_path / ABOUT_PARSE_CACHE_FILE_NAME)
+    cache.load()
+    return cache
+
+
+def test_about_fingerprint(tmp_path: Path) -> None:
+    about = tmp_path / "About.xml"
+    about.write_text("<ModMetaData/>")
+    pfid = tmp_path / "PublishedFileId.txt"
+    pfid.write_text("123")
+
+    about_stat = os.stat(about)
+    pfid_stat = os.stat(pfid)
+    assert about_fingerprint(about_stat, pfid_stat) == (
+        about_stat.st_mtime_ns,
+        about_stat.st_size,
+        pfid_stat.st_mtime_ns,
+    )
+    assert about_fingerprint(about_stat, None)[2] == -1
+
+
+def test_cache_hit_and_miss(tmp_path: Path) -> None:
+    cache = _make_cache(tmp_path)
+    assert cache.get(MOD_PATH, (1, 2, 3)) is None
+
+    cache.put(MOD_PATH, (1, 2, 3), METADATA, "123")
+    entry = cache.get(MOD_PATH, (1, 2, 3))
+    assert entry is not None
+    assert entry.metadata == METADATA
+    assert entry.pfid == "123"
+
+    # Any change in the fingerprint invalidates the entry
+    assert cache.get(MOD_PATH, (1, 2, 4)) is None
+    assert cache.get(MOD_PATH, (9, 2, 3)) is None
+    assert (cache.hits, cache.misses) == (1, 3)
+
+    cache.reset_stats()
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_cache_returns_copies(tmp_path: Path) -> None:
+    cache = _make_cache(tmp_path)
+    cache.put(MOD_PATH, (1, 2, 3), METADATA, None)
+
+    entry = cache.get(MOD_PATH, (1, 2, 3))
+    assert entry is not None and entry.metadata is not None
+    entry.metadata["supportedversions"]["li"].append("1.6")
+    entry.metadata["dependencies"] = {"some.dependency"}
+
+    entry = cache.get(MOD_PATH, (1, 2, 3))
+    assert entry is not None
+    assert entry.metadata == METADATA
+
+
+def test_cache_malformed_entry(tmp_path: Path) -> None:
+    cache = _make_cache(tmp_path)
+    cache.put(MOD_PATH, (1, 2, 3), None, None)
+
+    entry = cache.get(MOD_PATH, (1, 2, 3))
+    assert entry is not None
+    assert entry.metadata is None
+
+
+def test_cache_persistence(tmp_path: Path) -> None:
+    cache = _make_cache(tmp_path)
+    cache.put(MOD_PATH, (1, 2, 3), METADATA, "123")
+    cache.put("/mods/removed", (4, 5, -1), METADATA, None)
+    cache.prune([MOD_PATH])
+    cache.save()
+
+    reloaded = _make_cache(tmp_path)
+    assert set(reloaded.entries) == {MOD_PATH}
+    entry = reloaded.get(MOD_PATH, (1, 2, 3))
+    assert entry is not None
+    assert entry.metadata == METADATA
+    assert entry.pfid == "123"
+
+
+def test_cache_discards_outdated_or_corrupt_file(tmp_path: Path) -> None:
+    cache_path = tmp_path / ABOUT_PARSE_CACHE_FILE_NAME
+    cache_path.write_bytes(msgspec.json.encode({"version": -1, "entries": {}}))
+    cache = _make_cache(tmp_path)
+    assert cache.entries == {}
+
+    cache_path.write_text("not json")
+    cache = _make_cache(tmp_path)
+    assert cache.entries == {}
+
+
+def test_cache_entries_for_and_merge(tmp_path: Path) -> None:
+    cache = _make_cache(tmp_path)
+    cache.put(MOD_PATH, (1, 2, 3), METADATA, None)
+    entries = cache.entries_for([MOD_PATH, "/mods/unknown"])
+    assert set(entries) == {MOD_PATH}
+
+    # Simulate a worker process using an in-memory cache
+    worker_cache = AboutXmlParseCache()
+    worker_cache.entries = dict(entries)
+    assert worker_cache.get(MOD_PATH, (1, 2, 3)) is not None
+    worker_cache.put("/mods/new", (4, 5, 6), METADATA, "456")
+    worker_cache.save()
+
+    cache.reset_stats()
+    cache.merge(
+        {"/mods/new": worker_cache.entries["/mods/new"]},
+        worker_cache.hits,
+        worker_cache.misses,
+    )
+    assert set(cache.entries) == {MOD_PATH, "/mods/new"}
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def _write_replacement(folder: Path, pfid: str, versions: str, name: str) -> None:
+    (folder / f"{pfid}.xml").write_text(
+        "<ModReplacement>"
+        f"<ReplacementName>{name}</ReplacementName>"
+        "<ReplacementAuthor>Author</ReplacementAuthor>"
+        f"<ReplacementSteamId>9{pfid}</ReplacementSteamId>"
+        f"<ReplacementVersions>{versions}</ReplacementVersions>"
+        "</ModReplacement>"
+    )
+
+
+def _make_replacements(tmp_path: Path) -> Path:
+    folder = tmp_path / "Replacements"
+    folder.mkdir()
+    _write_replacement(folder, "111", "1.4,1.5", "New A")
+    _write_replacement(folder, "222", "1.4", "New B")
+    (folder / "333.xml").write_text("<NotAReplacement/>")
+    return folder
+
+
+def test_use_this_instead_index(tmp_path: Path) -> None:
+    folder = _make_replacements(tmp_path)
+    index = UseThisInsteadIndex(folder, "1.5.4104 rev435")
+    index.load()
+    # Replacements are filtered to the game version, and malformed ones skipped
+    assert index.replacements == {
+        "111": ModReplacement(name="New A", author="Author", pfid="9111")
+    }
+    assert index.get("222") is None
+    assert index.is_current()
+
+    _write_replacement(folder, "444", "1.5", "New D")
+    os.utime(folder, ns=(1, 1))
+    assert not index.is_current()
+
+
+def test_use_this_instead_index_persistence(tmp_path: Path) -> None:
+    folder = _make_replacements(tmp_path)
+    cache_path = tmp_path / USE_THIS_INSTEAD_INDEX_FILE_NAME
+    UseThisInsteadIndex(folder, "1.5.4104", cache_path).load()
+    assert cache_path.exists()
+
+    # The replacements are not parsed again while the stamp is unchanged
+    with patch("app.utils.metadata_cache.xml_path_to_json") as xml_path_to_json:
+        cached = UseThisInsteadIndex(folder, "1.5.4104", cache_path)
+        cached.load()
+    xml_path_to_json.assert_not_called()
+    assert cached.get("111") == ModReplacement("New A", "Author", "9111")
+
+    # Editing a replacement in place does not change the folder mtime
+    folder_stat = os.stat(folder)
+    _write_replacement(folder, "111", "1.5", "Renamed A")
+    os.utime(folder, ns=(folder_stat.st_atime_ns, folder_stat.st_mtime_ns))
+    assert not cached.is_current()
+    rebuilt = UseThisInsteadIndex(folder, "1.5.4104", cache_path)
+    rebuilt.load()
+    assert rebuilt.get("111") == ModReplacement("Renamed A", "Author", "9111")
+
+    # So is a different game version
+    other_version = UseThisInsteadIndex(folder, "1.4.3901", cache_path)
+    other_version.load()
+    assert set(other_version.replacements) == {"222"}
+
+
+def test_use_this_instead_source_stamp_tracks_commits(tmp_path: Path) -> None:
+    repository = pygit2.init_repository(str(tmp_path))
+    folder = _make_replacements(tmp_path)
+    assert use_this_instead_source_stamp(tmp_path / "missing") is None
+    unborn = use_this_instead_source_stamp(folder)
+    assert unborn is not None
+
+    signature = pygit2.Signature("Test", "test@example.com")
+    tree = repository.TreeBuilder().write()
+    repository.create_commit("HEAD", signature, signature, "initial", tree, [])
+    stamp = use_this_instead_source_stamp(folder)
+    assert stamp != unborn
+    assert stamp is not None and stamp.startswith(str(repository.head.target))
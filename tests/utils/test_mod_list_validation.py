@@ -0,0 +1,113 @@
+import random
+from typing import Any
+
+import pytest
+
+from app.utils.mod_list_validation import ModIssues, ModListValidator
+from app.utils.rule_snapshot import RuleSnapshot
+
+
+def _no_replacement(package_id: str, dependency: str, package_ids: set[str]) -> bool:
+    return False
+
+
+def _reference_load_order_violations(
+    metadata: dict[str, dict[str, Any]], uuids: list[str]
+) -> dict[str, tuple[set[str], set[str]]]:
+    """The index() based checks the validator replaces"""
+    packageid_to_uuid = {metadata[uuid]["packageid"]: uuid for uuid in uuids}
+    violations = {}
+    for uuid in uuids:
+        index = uuids.index(uuid)
+        violations[uuid] = (
+            {
+                target
+                for target, explicit in metadata[uuid].get("loadTheseBefore", [])
+                if explicit
+                and target in packageid_to_uuid
+                and index <= uuids.index(packageid_to_uuid[target])
+            },
+            {
+                target
+                for target, explicit in metadata[uuid].get("loadTheseAfter", [])
+                if explicit
+                and target in packageid_to_uuid
+                and index >= uuids.index(packageid_to_uuid[target])
+            },
+        )
+    return violations
+
+
+def test_validate() -> None:
+    metadata: dict[str, dict[str, Any]] = {
+        "uuid-a": {
+            "packageid": "author.a",
+            "dependencies": [
+                ("author.b", {"alternatives": set()}),
+                ("author.missing", {"alternatives": {"author.alt", "author.c"}}),
+                "author.replaced",
+            ],
+            "incompatibilities": {"author.c", "author.inactive"},
+            "loadTheseBefore": {("author.b", True), ("author.c", False)},
+        },
+        "uuid-b": {"packageid": "author.b", "loadTheseAfter": {("author.c", True)}},
+        "uuid-c": {"packageid": "author.c"},
+    }
+    rules = RuleSnapshot.from_metadata(metadata)
+    validator = ModListValidator(
+        lambda package_id, dependency, _: dependency == "author.replaced"
+    )
+    issues = validator.validate(["uuid-a", "uuid-b", "uuid-c"], rules, False)
+    assert issues["uuid-a"] == ModIssues(
+        missing_dependencies={"author.missing"},
+        conflicting_incompatibilities={"author.c"},
+        load_before_violations={"author.b"},
+    )
+    assert issues["uuid-a"].has_errors
+    assert issues["uuid-b"] == ModIssues()
+    assert not issues["uuid-b"].has_load_order_warnings
+
+    issues = validator.validate(["uuid-c", "uuid-b", "uuid-a"], rules, True)
+    # Only the alternative that is not active is shown
+    assert issues["uuid-a"] == ModIssues(conflicting_incompatibilities={"author.c"})
+    assert issues["uuid-b"] == ModIssues(load_after_violations={"author.c"})
+    assert issues["uuid-b"].has_load_order_warnings
+
+    # A new snapshot version is checked again
+    metadata["uuid-c"]["packageid"] = ""
+    rules = RuleSnapshot.from_metadata(metadata, version=1)
+    assert validator.validate(["uuid-c"], rules, True)["uuid-c"] == ModIssues()
+    # Mods missing from the snapshot have no issues
+    assert validator.validate(["uuid-d"], rules, True) == {"uuid-d": ModIssues()}
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_validate_moves_incrementally(seed: int) -> None:
+    rng = random.Random(seed)
+    count = rng.randrange(2, 60)
+    # Duplicate packageids: the last mod with a packageid is the one checked
+    package_ids = [f"author.mod{rng.randrange(count)}" for _ in range(count)]
+    metadata = {
+        f"uuid-{i}": {
+            "packageid": package_id,
+            "loadTheseBefore": {
+                (p, rng.random() < 0.8) for p in package_ids if rng.random() < 0.1
+            },
+            "loadTheseAfter": {
+                (p, rng.random() < 0.8) for p in package_ids if rng.random() < 0.1
+            },
+        }
+        for i, package_id in enumerate(package_ids)
+    }
+    uuids = list(metadata)
+    rng.shuffle(uuids)
+    rules = RuleSnapshot.from_metadata(metadata)
+    validator = ModListValidator(_no_replacement)
+    for _ in range(20):
+        old_row = rng.randrange(count)
+        uuids.insert(rng.randrange(count), uuids.pop(old_row))
+        issues = validator.validate(list(uuids), rules, False)
+        assert {
+            uuid: (i.load_before_violations, i.load_after_violations)
+            for uuid, i in issues.items()
+        } == _reference_load_order_violations(metadata, uuids)
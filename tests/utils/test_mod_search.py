@@ -0,0 +1,157 @@
+import random
+import string
+import time
+from typing import Any
+
+import pytest
+
+from app.utils.mod_search import ModSearchEntry, ModSearchIndex
+
+
+@pytest.fixture
+def metadata() -> dict[str, dict[str, Any]]:
+    return {
+        "core": {
+            "name": "Core",
+            "packageid": "ludeon.rimworld",
+            "data_source": "expansion",
+            "supportedversions": {"li": "1.5"},
+        },
+        "harmony": {
+            "name": "Harmony",
+            "packageid": "brrainz.harmony",
+            "authors": {"li": ["Andreas Pardeike", "Brrainz"]},
+            "publishedfileid": "2009463077",
+            "data_source": "workshop",
+            "csharp": True,
+            "supportedversions": {"li": ["1.4", "1.5"]},
+        },
+        "textures": {
+            "name": "Better Textures",
+            "packageid": "someone.textures",
+            "authors": "Someone",
+            "data_source": "local",
+            "git_repo": True,
+            "supportedversions": {"li": ["1.3"]},
+        },
+    }
+
+
+def _index(metadata: dict[str, dict[str, Any]]) -> ModSearchIndex:
+    index = ModSearchIndex()
+    index.update(metadata, metadata)
+    return index
+
+
+def test_entry_from_metadata(metadata: dict[str, dict[str, Any]]) -> None:
+    entry = ModSearchEntry.from_metadata(metadata["harmony"])
+    assert entry.name == "harmony"
+    assert entry.authors == "andreas pardeike, brrainz"
+    assert entry.versions == ("1.4", "1.5")
+    assert ModSearchEntry.from_metadata(metadata["core"]).authors is None
+
+
+def test_matching_text_search(metadata: dict[str, dict[str, Any]]) -> None:
+    index = _index(metadata)
+    assert index.matching(metadata, "name", "HAR", "all", 0) == {"harmony"}
+    # Narrowing the last search
+    assert index.matching(metadata, "name", "harx", "all", 0) == set()
+    assert index.matching(metadata, "name", "e", "all", 0) == {"core", "textures"}
+    # Mods without the field are not filtered out
+    assert index.matching(metadata, "authors", "brr", "all", 0) == {
+        "core",
+        "harmony",
+    }
+    assert index.matching(metadata, "name", "", "all", 0) == set(metadata)
+
+
+def test_matching_version_search(metadata: dict[str, dict[str, Any]]) -> None:
+    index = _index(metadata)
+    assert index.matching(metadata, "version", "1.5", "all", 0) == {
+        "core",
+        "harmony",
+    }
+    assert index.matching(metadata, "version", "1.3", "all", 0) == {"textures"}
+
+
+def test_matching_filters(metadata: dict[str, dict[str, Any]]) -> None:
+    index = _index(metadata)
+    assert index.matching(metadata, None, "", "workshop", 0) == {"harmony"}
+    assert index.matching(metadata, None, "", "git_repo", 0) == {"textures"}
+    assert index.matching(metadata, None, "", "steamcmd", 0) == set()
+    assert index.matching(metadata, None, "", "all", 1) == {"harmony"}
+    assert index.matching(metadata, None, "", "all", 2) == {"core", "textures"}
+    assert index.matching(["core", "harmony"], "name", "o", "all", 2) == {"core"}
+
+
+def test_invalidate(metadata: dict[str, dict[str, Any]]) -> None:
+    index = _index(metadata)
+    assert index.matching(metadata, "name", "better", "all", 0) == {"textures"}
+    metadata["textures"]["name"] = "Worse Textures"
+    # Still indexed with the old name until invalidated
+    index.update(metadata, metadata)
+    assert index.matching(metadata, "name", "better", "all", 0) == {"textures"}
+    index.invalidate("textures")
+    index.update(metadata, metadata)
+    assert index.matching(metadata, "name", "better", "all", 0) == set()
+    assert index.matching(metadata, None, "", "git_repo", 0) == {"textures"}
+
+
+def test_ranked(metadata: dict[str, dict[str, Any]]) -> None:
+    metadata["core"]["description"] = "The base game, it does not need Harmony."
+    index = _index(metadata)
+    # Name matches rank above description matches
+    assert [uuid for uuid, _ in index.ranked(metadata, "harmony")] == [
+        "harmony",
+        "core",
+    ]
+    # Typos and prefixes
+    assert index.ranked(metadata, "hamrony")[0][0] == "harmony"
+    assert index.ranked(metadata, "textu")[0][0] == "textures"
+    # Every word must match
+    assert [uuid for uuid, _ in index.ranked(metadata, "better someone")] == [
+        "textures"
+    ]
+    assert index.ranked(metadata, "better harmony") == []
+    assert index.ranked(metadata, "harmony", limit=1) == [("harmony", 3.0)]
+    assert index.ranked(["core"], "harmony") == [("core", 1.0)]
+    assert index.ranked(metadata, " ") == []
+
+
+def test_ranked_reindexes_changed_mods(metadata: dict[str, dict[str, Any]]) -> None:
+    index = _index(metadata)
+    assert index.ranked(metadata, "better")[0][0] == "textures"
+    metadata["textures"]["name"] = "Worse Textures"
+    index.invalidate()
+    index.update(metadata, metadata)
+    assert index.ranked(metadata, "better") == []
+    assert index.ranked(metadata, "worse")[0][0] == "textures"
+    assert index.ranked(metadata, "brrainz")[0][0] == "harmony"
+
+
+def test_ranked_first_query_uses_prebuilt_index() -> None:
+    rng = random.Random(0)
+    words = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10)))
+        for _ in range(20000)
+    ]
+    metadata = {
+        f"uuid-{i}": {
+            "name": " ".join(rng.choices(words, k=rng.randint(1, 4))),
+            "packageid": ".".join(rng.choices(words, k=2)),
+            "authors": rng.choice(words),
+            "description": " ".join(rng.choices(words, k=rng.randint(10, 100))),
+        }
+        for i in range(5000)
+    }
+    metadata["uuid-42"]["name"] = "Harmony"
+    index = _index(metadata)
+    # As when the mod list is rebuilt
+    index.index_words()
+
+    start = time.perf_counter()
+    ranking = index.ranked(metadata, "hamrony", limit=100)
+    elapsed = time.perf_counter() - start
+    assert ranking[0][0] == "uuid-42"
+    # Building the index takes far longer, the first query must not do it
+    assert elapsed < 0.1, f"First ranked query took {elapsed * 1000:.0f} ms"
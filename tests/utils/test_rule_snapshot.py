@@ -0,0 +1,69 @@
+from typing import Any
+
+import pytest
+
+from app.utils.rule_snapshot import ModDependency, ModRules, RuleSnapshot
+
+METADATA: dict[str, dict[str, Any]] = {
+    "uuid-a": {
+        "packageid": "author.a",
+        "dependencies": [
+            "author.b",
+            ("author.c", {"alternatives": {"author.d"}}),
+            ("author.e",),
+        ],
+        "incompatibilities": {"author.f"},
+        "loadTheseBefore": {("author.b", True), ("author.c", False)},
+        "loadTheseAfter": {("author.g", False)},
+        "loadTop": True,
+    },
+    "uuid-b": {"packageid": "author.b", "loadBottom": True},
+}
+
+
+def test_mod_rules_from_metadata() -> None:
+    assert ModRules.from_metadata(METADATA["uuid-a"]) == ModRules(
+        package_id="author.a",
+        dependencies=(
+            ModDependency("author.b"),
+            ModDependency("author.c", frozenset({"author.d"})),
+            ModDependency("author.e"),
+        ),
+        incompatibilities=frozenset({"author.f"}),
+        load_these_before=frozenset({"author.b", "author.c"}),
+        load_these_after=frozenset({"author.g"}),
+        explicit_load_these_before=frozenset({"author.b"}),
+        load_top=True,
+    )
+    assert ModRules.from_metadata({"packageid": "author.b"}) == ModRules("author.b")
+
+
+def test_unsatisfied_dependencies() -> None:
+    mod_rules = ModRules.from_metadata(METADATA["uuid-a"])
+    assert [
+        d.package_id
+        for d in mod_rules.unsatisfied_dependencies({"author.b", "author.d"}, False)
+    ] == ["author.c", "author.e"]
+    assert [
+        d.package_id
+        for d in mod_rules.unsatisfied_dependencies({"author.b", "author.d"}, True)
+    ] == ["author.e"]
+
+
+def test_rule_snapshot() -> None:
+    snapshot = RuleSnapshot.from_metadata(METADATA, version=3)
+    assert snapshot.version == 3
+    assert len(snapshot) == 2
+    assert snapshot["uuid-b"].load_bottom
+    assert snapshot.get("uuid-c") is None
+    assert snapshot.load_top_package_ids == {"author.a"}
+    # Snapshots are immutable
+    with pytest.raises(TypeError):
+        snapshot.rules["uuid-c"] = ModRules("author.c")  # type: ignore[index]
+
+    assert snapshot.covering(METADATA, ["uuid-a"]) is snapshot
+    metadata = {**METADATA, "uuid-c": {"packageid": "author.c"}}
+    covering = snapshot.covering(metadata, ["uuid-a", "uuid-c"])
+    assert covering.version == 3
+    assert covering["uuid-c"] == ModRules("author.c")
+    assert "uuid-c" not in snapshot
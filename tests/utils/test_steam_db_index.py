@@ -0,0 +1,156 @@
+import json
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Generator
+
+import pytest
+
+from app.utils.metadata import changed_keys, decode_steam_db
+from app.utils.steam_db_index import (
+    SteamDbEntries,
+    SteamDbIndex,
+    find_publishedfileids_by_packageid,
+    open_steam_db_index,
+    steam_db_index_path,
+)
+
+DATABASE: dict[str, Any] = {
+    "1111": {
+        "steamName": "Mod A",
+        "packageId": "Author.ModA",
+        "dependencies": {"2222": ["Mod B", "link"]},
+    },
+    "2222": {"steamName": "Mod B", "packageId": "author.modb"},
+    "3333": {"steamName": "Mod A (Continued)", "packageId": "author.moda"},
+    "294100": {"packageid": "Ludeon.RimWorld", "name": "Core", "appid": True},
+    "4444": {"steamName": "Unknown", "blacklist": {"value": True, "comment": "bad"}},
+}
+
+
+def _write_db(path: Path, database: dict[str, Any], version: int = 123) -> None:
+    path.write_text(json.dumps({"version": version, "database": database}))
+
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> Path:
+    path = tmp_path / "steamDB.json"
+    _write_db(path, DATABASE)
+    return path
+
+
+@pytest.fixture
+def steam_db_index(
+    db_path: Path, tmp_path: Path
+) -> Generator[SteamDbIndex, None, None]:
+    index = open_steam_db_index(db_path, tmp_path / "index")
+    yield index
+    index.close()
+
+
+def test_steam_db_index_lookups(steam_db_index: SteamDbIndex) -> None:
+    assert steam_db_index.version == 123
+    assert len(steam_db_index) == len(DATABASE)
+    assert set(steam_db_index) == set(DATABASE)
+    assert dict(steam_db_index.items()) == DATABASE
+    for publishedfileid, entry in DATABASE.items():
+        assert publishedfileid in steam_db_index
+        assert steam_db_index[publishedfileid] == entry
+    assert "5555" not in steam_db_index
+    assert steam_db_index.get("5555") is None
+    with pytest.raises(KeyError):
+        steam_db_index["5555"]
+
+
+def test_steam_db_index_packageid_lookups(steam_db_index: SteamDbIndex) -> None:
+    assert steam_db_index.publishedfileids_for_packageid("AUTHOR.MODA") == [
+        "1111",
+        "3333",
+    ]
+    assert steam_db_index.publishedfileids_for_packageid("author.modb") == ["2222"]
+    assert steam_db_index.publishedfileids_for_packageid("author.modc") == []
+    # Lowercase "packageid" entries are only used by compile_metadata
+    assert steam_db_index.publishedfileid_to_packageid == {"294100": "ludeon.rimworld"}
+    assert steam_db_index.packageid_to_name == {"Ludeon.RimWorld": "Core"}
+
+
+def test_steam_db_index_in_memory_changes(steam_db_index: SteamDbIndex) -> None:
+    steam_db_index["4444"].pop("blacklist")
+    assert "blacklist" not in steam_db_index["4444"]
+
+    steam_db_index["5555"] = {"steamName": "Mod C", "packageId": "author.moda"}
+    del steam_db_index["2222"]
+    assert "2222" not in steam_db_index
+    assert len(steam_db_index) == len(DATABASE)
+    assert set(steam_db_index) == set(DATABASE) - {"2222"} | {"5555"}
+    assert sorted(steam_db_index.publishedfileids_for_packageid("author.moda")) == [
+        "1111",
+        "3333",
+        "5555",
+    ]
+    assert steam_db_index.publishedfileids_for_packageid("author.modb") == []
+
+
+def test_steam_db_index_pickle_reopens_file(steam_db_index: SteamDbIndex) -> None:
+    unpickled = pickle.loads(pickle.dumps(steam_db_index))
+    assert unpickled.index_path == steam_db_index.index_path
+    assert unpickled["1111"] == DATABASE["1111"]
+    unpickled.close()
+
+
+def test_open_steam_db_index_rebuilds_changed_db(
+    db_path: Path, tmp_path: Path, steam_db_index: SteamDbIndex
+) -> None:
+    index_folder = tmp_path / "index"
+    reopened = open_steam_db_index(db_path, index_folder)
+    assert reopened.index_path == steam_db_index.index_path
+    assert changed_keys(steam_db_index, reopened) == set()
+    reopened.close()
+
+    database = dict(DATABASE)
+    database["2222"] = {"steamName": "Mod B", "packageId": "author.modb2"}
+    del database["4444"]
+    _write_db(db_path, database, version=456)
+    os.utime(db_path, ns=(1, 1))
+    rebuilt = open_steam_db_index(db_path, index_folder)
+    assert rebuilt.index_path == steam_db_index_path(db_path, index_folder)
+    assert rebuilt.index_path != steam_db_index.index_path
+    assert rebuilt.version == 456
+    assert rebuilt["2222"]["packageId"] == "author.modb2"
+    assert changed_keys(steam_db_index, rebuilt) == {"2222", "4444"}
+    # The index of the previous version of the JSON was removed
+    assert list(index_folder.iterdir()) == [rebuilt.index_path]
+    rebuilt.close()
+
+
+def test_open_steam_db_index_replaces_corrupt_index(
+    db_path: Path, tmp_path: Path
+) -> None:
+    index_folder = tmp_path / "index"
+    index_folder.mkdir()
+    steam_db_index_path(db_path, index_folder).write_bytes(b"not an index")
+    index = open_steam_db_index(db_path, index_folder)
+    assert index["2222"] == DATABASE["2222"]
+    index.close()
+
+
+def test_find_publishedfileids_by_packageid(steam_db_index: SteamDbIndex) -> None:
+    packageids = ["author.moda", "author.modb", "author.modc"]
+    expected = {"author.moda": ["1111", "3333"], "author.modb": ["2222"]}
+    assert find_publishedfileids_by_packageid(DATABASE, packageids) == expected
+    assert find_publishedfileids_by_packageid(steam_db_index, packageids) == expected
+
+
+def test_steam_db_entries(db_path: Path) -> None:
+    _, steam_db = decode_steam_db(db_path.read_bytes())
+    assert isinstance(steam_db, SteamDbEntries)
+    assert dict(steam_db.items()) == DATABASE
+    assert steam_db.publishedfileid_to_packageid == {"294100": "ludeon.rimworld"}
+    assert steam_db.packageid_to_name == {"Ludeon.RimWorld": "Core"}
+
+    steam_db["4444"].pop("blacklist")
+    assert "blacklist" not in steam_db["4444"]
+    _, reloaded = decode_steam_db(db_path.read_bytes())
+    assert changed_keys(reloaded, steam_db) == {"4444"}
+    del reloaded["1111"]
+    assert changed_keys(steam_db, reloaded) == {"1111", "4444"}
@@ -0,0 +1,111 @@
+from pathlib import Path
+
+import pytest
+from lxml import etree
+
+from app.utils.xml import (
+    ABOUT_XML_TAGS,
+    extract_about_xml_metadata,
+    xml_path_to_json,
+)
+
+MOD_EXAMPLES_PATH = Path(__file__).parent.parent / "data" / "mod_examples"
+
+ABOUT_XML = """<?xml version="1.0" encoding="utf-8"?>
+<ModMetaData>
+  <!-- A comment that should be ignored -->
+  <name>Example Mod</name>
+  <Author>Someone</Author>
+  <packageId>Someone.ExampleMod</packageId>
+  <steamAppId>123</steamAppId>
+  <supportedVersions>
+    <li>1.4</li>
+    <li> 1.5 </li>
+  </supportedVersions>
+  <modDependencies>
+    <li>
+      <packageId>brrainz.harmony</packageId>
+      <displayName>Harmony</displayName>
+      <alternativePackageIds>
+        <li>brrainz.harmony.alt</li>
+      </alternativePackageIds>
+    </li>
+  </modDependencies>
+  <loadAfter>
+    <li IgnoreIfNoMatchingField="True">Ludeon.RimWorld</li>
+  </loadAfter>
+  <loadBefore />
+  <descriptionsByVersion>
+    <v1.5>Description for 1.5</v1.5>
+  </descriptionsByVersion>
+</ModMetaData>
+"""
+
+
+def _xmltodict_about_metadata(path: Path) -> dict[str, object]:
+    """The About.xml metadata as produced by the generic xmltodict path"""
+    data = xml_path_to_json(str(path))
+    return {
+        ("authors" if key.lower() == "author" else key.lower()): value
+        for key, value in data["ModMetaData"].items()
+        if ("authors" if key.lower() == "author" else key.lower()) in ABOUT_XML_TAGS
+    }
+
+
+def test_extract_about_xml_metadata(tmp_path: Path) -> None:
+    about = tmp_path / "About.xml"
+    about.write_text(ABOUT_XML, encoding="utf-8")
+
+    metadata = extract_about_xml_metadata(str(about))
+    assert metadata is not None
+    assert metadata["name"] == "Example Mod"
+    assert metadata["authors"] == "Someone"
+    assert metadata["packageid"] == "Someone.ExampleMod"
+    assert metadata["supportedversions"] == {"li": ["1.4", "1.5"]}
+    assert metadata["loadafter"] == {
+        "li": {"@IgnoreIfNoMatchingField": "True", "#text": "Ludeon.RimWorld"}
+    }
+    assert metadata["loadbefore"] is None
+    assert "steamappid" not in metadata
+    assert metadata == _xmltodict_about_metadata(about)
+
+
+@pytest.mark.parametrize(
+    "about_path",
+    sorted(MOD_EXAMPLES_PATH.rglob("About.xml")),
+    ids=lambda path: path.parent.parent.name,
+)
+def test_extract_about_xml_metadata_matches_xmltodict(about_path: Path) -> None:
+    assert extract_about_xml_metadata(str(about_path)) == _xmltodict_about_metadata(
+        about_path
+    )
+
+
+def test_extract_about_xml_metadata_repeated_tags(tmp_path: Path) -> None:
+    about = tmp_path / "About.xml"
+    about.write_text(
+        "<ModMetaData><packageId>a.first</packageId>"
+        "<packageId>a.second</packageId></ModMetaData>"
+    )
+    metadata = extract_about_xml_metadata(str(about))
+    assert metadata == {"packageid": ["a.first", "a.second"]}
+
+
+def test_extract_about_xml_metadata_invalid_root(tmp_path: Path) -> None:
+    about = tmp_path / "About.xml"
+    about.write_text("<Defs><name>Not a mod</name></Defs>")
+    assert extract_about_xml_metadata(str(about)) is None
+
+    about.write_text("<ModMetaData></ModMetaData>")
+    assert extract_about_xml_metadata(str(about)) is None
+
+    # Unconsumed tags still make a valid, if empty, ModMetaData
+    about.write_text("<ModMetaData><steamAppId>1</steamAppId></ModMetaData>")
+    assert extract_about_xml_metadata(str(about)) == {}
+
+
+def test_extract_about_xml_metadata_malformed(tmp_path: Path) -> None:
+    about = tmp_path / "About.xml"
+    about.write_text("<ModMetaData><name>Broken</ModMetaData>")
+    with pytest.raises(etree.XMLSyntaxError):
+        extract_about_xml_metadata(str(about))
@@ -162,3 +162,56 @@ def test_run_without_unsaved(
     assert patch_dialogue.return_value is None
     assert save_calls == []
     assert patch_launch == [(Path("/fake/path"), ["--test"])]
+
+
+@pytest.fixture
+def cancelled_refresh(
+    monkeypatch: pytest.MonkeyPatch, main_content: Tuple[MainContent, List[bool]]
+) -> List[Tuple[List[str], List[str]]]:
+    """Refreshes of main_content are cancelled, returns the lists inserted"""
+    mc, _ = main_content
+    inserted: List[Tuple[List[str], List[str]]] = []
+    monkeypatch.setattr(mc, "check_if_essential_paths_are_set", lambda prompt: True)
+    # refresh_cache returns False when it is cancelled
+    monkeypatch.setattr(mc, "do_threaded_loading_animation", lambda **kwargs: False)
+    monkeypatch.setattr(
+        mc,
+        "_insert_data_into_lists",
+        lambda active, inactive: inserted.append((active, inactive)),
+    )
+    monkeypatch.setattr(mc.mods_panel, "signal_clear_search", Mock())
+    return inserted
+
+
+def test_cancelled_refresh_keeps_lists(
+    main_content: Tuple[MainContent, List[bool]],
+    cancelled_refresh: List[Tuple[List[str], List[str]]],
+) -> None:
+    mc, _ = main_content
+    mc.mods_panel.active_mods_list.uuids = ["a", "b"]
+    mc._do_refresh()
+    assert cancelled_refresh == []
+    assert mc.mods_panel.active_mods_list.uuids == ["a", "b"]
+
+
+def test_cancelled_initial_refresh_does_not_save(
+    monkeypatch: pytest.MonkeyPatch,
+    main_content: Tuple[MainContent, List[bool]],
+    cancelled_refresh: List[Tuple[List[str], List[str]]],
+) -> None:
+    from app.views import main_content_panel
+
+    mc, _ = main_content
+    written: List[str] = []
+    monkeypatch.setattr(
+        main_content_panel,
+        "json_to_xml_write",
+        lambda data, path: written.append(path),
+    )
+    monkeypatch.setattr(dialogue, "show_warning", Mock())
+    mc._do_refresh(is_initial=True)
+    assert cancelled_refresh == []
+    assert not mc.mod_lists_loaded
+    # The main_content fixture replaces _do_save on the instance
+    MainContent._do_save(mc)
+    assert written == []